@@ -0,0 +1,226 @@
+"""Normalized state machine storage
+
+Revision ID: 20261019_002
+Revises: 20251116_001
+Create Date: 2026-10-19
+
+DO-178C Traceability: REQ-SM-001, REQ-SM-002, REQ-SM-003
+Source: backend/models/project.py, backend/process_engine/schemas/process_engine_ddl.sql
+
+Upgrades a ci_state_machines table created before state machines were
+normalized (one JSON document per machine in state_data):
+- ci_state_machines gains its type, project, cursor, status and context
+  columns, the version (optimistic concurrency), events_since_snapshot
+  (history snapshots) and the progress counters; state_data becomes nullable
+- ci_phase_instances, ci_activity_instances, ci_current_activities and
+  state_machine_history are created
+- every machine still stored in state_data is moved into the normalized
+  tables (StateMachineStore.migrate_legacy), and the progress counters of
+  machines already normalized are backfilled (ensure_progress)
+
+Columns and tables that already exist (e.g. tables created by init_db())
+are left as they are, so the revision can run on any earlier state of
+the schema.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '20261019_002'
+down_revision: Union[str, None] = '20251116_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+STATE_MACHINE_COLUMNS = (
+    sa.Column('ci_type', sa.String(50)),
+    sa.Column('project_id', sa.Integer()),
+    sa.Column('current_sub_phase_index', sa.Integer(), server_default='0'),
+    sa.Column('current_activity_index', sa.Integer(), server_default='0'),
+    sa.Column('status', sa.String(20), server_default='not_started'),
+    sa.Column('context_json', sa.JSON()),
+    sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    sa.Column('events_since_snapshot', sa.Integer(), nullable=False, server_default='0'),
+    # Backfilled below (StateMachineStore.ensure_progress)
+    sa.Column('total_phases', sa.Integer()),
+    sa.Column('completed_phases', sa.Integer()),
+    sa.Column('total_activities', sa.Integer()),
+    sa.Column('completed_activities', sa.Integer()),
+    sa.Column('progress_percent', sa.Float()),
+)
+
+
+def _create_index(inspector, name, table, columns):
+    if name not in {index['name'] for index in inspector.get_indexes(table)}:
+        op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    """Add the normalized state machine schema and migrate JSON documents."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if 'ci_state_machines' not in tables:
+        # Created by init_db() together with the other tables below
+        return
+
+    existing = {column['name']: column for column in inspector.get_columns('ci_state_machines')}
+    with op.batch_alter_table('ci_state_machines') as batch:
+        for column in STATE_MACHINE_COLUMNS:
+            if column.name not in existing:
+                batch.add_column(column.copy())
+        if not existing['state_data']['nullable']:
+            batch.alter_column('state_data', existing_type=sa.Text(), nullable=True)
+    inspector = sa.inspect(bind)
+    _create_index(inspector, 'ix_ci_state_machines_project_id', 'ci_state_machines', ['project_id'])
+
+    if 'ci_phase_instances' not in tables:
+        op.create_table(
+            'ci_phase_instances',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('state_machine_id', sa.Integer(),
+                      sa.ForeignKey('ci_state_machines.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('ci_id', sa.Integer(), nullable=False),
+            sa.Column('phase_id', sa.String(100), nullable=False),
+            sa.Column('phase_name', sa.String(255), nullable=False),
+            sa.Column('phase_order', sa.Integer(), nullable=False),
+            sa.Column('deliverables', sa.JSON()),
+            sa.Column('reviews', sa.JSON()),
+            sa.Column('status', sa.String(20), nullable=False, server_default='not_started'),
+            sa.Column('entry_criteria_met', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column('exit_criteria_met', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column('total_activities', sa.Integer()),
+            sa.Column('completed_activities', sa.Integer()),
+            sa.Column('started_at', sa.DateTime(timezone=True)),
+            sa.Column('completed_at', sa.DateTime(timezone=True)),
+            sa.Column('updated_at', sa.DateTime(timezone=True)),
+            sa.UniqueConstraint('state_machine_id', 'phase_id', name='uq_ci_phase'),
+        )
+    inspector = sa.inspect(bind)
+    for column in ('id', 'state_machine_id', 'ci_id', 'status'):
+        _create_index(inspector, f'ix_ci_phase_instances_{column}', 'ci_phase_instances', [column])
+
+    if 'ci_activity_instances' not in tables:
+        op.create_table(
+            'ci_activity_instances',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('state_machine_id', sa.Integer(),
+                      sa.ForeignKey('ci_state_machines.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('phase_instance_id', sa.Integer(),
+                      sa.ForeignKey('ci_phase_instances.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('ci_id', sa.Integer(), nullable=False),
+            sa.Column('activity_id', sa.String(100), nullable=False),
+            sa.Column('activity_name', sa.String(255), nullable=False),
+            sa.Column('activity_type', sa.String(50), nullable=False),
+            sa.Column('sub_phase_id', sa.String(100), nullable=False),
+            sa.Column('sub_phase_name', sa.String(255), nullable=False),
+            sa.Column('sub_phase_order', sa.Integer(), nullable=False),
+            sa.Column('activity_order', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False, server_default='not_started'),
+            sa.Column('is_required', sa.Boolean(), nullable=False, server_default=sa.true()),
+            sa.Column('output_artifact_types', sa.JSON()),
+            sa.Column('completion_data', sa.JSON()),
+            sa.Column('started_at', sa.DateTime(timezone=True)),
+            sa.Column('completed_at', sa.DateTime(timezone=True)),
+            sa.Column('updated_at', sa.DateTime(timezone=True)),
+            sa.UniqueConstraint('state_machine_id', 'activity_id', name='uq_ci_activity'),
+        )
+    inspector = sa.inspect(bind)
+    for column in ('id', 'state_machine_id', 'phase_instance_id', 'ci_id', 'activity_type', 'status'):
+        _create_index(inspector, f'ix_ci_activity_instances_{column}', 'ci_activity_instances', [column])
+
+    if 'ci_current_activities' not in tables:
+        op.create_table(
+            'ci_current_activities',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('state_machine_id', sa.Integer(),
+                      sa.ForeignKey('ci_state_machines.id', ondelete='CASCADE'), nullable=False, unique=True),
+            sa.Column('ci_id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer()),
+            sa.Column('ci_type', sa.String(50)),
+            sa.Column('dal_level', sa.String(20)),
+            sa.Column('phase_id', sa.String(100)),
+            sa.Column('phase_name', sa.String(255)),
+            sa.Column('phase_order', sa.Integer()),
+            sa.Column('sub_phase_id', sa.String(100)),
+            sa.Column('sub_phase_name', sa.String(255)),
+            sa.Column('activity_id', sa.String(100)),
+            sa.Column('activity_name', sa.String(255)),
+            sa.Column('activity_type', sa.String(50)),
+            sa.Column('is_required', sa.Boolean()),
+            sa.Column('status', sa.String(20), nullable=False, server_default='not_started'),
+            sa.Column('state_machine_status', sa.String(20), nullable=False, server_default='not_started'),
+            sa.Column('started_at', sa.DateTime(timezone=True)),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+    inspector = sa.inspect(bind)
+    _create_index(inspector, 'ix_ci_current_activities_id', 'ci_current_activities', ['id'])
+    _create_index(inspector, 'ix_ci_current_activities_ci_id', 'ci_current_activities', ['ci_id'])
+    _create_index(inspector, 'ix_ci_current_activities_project_id', 'ci_current_activities', ['project_id'])
+    _create_index(inspector, 'idx_ci_current_activities_queue', 'ci_current_activities',
+                  ['project_id', 'status', 'phase_order'])
+    _create_index(inspector, 'idx_ci_current_activities_phase', 'ci_current_activities',
+                  ['project_id', 'phase_id'])
+    _create_index(inspector, 'idx_ci_current_activities_type', 'ci_current_activities',
+                  ['project_id', 'activity_type'])
+
+    if 'state_machine_history' not in tables:
+        op.create_table(
+            'state_machine_history',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('state_machine_id', sa.Integer(),
+                      sa.ForeignKey('ci_state_machines.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('ci_id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer()),
+            sa.Column('change_type', sa.String(50), nullable=False),
+            sa.Column('is_command', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column('phase_id', sa.String(100)),
+            sa.Column('activity_id', sa.String(100)),
+            sa.Column('from_status', sa.String(50)),
+            sa.Column('to_status', sa.String(50)),
+            sa.Column('event_data', sa.JSON()),
+            sa.Column('state_snapshot', sa.JSON()),
+            sa.Column('changed_by', sa.String(255)),
+            sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        )
+    inspector = sa.inspect(bind)
+    for column in ('id', 'ci_id', 'change_type', 'changed_at'):
+        _create_index(inspector, f'ix_state_machine_history_{column}', 'state_machine_history', [column])
+    _create_index(inspector, 'idx_sm_history_project_keyset', 'state_machine_history', ['project_id', 'id'])
+    _create_index(inspector, 'idx_sm_history_machine_keyset', 'state_machine_history', ['state_machine_id', 'id'])
+
+    # Data: JSON documents into the normalized tables, in this transaction
+    from sqlalchemy.orm import Session
+    from models.project import CIStateMachine
+    from services.state_machine_store import StateMachineStore
+
+    session = Session(bind=bind)
+    try:
+        store = StateMachineStore(session)
+        migrated = store.migrate_legacy()
+        backfilled = 0
+        for record in session.query(CIStateMachine).filter(CIStateMachine.total_activities.is_(None)):
+            store.ensure_progress(record)
+            backfilled += 1
+        session.flush()
+    finally:
+        session.close()
+    print(f"✅ Migrated {migrated} state machines to normalized storage, backfilled {backfilled} progress counters")
+
+
+def downgrade() -> None:
+    """
+    Drop the normalized state machine schema.
+
+    WARNING: Machines are not converted back to state_data; their state is
+    lost. Only use in development or with confirmed backups.
+    """
+    for table in ('state_machine_history', 'ci_current_activities', 'ci_activity_instances', 'ci_phase_instances'):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
+
+    op.drop_index('ix_ci_state_machines_project_id', table_name='ci_state_machines')
+    with op.batch_alter_table('ci_state_machines') as batch:
+        for column in reversed(STATE_MACHINE_COLUMNS):
+            batch.drop_column(column.name)
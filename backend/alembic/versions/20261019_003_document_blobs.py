@@ -0,0 +1,73 @@
+"""Content-addressed document blobs
+
+Revision ID: 20261019_003
+Revises: 20261019_002
+Create Date: 2026-10-19
+
+DO-178C Traceability: REQ-DOC-001, REQ-CERT-004
+Source: backend/models/document_export.py
+
+Upgrades a document_exports table created before exported files were
+stored as compressed, content-addressed blobs:
+- document_exports gains file_name (the name a file is downloaded as) and
+  an index on file_hash (the blob key)
+- document_blobs is created
+
+Columns, indexes and tables that already exist (e.g. created by init_db())
+are left as they are. Exports written before this revision keep their
+file_path; they have no blob, so no reference is counted for them.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '20261019_003'
+down_revision: Union[str, None] = '20261019_002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the export file name, the blob key index and the blob table."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if 'document_exports' not in tables:
+        # Created by init_db() together with document_blobs
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('document_exports')}
+    if 'file_name' not in columns:
+        with op.batch_alter_table('document_exports') as batch:
+            batch.add_column(sa.Column('file_name', sa.String(255)))
+    indexes = {index['name'] for index in sa.inspect(bind).get_indexes('document_exports')}
+    if 'ix_document_exports_file_hash' not in indexes:
+        op.create_index('ix_document_exports_file_hash', 'document_exports', ['file_hash'])
+
+    if 'document_blobs' not in tables:
+        op.create_table(
+            'document_blobs',
+            sa.Column('sha256', sa.String(64), primary_key=True),
+            sa.Column('size', sa.Integer(), nullable=False),
+            sa.Column('stored_size', sa.Integer(), nullable=False),
+            sa.Column('compression', sa.String(10), nullable=False, server_default='gzip'),
+            sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('released_at', sa.DateTime(timezone=True)),
+        )
+
+
+def downgrade() -> None:
+    """
+    Drop the blob table, the file name and the index.
+
+    WARNING: Exports stored as blobs are not converted back to plain files;
+    their downloads are lost. Only use in development or with confirmed
+    backups.
+    """
+    op.execute("DROP TABLE IF EXISTS document_blobs")
+    op.drop_index('ix_document_exports_file_hash', table_name='document_exports')
+    with op.batch_alter_table('document_exports') as batch:
+        batch.drop_column('file_name')
@@ -0,0 +1,57 @@
+"""Display ID sequences
+
+Revision ID: 20261019_004
+Revises: 20261019_003
+Create Date: 2026-10-19
+
+DO-178C Traceability: REQ-DB-064
+Source: backend/models/audit.py, backend/services/display_id_allocator.py
+
+Creates display_id_sequences, the counters DisplayIdAllocator reserves
+blocks of display ID numbers from, and seeds every sequence from the
+highest number already in use (requirements.requirement_id,
+design_components.component_id, configuration_items.ci_identifier,
+projects.project_code), so the first IDs handed out after the upgrade do
+not collide with existing ones.
+
+The table is left as it is if it already exists (e.g. created by
+init_db()); its sequences are still advanced past the numbers in use.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '20261019_004'
+down_revision: Union[str, None] = '20261019_003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the display ID sequences and seed them from existing IDs."""
+    bind = op.get_bind()
+
+    if 'display_id_sequences' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'display_id_sequences',
+            sa.Column('name', sa.String(100), primary_key=True),
+            sa.Column('next_value', sa.BigInteger(), nullable=False, server_default='1'),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    # Data: start each sequence after the highest number in use, in this transaction
+    from services.display_id_allocator import seed_sequences
+
+    seeded = seed_sequences(bind)
+    print(f"✅ Seeded {len(seeded)} display ID sequences")
+
+
+def downgrade() -> None:
+    """
+    Drop the display ID sequences.
+
+    WARNING: DisplayIdAllocator needs this table; only downgrade together
+    with the code. Only use in development or with confirmed backups.
+    """
+    op.execute("DROP TABLE IF EXISTS display_id_sequences")
@@ -32,6 +32,20 @@ class Settings(BaseSettings):
     lm_studio_url: str = Field("http://localhost:1234/v1", env="LM_STUDIO_URL")
     lm_studio_model: str = Field("mistral-7b-instruct", env="LM_STUDIO_MODEL")
     ai_service: str = Field("claude", env="AI_SERVICE")
+    ai_instruction_path: str = Field("", env="AI_INSTRUCTION_PATH")
+
+    # Fake AI Provider Settings (load testing without an upstream model)
+    fake_ai_seed: int = Field(0, env="FAKE_AI_SEED")
+    fake_ai_script_path: str = Field("", env="FAKE_AI_SCRIPT_PATH")
+    fake_ai_ttft_ms: float = Field(200.0, env="FAKE_AI_TTFT_MS")
+    fake_ai_latency_sigma: float = Field(0.5, env="FAKE_AI_LATENCY_SIGMA")
+    fake_ai_ms_per_token: float = Field(5.0, env="FAKE_AI_MS_PER_TOKEN")
+    fake_ai_error_rate: float = Field(0.0, env="FAKE_AI_ERROR_RATE")
+
+    # AI Metrics Settings
+    ai_usage_window_hours: int = Field(24, env="AI_USAGE_WINDOW_HOURS")
+    ai_cost_per_million_input_tokens: float = Field(0.0, env="AI_COST_PER_MILLION_INPUT_TOKENS")
+    ai_cost_per_million_output_tokens: float = Field(0.0, env="AI_COST_PER_MILLION_OUTPUT_TOKENS")
 
     # Security Settings
     secret_key: str = Field(..., env="SECRET_KEY")
@@ -53,6 +67,21 @@ class Settings(BaseSettings):
     # Export Settings
     export_templates_dir: str = Field("./templates", env="EXPORT_TEMPLATES_DIR")
     export_output_dir: str = Field("./exports", env="EXPORT_OUTPUT_DIR")
+    export_compression_level: int = Field(6, env="EXPORT_COMPRESSION_LEVEL")
+    export_blob_gc_grace_minutes: int = Field(60, env="EXPORT_BLOB_GC_GRACE_MINUTES")
+
+    # Process Engine Settings
+    process_template_snapshot_path: str = Field("", env="PROCESS_TEMPLATE_SNAPSHOT_PATH")
+    document_template_cache_dir: str = Field("", env="DOCUMENT_TEMPLATE_CACHE_DIR")
+    document_render_workers: int = Field(4, env="DOCUMENT_RENDER_WORKERS")
+
+    # Interview Session Settings
+    interview_session_backend: str = Field("memory", env="INTERVIEW_SESSION_BACKEND")
+    interview_session_ttl_minutes: int = Field(120, env="INTERVIEW_SESSION_TTL_MINUTES")
+    interview_session_max: int = Field(10000, env="INTERVIEW_SESSION_MAX")
+
+    # Display ID Settings (numbers reserved per database round trip)
+    display_id_block_size: int = Field(20, env="DISPLAY_ID_BLOCK_SIZE")
 
     # DO-178C Compliance Settings
     enable_audit_trail: bool = Field(True, env="ENABLE_AUDIT_TRAIL")
@@ -68,8 +97,32 @@ class Settings(BaseSettings):
     @classmethod
     def validate_ai_service(cls, v):
         """Ensure AI service is valid."""
-        if v not in ["claude", "lmstudio"]:
-            raise ValueError("ai_service must be 'claude' or 'lmstudio'")
+        if v not in ["claude", "lmstudio", "fake"]:
+            raise ValueError("ai_service must be 'claude', 'lmstudio' or 'fake'")
+        return v
+
+    @field_validator("interview_session_backend")
+    @classmethod
+    def validate_interview_session_backend(cls, v):
+        """Ensure the interview session backend is known."""
+        if v not in ["memory", "database"]:
+            raise ValueError("interview_session_backend must be 'memory' or 'database'")
+        return v
+
+    @field_validator("document_render_workers")
+    @classmethod
+    def validate_document_render_workers(cls, v):
+        """Ensure the render pool size is not negative."""
+        if v < 0:
+            raise ValueError("document_render_workers must be 0 or more")
+        return v
+
+    @field_validator("export_compression_level")
+    @classmethod
+    def validate_export_compression_level(cls, v):
+        """Ensure the compression level is a valid gzip level."""
+        if not 1 <= v <= 9:
+            raise ValueError("export_compression_level must be between 1 and 9")
         return v
 
     model_config = SettingsConfigDict(
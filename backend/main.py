@@ -15,6 +15,8 @@ import logging
 from config.settings import settings
 from database.connection import init_db
 from services.websocket_manager import init_websocket_manager
+from services.document_package_service import shutdown_render_pool
+from process_engine import get_document_environment, get_template_registry
 
 # Import routers
 from routers import (
@@ -30,7 +32,8 @@ from routers import (
     approval,
     auth,
     configuration_items,
-    process_engine
+    process_engine,
+    metrics
 )
 
 # Configure logging
@@ -54,10 +57,20 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("Database initialized successfully")
 
+    registry = get_template_registry()
+    if settings.process_template_snapshot_path:
+        registry.configure_snapshot(settings.process_template_snapshot_path)
+    logger.info(f"Loaded {registry.warm()} process templates")
+
+    documents = get_document_environment()
+    documents.configure(settings.document_template_cache_dir, auto_reload=settings.debug)
+    logger.info(f"Compiled {documents.warm()} document templates")
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    shutdown_render_pool()
 
 
 # Create FastAPI application
@@ -91,6 +104,7 @@ app.include_router(traceability.router, prefix="/api/v1", tags=["Traceability"])
 app.include_router(documents.router, prefix="/api/v1", tags=["Documents"])
 app.include_router(configuration_items.router, prefix="/api/v1", tags=["Configuration Items"])
 app.include_router(process_engine.router, prefix="/api/v1", tags=["Process Engine"])
+app.include_router(metrics.router, prefix="/api/v1", tags=["Metrics"])
 
 
 @app.get("/")
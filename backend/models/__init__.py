@@ -7,7 +7,18 @@ This package contains all database models with complete traceability
 to DO-178C requirements and audit trail capabilities.
 """
 
-from .project import Project, CIStateMachine
+from .project import (
+    Project,
+    CIStateMachine,
+    CIPhaseInstance,
+    CIActivityInstance,
+    CICurrentActivity,
+    StateMachineHistory,
+    InterviewSessionState,
+    InterviewAnswer,
+    GeneratedDocumentRecord,
+    GeneratedDocumentHistory
+)
 from .requirement import Requirement
 from .design_component import DesignComponent
 from .test_case import TestCase
@@ -19,9 +30,9 @@ from .traceability import (
     DesignTestTrace,
     TraceabilityGap
 )
-from .audit import VersionHistory, ChangeRequest, ValidationDecision
+from .audit import VersionHistory, ChangeRequest, ValidationDecision, DisplayIdSequence
 from .user import User
-from .document_export import DocumentExport
+from .document_export import DocumentBlob, DocumentExport
 from .configuration_item import (
     ConfigurationItem,
     BillOfMaterials,
@@ -55,7 +66,9 @@ __all__ = [
     "VersionHistory",
     "ChangeRequest",
     "ValidationDecision",
+    "DisplayIdSequence",
     "DocumentExport",
+    "DocumentBlob",
 
     # Configuration Management
     "ConfigurationItem",
@@ -68,4 +81,12 @@ __all__ = [
 
     # Process Engine
     "CIStateMachine",
+    "CIPhaseInstance",
+    "CIActivityInstance",
+    "CICurrentActivity",
+    "StateMachineHistory",
+    "InterviewSessionState",
+    "InterviewAnswer",
+    "GeneratedDocumentRecord",
+    "GeneratedDocumentHistory",
 ]
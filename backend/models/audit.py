@@ -7,7 +7,7 @@ All changes to critical entities must be tracked with full
 audit trail for DO-178C compliance.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, JSON, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum as SQLEnum, JSON, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -178,3 +178,25 @@ class ValidationDecision(Base):
 
     def __repr__(self):
         return f"<ValidationDecision(id={self.id}, decision='{self.decision}', by='{self.decided_by}')>"
+
+
+class DisplayIdSequence(Base):
+    """
+    Counter behind a family of human-readable display IDs.
+
+    One row per sequence (e.g. "REQ-FN", "CI-SW", "LOG"); every number
+    below next_value has been handed out. Workers reserve whole blocks
+    by advancing next_value (see DisplayIdAllocator), so IDs are unique
+    across workers and restarts.
+
+    Traceability:
+    - REQ-DB-064: Audit trail (stable, unique identifiers)
+    """
+    __tablename__ = "display_id_sequences"
+
+    name = Column(String(100), primary_key=True)
+    next_value = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DisplayIdSequence(name='{self.name}', next_value={self.next_value})>"
@@ -5,6 +5,10 @@ Purpose: Track generated certification documents
 
 Document exports are tracked for audit purposes and to maintain
 a complete record of all generated certification artifacts.
+
+Exported files are stored as compressed, content-addressed blobs: exports
+with identical content share one blob, keyed by the SHA-256 recorded in
+DocumentExport.file_hash.
 """
 
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Boolean, JSON
@@ -59,9 +63,10 @@ class DocumentExport(Base):
     description = Column(Text)
 
     # File Information
-    file_path = Column(String(1000), nullable=False)  # Path to generated file
+    file_path = Column(String(1000), nullable=False)  # Path to generated file (blob)
+    file_name = Column(String(255))  # Name the file is downloaded as
     file_size = Column(Integer)  # Size in bytes
-    file_hash = Column(String(64))  # SHA-256 hash for integrity verification
+    file_hash = Column(String(64), index=True)  # SHA-256 hash for integrity verification; blob key
 
     # Generation Parameters
     template_used = Column(String(255))
@@ -86,3 +91,30 @@ class DocumentExport(Base):
 
     def __repr__(self):
         return f"<DocumentExport(id={self.id}, type='{self.document_type}', format='{self.export_format}')>"
+
+
+class DocumentBlob(Base):
+    """
+    Compressed file content shared by document exports.
+
+    ref_count is the number of document exports pointing at the blob. Blobs
+    whose count has been zero for a grace period are garbage collected
+    (see DocumentBlobService.collect_garbage).
+
+    Traceability:
+    - REQ-DOC-001: Document generation tracking
+    - REQ-CERT-004: Certification artifact management
+    """
+
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # SHA-256 of the uncompressed content
+    size = Column(Integer, nullable=False)  # Uncompressed size in bytes
+    stored_size = Column(Integer, nullable=False)  # Compressed size in bytes
+    compression = Column(String(10), nullable=False, default="gzip")
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    released_at = Column(DateTime(timezone=True))  # When ref_count last dropped to zero
+
+    def __repr__(self):
+        return f"<DocumentBlob(sha256='{self.sha256[:12]}', refs={self.ref_count})>"
@@ -7,7 +7,7 @@ A project is the top-level container for all requirements, design,
 tests, and traceability information.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, JSON, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.connection import Base
@@ -114,9 +114,15 @@ class CIStateMachine(Base):
     """
     State Machine Instance for Configuration Items.
 
-    This model stores the runtime state of a development process (state machine)
-    for a Configuration Item. The state_data field contains the complete serialized
-    state machine instance.
+    This model stores the header and cursor of a development process (state
+    machine) for a Configuration Item. Per-phase and per-activity state lives
+    in CIPhaseInstance / CIActivityInstance rows, so a transition only updates
+    the rows it touches. state_data is kept for machines persisted before the
+    normalized tables existed; they are migrated by alembic revision
+    20261019_002 (StateMachineStore.migrate_legacy).
+
+    Every transition increments version; a concurrent writer that read an
+    older version fails with StaleDataError instead of overwriting.
 
     Traceability:
     - REQ-SM-001: Development lifecycle state machine
@@ -128,11 +134,13 @@ class CIStateMachine(Base):
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
 
-    # GUID for external references
+    # GUID for external references (StateMachineInstance.instance_id)
     guid = Column(String(36), unique=True, nullable=False, index=True)
 
     # CI Reference
     ci_id = Column(Integer, nullable=False, index=True)
+    ci_type = Column(String(50))  # Process engine CI type
+    project_id = Column(Integer, index=True)  # Denormalized from configuration_items
 
     # Template Information
     template_id = Column(String(100), nullable=False)
@@ -141,16 +149,442 @@ class CIStateMachine(Base):
     # Process Configuration
     dal_level = Column(String(20))  # DAL_A, DAL_B, ASIL_D, SIL_4, etc.
 
-    # Current State
+    # Current State (cursor)
     current_phase_index = Column(Integer, default=0)
+    current_sub_phase_index = Column(Integer, default=0)
+    current_activity_index = Column(Integer, default=0)
+    status = Column(String(20), default="not_started")
+
+    # Context for conditional logic
+    context_json = Column(JSON, default={})
+
+    # Legacy: complete JSON-serialized StateMachineInstance (pre-normalization rows)
+    state_data = Column(Text, nullable=True)
+
+    # Optimistic concurrency: each transition bumps the version and the
+    # UPDATE only matches the version that was read (compare-and-swap)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Replayable history events since the last snapshot (see StateMachineHistory)
+    events_since_snapshot = Column(Integer, nullable=False, default=0, server_default="0")
 
-    # Complete State Data (JSON-serialized StateMachineInstance)
-    state_data = Column(Text, nullable=False)
+    # Progress counters, maintained incrementally by every transition
+    # (NULL on rows written before they existed; backfilled on first use)
+    total_phases = Column(Integer)
+    completed_phases = Column(Integer)
+    total_activities = Column(Integer)
+    completed_activities = Column(Integer)
+    progress_percent = Column(Float)
 
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     created_by = Column(String(255))
 
+    __mapper_args__ = {
+        "version_id_col": version,
+        "version_id_generator": False
+    }
+
     def __repr__(self):
         return f"<CIStateMachine(id={self.id}, ci_id={self.ci_id}, template='{self.template_name}')>"
+
+
+class CIPhaseInstance(Base):
+    """
+    Runtime state of one phase of a CI state machine.
+
+    Traceability:
+    - REQ-SM-001: Development lifecycle state machine
+    - REQ-SM-002: Phase preconditions
+    """
+    __tablename__ = "ci_phase_instances"
+    __table_args__ = (
+        UniqueConstraint("state_machine_id", "phase_id", name="uq_ci_phase"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Parent references
+    state_machine_id = Column(Integer, ForeignKey("ci_state_machines.id", ondelete="CASCADE"), nullable=False, index=True)
+    ci_id = Column(Integer, nullable=False, index=True)
+
+    # Phase identification (rows are ordered by id, i.e. template order)
+    phase_id = Column(String(100), nullable=False)
+    phase_name = Column(String(255), nullable=False)
+    phase_order = Column(Integer, nullable=False)
+    deliverables = Column(JSON, default=[])
+    reviews = Column(JSON, default=[])
+
+    # Status
+    status = Column(String(20), nullable=False, default="not_started", index=True)
+    entry_criteria_met = Column(Boolean, nullable=False, default=False)
+    exit_criteria_met = Column(Boolean, nullable=False, default=False)
+
+    # Progress (completed counts skipped activities too)
+    total_activities = Column(Integer)
+    completed_activities = Column(Integer)
+
+    # Timestamps
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CIPhaseInstance(id={self.id}, phase_id='{self.phase_id}', status='{self.status}')>"
+
+
+class CIActivityInstance(Base):
+    """
+    Runtime state of one activity of a CI state machine.
+
+    Sub-phases are not stored separately; their identity and order are
+    carried on each activity row and their status is derived.
+
+    Traceability:
+    - REQ-SM-003: Sub-phase sequence, activity optional/required
+    """
+    __tablename__ = "ci_activity_instances"
+    __table_args__ = (
+        UniqueConstraint("state_machine_id", "activity_id", name="uq_ci_activity"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Parent references
+    state_machine_id = Column(Integer, ForeignKey("ci_state_machines.id", ondelete="CASCADE"), nullable=False, index=True)
+    phase_instance_id = Column(Integer, ForeignKey("ci_phase_instances.id", ondelete="CASCADE"), nullable=False, index=True)
+    ci_id = Column(Integer, nullable=False, index=True)
+
+    # Activity identification
+    activity_id = Column(String(100), nullable=False)
+    activity_name = Column(String(255), nullable=False)
+    activity_type = Column(String(50), nullable=False, index=True)
+
+    # Sub-phase info
+    sub_phase_id = Column(String(100), nullable=False)
+    sub_phase_name = Column(String(255), nullable=False)
+    sub_phase_order = Column(Integer, nullable=False)
+    activity_order = Column(Integer, nullable=False)  # Position within the sub-phase
+
+    # Status
+    status = Column(String(20), nullable=False, default="not_started", index=True)
+    is_required = Column(Boolean, nullable=False, default=True)
+
+    # Outputs
+    output_artifact_types = Column(JSON, default=[])
+    completion_data = Column(JSON, default={})
+
+    # Timestamps
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CIActivityInstance(id={self.id}, activity_id='{self.activity_id}', status='{self.status}')>"
+
+
+class CICurrentActivity(Base):
+    """
+    Work-queue projection: the current activity of each CI state machine.
+
+    One row per state machine, rewritten by StateMachineStore on every
+    transition so cross-CI questions ("what is in progress or blocked in
+    this project, by phase") are answered by an indexed query instead of
+    loading every machine.
+
+    Traceability:
+    - REQ-SM-001: Development lifecycle state machine
+    - REQ-SM-003: Sub-phase sequence
+    """
+    __tablename__ = "ci_current_activities"
+    __table_args__ = (
+        Index("idx_ci_current_activities_queue", "project_id", "status", "phase_order"),
+        Index("idx_ci_current_activities_phase", "project_id", "phase_id"),
+        Index("idx_ci_current_activities_type", "project_id", "activity_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Parent references
+    state_machine_id = Column(
+        Integer, ForeignKey("ci_state_machines.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    ci_id = Column(Integer, nullable=False, index=True)
+    project_id = Column(Integer, index=True)  # Denormalized from configuration_items
+    ci_type = Column(String(50))
+    dal_level = Column(String(20))
+
+    # Position (null once the machine is completed)
+    phase_id = Column(String(100))
+    phase_name = Column(String(255))
+    phase_order = Column(Integer)
+    sub_phase_id = Column(String(100))
+    sub_phase_name = Column(String(255))
+    activity_id = Column(String(100))
+    activity_name = Column(String(255))
+    activity_type = Column(String(50))
+    is_required = Column(Boolean)
+
+    # Activity status, or the machine status when there is no current activity
+    status = Column(String(20), nullable=False, default="not_started")
+    state_machine_status = Column(String(20), nullable=False, default="not_started")
+
+    # Timestamps
+    started_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def to_dict(self):
+        return {
+            "ci_id": self.ci_id,
+            "ci_type": self.ci_type,
+            "dal_level": self.dal_level,
+            "phase": {"phase_id": self.phase_id, "name": self.phase_name, "order": self.phase_order},
+            "sub_phase": {"sub_phase_id": self.sub_phase_id, "name": self.sub_phase_name},
+            "activity": {
+                "activity_id": self.activity_id,
+                "name": self.activity_name,
+                "type": self.activity_type,
+                "required": self.is_required,
+            },
+            "status": self.status,
+            "state_machine_status": self.state_machine_status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<CICurrentActivity(ci_id={self.ci_id}, activity_id='{self.activity_id}', status='{self.status}')>"
+
+
+class StateMachineHistory(Base):
+    """
+    Append-only event log of state machine transitions.
+
+    Every controller event is one row. Rows with state_snapshot hold the
+    complete state (format 1 dict) at changed_at: one is written when the
+    machine is created and then periodically, so the state at any past
+    time is the nearest earlier snapshot plus a bounded number of replayed
+    command events.
+
+    Traceability:
+    - REQ-SM-001: Development lifecycle state machine
+    - REQ-SM-003: Sub-phase sequence
+    """
+    __tablename__ = "state_machine_history"
+    __table_args__ = (
+        Index("idx_sm_history_project_keyset", "project_id", "id"),
+        Index("idx_sm_history_machine_keyset", "state_machine_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Context
+    state_machine_id = Column(Integer, ForeignKey("ci_state_machines.id", ondelete="CASCADE"), nullable=False)
+    ci_id = Column(Integer, nullable=False, index=True)
+    project_id = Column(Integer)
+
+    # Change info (TransitionType)
+    change_type = Column(String(50), nullable=False, index=True)
+    is_command = Column(Boolean, nullable=False, default=False)
+
+    # What changed
+    phase_id = Column(String(100))
+    activity_id = Column(String(100))
+    from_status = Column(String(50))
+    to_status = Column(String(50))
+    event_data = Column(JSON)
+
+    # Complete state at changed_at (snapshot rows only)
+    state_snapshot = Column(JSON)
+
+    # User and timestamp (timezone-aware UTC)
+    changed_by = Column(String(255))
+    changed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "state_machine_id": self.state_machine_id,
+            "ci_id": self.ci_id,
+            "change_type": self.change_type,
+            "is_command": self.is_command,
+            "phase_id": self.phase_id,
+            "activity_id": self.activity_id,
+            "from_status": self.from_status,
+            "to_status": self.to_status,
+            "event_data": self.event_data,
+            "has_snapshot": self.state_snapshot is not None,
+            "changed_by": self.changed_by,
+            "changed_at": self.changed_at.isoformat() if self.changed_at else None,
+        }
+
+    def __repr__(self):
+        return f"<StateMachineHistory(id={self.id}, ci_id={self.ci_id}, change_type='{self.change_type}')>"
+
+
+class InterviewSessionState(Base):
+    """
+    Serialized state of a live interview session.
+
+    Sessions are stored as compact JSON (script, current question,
+    answered questions, context) rather than executor objects, so any
+    worker can resume them; expired rows are purged by the session store.
+
+    Traceability:
+    - REQ-IS-001: Interview script execution
+    """
+    __tablename__ = "interview_sessions"
+
+    session_id = Column(String(36), primary_key=True)
+    script_name = Column(String(100), nullable=False)
+    project_id = Column(Integer, index=True)
+
+    # InterviewState.to_dict() as JSON text
+    state_json = Column(Text, nullable=False)
+
+    # Sliding expiry: pushed forward on every write
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<InterviewSessionState(session_id='{self.session_id}', script_name='{self.script_name}')>"
+
+
+class InterviewAnswer(Base):
+    """
+    Append-only log of captured interview answers.
+
+    Answers targeting project columns are written here first, one INSERT
+    per answer, and applied to the project in batches by the answer write
+    buffer (see AnswerWriteBuffer). Rows not yet applied are the pending
+    writes: they survive a crash and are applied by the next flush.
+
+    Traceability:
+    - REQ-DC-003: Database storage with audit trail
+    - REQ-IS-001: Interview script execution
+    """
+    __tablename__ = "interview_answers"
+    __table_args__ = (
+        Index("idx_interview_answers_pending", "project_id", "storage_successful"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Context
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    session_id = Column(String(36), index=True)
+
+    # Question info
+    question_id = Column(String(100), nullable=False, index=True)
+    question_text = Column(Text, nullable=False)
+    sub_phase_id = Column(String(100))
+
+    # Answer info (raw answer as JSON text)
+    answer_raw = Column(Text, nullable=False)
+    answer_transformed = Column(JSON)
+
+    # Storage mapping (target_json_path set for json_merge targets)
+    target_table = Column(String(100))
+    target_column = Column(String(100))
+    target_json_path = Column(String(100))
+    target_record_id = Column(Integer)
+    storage_successful = Column(Boolean, nullable=False, default=False)
+    storage_error = Column(Text)
+
+    # Audit
+    answered_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<InterviewAnswer(id={self.id}, project_id={self.project_id}, question_id='{self.question_id}')>"
+
+
+class GeneratedDocumentRecord(Base):
+    """
+    Current version of a document generated from a template.
+
+    source_data_hash is a hash of the data the document was rendered from;
+    source_fingerprint summarizes the source rows (counts, highest IDs,
+    latest timestamps) so an unchanged document is recognised without
+    loading them. Each version's content is kept in generated_document_history.
+
+    Traceability:
+    - REQ-AG-001: Template-based document generation
+    - REQ-AG-005: Generated document tracking
+    """
+    __tablename__ = "generated_documents"
+    __table_args__ = (
+        Index("idx_generated_documents_project_type", "project_id", "document_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Context
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    ci_id = Column(Integer, ForeignKey("configuration_items.id", ondelete="SET NULL"))
+
+    # Document info
+    document_type = Column(String(50), nullable=False, index=True)
+    title = Column(String(500), nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+
+    # Content
+    content = Column(Text, nullable=False)
+    content_format = Column(String(20), nullable=False, default="markdown")
+
+    # Generation info
+    template_id = Column(String(100))
+    template_version = Column(String(20))
+    source_data_hash = Column(String(64))
+    source_fingerprint = Column(String(64))
+
+    # Status: draft, needs_review, reviewed, approved, obsolete
+    status = Column(String(20), nullable=False, default="draft", index=True)
+
+    # Timestamps
+    generated_at = Column(DateTime, nullable=False)
+    reviewed_at = Column(DateTime(timezone=True))
+    approved_at = Column(DateTime(timezone=True))
+
+    # Users
+    generated_by = Column(Integer, ForeignKey("users.id"))
+    reviewed_by = Column(Integer, ForeignKey("users.id"))
+    approved_by = Column(Integer, ForeignKey("users.id"))
+
+    # Audit
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    history = relationship(
+        "GeneratedDocumentHistory", back_populates="document",
+        cascade="all, delete-orphan", order_by="GeneratedDocumentHistory.version"
+    )
+
+    def __repr__(self):
+        return f"<GeneratedDocumentRecord(id={self.id}, type='{self.document_type}', version={self.version})>"
+
+
+class GeneratedDocumentHistory(Base):
+    """
+    Content of every version of a generated document.
+
+    Traceability:
+    - REQ-AG-005: Generated document tracking
+    """
+    __tablename__ = "generated_document_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("generated_documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    version = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    change_summary = Column(Text)
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    changed_by = Column(Integer, ForeignKey("users.id"))
+
+    document = relationship("GeneratedDocumentRecord", back_populates="history")
+
+    def __repr__(self):
+        return f"<GeneratedDocumentHistory(document_id={self.document_id}, version={self.version})>"
@@ -27,15 +27,32 @@ from .services.state_machine_generator import (
     CIType,
     PhaseStatus,
     ActivityStatus,
+    TransitionType,
+    TransitionEvent,
     create_state_machine_for_ci,
     list_available_processes,
 )
 
+from .services.state_codec import (
+    StateCodecError,
+    encode_instance,
+    decode_instance,
+)
+
+from .services.template_registry import (
+    ProcessTemplateRegistry,
+    TemplateValidationError,
+    get_template_registry,
+)
+
 from .services.interview_executor import (
     InterviewScriptExecutor,
+    InterviewScriptCache,
+    CompiledInterviewScript,
     InterviewState,
     Question,
     AnswerResult,
+    get_script_cache,
     list_available_scripts,
     create_interview,
 )
@@ -43,9 +60,12 @@ from .services.interview_executor import (
 from .services.data_capture import (
     DataCaptureService,
     AutoPopulationService,
+    AnswerWriteBuffer,
     ValidationResult,
     CaptureResult,
     StorageTarget,
+    ValidationPipeline,
+    QuestionPipeline,
     validate_answer,
     transform_answer,
 )
@@ -53,6 +73,11 @@ from .services.data_capture import (
 from .services.artifact_generator import (
     ArtifactGeneratorService,
     GeneratedDocument,
+    DocumentJob,
+    DocumentTemplateEnvironment,
+    get_document_environment,
+    init_render_worker,
+    render_document,
     generate_document,
     list_available_templates,
 )
@@ -66,26 +91,47 @@ __all__ = [
     "CIType",
     "PhaseStatus",
     "ActivityStatus",
+    "TransitionType",
+    "TransitionEvent",
     "create_state_machine_for_ci",
     "list_available_processes",
+    # State Codec
+    "StateCodecError",
+    "encode_instance",
+    "decode_instance",
+    # Template Registry
+    "ProcessTemplateRegistry",
+    "TemplateValidationError",
+    "get_template_registry",
     # Interview Executor
     "InterviewScriptExecutor",
+    "InterviewScriptCache",
+    "CompiledInterviewScript",
     "InterviewState",
     "Question",
     "AnswerResult",
+    "get_script_cache",
     "list_available_scripts",
     "create_interview",
     # Data Capture
     "DataCaptureService",
     "AutoPopulationService",
+    "AnswerWriteBuffer",
     "ValidationResult",
     "CaptureResult",
     "StorageTarget",
+    "ValidationPipeline",
+    "QuestionPipeline",
     "validate_answer",
     "transform_answer",
     # Artifact Generator
     "ArtifactGeneratorService",
     "GeneratedDocument",
+    "DocumentJob",
+    "DocumentTemplateEnvironment",
+    "get_document_environment",
+    "init_render_worker",
+    "render_document",
     "generate_document",
     "list_available_templates",
 ]
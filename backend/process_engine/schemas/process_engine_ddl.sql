@@ -70,8 +70,9 @@ CREATE TABLE ci_state_machines (
     -- DAL level for this instance (affects which activities are required)
     dal_level VARCHAR(20),
 
-    -- Full state machine state (JSON)
-    state_json JSONB NOT NULL,
+    -- Legacy full state machine state (JSON); per-phase and per-activity
+    -- state lives in ci_phase_instances / ci_activity_instances
+    state_json JSONB,
 
     -- Progress metrics (denormalized for quick queries)
     total_phases INT NOT NULL DEFAULT 0,
@@ -87,6 +88,13 @@ CREATE TABLE ci_state_machines (
     -- Context for conditional logic
     context_json JSONB NOT NULL DEFAULT '{}',
 
+    -- Optimistic concurrency: incremented by every transition, updates
+    -- are conditional on the version that was read
+    version INT NOT NULL DEFAULT 1,
+
+    -- Replayable history events since the last snapshot
+    events_since_snapshot INT NOT NULL DEFAULT 0,
+
     -- Timestamps
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
@@ -118,6 +126,8 @@ CREATE TABLE ci_phase_instances (
     phase_id VARCHAR(100) NOT NULL,
     phase_name VARCHAR(255) NOT NULL,
     phase_order INT NOT NULL,
+    deliverables JSONB NOT NULL DEFAULT '[]',
+    reviews JSONB NOT NULL DEFAULT '[]',
 
     -- Status
     status VARCHAR(20) NOT NULL DEFAULT 'not_started',
@@ -171,6 +181,7 @@ CREATE TABLE ci_activity_instances (
 
     -- Sub-phase info
     sub_phase_id VARCHAR(100) NOT NULL,
+    sub_phase_name VARCHAR(255) NOT NULL,
     sub_phase_order INT NOT NULL,
     activity_order INT NOT NULL,
 
@@ -209,6 +220,49 @@ CREATE INDEX idx_ci_activity_instances_phase ON ci_activity_instances(phase_inst
 CREATE INDEX idx_ci_activity_instances_status ON ci_activity_instances(status);
 CREATE INDEX idx_ci_activity_instances_type ON ci_activity_instances(activity_type);
 
+-- =============================================================================
+-- WORK QUEUE
+-- =============================================================================
+
+-- Current activity of each state machine (projection, rewritten on every
+-- transition). Backs the per-project work-queue queries.
+CREATE TABLE ci_current_activities (
+    id SERIAL PRIMARY KEY,
+
+    -- Parent references
+    state_machine_id INT NOT NULL REFERENCES ci_state_machines(id) ON DELETE CASCADE,
+    ci_id INT NOT NULL REFERENCES configuration_items(id) ON DELETE CASCADE,
+    project_id INT REFERENCES projects(id) ON DELETE CASCADE,
+    ci_type VARCHAR(50),
+    dal_level VARCHAR(20),
+
+    -- Position (NULL once the state machine is completed)
+    phase_id VARCHAR(100),
+    phase_name VARCHAR(255),
+    phase_order INT,
+    sub_phase_id VARCHAR(100),
+    sub_phase_name VARCHAR(255),
+    activity_id VARCHAR(100),
+    activity_name VARCHAR(255),
+    activity_type VARCHAR(50),
+    is_required BOOLEAN,
+
+    -- Activity status (state machine status when there is no current activity)
+    status VARCHAR(20) NOT NULL DEFAULT 'not_started',
+    state_machine_status VARCHAR(20) NOT NULL DEFAULT 'not_started',
+
+    -- Timestamps
+    started_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT uq_ci_current_activity UNIQUE (state_machine_id)
+);
+
+CREATE INDEX idx_ci_current_activities_ci ON ci_current_activities(ci_id);
+CREATE INDEX idx_ci_current_activities_queue ON ci_current_activities(project_id, status, phase_order);
+CREATE INDEX idx_ci_current_activities_phase ON ci_current_activities(project_id, phase_id);
+CREATE INDEX idx_ci_current_activities_type ON ci_current_activities(project_id, activity_type);
+
 -- =============================================================================
 -- INTERVIEW ANSWERS
 -- =============================================================================
@@ -222,6 +276,7 @@ CREATE TABLE interview_answers (
     project_id INT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
     ci_id INT REFERENCES configuration_items(id) ON DELETE CASCADE,
     activity_instance_id INT REFERENCES ci_activity_instances(id) ON DELETE SET NULL,
+    session_id VARCHAR(36),  -- Interview session that captured the answer
 
     -- Question info
     question_id VARCHAR(100) NOT NULL,
@@ -239,8 +294,11 @@ CREATE TABLE interview_answers (
     -- Storage mapping
     target_table VARCHAR(100),
     target_column VARCHAR(100),
+    target_json_path VARCHAR(100),  -- Key merged into a JSON column (json_merge)
     target_record_id INT,
+    -- FALSE = pending write, applied by the next answer buffer flush
     storage_successful BOOLEAN NOT NULL DEFAULT FALSE,
+    storage_error TEXT,  -- Set when the write was rejected; no longer pending
 
     -- Validation
     validation_passed BOOLEAN NOT NULL DEFAULT TRUE,
@@ -263,6 +321,32 @@ CREATE INDEX idx_interview_answers_project ON interview_answers(project_id);
 CREATE INDEX idx_interview_answers_ci ON interview_answers(ci_id);
 CREATE INDEX idx_interview_answers_question ON interview_answers(question_id);
 CREATE INDEX idx_interview_answers_phase ON interview_answers(phase_id);
+CREATE INDEX idx_interview_answers_session ON interview_answers(session_id);
+CREATE INDEX idx_interview_answers_pending ON interview_answers(project_id, storage_successful);
+
+-- =============================================================================
+-- INTERVIEW SESSIONS
+-- =============================================================================
+
+-- Live interview sessions, serialized (script, current question, context) so
+-- that any worker can resume them; rows past expires_at are purged
+CREATE TABLE interview_sessions (
+    session_id VARCHAR(36) PRIMARY KEY,
+    script_name VARCHAR(100) NOT NULL,
+    project_id INT REFERENCES projects(id) ON DELETE CASCADE,
+
+    -- InterviewState as JSON
+    state_json TEXT NOT NULL,
+
+    -- Sliding expiry, pushed forward on every write
+    expires_at TIMESTAMP NOT NULL,
+
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_interview_sessions_project ON interview_sessions(project_id);
+CREATE INDEX idx_interview_sessions_expires ON interview_sessions(expires_at);
 
 -- =============================================================================
 -- GENERATED DOCUMENTS
@@ -293,6 +377,7 @@ CREATE TABLE generated_documents (
     template_id VARCHAR(100),
     template_version VARCHAR(20),
     source_data_hash VARCHAR(64),  -- To detect if regeneration needed
+    source_fingerprint VARCHAR(64),  -- Counts, max IDs and timestamps of source rows
 
     -- Status
     status VARCHAR(20) NOT NULL DEFAULT 'draft',
@@ -316,6 +401,7 @@ CREATE TABLE generated_documents (
 CREATE INDEX idx_generated_documents_project ON generated_documents(project_id);
 CREATE INDEX idx_generated_documents_type ON generated_documents(document_type);
 CREATE INDEX idx_generated_documents_status ON generated_documents(status);
+CREATE INDEX idx_generated_documents_project_type ON generated_documents(project_id, document_type);
 
 -- Document versions history
 CREATE TABLE generated_document_history (
@@ -425,7 +511,10 @@ CREATE INDEX idx_phase_reviews_type ON phase_reviews(review_type);
 -- STATE MACHINE HISTORY (AUDIT TRAIL)
 -- =============================================================================
 
--- History of state changes for audit trail
+-- History of state changes for audit trail. Append-only event log: rows
+-- with state_snapshot are full snapshots (on creation, then periodically);
+-- the state at time T is the latest snapshot at or before T plus the
+-- command events (is_command) after it, replayed in id order.
 CREATE TABLE state_machine_history (
     id SERIAL PRIMARY KEY,
     guid UUID NOT NULL DEFAULT gen_random_uuid(),
@@ -433,33 +522,34 @@ CREATE TABLE state_machine_history (
     -- Context
     state_machine_id INT NOT NULL REFERENCES ci_state_machines(id) ON DELETE CASCADE,
     ci_id INT NOT NULL REFERENCES configuration_items(id) ON DELETE CASCADE,
+    project_id INT REFERENCES projects(id) ON DELETE CASCADE,
 
     -- Change info
     change_type VARCHAR(50) NOT NULL,
-    -- Types: PHASE_STARTED, PHASE_COMPLETED, ACTIVITY_STARTED, ACTIVITY_COMPLETED,
-    --        ACTIVITY_SKIPPED, ROLLBACK, STATUS_CHANGE
+    -- Types: CREATED, SNAPSHOT, PHASE_STARTED, PHASE_COMPLETED, ACTIVITY_STARTED,
+    --        ACTIVITY_COMPLETED, ACTIVITY_SKIPPED
+    is_command BOOLEAN NOT NULL DEFAULT FALSE,
 
     -- What changed
-    from_phase VARCHAR(100),
-    to_phase VARCHAR(100),
+    phase_id VARCHAR(100),
+    activity_id VARCHAR(100),
     from_status VARCHAR(50),
     to_status VARCHAR(50),
-    activity_id VARCHAR(100),
+    event_data JSONB,
 
-    -- Snapshot of state at time of change
+    -- Snapshot of state at time of change (snapshot rows only)
     state_snapshot JSONB,
 
     -- User and timestamp
-    changed_by INT REFERENCES users(id),
-    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
-
-    -- Reason (especially for rollbacks)
-    change_reason TEXT
+    changed_by VARCHAR(255),
+    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
 );
 
 CREATE INDEX idx_sm_history_state_machine ON state_machine_history(state_machine_id);
 CREATE INDEX idx_sm_history_ci ON state_machine_history(ci_id);
 CREATE INDEX idx_sm_history_type ON state_machine_history(change_type);
+CREATE INDEX idx_sm_history_project_keyset ON state_machine_history(project_id, id);
+CREATE INDEX idx_sm_history_machine_keyset ON state_machine_history(state_machine_id, id);
 CREATE INDEX idx_sm_history_date ON state_machine_history(changed_at);
 
 -- =============================================================================
@@ -514,6 +604,31 @@ FROM
 GROUP BY
     p.id, p.name;
 
+-- View: Work queue (current activity per CI) by project
+CREATE OR REPLACE VIEW v_project_work_queue AS
+SELECT
+    cur.project_id,
+    cur.ci_id,
+    ci.display_id AS ci_display_id,
+    ci.name AS ci_name,
+    cur.ci_type,
+    cur.phase_id,
+    cur.phase_name,
+    cur.sub_phase_name,
+    cur.activity_id,
+    cur.activity_name,
+    cur.activity_type,
+    cur.is_required,
+    cur.status,
+    cur.started_at
+FROM
+    ci_current_activities cur
+    JOIN configuration_items ci ON ci.id = cur.ci_id
+WHERE
+    cur.activity_id IS NOT NULL
+ORDER BY
+    cur.project_id, cur.phase_order, cur.ci_id;
+
 -- =============================================================================
 -- TRIGGERS
 -- =============================================================================
@@ -561,6 +676,7 @@ COMMENT ON TABLE ci_state_machines IS 'State machine instances for each Configur
 COMMENT ON TABLE ci_phase_instances IS 'Individual phase tracking within a state machine';
 COMMENT ON TABLE ci_activity_instances IS 'Granular activity tracking (the work items)';
 COMMENT ON TABLE interview_answers IS 'Captured data from interview activities';
+COMMENT ON TABLE interview_sessions IS 'Serialized live interview sessions';
 COMMENT ON TABLE generated_documents IS 'Documents generated from templates';
 COMMENT ON TABLE phase_deliverables IS 'Tracks required deliverables for each phase';
 COMMENT ON TABLE phase_reviews IS 'Tracks required reviews/gates for each phase';
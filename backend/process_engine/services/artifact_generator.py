@@ -11,16 +11,27 @@ Key Features:
 - Apply filters and transformations
 - Track generated documents
 
+Templates are compiled once per process: all generators share one Jinja
+environment, whose compiled templates are also kept in a filesystem
+bytecode cache so that other workers (and restarts) skip compilation.
+Template files are only re-checked for changes in debug mode.
+
 Traceability: REQ-AG-001 to REQ-AG-005
 """
 
 import hashlib
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Callable, Tuple, Union
 from dataclasses import dataclass
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from sqlalchemy import inspect as sa_inspect
+
+
+DEFAULT_TEMPLATES_PATH = Path(__file__).parent.parent / "document_templates"
 
 
 # =============================================================================
@@ -44,6 +55,170 @@ class GeneratedDocument:
     ci_id: Optional[int] = None
 
 
+@dataclass
+class DocumentJob:
+    """
+    Everything needed to render one document version.
+
+    Holds a plain snapshot of the template data (no database objects), so
+    a job can be rendered in another process.
+    """
+    document_id: str
+    document_type: str
+    title: str
+    template: str
+    template_version: str
+    data: Dict[str, Any]
+    version: int
+    source_data_hash: str
+    project_id: Optional[int] = None
+    # Source fingerprint to store with the result (None if not settled)
+    fingerprint: Optional[str] = None
+
+
+# =============================================================================
+# TEMPLATE ENVIRONMENT
+# =============================================================================
+
+def _register_filters(env: Environment) -> None:
+    """Register custom Jinja2 filters."""
+    # Date formatting
+    env.filters["date"] = lambda d: d.strftime("%Y-%m-%d") if d else ""
+    env.filters["datetime"] = lambda d: d.strftime("%Y-%m-%d %H:%M:%S UTC") if d else ""
+
+    # Text manipulation
+    env.filters["truncate"] = lambda s, length=50: (s[:length] + "...") if s and len(s) > length else (s or "")
+
+    # List formatting
+    env.filters["join_ids"] = lambda items, attr="id": ", ".join(str(getattr(i, attr, i)) for i in items) if items else "-"
+
+
+class DocumentTemplateEnvironment:
+    """
+    Process-wide Jinja environment for document templates.
+
+    Compiled templates stay in memory for the life of the environment.
+    With a bytecode cache directory they are also written to disk, keyed by
+    template name and checked against the source checksum, so a worker
+    started later loads bytecode instead of compiling. Without auto_reload
+    the template files are never re-checked once loaded.
+    """
+
+    def __init__(
+        self,
+        templates_path: Path = DEFAULT_TEMPLATES_PATH,
+        bytecode_cache_dir: Optional[str] = None,
+        auto_reload: bool = False
+    ):
+        self.templates_path = Path(templates_path)
+        self.configure(bytecode_cache_dir, auto_reload)
+
+    def configure(self, bytecode_cache_dir: Optional[str] = None, auto_reload: bool = False) -> None:
+        """
+        (Re)build the environment.
+
+        Args:
+            bytecode_cache_dir: Directory for compiled templates shared by
+                workers; "" uses Jinja's per-user temporary directory, None
+                keeps compiled templates in memory only
+            auto_reload: Re-check template files on every lookup (debug)
+        """
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            if bytecode_cache_dir:
+                Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir or None)
+
+        env = Environment(
+            loader=FileSystemLoader(self.templates_path),
+            autoescape=select_autoescape(['html', 'xml']),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache
+        )
+        _register_filters(env)
+        self.env = env
+        # name -> (compiled template, source checksum)
+        self._checksums: Dict[str, Tuple[Template, str]] = {}
+
+    def get_template(self, name: str):
+        """Get a compiled template."""
+        return self.env.get_template(name)
+
+    def template_version(self, name: str) -> str:
+        """
+        Checksum of a template's source, as its version.
+
+        Computed once per compiled template, so it follows edits picked
+        up by auto-reload.
+        """
+        template = self.env.get_template(name)
+        cached = self._checksums.get(name)
+        if cached is None or cached[0] is not template:
+            source, _, _ = self.env.loader.get_source(self.env, name)
+            cached = (template, hashlib.sha256(source.encode()).hexdigest()[:16])
+            self._checksums[name] = cached
+        return cached[1]
+
+    def warm(self) -> int:
+        """Compile (or load from bytecode) all templates now; returns the count."""
+        names = self.env.list_templates(extensions=["md"])
+        for name in names:
+            self.env.get_template(name)
+        return len(names)
+
+
+_environment: Optional[DocumentTemplateEnvironment] = None
+_environment_lock = threading.Lock()
+
+
+def get_document_environment() -> DocumentTemplateEnvironment:
+    """Get the process-wide document template environment."""
+    global _environment
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                _environment = DocumentTemplateEnvironment()
+    return _environment
+
+
+def init_render_worker(bytecode_cache_dir: Optional[str] = None, auto_reload: bool = False) -> None:
+    """Process pool initializer: configure and precompile this worker's environment."""
+    environment = get_document_environment()
+    environment.configure(bytecode_cache_dir, auto_reload)
+    environment.warm()
+
+
+def render_document(job: DocumentJob) -> GeneratedDocument:
+    """
+    Render a document job with the process-wide environment.
+
+    Needs no database, so it can run in a worker process.
+    """
+    generated_at = datetime.utcnow()
+    content = get_document_environment().get_template(job.template).render(
+        **job.data,
+        document={
+            "version": job.version,
+            "generated_at": generated_at,
+            "status": "draft"
+        }
+    )
+    return GeneratedDocument(
+        document_id=job.document_id,
+        document_type=job.document_type,
+        title=job.title,
+        content=content,
+        version=job.version,
+        template_id=job.template.rsplit(".", 1)[0],
+        template_version=job.template_version,
+        source_data_hash=job.source_data_hash,
+        generated_at=generated_at,
+        project_id=job.project_id
+    )
+
+
 # =============================================================================
 # ARTIFACT GENERATOR SERVICE
 # =============================================================================
@@ -56,7 +231,7 @@ class ArtifactGeneratorService:
     templates and stored data, not AI generation.
     """
 
-    TEMPLATES_PATH = Path(__file__).parent.parent / "document_templates"
+    TEMPLATES_PATH = DEFAULT_TEMPLATES_PATH
 
     def __init__(self, db_session=None):
         """
@@ -66,30 +241,67 @@ class ArtifactGeneratorService:
             db_session: SQLAlchemy database session
         """
         self.db_session = db_session
-        self.env = Environment(
-            loader=FileSystemLoader(self.TEMPLATES_PATH),
-            autoescape=select_autoescape(['html', 'xml']),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        self._register_filters()
-
-    def _register_filters(self):
-        """Register custom Jinja2 filters."""
-        # Date formatting
-        self.env.filters["date"] = lambda d: d.strftime("%Y-%m-%d") if d else ""
-        self.env.filters["datetime"] = lambda d: d.strftime("%Y-%m-%d %H:%M:%S UTC") if d else ""
+        # Shared, already compiled templates
+        self.templates = get_document_environment()
+        self.env = self.templates.env
+        # While a snapshot is open: loaded rows by (kind, project_id), and
+        # their converted form by id()
+        self._memo: Optional[Dict[Tuple[str, int], Any]] = None
+        self._rows: Optional[Dict[int, Dict[str, Any]]] = None
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Load each kind of source data once within the block.
 
-        # Text manipulation
-        self.env.filters["truncate"] = lambda s, length=50: (s[:length] + "...") if s and len(s) > length else (s or "")
+        Used when several documents are prepared from the same rows.
+        """
+        self._memo, self._rows = {}, {}
+        try:
+            yield self
+        finally:
+            self._memo = self._rows = None
 
-        # List formatting
-        self.env.filters["join_ids"] = lambda items, attr="id": ", ".join(str(getattr(i, attr, i)) for i in items) if items else "-"
+    def _memoized(self, key: Tuple[str, int], load: Callable[[], Any]) -> Any:
+        if self._memo is None:
+            return load()
+        if key not in self._memo:
+            self._memo[key] = load()
+        return self._memo[key]
 
     # =========================================================================
     # DOCUMENT GENERATION
     # =========================================================================
 
+    # Document type -> data loader, template, ID code, title and source tables
+    DOCUMENT_TYPES = {
+        "SRS": {
+            "loader": "_load_srs_data",
+            "template": "SRS_template.md",
+            "code": "SRS",
+            "title": "Software Requirements Specification",
+            "sources": ("projects", "requirements"),
+        },
+        "RTM": {
+            "loader": "_load_rtm_data",
+            "template": "RTM_template.md",
+            "code": "RTM",
+            "title": "Requirements Traceability Matrix",
+            "sources": ("projects", "requirements", "requirements_design_trace", "requirements_test_trace"),
+        },
+        "GAP_ANALYSIS": {
+            "loader": "_load_gap_data",
+            "template": "Gap_Analysis_template.md",
+            "code": "GAP",
+            "title": "Gap Analysis Report",
+            "sources": ("projects", "requirements", "requirements_design_trace", "requirements_test_trace"),
+        },
+    }
+
+    # Rows changed this recently may share a timestamp with a later change
+    # (second resolution), so a fingerprint is only stored once they settle
+    FINGERPRINT_SETTLE_SECONDS = 2.0
+
     def generate_srs(self, project_id: int) -> GeneratedDocument:
         """
         Generate Software Requirements Specification.
@@ -100,43 +312,7 @@ class ArtifactGeneratorService:
         Returns:
             GeneratedDocument
         """
-        # Load data
-        project = self._get_project(project_id)
-        requirements = self._get_requirements(project_id)
-        standards = self._get_project_standards(project_id)
-
-        # Render template
-        template = self.env.get_template("SRS_template.md")
-        content = template.render(
-            project=project,
-            requirements=requirements,
-            standards=standards,
-            document={
-                "version": self._get_next_doc_version(project_id, "SRS"),
-                "generated_at": datetime.utcnow(),
-                "status": "draft"
-            }
-        )
-
-        # Create document record
-        doc = GeneratedDocument(
-            document_id=f"{project.project_code or 'PROJ'}-SRS-001",
-            document_type="SRS",
-            title=f"Software Requirements Specification - {project.name}",
-            content=content,
-            version=self._get_next_doc_version(project_id, "SRS"),
-            template_id="SRS_template",
-            template_version="1.0",
-            source_data_hash=self._hash_source_data(requirements),
-            generated_at=datetime.utcnow(),
-            project_id=project_id
-        )
-
-        # Store if database available
-        if self.db_session:
-            self._store_document(doc)
-
-        return doc
+        return self._generate(project_id, "SRS")
 
     def generate_traceability_matrix(self, project_id: int) -> GeneratedDocument:
         """
@@ -148,58 +324,103 @@ class ArtifactGeneratorService:
         Returns:
             GeneratedDocument
         """
-        # Load data
-        project = self._get_project(project_id)
-        requirements = self._get_requirements(project_id)
-        traces = self._get_traceability_data(project_id)
-        gaps = self._identify_gaps(project_id)
-        coverage = self._calculate_coverage(project_id)
+        return self._generate(project_id, "RTM")
 
-        # Render template
-        template = self.env.get_template("RTM_template.md")
-        content = template.render(
-            project=project,
-            requirements=requirements,
-            traces=traces,
-            gaps=gaps,
-            coverage=coverage,
-            document={
-                "version": self._get_next_doc_version(project_id, "RTM"),
-                "generated_at": datetime.utcnow(),
-                "status": "draft"
-            }
-        )
+    def generate_gap_analysis(self, project_id: int) -> GeneratedDocument:
+        """
+        Generate Gap Analysis Report.
 
-        doc = GeneratedDocument(
-            document_id=f"{project.project_code or 'PROJ'}-RTM-001",
-            document_type="RTM",
-            title=f"Requirements Traceability Matrix - {project.name}",
-            content=content,
-            version=self._get_next_doc_version(project_id, "RTM"),
-            template_id="RTM_template",
-            template_version="1.0",
-            source_data_hash=self._hash_source_data(traces),
-            generated_at=datetime.utcnow(),
-            project_id=project_id
-        )
+        Args:
+            project_id: Project ID
 
-        if self.db_session:
-            self._store_document(doc)
+        Returns:
+            GeneratedDocument
+        """
+        return self._generate(project_id, "GAP_ANALYSIS")
+
+    def _generate(self, project_id: int, doc_type: str) -> GeneratedDocument:
+        """Return the stored document if its source is unchanged, else render a new version."""
+        prepared = self.prepare(project_id, doc_type)
+        if isinstance(prepared, GeneratedDocument):
+            return prepared
 
+        doc = render_document(prepared)
+        if self.db_session:
+            self.store_document(doc, prepared.fingerprint)
         return doc
 
-    def generate_gap_analysis(self, project_id: int) -> GeneratedDocument:
+    def prepare(self, project_id: int, doc_type: str) -> Union[GeneratedDocument, DocumentJob]:
         """
-        Generate Gap Analysis Report.
+        Decide whether a document must be rendered, and snapshot its data if so.
+
+        With a database, the cheap source fingerprint is checked first; if
+        it differs, the source data is loaded and hashed, and a new version
+        is only needed when that hash changed too.
 
         Args:
             project_id: Project ID
+            doc_type: Document type (SRS, RTM, GAP_ANALYSIS)
 
         Returns:
-            GeneratedDocument
+            The stored document if it is current, else a DocumentJob to render
         """
-        # Load data
-        project = self._get_project(project_id)
+        spec = self.DOCUMENT_TYPES.get(doc_type)
+        if spec is None:
+            raise ValueError(f"Unknown document type: {doc_type}")
+        template_version = self.templates.template_version(spec["template"])
+
+        record = fingerprint = None
+        settled = False
+        if self.db_session:
+            record = self._get_stored_document(project_id, doc_type)
+            fingerprint, settled = self._source_fingerprint(project_id, spec["sources"], template_version)
+            if record is not None and record.source_fingerprint == fingerprint:
+                return self._to_document(record)
+
+        data = getattr(self, spec["loader"])(project_id)
+        project = data["project"]
+        snapshot = _snapshot(data, self._rows)
+        source_data_hash = self._hash_source_data({"template_version": template_version, **snapshot})
+
+        if record is not None and record.source_data_hash == source_data_hash:
+            # Rows were touched but what the document shows is the same
+            record.source_fingerprint = fingerprint if settled else None
+            self.db_session.commit()
+            return self._to_document(record)
+
+        return DocumentJob(
+            document_id=f"{project.project_code or 'PROJ'}-{spec['code']}-001",
+            document_type=doc_type,
+            title=f"{spec['title']} - {project.name}",
+            template=spec["template"],
+            template_version=template_version,
+            data=snapshot,
+            version=record.version + 1 if record is not None else 1,
+            source_data_hash=source_data_hash,
+            project_id=project_id,
+            fingerprint=fingerprint if settled else None
+        )
+
+    def _load_srs_data(self, project_id: int) -> Dict[str, Any]:
+        """Template data of the SRS."""
+        return {
+            "project": self._get_project(project_id),
+            "requirements": self._get_requirements(project_id),
+            "standards": self._get_project_standards(project_id),
+        }
+
+    def _load_rtm_data(self, project_id: int) -> Dict[str, Any]:
+        """Template data of the traceability matrix."""
+        return {
+            "project": self._get_project(project_id),
+            "requirements": self._get_requirements(project_id),
+            "traces": self._get_traceability_data(project_id),
+            "gaps": self._identify_gaps(project_id),
+            "coverage": self._calculate_coverage(project_id),
+        }
+
+    def _load_gap_data(self, project_id: int) -> Dict[str, Any]:
+        """Template data of the gap analysis."""
         gaps = {
             "requirements_without_design": self._find_unallocated_requirements(project_id),
             "requirements_without_tests": self._find_untested_requirements(project_id),
@@ -207,38 +428,11 @@ class ArtifactGeneratorService:
             "orphan_tests": self._find_orphan_tests(project_id),
             "cis_without_requirements": self._find_unallocated_cis(project_id)
         }
-        summary = self._summarize_gaps(project_id, gaps)
-
-        # Render template
-        template = self.env.get_template("Gap_Analysis_template.md")
-        content = template.render(
-            project=project,
-            gaps=gaps,
-            summary=summary,
-            document={
-                "version": self._get_next_doc_version(project_id, "GAP_ANALYSIS"),
-                "generated_at": datetime.utcnow(),
-                "status": "draft"
-            }
-        )
-
-        doc = GeneratedDocument(
-            document_id=f"{project.project_code or 'PROJ'}-GAP-001",
-            document_type="GAP_ANALYSIS",
-            title=f"Gap Analysis Report - {project.name}",
-            content=content,
-            version=self._get_next_doc_version(project_id, "GAP_ANALYSIS"),
-            template_id="Gap_Analysis_template",
-            template_version="1.0",
-            source_data_hash=self._hash_source_data(gaps),
-            generated_at=datetime.utcnow(),
-            project_id=project_id
-        )
-
-        if self.db_session:
-            self._store_document(doc)
-
-        return doc
+        return {
+            "project": self._get_project(project_id),
+            "gaps": gaps,
+            "summary": self._summarize_gaps(project_id, gaps),
+        }
 
     # =========================================================================
     # DATA RETRIEVAL (to be connected to actual DB models)
@@ -248,7 +442,10 @@ class ArtifactGeneratorService:
         """Get project by ID."""
         if self.db_session:
             from models.project import Project
-            return self.db_session.query(Project).filter_by(id=project_id).first()
+            return self._memoized(
+                ("project", project_id),
+                lambda: self.db_session.query(Project).filter_by(id=project_id).first()
+            )
 
         # Return mock for testing
         class MockProject:
@@ -268,7 +465,10 @@ class ArtifactGeneratorService:
         """Get requirements for a project."""
         if self.db_session:
             from models.requirement import Requirement
-            return self.db_session.query(Requirement).filter_by(project_id=project_id).all()
+            return self._memoized(
+                ("requirements", project_id),
+                lambda: self.db_session.query(Requirement).filter_by(project_id=project_id).order_by(Requirement.id).all()
+            )
         return []
 
     def _get_project_standards(self, project_id: int) -> List[Dict]:
@@ -294,30 +494,42 @@ class ArtifactGeneratorService:
     def _get_traceability_data(self, project_id: int) -> List[Dict]:
         """Get traceability data for a project."""
         if self.db_session:
-            from models.traceability import RequirementDesignTrace, RequirementTestTrace
-            req_design = self.db_session.query(RequirementDesignTrace).filter_by(project_id=project_id).all()
-            req_test = self.db_session.query(RequirementTestTrace).filter_by(project_id=project_id).all()
-
-            traces = []
-            for t in req_design:
-                traces.append({
-                    "type": "requirement_design",
-                    "requirement_id": t.requirement_id,
-                    "design_ids": [t.design_component_id],
-                    "trace_type": t.trace_type,
-                    "status": t.status
-                })
-            for t in req_test:
-                traces.append({
-                    "type": "requirement_test",
-                    "requirement_id": t.requirement_id,
-                    "test_ids": [t.test_case_id],
-                    "test_status": "Not Run",
-                    "verification_method": "Test"
-                })
-            return traces
+            return self._memoized(("traces", project_id), lambda: self._load_traceability_data(project_id))
         return []
 
+    def _load_traceability_data(self, project_id: int) -> List[Dict]:
+        """Query the design and test traces of a project's requirements."""
+        from models.requirement import Requirement
+        from models.traceability import RequirementDesignTrace, RequirementTestTrace
+        # Traces belong to the project through their requirement
+        req_design = (
+            self.db_session.query(RequirementDesignTrace).join(Requirement)
+            .filter(Requirement.project_id == project_id).order_by(RequirementDesignTrace.id).all()
+        )
+        req_test = (
+            self.db_session.query(RequirementTestTrace).join(Requirement)
+            .filter(Requirement.project_id == project_id).order_by(RequirementTestTrace.id).all()
+        )
+
+        traces = []
+        for t in req_design:
+            traces.append({
+                "type": "requirement_design",
+                "requirement_id": t.requirement_id,
+                "design_ids": [t.design_component_id],
+                "trace_type": t.trace_type,
+                "status": "Verified" if t.verified_at else "Pending"
+            })
+        for t in req_test:
+            traces.append({
+                "type": "requirement_test",
+                "requirement_id": t.requirement_id,
+                "test_ids": [t.test_case_id],
+                "test_status": "Not Run",
+                "verification_method": "Test"
+            })
+        return traces
+
     def _identify_gaps(self, project_id: int) -> Dict:
         """Identify traceability gaps."""
         return {
@@ -449,40 +661,183 @@ class ArtifactGeneratorService:
     # UTILITY METHODS
     # =========================================================================
 
-    def _get_next_doc_version(self, project_id: int, doc_type: str) -> int:
-        """Get next version number for a document type."""
-        if self.db_session:
-            # Query max version from generated_documents
-            # For now, return 1
-            pass
-        return 1
+    def _source_tables(self) -> Dict[str, Tuple[Any, Any, Any, Tuple[str, ...]]]:
+        """Source table name -> (table, FROM clause, project filter, timestamp columns)."""
+        from models.project import Project
+        from models.requirement import Requirement
+        from models.traceability import RequirementDesignTrace, RequirementTestTrace
+
+        projects = Project.__table__
+        requirements = Requirement.__table__
+        tables = {
+            "projects": (projects, projects, projects.c.id, ("created_at", "updated_at")),
+            "requirements": (requirements, requirements, requirements.c.project_id, ("created_at", "updated_at")),
+        }
+        # Traces belong to a project through their requirement
+        for model in (RequirementDesignTrace, RequirementTestTrace):
+            table = model.__table__
+            tables[table.name] = (
+                table,
+                table.join(requirements, table.c.requirement_id == requirements.c.id),
+                requirements.c.project_id,
+                ("created_at", "verified_at"),
+            )
+        return tables
+
+    def _source_fingerprint(
+        self,
+        project_id: int,
+        sources: Tuple[str, ...],
+        template_version: str
+    ) -> Tuple[str, bool]:
+        """
+        Fingerprint of a document's source rows, in one query.
+
+        Per source table: row count, highest ID and latest timestamps. Any
+        insert, delete or timestamped update changes it.
+
+        Returns:
+            (fingerprint, settled) - settled is False while the latest change
+            is too recent for its timestamp to tell it from a later one
+        """
+        from sqlalchemy import func, select
+        from services.state_machine_history import to_utc
+
+        tables = self._source_tables()
+        columns = []
+        for name in sources:
+            table, from_clause, project_column, timestamps = tables[name]
+            aggregates = [func.count(table.c.id), func.max(table.c.id)]
+            aggregates += [func.max(table.c[column]) for column in timestamps]
+            columns += [
+                select(aggregate).select_from(from_clause).where(project_column == project_id).scalar_subquery()
+                for aggregate in aggregates
+            ]
+
+        row = self.db_session.execute(select(*columns)).one()
+        newest = max((to_utc(value) for value in row if isinstance(value, datetime)), default=None)
+        settled = newest is None or (
+            (datetime.now(timezone.utc) - newest).total_seconds() >= self.FINGERPRINT_SETTLE_SECONDS
+        )
+
+        parts = [template_version] + [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        return hashlib.sha256(repr(parts).encode()).hexdigest(), settled
+
+    def _get_stored_document(self, project_id: int, doc_type: str) -> Any:
+        """Latest stored document of a type, or None."""
+        from models.project import GeneratedDocumentRecord
+        return (
+            self.db_session.query(GeneratedDocumentRecord)
+            .filter_by(project_id=project_id, document_type=doc_type, ci_id=None)
+            .order_by(GeneratedDocumentRecord.version.desc())
+            .first()
+        )
+
+    def _to_document(self, record: Any) -> GeneratedDocument:
+        """GeneratedDocument of a stored record."""
+        project = self._get_project(record.project_id)
+        code = self.DOCUMENT_TYPES[record.document_type]["code"]
+        return GeneratedDocument(
+            document_id=f"{project.project_code or 'PROJ'}-{code}-001",
+            document_type=record.document_type,
+            title=record.title,
+            content=record.content,
+            version=record.version,
+            template_id=record.template_id,
+            template_version=record.template_version,
+            source_data_hash=record.source_data_hash,
+            generated_at=record.generated_at,
+            status=record.status,
+            project_id=record.project_id,
+            ci_id=record.ci_id
+        )
 
     def _hash_source_data(self, data: Any) -> str:
-        """Create hash of source data for change detection."""
+        """Create a stable hash of (snapshotted) source data for change detection."""
         import json
         try:
-            if isinstance(data, list):
-                # Convert objects to dicts if needed
-                serializable = []
-                for item in data:
-                    if hasattr(item, '__dict__'):
-                        serializable.append(str(item.__dict__))
-                    elif isinstance(item, dict):
-                        serializable.append(str(item))
-                    else:
-                        serializable.append(str(item))
-                data_str = json.dumps(serializable, sort_keys=True)
-            else:
-                data_str = str(data)
-            return hashlib.sha256(data_str.encode()).hexdigest()[:16]
+            data_str = json.dumps(data, sort_keys=True, default=str)
+            return hashlib.sha256(data_str.encode()).hexdigest()
         except Exception:
-            return hashlib.sha256(str(datetime.utcnow()).encode()).hexdigest()[:16]
+            # Unhashable data: never matches, so the document is regenerated
+            return hashlib.sha256(str(datetime.utcnow()).encode()).hexdigest()
+
+    def store_document(self, doc: GeneratedDocument, fingerprint: Optional[str] = None) -> int:
+        """
+        Store a rendered document as a new version in the database.
 
-    def _store_document(self, doc: GeneratedDocument) -> int:
-        """Store generated document in database."""
-        # This would insert into generated_documents table
-        # For now, just return a mock ID
-        return 1
+        Args:
+            doc: Document rendered from a DocumentJob
+            fingerprint: Source fingerprint of the job
+
+        Returns:
+            ID of the generated_documents row
+        """
+        from models.project import GeneratedDocumentHistory, GeneratedDocumentRecord
+
+        record = self._get_stored_document(doc.project_id, doc.document_type)
+        if record is None:
+            change_summary = "Initial version"
+            record = GeneratedDocumentRecord(project_id=doc.project_id, ci_id=doc.ci_id, document_type=doc.document_type)
+            self.db_session.add(record)
+        elif record.template_version != doc.template_version:
+            change_summary = "Template changed"
+        else:
+            change_summary = "Source data changed"
+
+        record.title = doc.title
+        record.version = doc.version
+        record.content = doc.content
+        record.template_id = doc.template_id
+        record.template_version = doc.template_version
+        record.source_data_hash = doc.source_data_hash
+        record.source_fingerprint = fingerprint
+        record.status = doc.status
+        record.generated_at = doc.generated_at
+        record.history.append(GeneratedDocumentHistory(
+            version=doc.version,
+            content=doc.content,
+            change_summary=change_summary
+        ))
+        self.db_session.commit()
+        return record.id
+
+
+# Row bookkeeping that never appears in a document
+_UNSNAPSHOTTED_COLUMNS = frozenset({"updated_at"})
+
+_SCALARS = (str, int, float, bool, datetime, type(None))
+
+
+def _snapshot(value: Any, rows: Optional[Dict[int, Dict[str, Any]]] = None) -> Any:
+    """
+    Template data with ORM objects replaced by dicts of their column values.
+
+    Args:
+        value: Template data
+        rows: Converted objects by id(), to convert rows shared by several
+            documents only once (objects must stay alive while it is used)
+    """
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, dict):
+        return {k: _snapshot(v, rows) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_snapshot(v, rows) for v in value]
+
+    if rows is not None and id(value) in rows:
+        return rows[id(value)]
+    state = sa_inspect(value, raiseerr=False)
+    if state is None or not hasattr(state, "mapper"):
+        return value
+    row = {
+        attr.key: _snapshot(getattr(value, attr.key), rows)
+        for attr in state.mapper.column_attrs
+        if attr.key not in _UNSNAPSHOTTED_COLUMNS
+    }
+    if rows is not None:
+        rows[id(value)] = row
+    return row
 
 
 # =============================================================================
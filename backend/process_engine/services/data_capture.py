@@ -10,14 +10,23 @@ Key Features:
 - Database storage with audit trail
 - Traceability link creation
 
+Answers written to project columns during an interview go through an
+AnswerWriteBuffer: appended to interview_answers and applied to the
+project in one UPDATE per flush instead of one read-modify-write each.
+
+Validation rules and transformations are compiled into pipelines of
+bound closures (patterns pre-compiled, parameters and messages resolved
+once); compiled interview scripts hold one QuestionPipeline per question,
+and validate_many() checks a whole batch of answers with one pipeline.
+
 Traceability: REQ-DC-001 to REQ-DC-006
 """
 
 import re
 import uuid
 import json
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, Iterable, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -68,6 +77,191 @@ class CaptureResult:
     storage_result: Optional[StorageResult] = None
     transformed_value: Any = None
     context_updates: Dict[str, Any] = field(default_factory=dict)
+    buffered: bool = False  # Stored as a pending write (see AnswerWriteBuffer)
+
+
+# =============================================================================
+# COMPILED PIPELINES
+# =============================================================================
+
+# A compiled rule: (value, str(value)) -> failure, or None when satisfied
+Validator = Callable[[Any, str], Optional[ValidationResult]]
+
+
+def _failure(error: str) -> ValidationResult:
+    return ValidationResult(valid=False, error=error)
+
+
+def compile_rule(rule_def: Dict) -> Optional[Validator]:
+    """
+    Compile one rule definition into a validator closure.
+
+    Returns None for unknown rule types, which never fail.
+    """
+    rule = ValidationRule(
+        rule_type=rule_def.get("type"),
+        params=rule_def.get("params", {})
+    )
+    params = rule.params
+
+    if rule.rule_type == "required":
+        error = params.get("error", "This field is required")
+
+        def required(value, str_value):
+            if not value or not str_value.strip():
+                return _failure(error)
+        return required
+
+    if rule.rule_type == "min_length":
+        min_len = params.get("min", 0)
+        error = params.get("error", f"Must be at least {min_len} characters")
+
+        def min_length(value, str_value):
+            if len(str_value) < min_len:
+                return _failure(error)
+        return min_length
+
+    if rule.rule_type == "max_length":
+        max_len = params.get("max", float('inf'))
+        error = params.get("error", f"Must be no more than {max_len} characters")
+
+        def max_length(value, str_value):
+            if len(str_value) > max_len:
+                return _failure(error)
+        return max_length
+
+    if rule.rule_type == "pattern":
+        pattern = params.get("pattern", ".*")
+        error = params.get("error", f"Must match pattern: {pattern}")
+        try:
+            match = re.compile(pattern).match
+        except re.error:
+            # Report the invalid pattern when used, as an uncompiled match would
+            def match(str_value, pattern=pattern):
+                return re.match(pattern, str_value)
+
+        def pattern_rule(value, str_value):
+            if not match(str_value):
+                return _failure(error)
+        return pattern_rule
+
+    if rule.rule_type == "allowed_values":
+        allowed = params.get("values", [])
+
+        def allowed_values(value, str_value):
+            if str_value not in allowed and value not in allowed:
+                return _failure(params.get("error", f"Must be one of: {', '.join(allowed)}"))
+        return allowed_values
+
+    if rule.rule_type == "min_selections":
+        min_sel = params.get("min", 1)
+        error = params.get("error", f"Must select at least {min_sel} option(s)")
+
+        def min_selections(value, str_value):
+            if isinstance(value, list):
+                if len(value) < min_sel:
+                    return _failure(error)
+            elif not value:
+                return _failure(error)
+        return min_selections
+
+    if rule.rule_type == "shall_statement":
+        # DO-178C requirement format validation
+        def shall_statement(value, str_value):
+            lower_value = str_value.lower()
+            if "shall" not in lower_value:
+                return _failure("Requirement must contain 'shall' statement")
+            # Check for compound requirements
+            if " and " in lower_value and lower_value.count("shall") > 1:
+                return _failure("Split compound requirements: only one 'shall' per requirement")
+        return shall_statement
+
+    if rule.rule_type == "numeric_range":
+        min_val = params.get("min")
+        max_val = params.get("max")
+        min_error = params.get("error", f"Must be at least {min_val}")
+        max_error = params.get("error", f"Must be at most {max_val}")
+
+        def numeric_range(value, str_value):
+            try:
+                num_value = float(value) if value else 0
+            except (ValueError, TypeError):
+                return _failure("Must be a valid number")
+            try:
+                if min_val is not None and num_value < min_val:
+                    return _failure(min_error)
+                if max_val is not None and num_value > max_val:
+                    return _failure(max_error)
+            except TypeError:
+                return _failure("Must be a valid number")
+        return numeric_range
+
+    return None
+
+
+def compile_transformation(transformation: Optional[str]) -> Callable[[Any], Any]:
+    """
+    Resolve a transformation name into a callable.
+
+    Unknown or empty names yield the identity; a failing transformation
+    returns the value unchanged.
+    """
+    function = DataCaptureService.TRANSFORMATIONS.get(transformation) if transformation else None
+    if function is None:
+        return lambda value: value
+
+    def transform(value):
+        try:
+            return function(value)
+        except (ValueError, TypeError, AttributeError):
+            return value
+    return transform
+
+
+class ValidationPipeline:
+    """A rule list compiled into validator closures."""
+
+    __slots__ = ("_validators",)
+
+    def __init__(self, rules: List[Dict]):
+        self._validators = tuple(
+            validator for validator in (compile_rule(rule_def) for rule_def in rules)
+            if validator is not None
+        )
+
+    def validate(self, value: Any) -> List[ValidationResult]:
+        """Validate one value; returns the failures (empty if valid)."""
+        str_value = str(value) if value is not None else ""
+        errors = []
+        for validator in self._validators:
+            result = validator(value, str_value)
+            if result is not None:
+                errors.append(result)
+        return errors
+
+    def validate_many(self, values: Iterable[Any]) -> List[List[ValidationResult]]:
+        """Validate each value; one failure list per value, in order."""
+        validate = self.validate
+        return [validate(value) for value in values]
+
+
+class QuestionPipeline:
+    """
+    A question definition compiled for capture: its validation pipeline,
+    its target's transformation and the target itself.
+    """
+
+    __slots__ = ("validation", "transform", "transformation", "target")
+
+    def __init__(self, question_def: Dict):
+        self.validation = ValidationPipeline(question_def.get("validation", {}).get("rules", []))
+        self.target: Dict = question_def.get("target", {})
+        self.transformation: Optional[str] = self.target.get("transformation")
+        self.transform = compile_transformation(self.transformation)
+
+    def validate(self, value: Any) -> List[ValidationResult]:
+        """Validate one answer."""
+        return self.validation.validate(value)
 
 
 # =============================================================================
@@ -119,122 +313,23 @@ class DataCaptureService:
         Returns:
             List of ValidationResult (empty if all valid)
         """
-        errors = []
+        return ValidationPipeline(rules).validate(value)
 
-        for rule_def in rules:
-            rule = ValidationRule(
-                rule_type=rule_def.get("type"),
-                params=rule_def.get("params", {})
-            )
-            result = self._apply_validation_rule(value, rule)
-            if not result.valid:
-                errors.append(result)
-
-        return errors
-
-    def _apply_validation_rule(self, value: Any, rule: ValidationRule) -> ValidationResult:
+    def validate_many(self, values: Iterable[Any], rules: List[Dict]) -> List[List[ValidationResult]]:
         """
-        Apply a single validation rule.
+        Validate many values against the same rules.
+
+        The rules are compiled once for the whole batch (e.g. a column
+        of an imported spreadsheet).
 
         Args:
-            value: The value to validate
-            rule: The validation rule to apply
+            values: The values to validate
+            rules: List of rule definitions from question JSON
 
         Returns:
-            ValidationResult
+            One list of ValidationResult per value, in order
         """
-        str_value = str(value) if value is not None else ""
-
-        if rule.rule_type == "required":
-            if not value or not str_value.strip():
-                return ValidationResult(
-                    valid=False,
-                    error=rule.params.get("error", "This field is required")
-                )
-
-        elif rule.rule_type == "min_length":
-            min_len = rule.params.get("min", 0)
-            if len(str_value) < min_len:
-                return ValidationResult(
-                    valid=False,
-                    error=rule.params.get("error", f"Must be at least {min_len} characters")
-                )
-
-        elif rule.rule_type == "max_length":
-            max_len = rule.params.get("max", float('inf'))
-            if len(str_value) > max_len:
-                return ValidationResult(
-                    valid=False,
-                    error=rule.params.get("error", f"Must be no more than {max_len} characters")
-                )
-
-        elif rule.rule_type == "pattern":
-            pattern = rule.params.get("pattern", ".*")
-            if not re.match(pattern, str_value):
-                return ValidationResult(
-                    valid=False,
-                    error=rule.params.get("error", f"Must match pattern: {pattern}")
-                )
-
-        elif rule.rule_type == "allowed_values":
-            allowed = rule.params.get("values", [])
-            if str_value not in allowed and value not in allowed:
-                return ValidationResult(
-                    valid=False,
-                    error=rule.params.get("error", f"Must be one of: {', '.join(allowed)}")
-                )
-
-        elif rule.rule_type == "min_selections":
-            min_sel = rule.params.get("min", 1)
-            if isinstance(value, list):
-                if len(value) < min_sel:
-                    return ValidationResult(
-                        valid=False,
-                        error=rule.params.get("error", f"Must select at least {min_sel} option(s)")
-                    )
-            elif not value:
-                return ValidationResult(
-                    valid=False,
-                    error=rule.params.get("error", f"Must select at least {min_sel} option(s)")
-                )
-
-        elif rule.rule_type == "shall_statement":
-            # DO-178C requirement format validation
-            lower_value = str_value.lower()
-            if "shall" not in lower_value:
-                return ValidationResult(
-                    valid=False,
-                    error="Requirement must contain 'shall' statement"
-                )
-            # Check for compound requirements
-            if " and " in lower_value and lower_value.count("shall") > 1:
-                return ValidationResult(
-                    valid=False,
-                    error="Split compound requirements: only one 'shall' per requirement"
-                )
-
-        elif rule.rule_type == "numeric_range":
-            try:
-                num_value = float(value) if value else 0
-                min_val = rule.params.get("min")
-                max_val = rule.params.get("max")
-                if min_val is not None and num_value < min_val:
-                    return ValidationResult(
-                        valid=False,
-                        error=rule.params.get("error", f"Must be at least {min_val}")
-                    )
-                if max_val is not None and num_value > max_val:
-                    return ValidationResult(
-                        valid=False,
-                        error=rule.params.get("error", f"Must be at most {max_val}")
-                    )
-            except (ValueError, TypeError):
-                return ValidationResult(
-                    valid=False,
-                    error="Must be a valid number"
-                )
-
-        return ValidationResult(valid=True)
+        return ValidationPipeline(rules).validate_many(values)
 
     # =========================================================================
     # TRANSFORMATION
@@ -251,16 +346,7 @@ class DataCaptureService:
         Returns:
             Transformed value
         """
-        if not transformation:
-            return value
-
-        if transformation in self.TRANSFORMATIONS:
-            try:
-                return self.TRANSFORMATIONS[transformation](value)
-            except (ValueError, TypeError, AttributeError):
-                return value
-
-        return value
+        return compile_transformation(transformation)(value)
 
     # =========================================================================
     # STORAGE
@@ -384,7 +470,9 @@ class DataCaptureService:
         value: Any,
         question_def: Dict,
         project_id: int,
-        context: Dict[str, Any] = None
+        context: Dict[str, Any] = None,
+        pipeline: Optional[QuestionPipeline] = None,
+        answer_buffer: Optional["AnswerWriteBuffer"] = None
     ) -> CaptureResult:
         """
         Complete data capture flow: validate, transform, store.
@@ -394,16 +482,19 @@ class DataCaptureService:
             question_def: Question definition from JSON
             project_id: Project ID
             context: Current interview context
+            pipeline: The question's compiled pipeline (compiled here if omitted)
+            answer_buffer: Buffer for the project write (written immediately if omitted)
 
         Returns:
             CaptureResult with all outcomes
         """
         context = context or {}
         result = CaptureResult(valid=True, stored=False)
+        if pipeline is None:
+            pipeline = QuestionPipeline(question_def)
 
         # 1. Validate
-        validation_rules = question_def.get("validation", {}).get("rules", [])
-        errors = self.validate(value, validation_rules)
+        errors = pipeline.validate(value)
 
         if errors:
             result.valid = False
@@ -411,22 +502,27 @@ class DataCaptureService:
             return result
 
         # 2. Transform
-        target_def = question_def.get("target", {})
-        transformation = target_def.get("transformation")
-        result.transformed_value = self.transform(value, transformation)
+        target_def = pipeline.target
+        transformation = pipeline.transformation
+        result.transformed_value = pipeline.transform(value)
 
         # 3. Determine context updates from on_answer
         on_answer = question_def.get("on_answer", {})
         answer_action = on_answer.get(str(value)) or on_answer.get("default", {})
-        result.context_updates = answer_action.get("set_context", {})
+        # (copied: compiled scripts share their definitions)
+        result.context_updates = dict(answer_action.get("set_context", {}))
 
         # Replace $value placeholder with actual value
         for key, val in result.context_updates.items():
             if val == "$value":
                 result.context_updates[key] = result.transformed_value
 
-        # 4. Store (if database session available)
-        if self.db_session and target_def.get("table"):
+        # 4. Store (if database session available), or buffer the write
+        if answer_buffer is not None and answer_buffer.accepts(target_def.get("table")):
+            storage_result = answer_buffer.record(question_def, value, result.transformed_value, target_def)
+            result.buffered = storage_result.success
+            result.storage_result = storage_result
+        elif self.db_session and target_def.get("table"):
             target = StorageTarget(
                 table=target_def["table"],
                 column=target_def["column"],
@@ -442,6 +538,190 @@ class DataCaptureService:
         return result
 
 
+# =============================================================================
+# ANSWER WRITE BUFFER
+# =============================================================================
+
+class AnswerWriteBuffer:
+    """
+    Coalesces an interview's project writes.
+
+    Instead of a read-modify-write of the project row per answer, each
+    answer is appended to interview_answers (one INSERT, durable) and the
+    pending rows of the project are applied together by flush(): one read
+    of the JSON columns being merged, one UPDATE of the project, one
+    UPDATE marking the rows applied, in a single transaction.
+
+    The pending rows are the buffer, so it survives worker restarts and
+    crashes and needs no in-memory state: a buffer can be created per
+    request. Callers flush on sub-phase boundaries, on completion and
+    when due() reports the oldest pending answer is older than
+    MAX_DELAY_SECONDS.
+    """
+
+    # Tables whose writes are buffered (others are stored immediately)
+    TABLES = ("projects",)
+
+    # Oldest pending answer age that makes a flush due
+    MAX_DELAY_SECONDS = 30.0
+
+    def __init__(self, db_session, project_id: int, session_id: Optional[str] = None):
+        self.db_session = db_session
+        self.project_id = project_id
+        self.session_id = session_id
+
+    def accepts(self, table: str) -> bool:
+        """True if writes to the table are buffered."""
+        return table in self.TABLES
+
+    def record(
+        self,
+        question_def: Dict,
+        raw_value: Any,
+        transformed_value: Any,
+        target_def: Dict
+    ) -> StorageResult:
+        """
+        Append an answer as a pending write.
+
+        Returns:
+            StorageResult with the interview_answers row ID
+        """
+        from models.project import InterviewAnswer
+
+        variants = question_def.get("variants") or [question_def.get("text") or question_def.get("question_id", "")]
+        json_path = target_def.get("json_path") if target_def.get("transformation") == "json_merge" else None
+        row = InterviewAnswer(
+            project_id=self.project_id,
+            session_id=self.session_id,
+            question_id=question_def.get("question_id", ""),
+            question_text=variants[0],
+            sub_phase_id=question_def.get("sub_phase"),
+            answer_raw=json.dumps(raw_value, default=str),
+            answer_transformed=transformed_value,
+            target_table=target_def.get("table"),
+            target_column=target_def.get("column"),
+            target_json_path=json_path,
+            storage_successful=False,
+            answered_at=datetime.now(timezone.utc)
+        )
+        try:
+            self.db_session.add(row)
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            return StorageResult(success=False, error=str(e))
+        return StorageResult(success=True, record_id=row.id)
+
+    def due(self) -> bool:
+        """True if the oldest pending answer waited MAX_DELAY_SECONDS."""
+        from sqlalchemy import func
+        from models.project import InterviewAnswer
+        from services.state_machine_history import to_utc
+
+        oldest = self.db_session.query(func.min(InterviewAnswer.answered_at)).filter(
+            *self._pending_filter(InterviewAnswer)
+        ).scalar()
+        if oldest is None:
+            return False
+        return (datetime.now(timezone.utc) - to_utc(oldest)).total_seconds() >= self.MAX_DELAY_SECONDS
+
+    def flush(self) -> StorageResult:
+        """
+        Apply the project's pending answers, oldest first.
+
+        If the batch is rejected (e.g. a unique name collision), answers
+        are applied one by one and rejected ones are marked with their
+        storage_error so they no longer block the others.
+
+        Returns:
+            StorageResult; error lists the answers that were rejected
+        """
+        from models.project import InterviewAnswer
+
+        rows = self.db_session.query(InterviewAnswer).filter(
+            *self._pending_filter(InterviewAnswer)
+        ).order_by(InterviewAnswer.id).all()
+        if not rows:
+            return StorageResult(success=True, record_id=self.project_id)
+
+        try:
+            self._apply(rows)
+            self.db_session.commit()
+            return StorageResult(success=True, record_id=self.project_id)
+        except Exception:
+            self.db_session.rollback()
+
+        rejected = []
+        for row in rows:
+            try:
+                self._apply([row])
+                self.db_session.commit()
+            except Exception as e:
+                self.db_session.rollback()
+                self.db_session.query(InterviewAnswer).filter(InterviewAnswer.id == row.id).update(
+                    {InterviewAnswer.storage_error: str(e)}, synchronize_session=False
+                )
+                self.db_session.commit()
+                rejected.append(row.question_id)
+
+        if rejected:
+            return StorageResult(
+                success=False,
+                record_id=self.project_id,
+                error=f"Answers not stored: {', '.join(rejected)}"
+            )
+        return StorageResult(success=True, record_id=self.project_id)
+
+    def _pending_filter(self, model) -> tuple:
+        return (
+            model.project_id == self.project_id,
+            model.storage_successful.is_(False),
+            model.storage_error.is_(None)
+        )
+
+    def _apply(self, rows: List[Any]) -> None:
+        """Write the rows' values to the project and mark them applied."""
+        from sqlalchemy import select, update
+        from models.project import Project, InterviewAnswer
+
+        merged_columns = sorted({row.target_column for row in rows if row.target_json_path})
+        current: Dict[str, Any] = {}
+        if merged_columns:
+            stored = self.db_session.execute(
+                select(*[getattr(Project, column) for column in merged_columns]).where(Project.id == self.project_id)
+            ).first()
+            if stored is not None:
+                current = dict(zip(merged_columns, stored))
+
+        values: Dict[str, Any] = {}
+        for row in rows:
+            if row.target_json_path:
+                existing = values.get(row.target_column, current.get(row.target_column)) or {}
+                if isinstance(existing, str):
+                    existing = json.loads(existing)
+                merged = dict(existing)
+                merged[row.target_json_path] = row.answer_transformed
+                values[row.target_column] = merged
+            else:
+                values[row.target_column] = row.answer_transformed
+
+        updated = self.db_session.execute(
+            update(Project).where(Project.id == self.project_id).values(
+                {getattr(Project, column): value for column, value in values.items()}
+            )
+        ).rowcount
+        if not updated:
+            raise ValueError(f"Project {self.project_id} not found")
+
+        self.db_session.execute(
+            update(InterviewAnswer).where(InterviewAnswer.id.in_([row.id for row in rows])).values(
+                storage_successful=True,
+                target_record_id=self.project_id
+            )
+        )
+
+
 # =============================================================================
 # AUTO-POPULATION SERVICE
 # =============================================================================
@@ -495,7 +775,7 @@ class AutoPopulationService:
         # Generate requirement ID
         if "requirement_id" not in data or not data["requirement_id"]:
             req_type = data.get("type", "FN")[:2].upper()
-            next_num = self._get_next_sequence("requirement", req_type)
+            next_num = self._get_next_sequence(f"REQ-{req_type}")
             data["requirement_id"] = f"REQ-{req_type}-{next_num:03d}"
 
         # Default status
@@ -511,7 +791,7 @@ class AutoPopulationService:
         # Generate display ID
         if "display_id" not in data or not data["display_id"]:
             ci_type = data.get("ci_type", "").upper()[:2] or "CI"
-            next_num = self._get_next_sequence("ci", ci_type)
+            next_num = self._get_next_sequence(f"CI-{ci_type}")
             data["display_id"] = f"CI-{ci_type}-{next_num:04d}"
 
         # Default lifecycle phase
@@ -526,7 +806,7 @@ class AutoPopulationService:
         """Auto-populate design component fields."""
         if "component_id" not in data or not data["component_id"]:
             comp_type = data.get("type", "CMP")[:3].upper()
-            next_num = self._get_next_sequence("design", comp_type)
+            next_num = self._get_next_sequence(f"DSN-{comp_type}")
             data["component_id"] = f"DSN-{comp_type}-{next_num:03d}"
 
         data.setdefault("status", "draft")
@@ -537,22 +817,26 @@ class AutoPopulationService:
         if "project_code" not in data or not data["project_code"]:
             domain = data.get("domain", "PROJ")[:4].upper()
             year = datetime.now().year
-            next_num = self._get_next_sequence("project", domain)
+            next_num = self._get_next_sequence(f"{domain}-{year}")
             data["project_code"] = f"{domain}-{year}-{next_num:03d}"
 
         data.setdefault("status", "active")
         return data
 
-    def _get_next_sequence(self, entity_type: str, prefix: str) -> int:
-        """Get next sequence number for an entity type and prefix."""
-        key = f"{entity_type}_{prefix}"
+    def _get_next_sequence(self, sequence: str) -> int:
+        """
+        Get next number of a display ID sequence (e.g. "REQ-FN").
 
-        if key not in self._sequence_cache:
-            # In production, query database for max existing value
-            self._sequence_cache[key] = 0
+        Numbers come from the database (see DisplayIdAllocator), so they
+        are unique across workers and restarts; without a database
+        session a per-instance counter is used.
+        """
+        if self.db_session is not None:
+            from services.display_id_allocator import DisplayIdAllocator
+            return DisplayIdAllocator(self.db_session).next(sequence)
 
-        self._sequence_cache[key] += 1
-        return self._sequence_cache[key]
+        self._sequence_cache[sequence] = self._sequence_cache.get(sequence, 0) + 1
+        return self._sequence_cache[sequence]
 
 
 # =============================================================================
@@ -570,9 +854,7 @@ def validate_answer(value: Any, question_def: Dict) -> List[ValidationResult]:
     Returns:
         List of validation errors (empty if valid)
     """
-    service = DataCaptureService()
-    rules = question_def.get("validation", {}).get("rules", [])
-    return service.validate(value, rules)
+    return QuestionPipeline(question_def).validate(value)
 
 
 def transform_answer(value: Any, question_def: Dict) -> Any:
@@ -586,7 +868,4 @@ def transform_answer(value: Any, question_def: Dict) -> Any:
     Returns:
         Transformed value
     """
-    service = DataCaptureService()
-    target = question_def.get("target", {})
-    transformation = target.get("transformation")
-    return service.transform(value, transformation)
+    return QuestionPipeline(question_def).transform(value)
@@ -11,17 +11,26 @@ Key Features:
 - Question variant selection
 - Integration with Data Capture Service
 
+Script definitions are parsed and compiled once per process and shared
+by all executors (see CompiledInterviewScript and InterviewScriptCache):
+navigation follows precomputed next-pointer tables and skip/option
+conditions are compiled into predicates, so an executor is cheap to
+create per request from a session's serialized InterviewState and an
+answer costs no file I/O.
+
 Traceability: REQ-IS-001 to REQ-IS-008
 """
 
 import json
 import random
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
-from .data_capture import DataCaptureService, CaptureResult, validate_answer
+from .data_capture import AnswerWriteBuffer, DataCaptureService, CaptureResult, QuestionPipeline, StorageResult
 
 
 # =============================================================================
@@ -64,6 +73,244 @@ class InterviewState:
     started_at: datetime = field(default_factory=datetime.utcnow)
     last_interaction: datetime = field(default_factory=datetime.utcnow)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the state."""
+        return {
+            "script_id": self.script_id,
+            "current_sub_phase": self.current_sub_phase,
+            "current_question_id": self.current_question_id,
+            "questions_answered": list(self.questions_answered),
+            "questions_skipped": list(self.questions_skipped),
+            "context": self.context,
+            "started_at": self.started_at.isoformat(),
+            "last_interaction": self.last_interaction.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InterviewState":
+        """Rebuild a state from to_dict() output."""
+        return cls(
+            script_id=data["script_id"],
+            current_sub_phase=data["current_sub_phase"],
+            current_question_id=data["current_question_id"],
+            questions_answered=list(data.get("questions_answered", [])),
+            questions_skipped=list(data.get("questions_skipped", [])),
+            context=dict(data.get("context", {})),
+            started_at=datetime.fromisoformat(data["started_at"]),
+            last_interaction=datetime.fromisoformat(data["last_interaction"])
+        )
+
+
+# =============================================================================
+# COMPILED SCRIPTS
+# =============================================================================
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def compile_condition(condition: Dict) -> Predicate:
+    """
+    Compile a condition into a predicate over the interview context.
+
+    A condition maps context keys (optionally prefixed "context.") to an
+    expected value or a list of accepted values; all entries must match.
+    """
+    checks = []
+    for key, expected in condition.items():
+        actual_key = key[8:] if key.startswith("context.") else key
+        if isinstance(expected, list):
+            accepted = tuple(expected)
+            checks.append(lambda context, k=actual_key, a=accepted: context.get(k) in a)
+        else:
+            checks.append(lambda context, k=actual_key, e=expected: context.get(k) == e)
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda context: all(check(context) for check in checks)
+
+
+class CompiledInterviewScript:
+    """
+    An interview script prepared for execution.
+
+    Holds the parsed definitions plus:
+    - successor tables: for each question, the ordered questions that may
+      follow it (rest of its sub-phase, then the questions of every
+      sub-phase with a higher order), so the next question is found by
+      walking forward from a pointer instead of scanning the script
+    - skip predicates per question and option predicates per option
+    - a compiled validation/transformation pipeline per question
+
+    Instances are shared between executors and must not be mutated.
+    """
+
+    def __init__(self, script: Dict, questions: Dict[str, Dict]):
+        self.script = script
+        self.questions = questions
+
+        self.sub_phases: List[Dict] = script.get("sub_phases", [])
+        self.sub_phase_index: Dict[str, int] = {}
+        # Per sub-phase: its questions followed by those of later sub-phases
+        self._chains: List[Tuple[str, ...]] = []
+        # Question ID -> (chain, position of the question in it)
+        self._positions: Dict[str, Tuple[Tuple[str, ...], int]] = {}
+
+        for idx, sub_phase in enumerate(self.sub_phases):
+            self.sub_phase_index.setdefault(sub_phase.get("sub_phase_id"), idx)
+            order = sub_phase.get("order", 0)
+            following = tuple(
+                question_id
+                for later in self.sub_phases if later.get("order", 0) > order
+                for question_id in later.get("questions", [])
+            )
+            own = tuple(sub_phase.get("questions", []))
+            chain = own + following
+            self._chains.append(chain)
+            for pos, question_id in enumerate(own):
+                # A question listed twice belongs to its first occurrence
+                self._positions.setdefault(question_id, (chain, pos))
+
+        self._skip: Dict[str, Optional[Predicate]] = {}
+        self._options: Dict[str, List[Tuple[Optional[Predicate], Dict]]] = {}
+        # Validation and transformation per question
+        self.pipelines: Dict[str, QuestionPipeline] = {}
+        for question_id, question_def in questions.items():
+            self.pipelines[question_id] = QuestionPipeline(question_def)
+            skip_if = [compile_condition(c) for c in question_def.get("skip_if", [])]
+            if not skip_if:
+                self._skip[question_id] = None
+            elif len(skip_if) == 1:
+                self._skip[question_id] = skip_if[0]
+            else:
+                self._skip[question_id] = lambda context, preds=tuple(skip_if): any(p(context) for p in preds)
+
+            self._options[question_id] = [
+                (
+                    compile_condition(option["condition"]) if option.get("condition") else None,
+                    {k: v for k, v in option.items() if k != "condition"}
+                )
+                for option in question_def.get("options", [])
+            ]
+
+    @property
+    def first_questions(self) -> Tuple[str, ...]:
+        """Questions of the first sub-phase, in order."""
+        if not self.sub_phases:
+            return ()
+        return tuple(self.sub_phases[0].get("questions", []))
+
+    def should_skip(self, question_id: str, context: Dict) -> bool:
+        """True if the question is unknown or one of its skip conditions holds."""
+        if question_id not in self._skip:
+            return True
+        predicate = self._skip[question_id]
+        return predicate is not None and predicate(context)
+
+    def options(self, question_id: str, context: Dict) -> List[Dict]:
+        """The question's options whose condition holds, without conditions."""
+        return [
+            dict(option)
+            for predicate, option in self._options.get(question_id, ())
+            if predicate is None or predicate(context)
+        ]
+
+    def next_question_id(self, question_id: str, context: Dict) -> Optional[str]:
+        """First non-skipped question after question_id, in script order."""
+        position = self._positions.get(question_id)
+        if position is None:
+            return None
+        chain, pos = position
+        for next_idx in range(pos + 1, len(chain)):
+            if not self.should_skip(chain[next_idx], context):
+                return chain[next_idx]
+        return None
+
+
+# =============================================================================
+# SCRIPT CACHE
+# =============================================================================
+
+class InterviewScriptCache:
+    """
+    Process-wide cache of compiled interview scripts.
+
+    Each script directory (script.json plus questions/*.json) is parsed
+    and compiled once and reloaded when one of its files changes; files
+    are stat'ed at most every CHECK_INTERVAL_SECONDS. Cached scripts are
+    shared between executors and must be treated as read-only.
+    """
+
+    # Minimum seconds between checks of a script's files for changes
+    CHECK_INTERVAL_SECONDS = 2.0
+
+    def __init__(self, scripts_path: Path):
+        self.scripts_path = Path(scripts_path)
+        self._lock = threading.Lock()
+        # script name -> (signature, checked at, compiled script)
+        self._entries: Dict[str, Tuple[Tuple, float, CompiledInterviewScript]] = {}
+
+    def get(self, script_name: str) -> CompiledInterviewScript:
+        """
+        Get the compiled form of a script.
+
+        Raises:
+            FileNotFoundError: If the script does not exist
+        """
+        now = time.monotonic()
+        entry = self._entries.get(script_name)
+        if entry is not None and now - entry[1] < self.CHECK_INTERVAL_SECONDS:
+            return entry[2]
+
+        with self._lock:
+            signature = self._signature(script_name)
+            entry = self._entries.get(script_name)
+            if entry is None or entry[0] != signature:
+                entry = (signature, now, self._load(script_name))
+            else:
+                entry = (signature, now, entry[2])
+            self._entries[script_name] = entry
+            return entry[2]
+
+    def invalidate(self) -> None:
+        """Drop all cached scripts."""
+        with self._lock:
+            self._entries.clear()
+
+    def _signature(self, script_name: str) -> Tuple:
+        script_dir = self.scripts_path / script_name
+        script_path = script_dir / "script.json"
+        if not script_path.exists():
+            raise FileNotFoundError(f"Script not found: {script_path}")
+
+        stat = script_path.stat()
+        files = [("script.json", stat.st_mtime_ns, stat.st_size)]
+        questions_dir = script_dir / "questions"
+        if questions_dir.exists():
+            for path in sorted(questions_dir.glob("*.json")):
+                stat = path.stat()
+                files.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(files)
+
+    def _load(self, script_name: str) -> CompiledInterviewScript:
+        script_dir = self.scripts_path / script_name
+        with open(script_dir / "script.json", 'r') as f:
+            script = json.load(f)
+
+        questions = {}
+        questions_dir = script_dir / "questions"
+        if questions_dir.exists():
+            for question_file in questions_dir.glob("*.json"):
+                try:
+                    with open(question_file, 'r') as f:
+                        question_def = json.load(f)
+                        question_id = question_def.get("question_id")
+                        if question_id:
+                            questions[question_id] = question_def
+                except json.JSONDecodeError:
+                    continue
+
+        return CompiledInterviewScript(script, questions)
+
 
 # =============================================================================
 # INTERVIEW SCRIPT EXECUTOR
@@ -89,40 +336,12 @@ class InterviewScriptExecutor:
         """
         self.script_name = script_name
         self.db_session = db_session
-        self.script = self._load_script()
-        self.questions = self._load_questions()
+        # Shared, read-only definitions
+        self.compiled = get_script_cache().get(script_name)
+        self.script = self.compiled.script
+        self.questions = self.compiled.questions
         self.data_capture = DataCaptureService(db_session)
 
-    def _load_script(self) -> Dict:
-        """Load the main script definition."""
-        script_path = self.SCRIPTS_PATH / self.script_name / "script.json"
-
-        if not script_path.exists():
-            raise FileNotFoundError(f"Script not found: {script_path}")
-
-        with open(script_path, 'r') as f:
-            return json.load(f)
-
-    def _load_questions(self) -> Dict[str, Dict]:
-        """Load all question definitions."""
-        questions = {}
-        questions_dir = self.SCRIPTS_PATH / self.script_name / "questions"
-
-        if not questions_dir.exists():
-            return questions
-
-        for question_file in questions_dir.glob("*.json"):
-            try:
-                with open(question_file, 'r') as f:
-                    question_def = json.load(f)
-                    question_id = question_def.get("question_id")
-                    if question_id:
-                        questions[question_id] = question_def
-            except json.JSONDecodeError:
-                continue
-
-        return questions
-
     # =========================================================================
     # QUESTION RETRIEVAL
     # =========================================================================
@@ -140,12 +359,10 @@ class InterviewScriptExecutor:
         context = context or {}
 
         # Get first sub-phase
-        sub_phases = self.script.get("sub_phases", [])
-        if not sub_phases:
+        if not self.compiled.sub_phases:
             raise ValueError("Script has no sub-phases defined")
 
-        first_sub_phase = sub_phases[0]
-        first_question_ids = first_sub_phase.get("questions", [])
+        first_question_ids = self.compiled.first_questions
 
         if not first_question_ids:
             raise ValueError("First sub-phase has no questions")
@@ -187,7 +404,7 @@ class InterviewScriptExecutor:
         variant_text = self._select_variant(question_def)
 
         # Filter options by context
-        options = self._filter_options(question_def.get("options", []), context)
+        options = self.compiled.options(question_id, context)
 
         return Question(
             question_id=question_id,
@@ -210,31 +427,6 @@ class InterviewScriptExecutor:
             return random.choice(variants)
         return question_def.get("text", "")
 
-    def _filter_options(self, options: List[Dict], context: Dict) -> List[Dict]:
-        """
-        Filter options based on context conditions.
-
-        Args:
-            options: List of option definitions
-            context: Current context
-
-        Returns:
-            Filtered list of options
-        """
-        filtered = []
-
-        for option in options:
-            condition = option.get("condition")
-            if condition:
-                if not self._evaluate_condition(condition, context):
-                    continue
-
-            # Return option without the condition field
-            filtered_option = {k: v for k, v in option.items() if k != "condition"}
-            filtered.append(filtered_option)
-
-        return filtered
-
     def _should_skip(self, question_id: str, context: Dict) -> bool:
         """
         Check if a question should be skipped based on context.
@@ -246,46 +438,7 @@ class InterviewScriptExecutor:
         Returns:
             True if question should be skipped
         """
-        if question_id not in self.questions:
-            return True
-
-        question_def = self.questions[question_id]
-        skip_conditions = question_def.get("skip_if", [])
-
-        for condition in skip_conditions:
-            if self._evaluate_condition(condition, context):
-                return True
-
-        return False
-
-    def _evaluate_condition(self, condition: Dict, context: Dict) -> bool:
-        """
-        Evaluate a condition against the current context.
-
-        Args:
-            condition: Condition definition (e.g., {"context.industry": ["aerospace"]})
-            context: Current context
-
-        Returns:
-            True if condition is met
-        """
-        for key, expected_values in condition.items():
-            # Handle nested keys like "context.industry"
-            if key.startswith("context."):
-                actual_key = key[8:]  # Remove "context." prefix
-                actual_value = context.get(actual_key)
-            else:
-                actual_value = context.get(key)
-
-            # Check if actual value matches any expected value
-            if isinstance(expected_values, list):
-                if actual_value not in expected_values:
-                    return False
-            else:
-                if actual_value != expected_values:
-                    return False
-
-        return True
+        return self.compiled.should_skip(question_id, context)
 
     # =========================================================================
     # ANSWER PROCESSING
@@ -296,7 +449,8 @@ class InterviewScriptExecutor:
         question_id: str,
         answer: Any,
         context: Dict,
-        project_id: int = None
+        project_id: int = None,
+        answer_buffer: Optional[AnswerWriteBuffer] = None
     ) -> AnswerResult:
         """
         Process a user's answer.
@@ -306,6 +460,7 @@ class InterviewScriptExecutor:
             answer: The user's answer
             context: Current interview context
             project_id: Project ID for data storage
+            answer_buffer: Buffer for project writes (see flush_answers)
 
         Returns:
             AnswerResult with next steps
@@ -317,9 +472,10 @@ class InterviewScriptExecutor:
             )
 
         question_def = self.questions[question_id]
+        pipeline = self.compiled.pipelines[question_id]
 
         # 1. Validate
-        validation_errors = validate_answer(answer, question_def)
+        validation_errors = pipeline.validate(answer)
         if validation_errors:
             error_messages = [e.error for e in validation_errors if e.error]
             return AnswerResult(
@@ -334,7 +490,9 @@ class InterviewScriptExecutor:
                 value=answer,
                 question_def=question_def,
                 project_id=project_id,
-                context=context
+                context=context,
+                pipeline=pipeline,
+                answer_buffer=answer_buffer
             )
 
         # 3. Determine next action from on_answer
@@ -344,8 +502,8 @@ class InterviewScriptExecutor:
         answer_key = str(answer) if not isinstance(answer, list) else "default"
         answer_action = on_answer.get(answer_key) or on_answer.get("default", {})
 
-        # 4. Build context updates
-        context_updates = answer_action.get("set_context", {})
+        # 4. Build context updates (copied: the definition is shared)
+        context_updates = dict(answer_action.get("set_context", {}))
 
         # Replace $value placeholder
         for key, val in list(context_updates.items()):
@@ -363,7 +521,7 @@ class InterviewScriptExecutor:
         phase_complete = next_question_id is None
 
         # 6. Get auto-set values
-        auto_sets = answer_action.get("auto_set", [])
+        auto_sets = list(answer_action.get("auto_set", []))
 
         return AnswerResult(
             valid=True,
@@ -389,42 +547,7 @@ class InterviewScriptExecutor:
         Returns:
             Next question ID or None if complete
         """
-        # Find current question's sub-phase
-        for sub_phase in self.script.get("sub_phases", []):
-            questions = sub_phase.get("questions", [])
-
-            if current_question_id in questions:
-                # Find position in list
-                idx = questions.index(current_question_id)
-
-                # Try next question in same sub-phase
-                for next_idx in range(idx + 1, len(questions)):
-                    next_id = questions[next_idx]
-                    if not self._should_skip(next_id, context):
-                        return next_id
-
-                # Try next sub-phase
-                return self._get_first_question_of_next_subphase(sub_phase, context)
-
-        return None
-
-    def _get_first_question_of_next_subphase(
-        self,
-        current_sub_phase: Dict,
-        context: Dict
-    ) -> Optional[str]:
-        """Get first question of the next sub-phase."""
-        sub_phases = self.script.get("sub_phases", [])
-        current_order = current_sub_phase.get("order", 0)
-
-        for sub_phase in sub_phases:
-            if sub_phase.get("order", 0) > current_order:
-                questions = sub_phase.get("questions", [])
-                for question_id in questions:
-                    if not self._should_skip(question_id, context):
-                        return question_id
-
-        return None
+        return self.compiled.next_question_id(current_question_id, context)
 
     # =========================================================================
     # STATE MANAGEMENT
@@ -482,6 +605,36 @@ class InterviewScriptExecutor:
 
         return state
 
+    def flush_answers(
+        self,
+        answer_buffer: AnswerWriteBuffer,
+        previous_sub_phase: str,
+        state: InterviewState,
+        answer_result: AnswerResult
+    ) -> Optional[StorageResult]:
+        """
+        Flush buffered answers when the interview reaches a boundary.
+
+        Flushes on entering a new sub-phase, on completion, or when the
+        oldest pending answer is older than the buffer's maximum delay.
+
+        Args:
+            answer_buffer: The session's answer buffer
+            previous_sub_phase: Sub-phase before the answer was applied
+            state: State after update_state
+            answer_result: Result from process_answer
+
+        Returns:
+            The flush result, or None if no flush was needed
+        """
+        if (
+            answer_result.phase_complete
+            or state.current_sub_phase != previous_sub_phase
+            or answer_buffer.due()
+        ):
+            return answer_buffer.flush()
+        return None
+
     # =========================================================================
     # PROGRESS TRACKING
     # =========================================================================
@@ -500,13 +653,8 @@ class InterviewScriptExecutor:
         answered = len(state.questions_answered)
         skipped = len(state.questions_skipped)
 
-        sub_phases = self.script.get("sub_phases", [])
-        current_sub_phase_idx = 0
-
-        for idx, sp in enumerate(sub_phases):
-            if sp.get("sub_phase_id") == state.current_sub_phase:
-                current_sub_phase_idx = idx
-                break
+        sub_phases = self.compiled.sub_phases
+        current_sub_phase_idx = self.compiled.sub_phase_index.get(state.current_sub_phase, 0)
 
         return {
             "script_id": state.script_id,
@@ -525,6 +673,20 @@ class InterviewScriptExecutor:
 # CONVENIENCE FUNCTIONS
 # =============================================================================
 
+_script_cache: Optional[InterviewScriptCache] = None
+_script_cache_lock = threading.Lock()
+
+
+def get_script_cache() -> InterviewScriptCache:
+    """Get the process-wide interview script cache."""
+    global _script_cache
+    if _script_cache is None:
+        with _script_cache_lock:
+            if _script_cache is None:
+                _script_cache = InterviewScriptCache(InterviewScriptExecutor.SCRIPTS_PATH)
+    return _script_cache
+
+
 def list_available_scripts() -> List[Dict]:
     """List all available interview scripts."""
     scripts = []
@@ -0,0 +1,415 @@
+"""
+State Machine Codec for AISET Process Engine
+
+Single owner of StateMachineInstance (de)serialization.
+
+Formats:
+- 1 (dict): the verbose, self-describing structure returned by
+  StateMachineInstance.to_dict() and the API. Enum values, ISO timestamps
+  and every name/artifact repeated per instance.
+- 2 (compact): per-instance state only. The static structure (names, types,
+  required flags, output artifacts, deliverables, reviews) is referenced by
+  (template_id, dal_level) and rebuilt from the cached DAL prototype; enums
+  are stored as ordinals and timestamps as integer microseconds since the
+  Unix epoch (UTC).
+
+decode_instance() reads both formats, so state written as format 1 stays
+readable. orjson is used when installed, the standard json module otherwise.
+
+Traceability: REQ-SM-001 (Development lifecycle state machine)
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from .state_machine_generator import (
+    StateMachineInstance,
+    StateMachineGenerator,
+    ProcessPrototype,
+    PhasePrototype,
+    SubPhasePrototype,
+    ActivityPrototype,
+    CIType,
+    PhaseStatus,
+    SubPhaseStatus,
+    ActivityStatus,
+)
+
+
+COMPACT_FORMAT_VERSION = 2
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class StateCodecError(ValueError):
+    """Encoded state cannot be decoded (unknown version or template mismatch)."""
+
+
+# =============================================================================
+# BACKEND
+# =============================================================================
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _to_micros(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: Optional[int]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+# =============================================================================
+# FORMAT 1: VERBOSE DICT
+# =============================================================================
+
+def instance_to_dict(instance: StateMachineInstance) -> Dict[str, Any]:
+    """Serialize to the verbose, self-describing dictionary (format 1)."""
+    return {
+        "instance_id": instance.instance_id,
+        "ci_id": instance.ci_id,
+        "ci_type": instance.ci_type.value,
+        "template_id": instance.template_id,
+        "template_name": instance.template_name,
+        "dal_level": instance.dal_level,
+        "current_phase_index": instance.current_phase_index,
+        "created_at": instance.created_at.isoformat(),
+        "updated_at": instance.updated_at.isoformat(),
+        "context": instance.context,
+        "phases": [
+            {
+                "phase_id": phase.phase_id,
+                "name": phase.name,
+                "order": phase.order,
+                "status": phase.status.value,
+                "current_sub_phase_index": phase.current_sub_phase_index,
+                "entry_criteria_met": phase.entry_criteria_met,
+                "exit_criteria_met": phase.exit_criteria_met,
+                "started_at": _iso(phase.started_at),
+                "completed_at": _iso(phase.completed_at),
+                "sub_phases": [
+                    {
+                        "sub_phase_id": sub_phase.sub_phase_id,
+                        "name": sub_phase.name,
+                        "order": sub_phase.order,
+                        "status": sub_phase.status.value,
+                        "current_activity_index": sub_phase.current_activity_index,
+                        "started_at": _iso(sub_phase.started_at),
+                        "completed_at": _iso(sub_phase.completed_at),
+                        "activities": [
+                            {
+                                "activity_id": activity.activity_id,
+                                "name": activity.name,
+                                "activity_type": activity.activity_type,
+                                "status": activity.status.value,
+                                "required": activity.required,
+                                "started_at": _iso(activity.started_at),
+                                "completed_at": _iso(activity.completed_at),
+                                "output_artifacts": list(activity.output_artifacts),
+                                "completion_data": dict(activity.completion_data)
+                            }
+                            for activity in sub_phase.activities
+                        ]
+                    }
+                    for sub_phase in phase.sub_phases
+                ],
+                "deliverables": list(phase.deliverables),
+                "reviews": list(phase.reviews)
+            }
+            for phase in instance.phases
+        ]
+    }
+
+
+def instance_from_dict(state_dict: Dict[str, Any]) -> StateMachineInstance:
+    """
+    Rebuild an instance from the verbose dictionary (format 1).
+
+    The structure is taken from the dictionary itself rather than the
+    current template, so a stored document always round-trips.
+    """
+    prototype = ProcessPrototype(
+        template_id=state_dict["template_id"],
+        template_name=state_dict["template_name"],
+        dal_level=state_dict.get("dal_level"),
+        phases=tuple(
+            PhasePrototype(
+                phase_id=p["phase_id"],
+                name=p["name"],
+                order=p["order"],
+                deliverables=tuple(p.get("deliverables", [])),
+                reviews=tuple(p.get("reviews", [])),
+                sub_phases=tuple(
+                    SubPhasePrototype(
+                        sub_phase_id=sp["sub_phase_id"],
+                        name=sp["name"],
+                        order=sp["order"],
+                        activities=tuple(
+                            ActivityPrototype(
+                                activity_id=a["activity_id"],
+                                name=a["name"],
+                                activity_type=a["activity_type"],
+                                required=a["required"],
+                                output_artifacts=tuple(a.get("output_artifacts", []))
+                            )
+                            for a in sp["activities"]
+                        )
+                    )
+                    for sp in p["sub_phases"]
+                )
+            )
+            for p in state_dict["phases"]
+        )
+    )
+    instance = StateMachineInstance(
+        instance_id=state_dict["instance_id"],
+        ci_id=state_dict["ci_id"],
+        ci_type=CIType(state_dict["ci_type"]),
+        prototype=prototype,
+        current_phase_index=state_dict["current_phase_index"],
+        created_at=datetime.fromisoformat(state_dict["created_at"]),
+        updated_at=datetime.fromisoformat(state_dict["updated_at"]),
+        context=state_dict.get("context", {})
+    )
+
+    for phase, p in zip(instance.phases, state_dict["phases"]):
+        phase.status = PhaseStatus(p["status"])
+        phase.started_at = _parse_iso(p.get("started_at"))
+        phase.completed_at = _parse_iso(p.get("completed_at"))
+        phase.current_sub_phase_index = p["current_sub_phase_index"]
+        phase.entry_criteria_met = p["entry_criteria_met"]
+        phase.exit_criteria_met = p["exit_criteria_met"]
+        for sub_phase, sp in zip(phase.sub_phases, p["sub_phases"]):
+            sub_phase.status = SubPhaseStatus(sp["status"])
+            sub_phase.started_at = _parse_iso(sp.get("started_at"))
+            sub_phase.completed_at = _parse_iso(sp.get("completed_at"))
+            sub_phase.current_activity_index = sp["current_activity_index"]
+            for activity, a in zip(sub_phase.activities, sp["activities"]):
+                activity.status = ActivityStatus(a["status"])
+                activity.started_at = _parse_iso(a.get("started_at"))
+                activity.completed_at = _parse_iso(a.get("completed_at"))
+                activity.completion_data = a.get("completion_data", {})
+
+    return instance
+
+
+# =============================================================================
+# FORMAT 2: COMPACT
+# =============================================================================
+
+def instance_to_compact(instance: StateMachineInstance) -> Dict[str, Any]:
+    """
+    Serialize per-instance state only (format 2).
+
+    An activity that was never touched is encoded as its bare status
+    ordinal; otherwise as [status, started_at, completed_at, completion_data].
+    Reads the instance state arrays directly instead of going through views.
+    """
+    prototype = instance.prototype
+    status = instance._status
+    cursor = instance._cursor
+    times = instance._times or {}
+    data = instance._data or {}
+    no_times = (None, None)
+
+    phases: List[list] = []
+    sub_index = 0
+    activity_index = 0
+    for phase_index, phase in enumerate(prototype.phases):
+        sub_phases = []
+        for sub_phase in phase.sub_phases:
+            activities = []
+            for _ in sub_phase.activities:
+                activity_slot = prototype.activity_slot_offset + activity_index
+                activity_status = status[prototype.activity_status_offset + activity_index]
+                if activity_slot not in times and activity_index not in data:
+                    activities.append(activity_status)
+                else:
+                    started, completed = times.get(activity_slot, no_times)
+                    activities.append([
+                        activity_status,
+                        _to_micros(started),
+                        _to_micros(completed),
+                        data.get(activity_index)
+                    ])
+                activity_index += 1
+            sub_slot = prototype.sub_phase_slot_offset + sub_index
+            started, completed = times.get(sub_slot, no_times)
+            sub_phases.append([
+                status[prototype.sub_phase_status_offset + sub_index],
+                _to_micros(started),
+                _to_micros(completed),
+                cursor[sub_slot],
+                activities
+            ])
+            sub_index += 1
+        flags = status[prototype.phase_flag_offset + phase_index]
+        started, completed = times.get(phase_index, no_times)
+        phases.append([
+            status[phase_index],
+            _to_micros(started),
+            _to_micros(completed),
+            cursor[phase_index],
+            flags & 1,
+            (flags >> 1) & 1,
+            sub_phases
+        ])
+
+    return {
+        "v": COMPACT_FORMAT_VERSION,
+        "i": instance.instance_id,
+        "c": instance.ci_id,
+        "k": instance.ci_type.value,
+        "t": instance.template_id,
+        "d": instance.dal_level,
+        "p": instance.current_phase_index,
+        "ca": _to_micros(instance.created_at),
+        "ua": _to_micros(instance.updated_at),
+        "x": instance.context,
+        "ph": phases
+    }
+
+
+def _store_times(times: Dict[int, tuple], slot: int, started: Optional[int], completed: Optional[int]) -> None:
+    if started is not None or completed is not None:
+        times[slot] = (_from_micros(started), _from_micros(completed))
+
+
+def instance_from_compact(
+    data: Dict[str, Any],
+    generator: Optional[StateMachineGenerator] = None
+) -> StateMachineInstance:
+    """
+    Rebuild an instance from the compact format (format 2).
+
+    Raises:
+        StateCodecError: If the referenced template no longer has the
+            encoded structure
+    """
+    generator = generator or StateMachineGenerator()
+    template = generator.loader.load_template(data["t"])
+    prototype = generator.get_prototype(template, data["d"])
+    instance = prototype.instantiate(data["c"], CIType(data["k"]))
+
+    encoded_phases = data["ph"]
+    if len(encoded_phases) != len(prototype.phases):
+        raise StateCodecError(f"State does not match the phases of template '{data['t']}'")
+
+    status = instance._status
+    cursor = instance._cursor
+    times: Dict[int, tuple] = {}
+    completion: Dict[int, Dict[str, Any]] = {}
+    sub_index = 0
+    activity_index = 0
+    try:
+        for phase_index, (phase, encoded) in enumerate(zip(prototype.phases, encoded_phases)):
+            phase_status, started, completed, sub_phase_cursor, entry, exit_, encoded_sub_phases = encoded
+            if len(encoded_sub_phases) != len(phase.sub_phases):
+                raise StateCodecError(f"State does not match phase '{phase.phase_id}' of template '{data['t']}'")
+            status[phase_index] = phase_status
+            status[prototype.phase_flag_offset + phase_index] = (1 if entry else 0) | (2 if exit_ else 0)
+            cursor[phase_index] = sub_phase_cursor
+            _store_times(times, phase_index, started, completed)
+
+            for sub_phase, encoded_sp in zip(phase.sub_phases, encoded_sub_phases):
+                sub_status, started, completed, activity_cursor, encoded_activities = encoded_sp
+                if len(encoded_activities) != len(sub_phase.activities):
+                    raise StateCodecError(
+                        f"State does not match sub-phase '{sub_phase.sub_phase_id}' of template '{data['t']}'"
+                    )
+                sub_slot = prototype.sub_phase_slot_offset + sub_index
+                status[prototype.sub_phase_status_offset + sub_index] = sub_status
+                cursor[sub_slot] = activity_cursor
+                _store_times(times, sub_slot, started, completed)
+                sub_index += 1
+
+                for encoded_act in encoded_activities:
+                    if isinstance(encoded_act, int):
+                        status[prototype.activity_status_offset + activity_index] = encoded_act
+                    else:
+                        act_status, started, completed, completion_data = encoded_act
+                        status[prototype.activity_status_offset + activity_index] = act_status
+                        _store_times(times, prototype.activity_slot_offset + activity_index, started, completed)
+                        if completion_data:
+                            completion[activity_index] = completion_data
+                    activity_index += 1
+    except (TypeError, ValueError, OverflowError) as e:
+        raise StateCodecError(f"Malformed state for template '{data['t']}': {e}") from e
+
+    instance._times = times or None
+    instance._data = completion or None
+    instance._recount()
+    instance.instance_id = data["i"]
+    instance.current_phase_index = data["p"]
+    instance.created_at = _from_micros(data["ca"])
+    instance.updated_at = _from_micros(data["ua"])
+    instance.context = data.get("x") or {}
+    return instance
+
+
+# =============================================================================
+# ENCODE / DECODE
+# =============================================================================
+
+def encode_instance(instance: StateMachineInstance) -> bytes:
+    """Encode an instance in the compact format."""
+    return dumps(instance_to_compact(instance))
+
+
+def decode_instance(
+    data: Union[bytes, str, Dict[str, Any]],
+    generator: Optional[StateMachineGenerator] = None
+) -> StateMachineInstance:
+    """
+    Decode an instance written in any supported format.
+
+    Args:
+        data: Encoded bytes/text, or an already parsed dictionary
+        generator: Optional generator whose prototype cache is used
+
+    Raises:
+        StateCodecError: For unknown versions or template mismatches
+    """
+    obj = data if isinstance(data, dict) else loads(data)
+    version = obj.get("v", 1)
+    try:
+        if version == 1:
+            return instance_from_dict(obj)
+        if version == COMPACT_FORMAT_VERSION:
+            return instance_from_compact(obj, generator)
+    except (KeyError, IndexError, TypeError) as e:
+        raise StateCodecError(f"Malformed format {version} state: {e}") from e
+    raise StateCodecError(f"Unsupported state format version: {version}")
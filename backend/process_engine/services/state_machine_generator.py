@@ -8,15 +8,19 @@ The key insight: AISET-AI is a rigorous process executor, not an intelligent
 decision-maker. This generator creates deterministic state machines from templates.
 """
 
-import json
+import sys
 import uuid
-from pathlib import Path
+from array import array
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 from pydantic import BaseModel
 
+from .template_registry import DEFAULT_TEMPLATES_DIR, get_template_registry
+
 
 # =============================================================================
 # ENUMS
@@ -62,148 +66,500 @@ class ActivityStatus(str, Enum):
     BLOCKED = "blocked"
 
 
+class TransitionType(str, Enum):
+    """Kind of entry in the state machine history"""
+    CREATED = "CREATED"
+    SNAPSHOT = "SNAPSHOT"
+    PHASE_STARTED = "PHASE_STARTED"
+    PHASE_COMPLETED = "PHASE_COMPLETED"
+    ACTIVITY_STARTED = "ACTIVITY_STARTED"
+    ACTIVITY_COMPLETED = "ACTIVITY_COMPLETED"
+    ACTIVITY_SKIPPED = "ACTIVITY_SKIPPED"
+
+
+@dataclass
+class TransitionEvent:
+    """
+    One state change made by the StateMachineController.
+
+    command is True for the event of the public call that caused the
+    change (start_phase, complete_activity, skip_activity); the rest are
+    consequences of it. Replaying the command events in order, each at its
+    recorded time, reproduces the state exactly.
+    """
+    change_type: TransitionType
+    at: datetime
+    command: bool = False
+    phase_id: Optional[str] = None
+    activity_id: Optional[str] = None
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
 # =============================================================================
 # DATA MODELS
 # =============================================================================
+#
+# A StateMachineInstance is a flyweight. The immutable structure (ids, names,
+# types, required flags, artifacts, deliverables, reviews) lives in a shared
+# ProcessPrototype; the instance only holds its own mutable state:
+#
+#   _status  bytearray   phase status | phase flags | sub-phase status | activity status
+#   _cursor  array("H")  phase current_sub_phase_index | sub-phase current_activity_index
+#   _times   dict        slot -> (started_at, completed_at), only for started nodes
+#   _data    dict        activity index -> completion_data, only when non-empty
+#   _done    array("H")  completed/skipped activities per phase | per sub-phase
+#
+# The _done counters (and _done_total) are maintained by the activity status
+# setter, so progress at any level is O(1).
+#
+# PhaseInstance, SubPhaseInstance and ActivityInstance are views created on
+# access: reading or assigning their attributes goes to the owning instance.
+
+# Ordinal tables for the state arrays (append only, never reorder)
+PHASE_STATUSES = (
+    PhaseStatus.NOT_STARTED,
+    PhaseStatus.IN_PROGRESS,
+    PhaseStatus.COMPLETED,
+    PhaseStatus.BLOCKED,
+    PhaseStatus.SKIPPED,
+)
+SUB_PHASE_STATUSES = (
+    SubPhaseStatus.NOT_STARTED,
+    SubPhaseStatus.IN_PROGRESS,
+    SubPhaseStatus.COMPLETED,
+    SubPhaseStatus.BLOCKED,
+)
+ACTIVITY_STATUSES = (
+    ActivityStatus.NOT_STARTED,
+    ActivityStatus.IN_PROGRESS,
+    ActivityStatus.COMPLETED,
+    ActivityStatus.SKIPPED,
+    ActivityStatus.BLOCKED,
+)
+
+PHASE_ORDINALS = {status: i for i, status in enumerate(PHASE_STATUSES)}
+SUB_PHASE_ORDINALS = {status: i for i, status in enumerate(SUB_PHASE_STATUSES)}
+ACTIVITY_ORDINALS = {status: i for i, status in enumerate(ACTIVITY_STATUSES)}
+
+# Activity ordinals that count as done for progress and exit criteria
+DONE_ACTIVITY_ORDINALS = frozenset(
+    ACTIVITY_ORDINALS[status] for status in (ActivityStatus.COMPLETED, ActivityStatus.SKIPPED)
+)
+
+_ENTRY_CRITERIA_MET = 1
+_EXIT_CRITERIA_MET = 2
+
+# Shared, read-only value for activities without completion data
+EMPTY_COMPLETION_DATA = MappingProxyType({})
+
 
-@dataclass
 class ActivityInstance:
-    """Runtime instance of an activity"""
-    activity_id: str
-    name: str
-    activity_type: str
-    status: ActivityStatus = ActivityStatus.NOT_STARTED
-    required: bool = True
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    output_artifacts: List[str] = field(default_factory=list)
-    completion_data: Dict[str, Any] = field(default_factory=dict)
+    """Runtime view of an activity"""
+    __slots__ = ("node", "_sm", "_index")
+
+    def __init__(self, node: "ActivityPrototype", sm: "StateMachineInstance", index: int):
+        self.node = node
+        self._sm = sm
+        self._index = index
+
+    @property
+    def activity_id(self) -> str:
+        return self.node.activity_id
+
+    @property
+    def name(self) -> str:
+        return self.node.name
+
+    @property
+    def activity_type(self) -> str:
+        return self.node.activity_type
+
+    @property
+    def required(self) -> bool:
+        return self.node.required
+
+    @property
+    def output_artifacts(self) -> Tuple[str, ...]:
+        return self.node.output_artifacts
+
+    @property
+    def status(self) -> ActivityStatus:
+        sm = self._sm
+        return ACTIVITY_STATUSES[sm._status[sm.prototype.activity_status_offset + self._index]]
+
+    @status.setter
+    def status(self, value: ActivityStatus) -> None:
+        sm = self._sm
+        position = sm.prototype.activity_status_offset + self._index
+        was_done = sm._status[position] in DONE_ACTIVITY_ORDINALS
+        sm._status[position] = ordinal = ACTIVITY_ORDINALS[value]
+        is_done = ordinal in DONE_ACTIVITY_ORDINALS
+        if was_done != is_done:
+            sm._count_done(self._index, 1 if is_done else -1)
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        return self._sm._get_time(self._sm.prototype.activity_slot_offset + self._index, 0)
+
+    @started_at.setter
+    def started_at(self, value: Optional[datetime]) -> None:
+        self._sm._set_time(self._sm.prototype.activity_slot_offset + self._index, 0, value)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        return self._sm._get_time(self._sm.prototype.activity_slot_offset + self._index, 1)
+
+    @completed_at.setter
+    def completed_at(self, value: Optional[datetime]) -> None:
+        self._sm._set_time(self._sm.prototype.activity_slot_offset + self._index, 1, value)
+
+    @property
+    def completion_data(self) -> Dict[str, Any]:
+        """Completion data; assign a new dict to change it"""
+        data = self._sm._data
+        if data is None or self._index not in data:
+            return EMPTY_COMPLETION_DATA
+        return data[self._index]
+
+    @completion_data.setter
+    def completion_data(self, value: Optional[Dict[str, Any]]) -> None:
+        sm = self._sm
+        if value:
+            if sm._data is None:
+                sm._data = {}
+            sm._data[self._index] = value
+        elif sm._data is not None:
+            sm._data.pop(self._index, None)
+
+    def __repr__(self) -> str:
+        return f"ActivityInstance(activity_id={self.activity_id!r}, status={self.status.value!r})"
 
 
-@dataclass
 class SubPhaseInstance:
-    """Runtime instance of a sub-phase"""
-    sub_phase_id: str
-    name: str
-    order: int
-    status: SubPhaseStatus = SubPhaseStatus.NOT_STARTED
-    activities: List[ActivityInstance] = field(default_factory=list)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    current_activity_index: int = 0
+    """Runtime view of a sub-phase"""
+    __slots__ = ("node", "_sm", "_index")
+
+    def __init__(self, node: "SubPhasePrototype", sm: "StateMachineInstance", index: int):
+        self.node = node
+        self._sm = sm
+        self._index = index
+
+    @property
+    def sub_phase_id(self) -> str:
+        return self.node.sub_phase_id
+
+    @property
+    def name(self) -> str:
+        return self.node.name
+
+    @property
+    def order(self) -> int:
+        return self.node.order
+
+    @property
+    def activities(self) -> List[ActivityInstance]:
+        sm = self._sm
+        base = sm.prototype.activity_bases[self._index]
+        return [ActivityInstance(a, sm, base + i) for i, a in enumerate(self.node.activities)]
+
+    @property
+    def status(self) -> SubPhaseStatus:
+        sm = self._sm
+        return SUB_PHASE_STATUSES[sm._status[sm.prototype.sub_phase_status_offset + self._index]]
+
+    @status.setter
+    def status(self, value: SubPhaseStatus) -> None:
+        sm = self._sm
+        sm._status[sm.prototype.sub_phase_status_offset + self._index] = SUB_PHASE_ORDINALS[value]
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        return self._sm._get_time(self._sm.prototype.sub_phase_slot_offset + self._index, 0)
+
+    @started_at.setter
+    def started_at(self, value: Optional[datetime]) -> None:
+        self._sm._set_time(self._sm.prototype.sub_phase_slot_offset + self._index, 0, value)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        return self._sm._get_time(self._sm.prototype.sub_phase_slot_offset + self._index, 1)
+
+    @completed_at.setter
+    def completed_at(self, value: Optional[datetime]) -> None:
+        self._sm._set_time(self._sm.prototype.sub_phase_slot_offset + self._index, 1, value)
+
+    @property
+    def completed_activities(self) -> int:
+        """Completed or skipped activities"""
+        return self._sm._done[len(self._sm.prototype.phases) + self._index]
+
+    @property
+    def total_activities(self) -> int:
+        return len(self.node.activities)
+
+    @property
+    def current_activity_index(self) -> int:
+        return self._sm._cursor[self._sm.prototype.sub_phase_slot_offset + self._index]
+
+    @current_activity_index.setter
+    def current_activity_index(self, value: int) -> None:
+        self._sm._cursor[self._sm.prototype.sub_phase_slot_offset + self._index] = value
+
+    def __repr__(self) -> str:
+        return f"SubPhaseInstance(sub_phase_id={self.sub_phase_id!r}, status={self.status.value!r})"
 
 
-@dataclass
 class PhaseInstance:
-    """Runtime instance of a phase"""
-    phase_id: str
-    name: str
-    order: int
-    status: PhaseStatus = PhaseStatus.NOT_STARTED
-    sub_phases: List[SubPhaseInstance] = field(default_factory=list)
-    deliverables: List[Dict] = field(default_factory=list)
-    reviews: List[Dict] = field(default_factory=list)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    current_sub_phase_index: int = 0
-    entry_criteria_met: bool = False
-    exit_criteria_met: bool = False
+    """Runtime view of a phase"""
+    __slots__ = ("node", "_sm", "_index")
+
+    def __init__(self, node: "PhasePrototype", sm: "StateMachineInstance", index: int):
+        self.node = node
+        self._sm = sm
+        self._index = index
+
+    @property
+    def phase_id(self) -> str:
+        return self.node.phase_id
+
+    @property
+    def name(self) -> str:
+        return self.node.name
+
+    @property
+    def order(self) -> int:
+        return self.node.order
+
+    @property
+    def deliverables(self) -> Tuple[Dict, ...]:
+        return self.node.deliverables
+
+    @property
+    def reviews(self) -> Tuple[Dict, ...]:
+        return self.node.reviews
+
+    @property
+    def sub_phases(self) -> List[SubPhaseInstance]:
+        sm = self._sm
+        base = sm.prototype.sub_phase_bases[self._index]
+        return [SubPhaseInstance(sp, sm, base + i) for i, sp in enumerate(self.node.sub_phases)]
+
+    @property
+    def status(self) -> PhaseStatus:
+        return PHASE_STATUSES[self._sm._status[self._index]]
+
+    @status.setter
+    def status(self, value: PhaseStatus) -> None:
+        self._sm._status[self._index] = PHASE_ORDINALS[value]
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        return self._sm._get_time(self._index, 0)
+
+    @started_at.setter
+    def started_at(self, value: Optional[datetime]) -> None:
+        self._sm._set_time(self._index, 0, value)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        return self._sm._get_time(self._index, 1)
+
+    @completed_at.setter
+    def completed_at(self, value: Optional[datetime]) -> None:
+        self._sm._set_time(self._index, 1, value)
+
+    @property
+    def completed_activities(self) -> int:
+        """Completed or skipped activities"""
+        return self._sm._done[self._index]
+
+    @property
+    def total_activities(self) -> int:
+        return self._sm.prototype.phase_totals[self._index]
+
+    @property
+    def current_sub_phase_index(self) -> int:
+        return self._sm._cursor[self._index]
+
+    @current_sub_phase_index.setter
+    def current_sub_phase_index(self, value: int) -> None:
+        self._sm._cursor[self._index] = value
+
+    @property
+    def entry_criteria_met(self) -> bool:
+        return self._get_flag(_ENTRY_CRITERIA_MET)
+
+    @entry_criteria_met.setter
+    def entry_criteria_met(self, value: bool) -> None:
+        self._set_flag(_ENTRY_CRITERIA_MET, value)
+
+    @property
+    def exit_criteria_met(self) -> bool:
+        return self._get_flag(_EXIT_CRITERIA_MET)
+
+    @exit_criteria_met.setter
+    def exit_criteria_met(self, value: bool) -> None:
+        self._set_flag(_EXIT_CRITERIA_MET, value)
+
+    def _get_flag(self, flag: int) -> bool:
+        sm = self._sm
+        return bool(sm._status[sm.prototype.phase_flag_offset + self._index] & flag)
+
+    def _set_flag(self, flag: int, value: bool) -> None:
+        sm = self._sm
+        position = sm.prototype.phase_flag_offset + self._index
+        if value:
+            sm._status[position] |= flag
+        else:
+            sm._status[position] &= ~flag
+
+    def __repr__(self) -> str:
+        return f"PhaseInstance(phase_id={self.phase_id!r}, status={self.status.value!r})"
 
 
-@dataclass
 class StateMachineInstance:
     """
     A complete state machine instance for a Configuration Item.
     This is the runtime representation of a process template.
     """
-    instance_id: str
-    ci_id: int
-    ci_type: CIType
-    template_id: str
-    template_name: str
-    dal_level: Optional[str] = None
+    __slots__ = (
+        "instance_id", "ci_id", "ci_type", "prototype", "current_phase_index",
+        "created_at", "updated_at", "context", "_status", "_cursor", "_times", "_data",
+        "_done", "_done_total",
+    )
+
+    def __init__(
+        self,
+        instance_id: str,
+        ci_id: int,
+        ci_type: CIType,
+        prototype: "ProcessPrototype",
+        current_phase_index: int = 0,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        context: Optional[Dict[str, Any]] = None
+    ):
+        now = datetime.utcnow()
+        self.instance_id = instance_id
+        self.ci_id = ci_id
+        self.ci_type = ci_type
+        self.prototype = prototype
+        self.current_phase_index = current_phase_index
+
+        # Metadata
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
+
+        # Context for conditional logic
+        self.context = context if context is not None else {}
+
+        # Per-instance state (all nodes start NOT_STARTED at index 0)
+        self._status = bytearray(prototype.status_size)
+        self._cursor = prototype.blank_cursor[:]
+        self._times: Optional[Dict[int, Tuple[Optional[datetime], Optional[datetime]]]] = None
+        self._data: Optional[Dict[int, Dict[str, Any]]] = None
+        self._done = prototype.blank_done[:]
+        self._done_total = 0
 
-    # Phases
-    phases: List[PhaseInstance] = field(default_factory=list)
-    current_phase_index: int = 0
+    @property
+    def template_id(self) -> str:
+        return self.prototype.template_id
 
-    # Metadata
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    @property
+    def template_name(self) -> str:
+        return self.prototype.template_name
 
-    # Context for conditional logic
-    context: Dict[str, Any] = field(default_factory=dict)
+    @property
+    def dal_level(self) -> Optional[str]:
+        return self.prototype.dal_level
+
+    @property
+    def phases(self) -> List[PhaseInstance]:
+        return [PhaseInstance(p, self, i) for i, p in enumerate(self.prototype.phases)]
 
     @property
     def current_phase(self) -> Optional[PhaseInstance]:
-        if 0 <= self.current_phase_index < len(self.phases):
-            return self.phases[self.current_phase_index]
+        if 0 <= self.current_phase_index < len(self.prototype.phases):
+            return PhaseInstance(self.prototype.phases[self.current_phase_index], self, self.current_phase_index)
         return None
 
+    @property
+    def completed_activities(self) -> int:
+        """Completed or skipped activities"""
+        return self._done_total
+
+    @property
+    def total_activities(self) -> int:
+        return self.prototype.activity_count
+
     @property
     def overall_progress(self) -> float:
-        """Calculate overall progress percentage"""
-        if not self.phases:
+        """Activity-weighted progress percentage"""
+        total = self.prototype.activity_count
+        if not total:
             return 0.0
-        completed = sum(1 for p in self.phases if p.status == PhaseStatus.COMPLETED)
-        return (completed / len(self.phases)) * 100
+        return (self._done_total / total) * 100
+
+    def _count_done(self, activity_index: int, delta: int) -> None:
+        prototype = self.prototype
+        self._done[prototype.activity_phase[activity_index]] += delta
+        self._done[len(prototype.phases) + prototype.activity_sub_phase[activity_index]] += delta
+        self._done_total += delta
+
+    def _recount(self) -> None:
+        """Rebuild the progress counters after writing _status directly"""
+        prototype = self.prototype
+        self._done = prototype.blank_done[:]
+        self._done_total = 0
+        offset = prototype.activity_status_offset
+        for index in range(prototype.activity_count):
+            if self._status[offset + index] in DONE_ACTIVITY_ORDINALS:
+                self._count_done(index, 1)
+
+    def _get_time(self, slot: int, position: int) -> Optional[datetime]:
+        if self._times is None:
+            return None
+        times = self._times.get(slot)
+        return times[position] if times else None
+
+    def _set_time(self, slot: int, position: int, value: Optional[datetime]) -> None:
+        if self._times is None:
+            if value is None:
+                return
+            self._times = {}
+        times = list(self._times.get(slot, (None, None)))
+        times[position] = value
+        if times[0] is None and times[1] is None:
+            self._times.pop(slot, None)
+        else:
+            self._times[slot] = (times[0], times[1])
 
-    def to_dict(self) -> Dict:
-        """Serialize to dictionary for database storage"""
-        return {
-            "instance_id": self.instance_id,
-            "ci_id": self.ci_id,
-            "ci_type": self.ci_type.value,
-            "template_id": self.template_id,
-            "template_name": self.template_name,
-            "dal_level": self.dal_level,
-            "current_phase_index": self.current_phase_index,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "context": self.context,
-            "phases": [self._phase_to_dict(p) for p in self.phases]
-        }
+    def _state_key(self) -> Tuple:
+        return (
+            self.instance_id, self.ci_id, self.ci_type, self.prototype, self.current_phase_index,
+            self.created_at, self.updated_at, self.context, bytes(self._status), self._cursor.tobytes(),
+            self._times or {}, self._data or {},
+        )
 
-    def _phase_to_dict(self, phase: PhaseInstance) -> Dict:
-        return {
-            "phase_id": phase.phase_id,
-            "name": phase.name,
-            "order": phase.order,
-            "status": phase.status.value,
-            "current_sub_phase_index": phase.current_sub_phase_index,
-            "entry_criteria_met": phase.entry_criteria_met,
-            "exit_criteria_met": phase.exit_criteria_met,
-            "started_at": phase.started_at.isoformat() if phase.started_at else None,
-            "completed_at": phase.completed_at.isoformat() if phase.completed_at else None,
-            "sub_phases": [self._sub_phase_to_dict(sp) for sp in phase.sub_phases],
-            "deliverables": phase.deliverables,
-            "reviews": phase.reviews
-        }
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StateMachineInstance):
+            return NotImplemented
+        return self._state_key() == other._state_key()
 
-    def _sub_phase_to_dict(self, sub_phase: SubPhaseInstance) -> Dict:
-        return {
-            "sub_phase_id": sub_phase.sub_phase_id,
-            "name": sub_phase.name,
-            "order": sub_phase.order,
-            "status": sub_phase.status.value,
-            "current_activity_index": sub_phase.current_activity_index,
-            "started_at": sub_phase.started_at.isoformat() if sub_phase.started_at else None,
-            "completed_at": sub_phase.completed_at.isoformat() if sub_phase.completed_at else None,
-            "activities": [self._activity_to_dict(a) for a in sub_phase.activities]
-        }
+    __hash__ = None
 
-    def _activity_to_dict(self, activity: ActivityInstance) -> Dict:
-        return {
-            "activity_id": activity.activity_id,
-            "name": activity.name,
-            "activity_type": activity.activity_type,
-            "status": activity.status.value,
-            "required": activity.required,
-            "started_at": activity.started_at.isoformat() if activity.started_at else None,
-            "completed_at": activity.completed_at.isoformat() if activity.completed_at else None,
-            "output_artifacts": activity.output_artifacts,
-            "completion_data": activity.completion_data
-        }
+    def __repr__(self) -> str:
+        return (
+            f"StateMachineInstance(instance_id={self.instance_id!r}, ci_id={self.ci_id!r}, "
+            f"template_id={self.template_id!r}, current_phase_index={self.current_phase_index})"
+        )
+
+    def to_dict(self) -> Dict:
+        """Serialize to the verbose dictionary form (see state_codec)"""
+        from .state_codec import instance_to_dict
+        return instance_to_dict(self)
 
 
 # =============================================================================
@@ -212,10 +568,13 @@ class StateMachineInstance:
 
 class ProcessTemplateLoader:
     """
-    Loads process templates from JSON files.
+    Loads process templates through the process-wide template registry.
+
+    Templates are parsed and schema-validated once, indexed by template_id
+    and CI type, and reloaded only when their file changes on disk.
     """
 
-    TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+    TEMPLATES_DIR = DEFAULT_TEMPLATES_DIR
 
     # Mapping from CI type to template file
     CI_TYPE_TO_TEMPLATE = {
@@ -230,62 +589,137 @@ class ProcessTemplateLoader:
         CIType.PART: "component_part_process.json",
     }
 
-    _template_cache: Dict[str, Dict] = {}
-
     @classmethod
     def load_template(cls, template_id: str) -> Dict:
         """Load a template by its ID"""
-        if template_id in cls._template_cache:
-            return cls._template_cache[template_id]
-
-        # Search all template files
-        for template_file in cls.TEMPLATES_DIR.glob("*.json"):
-            try:
-                with open(template_file, 'r') as f:
-                    template = json.load(f)
-                    if template.get("template_id") == template_id:
-                        cls._template_cache[template_id] = template
-                        return template
-            except json.JSONDecodeError:
-                continue
-
-        raise ValueError(f"Template '{template_id}' not found")
+        return get_template_registry().get(template_id)
 
     @classmethod
     def load_template_for_ci_type(cls, ci_type: CIType) -> Dict:
         """Load the appropriate template for a CI type"""
         template_file = cls.CI_TYPE_TO_TEMPLATE.get(ci_type)
-        if not template_file:
-            raise ValueError(f"No template defined for CI type '{ci_type}'")
-
-        template_path = cls.TEMPLATES_DIR / template_file
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template file not found: {template_path}")
+        if template_file:
+            return get_template_registry().get_by_file(template_file)
 
-        with open(template_path, 'r') as f:
-            template = json.load(f)
-
-        cls._template_cache[template["template_id"]] = template
+        template = get_template_registry().get_for_ci_type(CIType(ci_type).value)
+        if template is None:
+            raise ValueError(f"No template defined for CI type '{ci_type}'")
         return template
 
     @classmethod
     def list_available_templates(cls) -> List[Dict]:
         """List all available templates with summary info"""
-        templates = []
-        for template_file in cls.TEMPLATES_DIR.glob("*.json"):
-            try:
-                with open(template_file, 'r') as f:
-                    template = json.load(f)
-                    templates.append({
-                        "template_id": template.get("template_id"),
-                        "name": template.get("name"),
-                        "standard": template.get("standard"),
-                        "applicable_ci_types": template.get("applicable_ci_types", []),
-                        "phase_count": len(template.get("phases", []))
-                    })
-            except (json.JSONDecodeError, KeyError):
-                continue
-        return templates
+        return get_template_registry().list_summaries()
+
+
+# =============================================================================
+# PROTOTYPES
+# =============================================================================
+
+@dataclass(frozen=True)
+class ActivityPrototype:
+    """DAL-resolved, immutable definition of an activity"""
+    activity_id: str
+    name: str
+    activity_type: str
+    required: bool
+    output_artifacts: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SubPhasePrototype:
+    """DAL-resolved, immutable definition of a sub-phase"""
+    sub_phase_id: str
+    name: str
+    order: int
+    activities: Tuple[ActivityPrototype, ...]
+
+
+@dataclass(frozen=True)
+class PhasePrototype:
+    """DAL-resolved, immutable definition of a phase"""
+    phase_id: str
+    name: str
+    order: int
+    deliverables: Tuple[Dict, ...]
+    reviews: Tuple[Dict, ...]
+    sub_phases: Tuple[SubPhasePrototype, ...]
+
+
+@dataclass(frozen=True)
+class ProcessPrototype:
+    """
+    A process template specialized for one DAL level.
+
+    DAL filtering is resolved once when the prototype is built. The
+    prototype is shared by all instances created from it and also defines
+    the layout of their state arrays (see DATA MODELS).
+    """
+    template_id: str
+    template_name: str
+    dal_level: Optional[str]
+    phases: Tuple[PhasePrototype, ...]
+
+    # State layout, derived from phases
+    sub_phase_bases: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    activity_bases: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    phase_flag_offset: int = field(init=False, repr=False, compare=False)
+    sub_phase_status_offset: int = field(init=False, repr=False, compare=False)
+    activity_status_offset: int = field(init=False, repr=False, compare=False)
+    sub_phase_slot_offset: int = field(init=False, repr=False, compare=False)
+    activity_slot_offset: int = field(init=False, repr=False, compare=False)
+    status_size: int = field(init=False, repr=False, compare=False)
+    blank_cursor: array = field(init=False, repr=False, compare=False)
+    blank_done: array = field(init=False, repr=False, compare=False)
+    phase_totals: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    activity_phase: array = field(init=False, repr=False, compare=False)
+    activity_sub_phase: array = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        sub_phase_bases = []
+        activity_bases = []
+        phase_totals = []
+        activity_phase = array("H")
+        activity_sub_phase = array("H")
+        sub_phase_count = 0
+        activity_count = 0
+        for phase_index, phase in enumerate(self.phases):
+            sub_phase_bases.append(sub_phase_count)
+            phase_start = activity_count
+            for sub_phase in phase.sub_phases:
+                activity_bases.append(activity_count)
+                activity_count += len(sub_phase.activities)
+                activity_phase.extend([phase_index] * len(sub_phase.activities))
+                activity_sub_phase.extend([sub_phase_count] * len(sub_phase.activities))
+                sub_phase_count += 1
+            phase_totals.append(activity_count - phase_start)
+
+        phase_count = len(self.phases)
+        layout = {
+            "sub_phase_bases": tuple(sub_phase_bases),
+            "activity_bases": tuple(activity_bases),
+            "phase_flag_offset": phase_count,
+            "sub_phase_status_offset": 2 * phase_count,
+            "activity_status_offset": 2 * phase_count + sub_phase_count,
+            "sub_phase_slot_offset": phase_count,
+            "activity_slot_offset": phase_count + sub_phase_count,
+            "status_size": 2 * phase_count + sub_phase_count + activity_count,
+            "blank_cursor": array("H", bytes(2 * (phase_count + sub_phase_count))),
+            "blank_done": array("H", bytes(2 * (phase_count + sub_phase_count))),
+            "phase_totals": tuple(phase_totals),
+            "activity_phase": activity_phase,
+            "activity_sub_phase": activity_sub_phase,
+        }
+        for name, value in layout.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def activity_count(self) -> int:
+        return self.status_size - self.activity_status_offset
+
+    def instantiate(self, ci_id: int, ci_type: CIType) -> StateMachineInstance:
+        """Create a fresh, not-started instance from this prototype"""
+        return StateMachineInstance(str(uuid.uuid4()), ci_id, ci_type, self)
 
 
 # =============================================================================
@@ -298,11 +732,39 @@ class StateMachineGenerator:
 
     This is the core of the "Codification of the Systems Engineer" -
     it creates deterministic, executable process instances.
+
+    Templates are specialized per DAL level into cached ProcessPrototypes;
+    a prototype is rebuilt only when the registry returns a different
+    template object (i.e. the template file changed).
     """
 
+    # (template_id, dal_level) -> (template the prototype was built from, prototype)
+    _prototypes: Dict[Tuple[str, Optional[str]], Tuple[Dict, ProcessPrototype]] = {}
+
     def __init__(self):
         self.loader = ProcessTemplateLoader()
 
+    def get_prototype(self, template: Dict, dal_level: Optional[str]) -> ProcessPrototype:
+        """Get (building if needed) the DAL-specialized prototype of a template"""
+        key = (template["template_id"], dal_level)
+        cached = self._prototypes.get(key)
+        if cached is not None and cached[0] is template:
+            return cached[1]
+
+        prototype = ProcessPrototype(
+            template_id=template["template_id"],
+            template_name=template["name"],
+            dal_level=dal_level,
+            phases=tuple(self._generate_phases(template, dal_level))
+        )
+        StateMachineGenerator._prototypes[key] = (template, prototype)
+        return prototype
+
+    def _resolve_template(self, ci_type: CIType, template_id: Optional[str]) -> Dict:
+        if template_id:
+            return self.loader.load_template(template_id)
+        return self.loader.load_template_for_ci_type(ci_type)
+
     def generate_for_ci(
         self,
         ci_id: int,
@@ -322,54 +784,34 @@ class StateMachineGenerator:
         Returns:
             A fully initialized StateMachineInstance
         """
-        # Load template
-        if template_id:
-            template = self.loader.load_template(template_id)
-        else:
-            template = self.loader.load_template_for_ci_type(ci_type)
-
-        # Create instance
-        instance = StateMachineInstance(
-            instance_id=str(uuid.uuid4()),
-            ci_id=ci_id,
-            ci_type=ci_type,
-            template_id=template["template_id"],
-            template_name=template["name"],
-            dal_level=dal_level
-        )
+        template = self._resolve_template(ci_type, template_id)
+        return self.get_prototype(template, dal_level).instantiate(ci_id, ci_type)
 
-        # Generate phases from template
-        instance.phases = self._generate_phases(template, dal_level)
-
-        return instance
-
-    def _generate_phases(self, template: Dict, dal_level: Optional[str]) -> List[PhaseInstance]:
-        """Generate phase instances from template"""
+    def _generate_phases(self, template: Dict, dal_level: Optional[str]) -> List[PhasePrototype]:
+        """Generate phase prototypes from template"""
         phases = []
 
         for phase_def in template.get("phases", []):
-            phase = PhaseInstance(
-                phase_id=phase_def["phase_id"],
-                name=phase_def["name"],
-                order=phase_def["order"],
-                deliverables=phase_def.get("deliverables", []),
-                reviews=phase_def.get("reviews", [])
-            )
-
-            # Generate sub-phases
-            phase.sub_phases = self._generate_sub_phases(
-                phase_def.get("sub_phases", []),
-                dal_level
-            )
+            deliverables = phase_def.get("deliverables", [])
 
             # Filter deliverables by DAL if specified
             if dal_level:
-                phase.deliverables = [
-                    d for d in phase.deliverables
+                deliverables = [
+                    d for d in deliverables
                     if self._is_required_for_dal(d, dal_level)
                 ]
 
-            phases.append(phase)
+            phases.append(PhasePrototype(
+                phase_id=sys.intern(phase_def["phase_id"]),
+                name=sys.intern(phase_def["name"]),
+                order=phase_def["order"],
+                deliverables=tuple(deliverables),
+                reviews=tuple(phase_def.get("reviews", [])),
+                sub_phases=tuple(self._generate_sub_phases(
+                    phase_def.get("sub_phases", []),
+                    dal_level
+                ))
+            ))
 
         return phases
 
@@ -377,24 +819,23 @@ class StateMachineGenerator:
         self,
         sub_phase_defs: List[Dict],
         dal_level: Optional[str]
-    ) -> List[SubPhaseInstance]:
-        """Generate sub-phase instances"""
+    ) -> List[SubPhasePrototype]:
+        """Generate sub-phase prototypes, dropping those with no activity at this DAL"""
         sub_phases = []
 
         for sp_def in sub_phase_defs:
-            sub_phase = SubPhaseInstance(
-                sub_phase_id=sp_def["sub_phase_id"],
-                name=sp_def["name"],
-                order=sp_def["order"]
-            )
+            activities = self._generate_activities(sp_def.get("activities", []), dal_level)
 
-            # Generate activities
-            sub_phase.activities = self._generate_activities(
-                sp_def.get("activities", []),
-                dal_level
-            )
+            # An empty sub-phase could never be completed by the controller
+            if not activities:
+                continue
 
-            sub_phases.append(sub_phase)
+            sub_phases.append(SubPhasePrototype(
+                sub_phase_id=sys.intern(sp_def["sub_phase_id"]),
+                name=sys.intern(sp_def["name"]),
+                order=sp_def["order"],
+                activities=tuple(activities)
+            ))
 
         return sub_phases
 
@@ -402,26 +843,20 @@ class StateMachineGenerator:
         self,
         activity_defs: List[Dict],
         dal_level: Optional[str]
-    ) -> List[ActivityInstance]:
-        """Generate activity instances, filtering by DAL level"""
-        activities = []
-
-        for act_def in activity_defs:
-            # Check if activity is required for this DAL level
-            if not self._is_required_for_dal(act_def, dal_level):
-                continue
-
-            activity = ActivityInstance(
-                activity_id=act_def["activity_id"],
-                name=act_def["name"],
-                activity_type=act_def["type"],
+    ) -> List[ActivityPrototype]:
+        """Generate activity prototypes, filtering by DAL level"""
+        return [
+            ActivityPrototype(
+                activity_id=sys.intern(act_def["activity_id"]),
+                name=sys.intern(act_def["name"]),
+                activity_type=sys.intern(act_def["type"]),
                 required=act_def.get("required", True),
-                output_artifacts=act_def.get("output_artifacts", [])
+                output_artifacts=tuple(sys.intern(a) for a in act_def.get("output_artifacts", []))
             )
-
-            activities.append(activity)
-
-        return activities
+            for act_def in activity_defs
+            # Check if activity is required for this DAL level
+            if self._is_required_for_dal(act_def, dal_level)
+        ]
 
     def _is_required_for_dal(self, item: Dict, dal_level: Optional[str]) -> bool:
         """Check if an item is required for the given DAL level"""
@@ -445,6 +880,9 @@ class StateMachineGenerator:
         """
         Generate state machines for an entire product structure.
 
+        Prototypes are resolved once per (CI type, DAL level) pair, so the
+        per-CI cost is a single structural clone.
+
         Args:
             product_structure: List of CI dictionaries with id, type, dal_level
 
@@ -452,14 +890,17 @@ class StateMachineGenerator:
             Dictionary mapping CI ID to StateMachineInstance
         """
         instances = {}
+        prototypes: Dict[Tuple[str, Optional[str]], Tuple[CIType, ProcessPrototype]] = {}
 
         for ci in product_structure:
-            ci_id = ci["id"]
-            ci_type = CIType(ci["type"])
-            dal_level = ci.get("dal_level")
+            key = (ci["type"], ci.get("dal_level"))
+            resolved = prototypes.get(key)
+            if resolved is None:
+                ci_type = CIType(key[0])
+                template = self._resolve_template(ci_type, None)
+                resolved = prototypes[key] = (ci_type, self.get_prototype(template, key[1]))
 
-            instance = self.generate_for_ci(ci_id, ci_type, dal_level)
-            instances[ci_id] = instance
+            instances[ci["id"]] = resolved[1].instantiate(ci["id"], resolved[0])
 
         return instances
 
@@ -473,11 +914,17 @@ class StateMachineController:
     Controls the execution of a state machine instance.
 
     This is the "process executor" that manages state transitions,
-    activity completion, and phase progression.
+    activity completion, and phase progression. Every change is appended
+    to `events` (see TransitionEvent); all timestamps of one call share the
+    time read from `clock` when the call started.
     """
 
-    def __init__(self, instance: StateMachineInstance):
+    def __init__(self, instance: StateMachineInstance, clock: Optional[Callable[[], datetime]] = None):
         self.instance = instance
+        self.clock = clock or datetime.utcnow
+        self.events: List[TransitionEvent] = []
+        self._depth = 0
+        self._now: Optional[datetime] = None
 
     def get_current_activity(self) -> Optional[ActivityInstance]:
         """Get the current activity to work on"""
@@ -496,29 +943,35 @@ class StateMachineController:
 
     def start_phase(self, phase_index: int = None) -> bool:
         """Start a phase (checks entry criteria)"""
-        if phase_index is None:
-            phase_index = self.instance.current_phase_index
-
-        if phase_index >= len(self.instance.phases):
-            return False
-
-        phase = self.instance.phases[phase_index]
-
-        # Check entry criteria
-        if not self._check_entry_criteria(phase):
-            phase.status = PhaseStatus.BLOCKED
-            return False
-
-        phase.status = PhaseStatus.IN_PROGRESS
-        phase.started_at = datetime.utcnow()
-        phase.entry_criteria_met = True
+        with self._transition() as now:
+            if phase_index is None:
+                phase_index = self.instance.current_phase_index
+
+            if phase_index >= len(self.instance.phases):
+                return False
+
+            phase = self.instance.phases[phase_index]
+
+            # Check entry criteria
+            if not self._check_entry_criteria(phase):
+                phase.status = PhaseStatus.BLOCKED
+                return False
+
+            from_status = phase.status
+            phase.status = PhaseStatus.IN_PROGRESS
+            phase.started_at = now
+            phase.entry_criteria_met = True
+            self._record(
+                TransitionType.PHASE_STARTED, command=True, phase_id=phase.phase_id,
+                from_status=from_status, to_status=phase.status, data={"phase_index": phase_index}
+            )
 
-        # Start first sub-phase
-        if phase.sub_phases:
-            self._start_sub_phase(phase.sub_phases[0])
+            # Start first sub-phase
+            if phase.sub_phases:
+                self._start_sub_phase(phase.sub_phases[0])
 
-        self.instance.updated_at = datetime.utcnow()
-        return True
+            self.instance.updated_at = now
+            return True
 
     def complete_activity(
         self,
@@ -526,65 +979,96 @@ class StateMachineController:
         completion_data: Dict = None
     ) -> bool:
         """Mark an activity as complete and advance state"""
-        phase = self.instance.current_phase
-        if not phase:
-            return False
-
-        sub_phase = phase.sub_phases[phase.current_sub_phase_index]
-        activity = sub_phase.activities[sub_phase.current_activity_index]
-
-        if activity.activity_id != activity_id:
-            return False
-
-        # Complete the activity
-        activity.status = ActivityStatus.COMPLETED
-        activity.completed_at = datetime.utcnow()
-        if completion_data:
-            activity.completion_data = completion_data
+        with self._transition() as now:
+            phase = self.instance.current_phase
+            if not phase:
+                return False
+
+            sub_phase = phase.sub_phases[phase.current_sub_phase_index]
+            activity = sub_phase.activities[sub_phase.current_activity_index]
+
+            if activity.activity_id != activity_id:
+                return False
+
+            # Complete the activity
+            from_status = activity.status
+            activity.status = ActivityStatus.COMPLETED
+            activity.completed_at = now
+            if completion_data:
+                activity.completion_data = completion_data
+            self._record(
+                TransitionType.ACTIVITY_COMPLETED, command=True, phase_id=phase.phase_id,
+                activity_id=activity_id, from_status=from_status, to_status=activity.status,
+                data={"completion_data": completion_data or {}}
+            )
 
-        # Advance to next activity or sub-phase
-        self._advance_state()
+            # Advance to next activity or sub-phase
+            self._advance_state()
 
-        self.instance.updated_at = datetime.utcnow()
-        return True
+            self.instance.updated_at = now
+            return True
 
     def skip_activity(self, activity_id: str, reason: str = None) -> bool:
         """Skip an optional activity"""
-        phase = self.instance.current_phase
-        if not phase:
-            return False
-
-        sub_phase = phase.sub_phases[phase.current_sub_phase_index]
-        activity = sub_phase.activities[sub_phase.current_activity_index]
+        with self._transition() as now:
+            phase = self.instance.current_phase
+            if not phase:
+                return False
+
+            sub_phase = phase.sub_phases[phase.current_sub_phase_index]
+            activity = sub_phase.activities[sub_phase.current_activity_index]
+
+            if activity.activity_id != activity_id:
+                return False
+
+            if activity.required:
+                return False  # Cannot skip required activities
+
+            from_status = activity.status
+            activity.status = ActivityStatus.SKIPPED
+            activity.completion_data = {"skip_reason": reason}
+            self._record(
+                TransitionType.ACTIVITY_SKIPPED, command=True, phase_id=phase.phase_id,
+                activity_id=activity_id, from_status=from_status, to_status=activity.status,
+                data={"reason": reason}
+            )
 
-        if activity.activity_id != activity_id:
-            return False
+            self._advance_state()
+            self.instance.updated_at = now
+            return True
 
-        if activity.required:
-            return False  # Cannot skip required activities
+    def replay(self, event: TransitionEvent) -> bool:
+        """
+        Re-execute a recorded command event at its recorded time.
 
-        activity.status = ActivityStatus.SKIPPED
-        activity.completion_data = {"skip_reason": reason}
+        Events with command=False are consequences of a command and are
+        reproduced by replaying it; they are ignored here.
+        """
+        if not event.command:
+            return True
 
-        self._advance_state()
-        self.instance.updated_at = datetime.utcnow()
-        return True
+        clock = self.clock
+        self.clock = lambda: event.at
+        try:
+            if event.change_type == TransitionType.PHASE_STARTED:
+                return self.start_phase(event.data.get("phase_index"))
+            if event.change_type == TransitionType.ACTIVITY_COMPLETED:
+                return self.complete_activity(event.activity_id, event.data.get("completion_data"))
+            if event.change_type == TransitionType.ACTIVITY_SKIPPED:
+                return self.skip_activity(event.activity_id, event.data.get("reason"))
+            raise ValueError(f"Cannot replay event type {event.change_type}")
+        finally:
+            self.clock = clock
 
     def get_phase_progress(self, phase_index: int = None) -> Dict:
-        """Get progress information for a phase"""
+        """Get progress information for a phase (O(1), from the counters)"""
         if phase_index is None:
             phase_index = self.instance.current_phase_index
 
         phase = self.instance.phases[phase_index]
 
-        total_activities = 0
-        completed_activities = 0
-
-        for sp in phase.sub_phases:
-            for act in sp.activities:
-                total_activities += 1
-                if act.status in [ActivityStatus.COMPLETED, ActivityStatus.SKIPPED]:
-                    completed_activities += 1
+        total_activities = phase.total_activities
+        completed_activities = phase.completed_activities
 
         return {
             "phase_id": phase.phase_id,
@@ -593,7 +1077,7 @@ class StateMachineController:
             "total_activities": total_activities,
             "completed_activities": completed_activities,
             "progress_percent": (completed_activities / total_activities * 100) if total_activities > 0 else 0,
-            "current_sub_phase": phase.sub_phases[phase.current_sub_phase_index].name if phase.sub_phases else None
+            "current_sub_phase": phase.node.sub_phases[phase.current_sub_phase_index].name if phase.node.sub_phases else None
         }
 
     def get_overall_progress(self) -> Dict:
@@ -606,6 +1090,8 @@ class StateMachineController:
             "template_name": self.instance.template_name,
             "current_phase_index": self.instance.current_phase_index,
             "overall_progress": self.instance.overall_progress,
+            "total_activities": self.instance.total_activities,
+            "completed_activities": self.instance.completed_activities,
             "phases": phase_progress
         }
 
@@ -621,7 +1107,7 @@ class StateMachineController:
 
         # Sub-phase complete, try next sub-phase
         sub_phase.status = SubPhaseStatus.COMPLETED
-        sub_phase.completed_at = datetime.utcnow()
+        sub_phase.completed_at = self._now
 
         if phase.current_sub_phase_index < len(phase.sub_phases) - 1:
             phase.current_sub_phase_index += 1
@@ -630,9 +1116,14 @@ class StateMachineController:
 
         # Phase complete, check exit criteria
         if self._check_exit_criteria(phase):
+            from_status = phase.status
             phase.status = PhaseStatus.COMPLETED
-            phase.completed_at = datetime.utcnow()
+            phase.completed_at = self._now
             phase.exit_criteria_met = True
+            self._record(
+                TransitionType.PHASE_COMPLETED, phase_id=phase.phase_id,
+                from_status=from_status, to_status=phase.status
+            )
 
             # Try next phase
             if self.instance.current_phase_index < len(self.instance.phases) - 1:
@@ -642,13 +1133,43 @@ class StateMachineController:
     def _start_sub_phase(self, sub_phase: SubPhaseInstance):
         """Start a sub-phase"""
         sub_phase.status = SubPhaseStatus.IN_PROGRESS
-        sub_phase.started_at = datetime.utcnow()
+        sub_phase.started_at = self._now
         sub_phase.current_activity_index = 0
 
         # Start first activity
         if sub_phase.activities:
-            sub_phase.activities[0].status = ActivityStatus.IN_PROGRESS
-            sub_phase.activities[0].started_at = datetime.utcnow()
+            activity = sub_phase.activities[0]
+            from_status = activity.status
+            activity.status = ActivityStatus.IN_PROGRESS
+            activity.started_at = self._now
+            self._record(
+                TransitionType.ACTIVITY_STARTED, phase_id=self.instance.current_phase.phase_id,
+                activity_id=activity.activity_id, from_status=from_status, to_status=activity.status
+            )
+
+    @contextmanager
+    def _transition(self):
+        """Scope of one public call: fixes the time and marks nested calls"""
+        if self._depth == 0:
+            self._now = self.clock()
+        self._depth += 1
+        try:
+            yield self._now
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._now = None
+
+    def _record(self, change_type: TransitionType, command: bool = False, **fields) -> None:
+        for key in ("from_status", "to_status"):
+            if isinstance(fields.get(key), Enum):
+                fields[key] = fields[key].value
+        self.events.append(TransitionEvent(
+            change_type=change_type,
+            at=self._now,
+            command=command and self._depth == 1,
+            **fields
+        ))
 
     def _check_entry_criteria(self, phase: PhaseInstance) -> bool:
         """Check if entry criteria for a phase are met"""
@@ -658,6 +1179,9 @@ class StateMachineController:
 
     def _check_exit_criteria(self, phase: PhaseInstance) -> bool:
         """Check if exit criteria for a phase are met"""
+        if phase.completed_activities == phase.total_activities:
+            return True
+
         # Check all required activities are complete
         for sp in phase.sub_phases:
             for act in sp.activities:
@@ -0,0 +1,290 @@
+"""
+Process Template Registry for AISET Process Engine
+
+This module keeps a process-wide, validated, indexed copy of the process
+templates so that state machine generation never touches the disk on the
+hot path.
+
+Key Features:
+- Parse and validate each template once against process_template_schema.json
+- Index by template_id, file name and applicable CI type
+- Invalidate per file when its mtime/size changes
+- Optional precompiled snapshot so new workers start warm
+
+Templates returned by the registry are shared; callers must treat them as
+read-only.
+
+Traceability: REQ-SM-001 (Process template instantiation)
+"""
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import jsonschema
+except ImportError:  # pragma: no cover - optional dependency
+    jsonschema = None
+
+logger = logging.getLogger(__name__)
+
+
+PROCESS_ENGINE_DIR = Path(__file__).parent.parent
+DEFAULT_TEMPLATES_DIR = PROCESS_ENGINE_DIR / "templates"
+DEFAULT_SCHEMA_PATH = PROCESS_ENGINE_DIR / "schemas" / "process_template_schema.json"
+
+SNAPSHOT_VERSION = 1
+
+
+class TemplateValidationError(ValueError):
+    """A process template does not conform to the template schema."""
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+class ProcessTemplateRegistry:
+    """
+    Validated, indexed, change-aware cache of process templates.
+    """
+
+    # Minimum seconds between directory scans for changed files
+    CHECK_INTERVAL_SECONDS = 2.0
+
+    def __init__(
+        self,
+        templates_dir: Path = DEFAULT_TEMPLATES_DIR,
+        schema_path: Path = DEFAULT_SCHEMA_PATH,
+        snapshot_path: Optional[Path] = None
+    ):
+        self.templates_dir = Path(templates_dir)
+        self.schema_path = Path(schema_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+
+        self._lock = threading.RLock()
+        self._validator = None
+        self._last_scan = 0.0
+        self._loaded = False
+
+        # file name -> (signature, template)
+        self._files: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._errors: Dict[str, str] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_ci_type: Dict[str, Dict[str, Any]] = {}
+        self._summaries: List[Dict[str, Any]] = []
+
+    # -------------------------------------------------------------------------
+    # Validation
+    # -------------------------------------------------------------------------
+
+    def _get_validator(self):
+        if self._validator is None and jsonschema is not None:
+            with open(self.schema_path, "r") as f:
+                schema = json.load(f)
+            self._validator = jsonschema.Draft7Validator(schema)
+        return self._validator
+
+    def validate(self, template: Dict[str, Any]) -> None:
+        """
+        Validate a template against the template schema.
+
+        Falls back to a structural check of required keys when jsonschema
+        is not installed.
+
+        Raises:
+            TemplateValidationError: If the template is invalid
+        """
+        validator = self._get_validator()
+        if validator is not None:
+            error = next(iter(validator.iter_errors(template)), None)
+            if error is not None:
+                location = "/".join(str(p) for p in error.absolute_path) or "<root>"
+                raise TemplateValidationError(f"{location}: {error.message}")
+            return
+
+        for key in ("template_id", "name", "standard", "version", "applicable_ci_types", "phases"):
+            if key not in template:
+                raise TemplateValidationError(f"<root>: '{key}' is a required property")
+        for phase in template["phases"]:
+            for key in ("phase_id", "name", "order"):
+                if key not in phase:
+                    raise TemplateValidationError(f"phases: '{key}' is a required property")
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def _refresh(self, force: bool = False) -> None:
+        """Reload changed template files (throttled unless forced)."""
+        now = time.monotonic()
+        if not force and self._loaded and now - self._last_scan < self.CHECK_INTERVAL_SECONDS:
+            return
+
+        with self._lock:
+            if not self._loaded:
+                self._load_snapshot()
+
+            self._last_scan = now
+            signatures = {}
+            for path in self.templates_dir.glob("*.json"):
+                stat = path.stat()
+                signatures[path.name] = (stat.st_mtime_ns, stat.st_size)
+
+            changed = False
+            for name in list(self._files):
+                if name not in signatures:
+                    del self._files[name]
+                    changed = True
+            for name in list(self._errors):
+                if name not in signatures:
+                    del self._errors[name]
+
+            for name, signature in signatures.items():
+                cached = self._files.get(name)
+                if cached and cached[0] == signature:
+                    continue
+                changed = True
+                self._files.pop(name, None)
+                try:
+                    with open(self.templates_dir / name, "r") as f:
+                        template = json.load(f)
+                    self.validate(template)
+                except (json.JSONDecodeError, TemplateValidationError) as e:
+                    self._errors[name] = str(e)
+                    logger.warning(f"Invalid process template {name}: {e}")
+                    continue
+                self._errors.pop(name, None)
+                self._files[name] = (signature, template)
+
+            if changed or not self._loaded:
+                self._rebuild_indexes()
+            if changed:
+                self._save_snapshot()
+            self._loaded = True
+
+    def _rebuild_indexes(self) -> None:
+        by_id: Dict[str, Dict[str, Any]] = {}
+        by_ci_type: Dict[str, Dict[str, Any]] = {}
+        summaries = []
+        for name in sorted(self._files):
+            template = self._files[name][1]
+            by_id[template["template_id"]] = template
+            for ci_type in template.get("applicable_ci_types", []):
+                by_ci_type.setdefault(ci_type, template)
+            summaries.append({
+                "template_id": template.get("template_id"),
+                "name": template.get("name"),
+                "standard": template.get("standard"),
+                "applicable_ci_types": template.get("applicable_ci_types", []),
+                "phase_count": len(template.get("phases", []))
+            })
+        self._by_id = by_id
+        self._by_ci_type = by_ci_type
+        self._summaries = summaries
+
+    def _load_snapshot(self) -> None:
+        """Seed the cache from a precompiled snapshot, if configured."""
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable template snapshot {self.snapshot_path}: {e}")
+            return
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("templates_dir") != str(self.templates_dir):
+            return
+        # Entries are only reused while the file signature still matches
+        self._files = dict(snapshot["files"])
+
+    def _save_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "templates_dir": str(self.templates_dir),
+            "files": self._files,
+        }
+        tmp_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not write template snapshot {self.snapshot_path}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def configure_snapshot(self, snapshot_path: Optional[Path]) -> None:
+        """Enable (or disable with None) snapshot persistence."""
+        with self._lock:
+            self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+
+    def warm(self) -> int:
+        """Load and validate all templates now; returns the template count."""
+        self._refresh(force=True)
+        return len(self._by_id)
+
+    def invalidate(self) -> None:
+        """Drop all cached templates; the next access reloads from disk."""
+        with self._lock:
+            self._files.clear()
+            self._errors.clear()
+            self._loaded = False
+            self._rebuild_indexes()
+
+    def get(self, template_id: str) -> Dict[str, Any]:
+        """Get a template by ID."""
+        self._refresh()
+        template = self._by_id.get(template_id)
+        if template is None:
+            raise ValueError(f"Template '{template_id}' not found")
+        return template
+
+    def get_by_file(self, file_name: str) -> Dict[str, Any]:
+        """Get a template by its file name."""
+        self._refresh()
+        cached = self._files.get(file_name)
+        if cached is None:
+            if file_name in self._errors:
+                raise TemplateValidationError(f"{file_name}: {self._errors[file_name]}")
+            raise FileNotFoundError(f"Template file not found: {self.templates_dir / file_name}")
+        return cached[1]
+
+    def get_for_ci_type(self, ci_type: str) -> Optional[Dict[str, Any]]:
+        """Get the first template (by file name) listing ci_type as applicable."""
+        self._refresh()
+        return self._by_ci_type.get(ci_type)
+
+    def list_summaries(self) -> List[Dict[str, Any]]:
+        """List all valid templates with summary info."""
+        self._refresh()
+        return [dict(s) for s in self._summaries]
+
+    def get_errors(self) -> Dict[str, str]:
+        """Validation errors for template files that were rejected."""
+        self._refresh()
+        return dict(self._errors)
+
+
+_registry: Optional[ProcessTemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> ProcessTemplateRegistry:
+    """Get the process-wide template registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ProcessTemplateRegistry()
+    return _registry
@@ -19,5 +19,6 @@ __all__ = [
     "documents",
     "users",
     "configuration_items",
-    "process_engine"
+    "process_engine",
+    "metrics"
 ]
@@ -109,7 +109,10 @@ async def send_message(
 
     try:
         # Get AI response
-        response = await ai_service.requirements_elicitation(message)
+        response = await ai_service.requirements_elicitation(
+            message,
+            project_id=conversation.project_id
+        )
 
         # Validate single question (REQ-AI-001)
         validation = await ai_service.validate_single_question(response)
@@ -167,6 +170,8 @@ async def extract_requirements(conversation_id: int, db: Session = Depends(get_d
 
     Traceability: REQ-AI-014 - Requirements extraction API
     """
+    conversation = db.query(AIConversation).filter(AIConversation.id == conversation_id).first()
+
     # Get all messages
     messages = db.query(AIMessage).filter(
         AIMessage.conversation_id == conversation_id
@@ -180,7 +185,10 @@ async def extract_requirements(conversation_id: int, db: Session = Depends(get_d
 
     try:
         # Extract requirements
-        extracted = await ai_service.extract_requirements(conversation_text)
+        extracted = await ai_service.extract_requirements(
+            conversation_text,
+            project_id=conversation.project_id if conversation else None
+        )
 
         return {
             "extracted_count": len(extracted),
@@ -4,7 +4,9 @@ DO-178C Traceability: REQ-AI-038, REQ-AI-039, REQ-AI-040, REQ-BE-013
 Purpose: REST API endpoints for product structure and BOM management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
@@ -15,6 +17,7 @@ from services.configuration_item_service import ConfigurationItemService
 from services.activity_interview_service import ActivityInterviewService
 from services.process_event_service import get_event_service
 from services.phase_approval_service import PhaseApprovalService
+from services.state_machine_store import StateMachineConflictError
 from models.configuration_item import CIType, CILifecyclePhase, CIControlLevel, CIStatus, BOMType
 
 router = APIRouter()
@@ -458,6 +461,47 @@ async def create_ci_state_machine(
     return result
 
 
+class BulkStateMachineCreate(BaseModel):
+    """Schema for creating state machines for a whole product structure."""
+    root_ci_id: Optional[int] = None
+    dal_level: Optional[str] = None
+    auto_start: bool = True
+
+
+@router.post("/projects/{project_id}/state-machines/bulk")
+async def create_project_state_machines(
+    project_id: int,
+    request: BulkStateMachineCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create development process state machines for a product structure.
+
+    Traceability: REQ-SM-001
+
+    Walks the project's CI tree (or the subtree under root_ci_id) and
+    creates one state machine per CI in a single transaction. CIs that
+    already have one are skipped. Each CI's template comes from its type
+    and criticality unless dal_level is given.
+    """
+    service = ConfigurationItemService(db)
+
+    result = service.create_state_machines_for_project(
+        project_id,
+        root_ci_id=request.root_ci_id,
+        dal_level=request.dal_level,
+        auto_start=request.auto_start
+    )
+
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Project {project_id} or root CI {request.root_ci_id} not found"
+        )
+
+    return result
+
+
 @router.get("/configuration-items/{ci_id}/state-machine")
 async def get_ci_state_machine(ci_id: int, db: Session = Depends(get_db)):
     """
@@ -506,9 +550,11 @@ async def get_ci_progress(ci_id: int, db: Session = Depends(get_db)):
     """
     Get progress information for a CI's development process.
 
+    Served from the counters each transition maintains; no activity scan.
+
     Returns:
-        - Overall completion percentage
-        - Phase progress
+        - Overall completion percentage (activity-weighted)
+        - Per-phase completed/total activities
         - Activity completion counts
         - Current phase/activity
     """
@@ -525,6 +571,125 @@ async def get_ci_progress(ci_id: int, db: Session = Depends(get_db)):
     return progress
 
 
+@router.get("/projects/{project_id}/work-queue")
+async def get_project_work_queue(
+    project_id: int,
+    status_filter: Optional[List[str]] = Query(None, alias="status"),
+    phase_id: Optional[str] = None,
+    activity_type: Optional[str] = None,
+    ci_type: Optional[str] = None,
+    required: Optional[bool] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Current activity of every CI in a project (work queue).
+
+    Traceability: REQ-SM-003 (Activity sequencing)
+
+    Served from the ci_current_activities projection, kept in sync on
+    every transition. Filters combine; `status` may be repeated, e.g.
+    ?status=in_progress&status=blocked. Returns per-phase counts for the
+    filtered queue and one page of items.
+    """
+    service = ConfigurationItemService(db)
+    return service.get_project_work_queue(
+        project_id,
+        statuses=status_filter,
+        phase_id=phase_id,
+        activity_type=activity_type,
+        ci_type=ci_type,
+        required=required,
+        limit=limit,
+        offset=offset
+    )
+
+
+@router.get("/projects/{project_id}/process-dashboard")
+async def get_project_process_dashboard(
+    project_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Process state of every CI in a project, with rollups (dashboard).
+
+    Traceability: REQ-SM-001, REQ-SM-003
+
+    One response replaces a /progress and /current-activity call per CI:
+    per-CI phase, current activity and progress, plus rollups by CI type,
+    DAL and phase. Responses carry an ETag that changes with any state
+    machine transition in the project; send it back in If-None-Match to
+    get 304 Not Modified while nothing has changed.
+    """
+    service = ConfigurationItemService(db)
+    etag, dashboard = service.get_project_process_dashboard(
+        project_id,
+        if_none_match=request.headers.get("if-none-match")
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if dashboard is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=jsonable_encoder(dashboard), headers=headers)
+
+
+@router.get("/projects/{project_id}/state-machine-history")
+async def get_project_state_machine_history(
+    project_id: int,
+    after: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ci_id: Optional[int] = None,
+    change_type: Optional[List[str]] = Query(None),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    State machine transition history of a project (audit trail).
+
+    Traceability: REQ-SM-001 (Development lifecycle state machine)
+
+    Oldest first, keyset-paginated: pass `next_cursor` from one page as
+    `after` to get the next.
+    """
+    service = ConfigurationItemService(db)
+    return service.get_project_state_machine_history(
+        project_id,
+        after_id=after,
+        limit=limit,
+        ci_id=ci_id,
+        change_types=change_type,
+        since=since,
+        until=until
+    )
+
+
+@router.get("/configuration-items/{ci_id}/state-machine/as-of")
+async def get_ci_state_machine_as_of(
+    ci_id: int,
+    at: datetime,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a CI's state machine as it was at time `at` (ISO 8601).
+
+    Traceability: REQ-SM-001 (Development lifecycle state machine)
+
+    Rebuilt from the nearest earlier snapshot plus the transitions after it.
+    """
+    service = ConfigurationItemService(db)
+    state = service.get_ci_state_as_of(ci_id, at)
+
+    if not state:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No process state found for CI {ci_id} at {at.isoformat()}"
+        )
+
+    return state
+
+
 class ActivityComplete(BaseModel):
     """Schema for completing an activity."""
     activity_id: str
@@ -537,6 +702,17 @@ class ActivitySkip(BaseModel):
     reason: str
 
 
+def _conflict(error: StateMachineConflictError) -> HTTPException:
+    """409 carrying the state another user committed first."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": str(error),
+            "current_state": error.current_state
+        }
+    )
+
+
 @router.post("/configuration-items/{ci_id}/complete-activity")
 async def complete_activity(
     ci_id: int,
@@ -553,14 +729,20 @@ async def complete_activity(
     - Stores optional completion data (artifacts, notes, etc.)
     - Advances the state machine to the next activity
     - Updates progress percentages
+
+    Returns 409 with the current state if a concurrent change made the
+    completion inapplicable.
     """
     service = ConfigurationItemService(db)
 
-    result = service.complete_activity(
-        ci_id=ci_id,
-        activity_id=request.activity_id,
-        completion_data=request.completion_data
-    )
+    try:
+        result = service.complete_activity(
+            ci_id=ci_id,
+            activity_id=request.activity_id,
+            completion_data=request.completion_data
+        )
+    except StateMachineConflictError as e:
+        raise _conflict(e)
 
     if not result:
         raise HTTPException(
@@ -590,11 +772,14 @@ async def skip_activity(
     """
     service = ConfigurationItemService(db)
 
-    result = service.skip_activity(
-        ci_id=ci_id,
-        activity_id=request.activity_id,
-        reason=request.reason
-    )
+    try:
+        result = service.skip_activity(
+            ci_id=ci_id,
+            activity_id=request.activity_id,
+            reason=request.reason
+        )
+    except StateMachineConflictError as e:
+        raise _conflict(e)
 
     if not result:
         raise HTTPException(
@@ -680,11 +865,14 @@ async def complete_activity_with_interview(
     """
     service = ActivityInterviewService(db)
 
-    result = service.complete_activity_with_interview_data(
-        ci_id=ci_id,
-        activity_id=activity_id,
-        interview_results=request.interview_results
-    )
+    try:
+        result = service.complete_activity_with_interview_data(
+            ci_id=ci_id,
+            activity_id=activity_id,
+            interview_results=request.interview_results
+        )
+    except StateMachineConflictError as e:
+        raise _conflict(e)
 
     if not result:
         raise HTTPException(
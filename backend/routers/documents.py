@@ -4,14 +4,36 @@ DO-178C Traceability: REQ-API-007
 Purpose: Document generation and export endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import json
+import os
+import re
+from functools import partial
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
 
 from database.connection import get_db
+from models.document_export import DocumentBlob, DocumentExport, ExportFormat
+from services.document_blob_service import DocumentBlobService, get_blob_store
+from services.document_package_service import DocumentPackageService
 from services.document_service import DocumentService
 
 router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.MARKDOWN: "text/markdown; charset=utf-8",
+    ExportFormat.PDF: "application/pdf",
+    ExportFormat.HTML: "text/html; charset=utf-8",
+    ExportFormat.DOCX: "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ExportFormat.JSON: "application/json",
+}
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 @router.post("/projects/{project_id}/generate-srs")
 async def generate_srs(
@@ -65,3 +87,182 @@ async def generate_rtm(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/projects/{project_id}/documents/generate-all")
+def generate_all_documents(
+    project_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate the full certification package (SRS, RTM, gap analysis and
+    compliance reports), rendering documents in parallel.
+
+    Streams newline-delimited JSON events, one per finished document.
+
+    Traceability: REQ-AG-001, REQ-BE-029 - Certification package generation
+    """
+    service = DocumentPackageService(db)
+    try:
+        package = service.prepare(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    # The request session is closed once the response starts streaming
+    session_factory = sessionmaker(bind=db.get_bind())
+
+    def events():
+        with session_factory() as session:
+            for event in service.generate(package, session):
+                yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+
+@router.get("/documents/{export_id}/download")
+def download_document(
+    export_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Download a generated document file.
+
+    Clients accepting gzip get the stored blob as is (Content-Encoding:
+    gzip); others get it decompressed on the fly. Supports single byte
+    ranges (Range / If-Range) of either representation so large documents
+    can be fetched in parts and interrupted downloads resumed; the file is
+    streamed from disk, never loaded whole.
+
+    Traceability: REQ-DOC-002 - Document retrieval
+    """
+    export = db.get(DocumentExport, export_id)
+    if export is None:
+        raise HTTPException(status_code=404, detail=f"Document {export_id} not found")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{export.file_name or os.path.basename(export.file_path)}"',
+    }
+    blob = db.get(DocumentBlob, export.file_hash) if export.file_hash else None
+    if blob is not None:
+        store = get_blob_store()
+        if not os.path.isfile(store.path(blob.sha256)):
+            raise HTTPException(status_code=404, detail=f"File of document {export_id} is missing")
+        headers["Vary"] = "Accept-Encoding"
+        if _accepts_gzip(request):
+            headers["Content-Encoding"] = "gzip"
+            headers["ETag"] = f'"{blob.sha256}-gzip"'
+            open_file, file_size = partial(store.open, blob.sha256), blob.stored_size
+        else:
+            headers["ETag"] = f'"{blob.sha256}"'
+            open_file, file_size = partial(store.open_content, blob.sha256), blob.size
+    else:
+        # Exported before the blob store: a loose file
+        if not os.path.isfile(export.file_path):
+            raise HTTPException(status_code=404, detail=f"File of document {export_id} is missing")
+        if export.file_hash:
+            headers["ETag"] = f'"{export.file_hash}"'
+        open_file, file_size = partial(open, export.file_path, "rb"), os.path.getsize(export.file_path)
+
+    media_type = EXPORT_MEDIA_TYPES.get(export.export_format, "application/octet-stream")
+    start, end, status_code = 0, file_size - 1, 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # Multi-range requests are answered with the whole file
+    if range_header and "," not in range_header and (if_range is None or if_range == headers.get("ETag")):
+        byte_range = _parse_range(range_header, file_size)
+        if byte_range is None:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{file_size}"})
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _read_range(open_file, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+@router.delete("/documents/{export_id}", status_code=204)
+def delete_document(
+    export_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a generated document, releasing its stored file.
+
+    Traceability: REQ-DOC-001 - Document generation tracking
+    """
+    export = db.get(DocumentExport, export_id)
+    if export is None:
+        raise HTTPException(status_code=404, detail=f"Document {export_id} not found")
+    if export.file_hash:
+        DocumentBlobService(db).release(export.file_hash)
+    db.delete(export)
+    db.commit()
+    return Response(status_code=204)
+
+
+@router.post("/documents/blobs/collect-garbage")
+def collect_document_blobs(
+    grace_minutes: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Delete stored document files no longer referenced by any export.
+
+    Intended to run periodically (e.g. after the nightly exports).
+
+    Traceability: REQ-CERT-004 - Certification artifact management
+    """
+    return DocumentBlobService(db).collect_garbage(grace_minutes)
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Whether the client accepts a gzip Content-Encoding."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _parse_range(header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end).
+
+    Returns None for a malformed or unsatisfiable range.
+    """
+    match = _BYTE_RANGE.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), file_size - 1) if last else file_size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(file_size - int(last), 0)
+        end = file_size - 1
+    if start > end or start >= file_size:
+        return None
+    return start, end
+
+
+def _read_range(open_file: Callable[[], BinaryIO], start: int, end: int) -> Iterator[bytes]:
+    """Read bytes start..end (inclusive) of a file in chunks."""
+    with open_file() as f:
+        # Seeking a decompressed blob decompresses up to start
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,56 @@
+"""
+Metrics Router
+DO-178C Traceability: REQ-MONITOR-002
+Purpose: AI call observability endpoints
+
+Exposes per-call-site latency/token histograms and the rolling
+per-project AI usage table recorded by the AI metrics service, and the
+size of the interview session store.
+"""
+
+from typing import Optional
+from fastapi import APIRouter
+
+from services.ai_metrics_service import ai_metrics
+from services.interview_session_store import get_interview_session_store
+
+router = APIRouter()
+
+
+@router.get("/metrics/ai")
+async def get_ai_metrics():
+    """
+    Get AI call metrics grouped by call site.
+
+    Traceability: REQ-MONITOR-002 - AI call observability
+
+    Returns wall time, time-to-first-token and input/output token
+    histograms, stop reasons and error counts for each call site.
+    """
+    return ai_metrics.get_call_site_metrics()
+
+
+@router.get("/metrics/ai/usage")
+async def get_ai_usage(project_id: Optional[int] = None):
+    """
+    Get rolling-window AI usage per project.
+
+    Traceability: REQ-MONITOR-002 - AI call observability
+    """
+    return {
+        "window_seconds": ai_metrics.usage_window_seconds,
+        "projects": ai_metrics.get_project_usage(project_id)
+    }
+
+
+@router.get("/metrics/interview-sessions")
+async def get_interview_session_metrics():
+    """
+    Get interview session store metrics.
+
+    Traceability: REQ-MONITOR-002 - Session store observability
+
+    Returns the backend, live session count, serialized bytes held and
+    hit/miss/eviction counters.
+    """
+    return get_interview_session_store().stats()
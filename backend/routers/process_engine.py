@@ -14,9 +14,11 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+import json
 
 from database.connection import get_db
 from sqlalchemy.orm import Session
+from services.interview_session_store import InterviewSession, get_interview_session_store
 
 # Import process engine components
 import sys
@@ -24,11 +26,14 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from process_engine import (
-    InterviewScriptExecutor,
     InterviewState,
     list_available_scripts,
     create_interview,
     DataCaptureService,
+    AnswerWriteBuffer,
+    ValidationPipeline,
+    ValidationResult,
+    get_script_cache,
     ArtifactGeneratorService,
     generate_document,
     list_available_templates,
@@ -106,6 +111,20 @@ class StateMachineCreateRequest(BaseModel):
     dal_level: Optional[str] = None
 
 
+class BatchValidateItem(BaseModel):
+    """One value of a batch validation"""
+    value: Any = None
+    question_id: Optional[str] = None  # validate with this script question's rules
+    rules: Optional[List[Dict]] = None  # or with these rules
+
+
+class BatchValidateRequest(BaseModel):
+    """Request to validate many values in one call"""
+    items: List[BatchValidateItem]
+    rules: List[Dict] = []  # rules for items without their own
+    script_name: Optional[str] = None  # script resolving items' question_id
+
+
 class StateMachineResponse(BaseModel):
     """Response with state machine info"""
     instance_id: str
@@ -121,8 +140,16 @@ class StateMachineResponse(BaseModel):
 # INTERVIEW SCRIPT ENDPOINTS
 # =============================================================================
 
-# In-memory session storage (use Redis/DB in production)
-_interview_sessions: Dict[str, Dict] = {}
+def _load_interview(session_id: str, db: Session):
+    """Get a stored session and an executor for it (404 if expired or unknown)."""
+    session = get_interview_session_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    try:
+        executor = create_interview(session.script_name, db)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Interview script '{session.script_name}' not found")
+    return session, executor
 
 
 @router.get("/interviews/scripts", response_model=List[Dict])
@@ -155,6 +182,10 @@ async def start_interview(
         # Create executor
         executor = create_interview(script_name, db)
 
+        # Apply answers left pending by an interrupted interview
+        if project_id:
+            AnswerWriteBuffer(db, project_id).flush()
+
         # Create initial state
         state = executor.create_initial_state()
 
@@ -165,12 +196,13 @@ async def start_interview(
         import uuid
         session_id = str(uuid.uuid4())
 
-        # Store session
-        _interview_sessions[session_id] = {
-            "executor": executor,
-            "state": state,
-            "project_id": project_id
-        }
+        # Store session (state only; executors are rebuilt per request)
+        get_interview_session_store().put(InterviewSession(
+            session_id=session_id,
+            script_name=script_name,
+            project_id=project_id,
+            state=state
+        ))
 
         # Get progress
         progress = executor.get_progress(state)
@@ -212,20 +244,19 @@ async def submit_answer(
         Result with next question or completion status
     """
     # Get session
-    session = _interview_sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Interview session not found")
-
-    executor: InterviewScriptExecutor = session["executor"]
-    state: InterviewState = session["state"]
-    project_id = request.project_id or session.get("project_id")
+    session, executor = _load_interview(session_id, db)
+    state: InterviewState = session.state
+    project_id = request.project_id or session.project_id
+    answer_buffer = AnswerWriteBuffer(db, project_id, session_id) if project_id else None
+    previous_sub_phase = state.current_sub_phase
 
     # Process answer
     result = executor.process_answer(
         question_id=request.question_id,
         answer=request.answer,
         context=state.context,
-        project_id=project_id
+        project_id=project_id,
+        answer_buffer=answer_buffer
     )
 
     if not result.valid:
@@ -236,8 +267,13 @@ async def submit_answer(
         )
 
     # Update state
-    state = executor.update_state(state, request.question_id, result)
-    session["state"] = state
+    session.state = executor.update_state(state, request.question_id, result)
+    state = session.state
+    get_interview_session_store().put(session)
+
+    # Apply buffered project writes on sub-phase boundaries, completion or delay
+    if answer_buffer is not None:
+        executor.flush_answers(answer_buffer, previous_sub_phase, state, result)
 
     # Get next question if not complete
     next_question = None
@@ -265,18 +301,13 @@ async def submit_answer(
 
 
 @router.get("/interviews/{session_id}/progress")
-async def get_interview_progress(session_id: str):
+async def get_interview_progress(session_id: str, db: Session = Depends(get_db)):
     """
     Get progress information for an interview session.
     """
-    session = _interview_sessions.get(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Interview session not found")
-
-    executor = session["executor"]
-    state = session["state"]
+    session, executor = _load_interview(session_id, db)
 
-    return executor.get_progress(state)
+    return executor.get_progress(session.state)
 
 
 @router.get("/interviews/{session_id}/context")
@@ -284,20 +315,24 @@ async def get_interview_context(session_id: str):
     """
     Get current context (collected data) for an interview session.
     """
-    session = _interview_sessions.get(session_id)
-    if not session:
+    session = get_interview_session_store().get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Interview session not found")
 
-    return session["state"].context
+    return session.state.context
 
 
 @router.delete("/interviews/{session_id}")
-async def end_interview(session_id: str):
+async def end_interview(session_id: str, db: Session = Depends(get_db)):
     """
-    End an interview session.
+    End an interview session, applying its pending answers.
     """
-    if session_id in _interview_sessions:
-        del _interview_sessions[session_id]
+    store = get_interview_session_store()
+    session = store.get(session_id)
+    if session is not None and session.project_id:
+        AnswerWriteBuffer(db, session.project_id, session_id).flush()
+
+    if store.delete(session_id):
         return {"status": "session ended"}
 
     raise HTTPException(status_code=404, detail="Interview session not found")
@@ -464,3 +499,51 @@ async def validate_data(
         "valid": len(errors) == 0,
         "errors": [{"error": e.error, "field": e.field} for e in errors]
     }
+
+
+@router.post("/validate/batch")
+async def validate_data_batch(request: BatchValidateRequest):
+    """
+    Validate many values in one call (imported questionnaires, spreadsheets).
+
+    Each item is checked against its own rules, else its script question's
+    compiled rules (question_id with script_name), else the shared rules.
+    Each rule set is compiled once for the whole batch; items repeating the
+    same inline rules share one pipeline.
+    """
+    compiled_script = None
+    if request.script_name:
+        try:
+            compiled_script = get_script_cache().get(request.script_name)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"Interview script '{request.script_name}' not found")
+
+    shared = ValidationPipeline(request.rules)
+    inline: Dict[str, ValidationPipeline] = {}
+    results = []
+    for index, item in enumerate(request.items):
+        if item.rules is not None:
+            key = json.dumps(item.rules, sort_keys=True, default=str)
+            if key not in inline:
+                inline[key] = ValidationPipeline(item.rules)
+            errors = inline[key].validate(item.value)
+        elif item.question_id is not None:
+            if compiled_script is None or item.question_id not in compiled_script.pipelines:
+                errors = [ValidationResult(valid=False, error=f"Question '{item.question_id}' not found")]
+            else:
+                errors = compiled_script.pipelines[item.question_id].validate(item.value)
+        else:
+            errors = shared.validate(item.value)
+        results.append({
+            "index": index,
+            "valid": not errors,
+            "errors": [{"error": e.error, "field": e.field} for e in errors]
+        })
+
+    invalid = sum(1 for result in results if not result["valid"])
+    return {
+        "valid": invalid == 0,
+        "total": len(results),
+        "invalid": invalid,
+        "results": results
+    }
@@ -227,7 +227,8 @@ async def initialize_project(
         interview_result = await ai_service.project_initialization_interview(
             user_input=request.user_input,
             context=current_context,
-            conversation_history=conversation_text
+            conversation_history=conversation_text,
+            project_id=project.id
         )
 
         # STEP 6: Save AI response to database
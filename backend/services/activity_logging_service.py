@@ -20,6 +20,8 @@ from datetime import datetime
 import logging
 import json
 
+from services.display_id_allocator import DisplayIdAllocator
+
 logger = logging.getLogger(__name__)
 
 
@@ -364,7 +366,9 @@ class ActivityLoggingService:
         return []
 
     def _generate_log_id(self) -> str:
-        """Generate unique log ID."""
+        """Generate unique log ID (sequential when a database is available)."""
+        if self.db is not None:
+            return DisplayIdAllocator(self.db).next_display_id("LOG", width=8)
         import uuid
         return f"LOG-{uuid.uuid4().hex[:12].upper()}"
 
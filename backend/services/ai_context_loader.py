@@ -4,11 +4,39 @@ DO-178C Traceability: REQ-AI-046, REQ-AI-047, REQ-DOC-001
 
 Purpose: Load and manage AI instruction context from AI_INSTRUCTION.md
 Provides role-specific context snippets for AI prompts.
+
+The instruction file is parsed lazily on first use into an indexed
+section store with precomputed token counts. It is re-read only when its
+mtime/size changes (and re-parsed only when its content hash changes), so
+edits are picked up without a restart and worker startup does no file I/O.
+Role snippets are assembled from file sections within a token budget.
 """
 
-import os
-from typing import Dict, Optional
+from dataclasses import dataclass
 from pathlib import Path
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import re
+import time
+
+from config.settings import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+@dataclass(frozen=True)
+class InstructionSection:
+    """One "##" or "###" section of the instruction file."""
+    key: str
+    number: Optional[str]
+    title: str
+    level: int
+    content: str
+    token_count: int
 
 
 class AIContextLoader:
@@ -21,53 +49,134 @@ class AIContextLoader:
     - REQ-DOC-001: AI_INSTRUCTION.md creation and usage
     """
 
-    def __init__(self):
+    # Sections (by number) assembled into each role snippet, in priority order
+    ROLE_SECTIONS: Dict[str, List[str]] = {
+        "summary": ["1.1", "4.2", "4.3", "4.4", "4.5", "6.4"],
+        "requirements": ["4.1", "4.4", "6.4", "2.3"],
+        "project": ["2.2", "5.1", "4.2"],
+        "ci": ["2.4"],
+    }
+
+    # Default token budget per role
+    ROLE_BUDGETS: Dict[str, int] = {
+        "summary": 500,
+        "requirements": 900,
+        "project": 800,
+        "ci": 1200,
+    }
+
+    ROLE_HEADERS: Dict[str, str] = {
+        "summary": "DATABASE KNOWLEDGE (from AI_INSTRUCTION.md):",
+        "requirements": "REQUIREMENTS EXTRACTION RULES (from AI_INSTRUCTION.md):",
+        "project": "PROJECT INITIALIZATION RULES (from AI_INSTRUCTION.md):",
+        "ci": "CONFIGURATION ITEM RULES (from AI_INSTRUCTION.md):",
+    }
+
+    # Minimum seconds between stat() calls on the instruction file
+    CHECK_INTERVAL_SECONDS = 2.0
+
+    _HEADING = re.compile(r"^(#{2,3}) +(?:(\d+(?:\.\d+)*)\.? +)?(.+?)\s*$")
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+        self._lock = RLock()
         self._full_content: Optional[str] = None
-        self._sections: Dict[str, str] = {}
-        self._load_instruction_file()
-
-    def _load_instruction_file(self):
-        """Load AI_INSTRUCTION.md from project root."""
-        # Try multiple possible paths
-        possible_paths = [
-            Path(__file__).parent.parent.parent / "AI_INSTRUCTION.md",  # backend/../AI_INSTRUCTION.md
-            Path("/home/joiedelor/aiset/AI_INSTRUCTION.md"),
-            Path("AI_INSTRUCTION.md"),
-        ]
-
-        for path in possible_paths:
+        self._content_hash: Optional[str] = None
+        self._file_signature: Optional[Tuple[int, int]] = None
+        self._sections: Dict[str, InstructionSection] = {}
+        self._aliases: Dict[str, str] = {}
+        self._snippets: Dict[Tuple[str, int], str] = {}
+        self._last_check = 0.0
+
+    def _resolve_path(self) -> Optional[Path]:
+        """Locate AI_INSTRUCTION.md (configured path, repository root, cwd)."""
+        if self._path is not None:
+            return self._path
+        candidates = []
+        if settings.ai_instruction_path:
+            candidates.append(Path(settings.ai_instruction_path))
+        candidates.append(Path(__file__).parent.parent.parent / "AI_INSTRUCTION.md")
+        candidates.append(Path("AI_INSTRUCTION.md"))
+        for path in candidates:
             if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    self._full_content = f.read()
-                self._parse_sections()
+                self._path = path
+                return path
+        return None
+
+    def _ensure_loaded(self) -> None:
+        """Load on first use; reload when the file changes on disk."""
+        now = time.monotonic()
+        if self._full_content is not None and now - self._last_check < self.CHECK_INTERVAL_SECONDS:
+            return
+
+        with self._lock:
+            self._last_check = now
+            path = self._resolve_path()
+            if path is None:
+                if self._full_content is None:
+                    self._index(self._get_embedded_summary())
                 return
 
-        # If not found, use embedded summary
-        self._full_content = self._get_embedded_summary()
-        self._sections = {"summary": self._full_content}
+            try:
+                stat = path.stat()
+            except OSError:
+                if self._full_content is None:
+                    self._index(self._get_embedded_summary())
+                return
 
-    def _parse_sections(self):
-        """Parse the document into sections for selective loading."""
-        if not self._full_content:
-            return
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._file_signature:
+                return
 
-        current_section = "header"
-        current_content = []
-
-        for line in self._full_content.split("\n"):
-            if line.startswith("## ") and not line.startswith("## Document"):
-                # Save previous section
-                if current_content:
-                    self._sections[current_section] = "\n".join(current_content)
-                # Start new section
-                current_section = line.replace("## ", "").strip().lower().replace(" ", "_")
-                current_content = [line]
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            self._file_signature = signature
+            if hashlib.sha256(content.encode("utf-8")).hexdigest() != self._content_hash:
+                self._index(content)
+
+    def _index(self, content: str) -> None:
+        """Parse the document into an indexed section store (lock held)."""
+        sections: Dict[str, InstructionSection] = {}
+        aliases: Dict[str, str] = {}
+        heading: Optional[Tuple[int, Optional[str], str]] = None
+        lines: List[str] = []
+
+        def flush() -> None:
+            if heading is None:
+                return
+            level, number, title = heading
+            key = number or self._slug(title)
+            text = "\n".join(lines).strip()
+            sections[key] = InstructionSection(
+                key=key,
+                number=number,
+                title=title,
+                level=level,
+                content=text,
+                token_count=estimate_tokens(text),
+            )
+            aliases.setdefault(self._slug(title), key)
+            aliases.setdefault(self._slug(f"{number}. {title}" if number else title), key)
+
+        for line in content.split("\n"):
+            match = self._HEADING.match(line)
+            if match:
+                flush()
+                heading = (len(match.group(1)), match.group(2), match.group(3))
+                lines = [line]
             else:
-                current_content.append(line)
+                lines.append(line)
+        flush()
+
+        self._full_content = content
+        self._content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        self._sections = sections
+        self._aliases = aliases
+        self._snippets = {}
 
-        # Save last section
-        if current_content:
-            self._sections[current_section] = "\n".join(current_content)
+    @staticmethod
+    def _slug(title: str) -> str:
+        return title.strip().lower().replace(" ", "_")
 
     def _get_embedded_summary(self) -> str:
         """Fallback summary if file not found."""
@@ -99,137 +208,103 @@ class AIContextLoader:
 - project.certification_level: DAL-A, DAL-B, DAL-C, DAL-D, SIL-1, SIL-2, SIL-3, SIL-4, None
 """
 
+    def build_context(self, section_keys: List[str], max_tokens: int, header: str = "") -> str:
+        """
+        Assemble a context snippet from sections within a token budget.
+
+        Sections are added in the given order; a section that would exceed
+        the remaining budget is skipped so that smaller ones can still fit.
+
+        Args:
+            section_keys: Section numbers, titles or keys in priority order
+            max_tokens: Token budget for the assembled snippet
+            header: Optional first line of the snippet
+
+        Returns:
+            Assembled context text
+        """
+        self._ensure_loaded()
+        parts = [header] if header else []
+        used = estimate_tokens(header)
+        for key in section_keys:
+            section = self._lookup(key)
+            if section is None or used + section.token_count > max_tokens:
+                continue
+            parts.append(section.content)
+            used += section.token_count
+        return "\n\n".join(parts)
+
+    def get_role_context(self, role: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Get the context snippet for a role ("summary", "requirements", "project", "ci").
+
+        Snippets are cached until the instruction file changes.
+        """
+        self._ensure_loaded()
+        budget = max_tokens if max_tokens is not None else self.ROLE_BUDGETS[role]
+        cache_key = (role, budget)
+        snippet = self._snippets.get(cache_key)
+        if snippet is None:
+            header = self.ROLE_HEADERS[role]
+            snippet = self.build_context(self.ROLE_SECTIONS[role], budget, header)
+            if snippet == header:
+                # Instruction file without the expected sections
+                snippet = f"{header}\n{self._get_embedded_summary()}"
+            self._snippets[cache_key] = snippet
+        return snippet
+
     def get_summary_context(self) -> str:
         """
         Get a condensed summary suitable for every AI call.
         ~500 tokens max.
         """
-        return """
-DATABASE KNOWLEDGE (from AI_INSTRUCTION.md):
-
-CORE TABLES:
-- projects: name, project_code, safety_critical (bool), certification_level (DAL-A/B/C/D, SIL-1/2/3/4)
-- requirements: title, description, type, priority, status, verification_method
-- configuration_items: ci_name, ci_type, part_number, 34+ metadata fields
-- ai_conversations: project_guid, title, purpose, status
-- ai_messages: conversation_guid, role (user/assistant), content
-
-VALID VALUES:
-- requirement.type: functional, performance, safety, security, interface, operational
-- requirement.priority: critical, high, medium, low
-- requirement.status: draft, proposed, approved, rejected, verified
-- verification_method: test, analysis, inspection, demonstration
-
-AI RULES (MUST FOLLOW):
-1. Ask ONE question at a time
-2. Use SIMPLE language
-3. PROPOSE options, never DECIDE
-4. Ask for CLARIFICATION when ambiguous
-"""
+        return self.get_role_context("summary")
 
     def get_requirements_context(self) -> str:
         """Get context for requirements elicitation."""
-        return """
-REQUIREMENTS EXTRACTION RULES (from AI_INSTRUCTION.md):
-
-When extracting requirements, ALWAYS include:
-- title: One-line summary
-- description: Detailed statement using "shall" language
-- type: functional/performance/safety/security/interface/operational
-- priority: critical/high/medium/low
-- confidence_score: Your confidence (0.0 to 1.0)
-
-OPTIONAL but recommended:
-- rationale: Why this requirement exists
-- acceptance_criteria: How to verify
-- verification_method: test/analysis/inspection/demonstration
-
-EXAMPLE requirement format:
-{
-    "title": "Autopilot Engagement Time",
-    "description": "The system shall engage the autopilot within 2 seconds of pilot command",
-    "type": "functional",
-    "priority": "critical",
-    "status": "proposed",
-    "rationale": "Timely engagement is critical for flight safety",
-    "verification_method": "test",
-    "confidence_score": 0.95
-}
-
-NEVER:
-- Make design decisions for the user
-- Auto-approve requirements
-- Create requirements without user input
-"""
+        return self.get_role_context("requirements")
 
     def get_project_context(self) -> str:
         """Get context for project initialization."""
-        return """
-PROJECT INITIALIZATION RULES (from AI_INSTRUCTION.md):
-
-PROJECT FIELDS TO COLLECT:
-- name: Project name
-- project_code: Unique identifier (e.g., "FCS-2025")
-- description: What the project does
-- industry_sector: aerospace, automotive, medical, industrial, other
-- safety_critical: true/false
-- certification_level: DAL-A/B/C/D, SIL-1/2/3/4, or None
-- lifecycle_phase: concept, requirements, design, implementation, verification, certification
-
-VALID CERTIFICATION LEVELS:
-- Aerospace (DO-178C): DAL-A (highest), DAL-B, DAL-C, DAL-D (lowest)
-- Automotive (ISO 26262): ASIL-D (highest), ASIL-C, ASIL-B, ASIL-A (lowest)
-- Industrial (IEC 61508): SIL-4 (highest), SIL-3, SIL-2, SIL-1 (lowest)
-- Medical (IEC 62304): Class C (highest), Class B, Class A (lowest)
-- Not safety-critical: None
-
-VALID LIFECYCLE PHASES:
-concept, requirements, architecture, design, implementation, verification, certification, production, maintenance
-
-INTERVIEW APPROACH:
-1. Ask about what they're building
-2. Determine if safety-critical
-3. Identify industry/domain
-4. Determine applicable standards
-5. Ask about current lifecycle phase
-"""
+        return self.get_role_context("project")
 
     def get_ci_context(self) -> str:
         """Get context for Configuration Item management."""
-        return """
-CONFIGURATION ITEM RULES (from AI_INSTRUCTION.md):
-
-CI FIELDS (34+ total, key ones):
-- ci_identifier: Unique ID within project
-- ci_name: Human-readable name
-- ci_type: system, subsystem, assembly, component, part, software, hardware, document
-- part_number: Manufacturing part number
-- parent_guid: Reference to parent CI (for hierarchy)
-- safety_classification: Safety-Critical, Safety-Related, Non-Safety
-- certification_status: Certification state
-
-VALID CI TYPES:
-system, subsystem, assembly, component, part, software, hardware, document
-
-BOM/PBS STRUCTURE:
-- System (top level)
-  - Subsystem
-    - Assembly
-      - Component
-        - Part
-
-MAKE/BUY DECISION:
-make, buy, both, TBD
-"""
+        return self.get_role_context("ci")
 
     def get_full_content(self) -> str:
         """Get the complete AI_INSTRUCTION.md content."""
+        self._ensure_loaded()
         return self._full_content or self._get_embedded_summary()
 
+    def _lookup(self, section_name: str) -> Optional[InstructionSection]:
+        key = section_name.strip()
+        section = self._sections.get(key)
+        if section is None:
+            alias = self._aliases.get(self._slug(key))
+            section = self._sections.get(alias) if alias else None
+        return section
+
     def get_section(self, section_name: str) -> Optional[str]:
-        """Get a specific section by name."""
-        return self._sections.get(section_name.lower().replace(" ", "_"))
+        """Get a specific section by number (e.g., "4.2") or title."""
+        self._ensure_loaded()
+        section = self._lookup(section_name)
+        return section.content if section else None
+
+    def list_sections(self) -> List[Dict[str, object]]:
+        """List indexed sections with their token counts."""
+        self._ensure_loaded()
+        return [
+            {
+                "key": s.key,
+                "number": s.number,
+                "title": s.title,
+                "level": s.level,
+                "token_count": s.token_count,
+            }
+            for s in self._sections.values()
+        ]
 
 
-# Global singleton instance
+# Global singleton instance (no file I/O until first use)
 ai_context_loader = AIContextLoader()
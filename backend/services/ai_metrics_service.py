@@ -0,0 +1,305 @@
+"""
+AI Metrics Service
+DO-178C Traceability: REQ-MONITOR-002
+Purpose: Per-call-site latency, token and cost instrumentation for AI calls
+
+Every call made through AIService is recorded here with its call site
+(elicitation, extraction, proposal extraction, initialization interview, ...):
+- Wall time and time-to-first-token
+- Input/output tokens
+- Stop reason and error type
+- Rolling per-project usage (tokens, calls, estimated cost)
+
+The recorder is in-process and thread-safe; it is exposed through the
+/metrics/ai endpoints and is used to tune max_tokens and prompt sizes.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from collections import Counter, deque
+from dataclasses import dataclass
+from threading import Lock
+import bisect
+import math
+import time
+
+from config.settings import settings
+
+
+# Histogram bucket upper bounds (the last bucket is +Inf)
+LATENCY_BUCKETS_MS: Sequence[float] = (
+    50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 180000
+)
+TOKEN_BUCKETS: Sequence[float] = (
+    16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384
+)
+
+# Number of recent samples kept per histogram for percentile estimation
+RESERVOIR_SIZE = 1024
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with a bounded window of recent samples.
+
+    Bucket counts are cumulative over the process lifetime; percentiles
+    are computed over the most recent RESERVOIR_SIZE observations.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._recent: deque = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._recent.append(value)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Nearest-rank percentile over recent samples (p in 0-100)."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        rank = max(0, min(len(ordered) - 1, math.ceil(p / 100.0 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize histogram for API responses."""
+        labels = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": [
+                {"le": label, "count": count}
+                for label, count in zip(labels, self.counts)
+            ],
+        }
+
+
+class CallSiteMetrics:
+    """Aggregated metrics for one AI call site."""
+
+    def __init__(self, call_site: str):
+        self.call_site = call_site
+        self.calls = 0
+        self.errors = 0
+        self.error_types: Counter = Counter()
+        self.stop_reasons: Counter = Counter()
+        self.models: Counter = Counter()
+        self.wall_time_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.ttft_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.input_tokens = Histogram(TOKEN_BUCKETS)
+        self.output_tokens = Histogram(TOKEN_BUCKETS)
+        self.last_call_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "call_site": self.call_site,
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 4) if self.calls else 0.0,
+            "error_types": dict(self.error_types),
+            "stop_reasons": dict(self.stop_reasons),
+            "models": dict(self.models),
+            "last_call_at": self.last_call_at,
+            "wall_time_ms": self.wall_time_ms.to_dict(),
+            "ttft_ms": self.ttft_ms.to_dict(),
+            "input_tokens": self.input_tokens.to_dict(),
+            "output_tokens": self.output_tokens.to_dict(),
+        }
+
+
+@dataclass
+class UsageRecord:
+    """A single AI call attributed to a project."""
+    timestamp: float
+    call_site: str
+    input_tokens: int
+    output_tokens: int
+    wall_time_ms: float
+    error: bool
+
+
+class AIMetricsRecorder:
+    """
+    Thread-safe recorder for AI call metrics.
+
+    Traceability:
+    - REQ-MONITOR-002: AI call observability
+    - REQ-AI-007: Unified AI interface (instrumented at AIService level)
+    """
+
+    def __init__(self, usage_window_seconds: Optional[float] = None):
+        self.usage_window_seconds = (
+            usage_window_seconds
+            if usage_window_seconds is not None
+            else settings.ai_usage_window_hours * 3600
+        )
+        self._lock = Lock()
+        self._call_sites: Dict[str, CallSiteMetrics] = {}
+        self._usage: Dict[int, deque] = {}
+        self._started_at = time.time()
+
+    def record(
+        self,
+        call_site: str,
+        wall_time_ms: float,
+        ttft_ms: Optional[float] = None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        stop_reason: Optional[str] = None,
+        model: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        project_id: Optional[int] = None,
+    ) -> None:
+        """
+        Record one AI call.
+
+        Args:
+            call_site: Logical caller (e.g., "requirements_elicitation")
+            wall_time_ms: Total time spent in the provider call
+            ttft_ms: Time to first token (equals wall time for non-streaming calls)
+            input_tokens: Prompt tokens reported by the provider
+            output_tokens: Completion tokens reported by the provider
+            stop_reason: Provider stop/finish reason
+            model: Model name used for the call
+            error: Exception raised by the provider, if any
+            project_id: Project the call is attributed to, if known
+        """
+        now = time.time()
+        with self._lock:
+            metrics = self._call_sites.get(call_site)
+            if metrics is None:
+                metrics = self._call_sites[call_site] = CallSiteMetrics(call_site)
+
+            metrics.calls += 1
+            metrics.last_call_at = now
+            metrics.wall_time_ms.observe(wall_time_ms)
+            if model:
+                metrics.models[model] += 1
+
+            if error is not None:
+                metrics.errors += 1
+                metrics.error_types[type(error).__name__] += 1
+            else:
+                metrics.ttft_ms.observe(ttft_ms if ttft_ms is not None else wall_time_ms)
+                metrics.input_tokens.observe(input_tokens)
+                metrics.output_tokens.observe(output_tokens)
+                metrics.stop_reasons[stop_reason or "unknown"] += 1
+
+            if project_id is not None:
+                usage = self._usage.setdefault(project_id, deque())
+                usage.append(UsageRecord(
+                    timestamp=now,
+                    call_site=call_site,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    wall_time_ms=wall_time_ms,
+                    error=error is not None,
+                ))
+                self._expire(usage, now)
+
+    def _expire(self, usage: deque, now: float) -> None:
+        """Drop usage records older than the rolling window (lock held)."""
+        cutoff = now - self.usage_window_seconds
+        while usage and usage[0].timestamp < cutoff:
+            usage.popleft()
+
+    @staticmethod
+    def estimate_cost(input_tokens: int, output_tokens: int) -> float:
+        """Estimate cost from configured per-million-token prices."""
+        return round(
+            input_tokens / 1_000_000 * settings.ai_cost_per_million_input_tokens
+            + output_tokens / 1_000_000 * settings.ai_cost_per_million_output_tokens,
+            6,
+        )
+
+    def get_call_site_metrics(self) -> Dict[str, Any]:
+        """Get histograms and counters for every call site."""
+        with self._lock:
+            return {
+                "started_at": self._started_at,
+                "call_sites": {
+                    name: metrics.to_dict()
+                    for name, metrics in sorted(self._call_sites.items())
+                },
+            }
+
+    def _summarize(self, project_id: int, usage: deque) -> Dict[str, Any]:
+        by_call_site: Dict[str, Dict[str, int]] = {}
+        input_tokens = output_tokens = errors = 0
+        wall_time_ms = 0.0
+        for record in usage:
+            input_tokens += record.input_tokens
+            output_tokens += record.output_tokens
+            wall_time_ms += record.wall_time_ms
+            errors += record.error
+            site = by_call_site.setdefault(
+                record.call_site,
+                {"calls": 0, "input_tokens": 0, "output_tokens": 0},
+            )
+            site["calls"] += 1
+            site["input_tokens"] += record.input_tokens
+            site["output_tokens"] += record.output_tokens
+
+        return {
+            "project_id": project_id,
+            "calls": len(usage),
+            "errors": errors,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "wall_time_ms": round(wall_time_ms, 3),
+            "estimated_cost": self.estimate_cost(input_tokens, output_tokens),
+            "by_call_site": by_call_site,
+        }
+
+    def get_project_usage(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get rolling-window usage per project.
+
+        Args:
+            project_id: Restrict to a single project (optional)
+
+        Returns:
+            List of usage rows, highest token consumers first
+        """
+        now = time.time()
+        with self._lock:
+            rows = []
+            for pid, usage in list(self._usage.items()):
+                if project_id is not None and pid != project_id:
+                    continue
+                self._expire(usage, now)
+                if not usage:
+                    del self._usage[pid]
+                    continue
+                rows.append(self._summarize(pid, usage))
+
+        rows.sort(key=lambda row: row["total_tokens"], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._call_sites.clear()
+            self._usage.clear()
+            self._started_at = time.time()
+
+
+# Global recorder instance
+ai_metrics = AIMetricsRecorder()
@@ -10,11 +10,17 @@ supporting both cloud-based (Claude) and local (LM Studio) models.
 from typing import List, Dict, Any, Optional
 from abc import ABC, abstractmethod
 import anthropic
+import asyncio
+import hashlib
 import httpx
+import json
 import logging
+import random
+import time
 
 from config.settings import settings
 from services.ai_context_loader import ai_context_loader
+from services.ai_metrics_service import ai_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +94,8 @@ class ClaudeProvider(AIProvider):
                 "content": response.content[0].text,
                 "model": self.model,
                 "tokens_used": response.usage.input_tokens + response.usage.output_tokens,
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
                 "stop_reason": response.stop_reason
             }
 
@@ -161,11 +169,14 @@ class LMStudioProvider(AIProvider):
                 )
                 response.raise_for_status()
                 data = response.json()
+                usage = data.get("usage", {})
 
                 return {
                     "content": data["choices"][0]["message"]["content"],
                     "model": self.model,
-                    "tokens_used": data.get("usage", {}).get("total_tokens", 0),
+                    "tokens_used": usage.get("total_tokens", 0),
+                    "input_tokens": usage.get("prompt_tokens", 0),
+                    "output_tokens": usage.get("completion_tokens", 0),
                     "stop_reason": data["choices"][0].get("finish_reason", "stop")
                 }
 
@@ -177,6 +188,171 @@ class LMStudioProvider(AIProvider):
         return self.model
 
 
+class FakeProviderError(RuntimeError):
+    """Error injected by FakeProvider to exercise failure paths."""
+
+
+class FakeProvider(AIProvider):
+    """
+    Deterministic local AI provider for testing and load generation.
+
+    Response content is derived from a hash of the request and the seed,
+    so identical prompts always yield identical output. Latency follows a
+    log-normal time-to-first-token plus a per-output-token cost, drawn
+    from a seeded generator.
+
+    An optional JSON script (FAKE_AI_SCRIPT_PATH) supplies canned output:
+        {"responses": [{"match": "extract requirements", "content": "[...]"}],
+         "default": "What should the system do?"}
+    "match" is a case-insensitive substring of the system prompt or the
+    last user message; "contents" (a list) may be given instead of
+    "content" to pick among several responses.
+
+    Traceability:
+    - REQ-AI-004: AI provider abstraction
+    - REQ-TEST-001: Test infrastructure
+    """
+
+    QUESTIONS = [
+        "What should happen when the system starts up?",
+        "Who will be the main users of this system?",
+        "What should the system do if a sensor stops responding?",
+        "How quickly does the system need to respond to an input?",
+        "What information should be shown to the operator?",
+        "Which conditions should raise an alert?",
+    ]
+
+    REQUIREMENT_TYPES = ["functional", "performance", "safety", "interface"]
+    PRIORITIES = ["critical", "high", "medium", "low"]
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        script_path: Optional[str] = None,
+        ttft_ms: Optional[float] = None,
+        latency_sigma: Optional[float] = None,
+        ms_per_token: Optional[float] = None,
+        error_rate: Optional[float] = None
+    ):
+        self.model = "fake-model"
+        self.seed = settings.fake_ai_seed if seed is None else seed
+        self.ttft_ms = settings.fake_ai_ttft_ms if ttft_ms is None else ttft_ms
+        self.latency_sigma = settings.fake_ai_latency_sigma if latency_sigma is None else latency_sigma
+        self.ms_per_token = settings.fake_ai_ms_per_token if ms_per_token is None else ms_per_token
+        self.error_rate = settings.fake_ai_error_rate if error_rate is None else error_rate
+        self._rng = random.Random(self.seed)
+        self._script = self._load_script(script_path if script_path is not None else settings.fake_ai_script_path)
+
+    @staticmethod
+    def _load_script(script_path: str) -> Dict[str, Any]:
+        """Load scripted responses, if configured."""
+        if not script_path:
+            return {}
+        with open(script_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        """Approximate token count (about four characters per token)."""
+        return max(1, len(text) // 4)
+
+    def _scripted_content(self, haystack: str, rng: random.Random) -> Optional[str]:
+        for rule in self._script.get("responses", []):
+            if rule.get("match", "").lower() in haystack:
+                if "contents" in rule:
+                    return rng.choice(rule["contents"])
+                return rule.get("content", "")
+        return self._script.get("default")
+
+    def _generated_content(self, haystack: str, rng: random.Random) -> str:
+        """Produce plausible output shaped like the real call site expects."""
+        if "component_id" in haystack:
+            return json.dumps([{
+                "component_id": f"COMP-{rng.randint(1, 99):03d}",
+                "confidence_score": round(rng.uniform(0.5, 1.0), 2),
+                "rationale": "Component implements the requirement behaviour"
+            }])
+        if "change_type" in haystack:
+            return json.dumps([{
+                "change_type": "addition",
+                "entity_type": "requirement",
+                "section": "3.1 Functional Requirements",
+                "proposed_content": f"REQ-SYS-{rng.randint(1, 999):03d}: The system shall log all faults.",
+                "rationale": "User described fault handling needs"
+            }])
+        if "extract" in haystack and "requirement" in haystack:
+            return json.dumps([
+                {
+                    "title": f"System shall perform function {i + 1}",
+                    "description": f"The system shall perform function {i + 1} within 100 ms.",
+                    "type": rng.choice(self.REQUIREMENT_TYPES),
+                    "priority": rng.choice(self.PRIORITIES),
+                    "acceptance_criteria": "Verified by test",
+                    "confidence_score": round(rng.uniform(0.6, 1.0), 2)
+                }
+                for i in range(rng.randint(1, 3))
+            ])
+        return f"Thanks, noted. {rng.choice(self.QUESTIONS)}"
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096
+    ) -> Dict[str, Any]:
+        """
+        Return a deterministic fake response after a simulated delay.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: Optional system prompt
+            temperature: Ignored
+            max_tokens: Output is truncated to roughly this many tokens
+
+        Returns:
+            Dict containing response text and metadata
+        """
+        prompt_text = (system_prompt or "") + "".join(m["content"] for m in messages)
+        digest = hashlib.sha256(f"{self.seed}:{prompt_text}".encode("utf-8")).hexdigest()
+        content_rng = random.Random(digest)
+
+        last_user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        haystack = f"{system_prompt or ''}\n{last_user}".lower()
+
+        content = self._scripted_content(haystack, content_rng)
+        if content is None:
+            content = self._generated_content(haystack, content_rng)
+
+        output_tokens = self._count_tokens(content)
+        stop_reason = "end_turn"
+        if output_tokens > max_tokens:
+            content = content[:max_tokens * 4]
+            output_tokens = max_tokens
+            stop_reason = "max_tokens"
+
+        ttft_ms = self.ttft_ms * self._rng.lognormvariate(0.0, self.latency_sigma)
+        fail = self._rng.random() < self.error_rate
+        await asyncio.sleep((ttft_ms + output_tokens * self.ms_per_token) / 1000)
+
+        if fail:
+            raise FakeProviderError("Injected fake provider error")
+
+        input_tokens = self._count_tokens(prompt_text)
+        return {
+            "content": content,
+            "model": self.model,
+            "tokens_used": input_tokens + output_tokens,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "stop_reason": stop_reason,
+            "ttft_ms": ttft_ms
+        }
+
+    def get_model_name(self) -> str:
+        return self.model
+
+
 class AIService:
     """
     Unified AI service with provider switching.
@@ -197,13 +373,102 @@ class AIService:
         elif settings.ai_service == "lmstudio":
             logger.info("Initializing LM Studio AI provider")
             return LMStudioProvider()
+        elif settings.ai_service == "fake":
+            logger.info("Initializing fake AI provider (seed=%s)", settings.fake_ai_seed)
+            return FakeProvider()
         else:
             raise ValueError(f"Unknown AI service: {settings.ai_service}")
 
+    async def _chat(
+        self,
+        call_site: str,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        project_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Call the provider and record latency, token and error metrics.
+
+        Traceability: REQ-MONITOR-002 - AI call observability
+
+        Args:
+            call_site: Logical caller used to group metrics
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in response
+            project_id: Project the call is attributed to (optional)
+
+        Returns:
+            Provider response dict
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.provider.chat(
+                messages=messages,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        except Exception as e:
+            ai_metrics.record(
+                call_site=call_site,
+                wall_time_ms=(time.perf_counter() - started) * 1000,
+                model=self.provider.get_model_name(),
+                error=e,
+                project_id=project_id
+            )
+            raise
+
+        wall_time_ms = (time.perf_counter() - started) * 1000
+        input_tokens = response.get("input_tokens")
+        output_tokens = response.get("output_tokens")
+        if input_tokens is None and output_tokens is None:
+            # Provider only reported a total; attribute it to output
+            input_tokens, output_tokens = 0, response.get("tokens_used", 0)
+
+        ai_metrics.record(
+            call_site=call_site,
+            wall_time_ms=wall_time_ms,
+            ttft_ms=response.get("ttft_ms"),
+            input_tokens=input_tokens or 0,
+            output_tokens=output_tokens or 0,
+            stop_reason=response.get("stop_reason"),
+            model=response.get("model"),
+            project_id=project_id
+        )
+        return response
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        call_site: str = "chat",
+        project_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Instrumented generic chat call for services outside AIService.
+
+        Traceability: REQ-AI-007 - Unified AI interface
+        """
+        return await self._chat(
+            call_site,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            project_id=project_id
+        )
+
     async def requirements_elicitation(
         self,
         user_input: str,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        project_id: Optional[int] = None
     ) -> str:
         """
         Elicit requirements from user input.
@@ -217,6 +482,7 @@ class AIService:
         Args:
             user_input: User's description or response
             context: Optional conversation context
+            project_id: Project for usage accounting (optional)
 
         Returns:
             AI response with follow-up questions or extracted requirements
@@ -271,10 +537,12 @@ Example BAD (don't do this):
         if context:
             messages.insert(0, {"role": "assistant", "content": context})
 
-        response = await self.provider.chat(
+        response = await self._chat(
+            "requirements_elicitation",
             messages=messages,
             system_prompt=system_prompt,
-            temperature=0.7
+            temperature=0.7,
+            project_id=project_id
         )
 
         return response["content"]
@@ -327,7 +595,8 @@ Example BAD (don't do this):
 
     async def extract_requirements(
         self,
-        conversation_text: str
+        conversation_text: str,
+        project_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Extract structured requirements from conversation.
@@ -336,6 +605,7 @@ Example BAD (don't do this):
 
         Args:
             conversation_text: Full conversation text
+            project_id: Project for usage accounting (optional)
 
         Returns:
             List of extracted requirements with metadata
@@ -364,11 +634,13 @@ Return ONLY a JSON array of requirements. Example format:
 
         messages = [{"role": "user", "content": f"Extract requirements from:\n\n{conversation_text}"}]
 
-        response = await self.provider.chat(
+        response = await self._chat(
+            "requirements_extraction",
             messages=messages,
             system_prompt=system_prompt,
             temperature=0.3,  # Lower temperature for more consistent extraction
-            max_tokens=4096
+            max_tokens=4096,
+            project_id=project_id
         )
 
         # Parse JSON response
@@ -421,7 +693,8 @@ Return ONLY a JSON array. Example:
             "content": f"Requirement: {requirement_text}\n\nDesign Components:\n{components_text}"
         }]
 
-        response = await self.provider.chat(
+        response = await self._chat(
+            "traceability_suggestion",
             messages=messages,
             system_prompt=system_prompt,
             temperature=0.3
@@ -439,7 +712,8 @@ Return ONLY a JSON array. Example:
         self,
         user_input: str,
         context: Optional[Dict[str, Any]] = None,
-        conversation_history: Optional[str] = None
+        conversation_history: Optional[str] = None,
+        project_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Conduct structured project initialization interview.
@@ -454,6 +728,7 @@ Return ONLY a JSON array. Example:
             user_input: User's response to current question
             context: Current interview context including stage and collected data
             conversation_history: Full conversation history for AI memory
+            project_id: Project for usage accounting (optional)
 
         Returns:
             Dict containing:
@@ -461,6 +736,7 @@ Return ONLY a JSON array. Example:
             - stage: Current interview stage
             - extracted_data: Data extracted from user response
             - complete: Whether interview is finished
+            - tokens_used: Tokens consumed by this turn
         """
         if context is None:
             context = {
@@ -660,11 +936,13 @@ The interview is complete. Thank the user."""
         # Prepare messages for AI
         messages = [{"role": "user", "content": user_input}]
 
-        response = await self.provider.chat(
+        response = await self._chat(
+            "initialization_interview",
             messages=messages,
             system_prompt=system_prompt,
             temperature=0.7,
-            max_tokens=512  # Limit response length for faster generation
+            max_tokens=512,  # Limit response length for faster generation
+            project_id=project_id
         )
 
         # Initialize next_stage with current stage (default: stay in same stage)
@@ -714,6 +992,7 @@ The interview is complete. Thank the user."""
             "stage": next_stage,
             "complete": next_stage == "complete",
             "model": self.model if hasattr(self, 'model') else self.provider.get_model_name(),
+            "tokens_used": response.get("tokens_used", 0),
             "answered": answered_questions  # Return updated list
         }
 
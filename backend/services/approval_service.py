@@ -23,6 +23,7 @@ from models.ai_conversation import AIConversation, AIMessage
 from models.requirement import Requirement
 from models.audit import ValidationDecision
 from services.ai_service import ai_service
+from services.display_id_allocator import DisplayIdAllocator
 
 logger = logging.getLogger(__name__)
 
@@ -139,10 +140,16 @@ Example output:
 """
 
         try:
+            conversation = db.query(AIConversation).filter(
+                AIConversation.id == conversation_id
+            ).first()
+
             extraction_result = await ai_service.chat(
                 messages=[{"role": "user", "content": extraction_prompt}],
                 temperature=0.3,  # Lower temperature for structured extraction
-                max_tokens=2000
+                max_tokens=2000,
+                call_site="proposal_extraction",
+                project_id=conversation.project_id if conversation else None
             )
 
             # Parse JSON from response
@@ -343,7 +350,10 @@ Example output:
             # Extract requirement ID from content if present
             import re
             req_id_match = re.search(r'(REQ-[A-Z]+-\d+)', content)
-            display_id = req_id_match.group(1) if req_id_match else f"REQ-NEW-{datetime.now().strftime('%H%M%S')}"
+            display_id = (
+                req_id_match.group(1) if req_id_match
+                else DisplayIdAllocator(db).next_display_id("REQ-NEW")
+            )
 
             # Get project_id from conversation (need to look it up)
             # For now, use a placeholder - should be fetched from conversation
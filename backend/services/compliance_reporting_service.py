@@ -12,15 +12,70 @@ Report Types:
 - Verification status report
 - Configuration management status
 - Quality metrics report
+
+Reports are computed from a ComplianceSnapshot of the project: a handful
+of grouped aggregate queries (counts by type/priority/status with
+EXISTS-based coverage flags, per-requirement verification rollups, CI and
+change request rollups, phase rollups) instead of loading rows. Each part
+of the snapshot is queried on first use; generate_all_compliance_reports
+shares one snapshot between all reports. Lists of individual items (gaps,
+orphans, failed tests) come from anti-join queries capped at LIST_LIMIT;
+their full sizes are in the summaries.
+
+The schema has no problem reports: unresolved traceability gaps stand in
+for open problems and defects.
 """
 
-from typing import Dict, Any, Optional, List
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+from sqlalchemy import and_, case, exists, func, not_, select
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
 
+from models.audit import ChangeRequest, ChangeRequestStatus
+from models.configuration_item import CIStatus, ConfigurationItem
+from models.design_component import DesignComponent, DesignStatus
+from models.project import CIPhaseInstance, CIStateMachine
+from models.requirement import Requirement, RequirementStatus
+from models.test_case import TestCase, TestStatus
+from models.traceability import DesignTestTrace, RequirementDesignTrace, RequirementTestTrace, TraceabilityGap
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of items in each list of a report
+LIST_LIMIT = 100
+
+APPROVED_REQUIREMENT_STATUSES = (RequirementStatus.APPROVED, RequirementStatus.IMPLEMENTED, RequirementStatus.VERIFIED)
+IMPLEMENTED_DESIGN_STATUSES = (DesignStatus.IMPLEMENTED, DesignStatus.REVIEWED, DesignStatus.VERIFIED)
+BASELINED_CI_STATUSES = (CIStatus.APPROVED, CIStatus.RELEASED)
+OPEN_CHANGE_REQUEST_STATUSES = (
+    ChangeRequestStatus.DRAFT, ChangeRequestStatus.PENDING_REVIEW, ChangeRequestStatus.APPROVED
+)
+
+# DO-178C objectives: (category, objective, metric, applicable DAL levels).
+# An objective is satisfied when its metric reaches 100%.
+DO178C_OBJECTIVES = (
+    ("planning", "Software plans are developed and reviewed", "planning_phase", "ABCD"),
+    ("development", "High-level requirements are developed and approved", "requirements_approved", "ABCD"),
+    ("development", "High-level requirements are traceable to design", "requirements_to_design", "ABC"),
+    ("development", "Software design is implemented", "design_implemented", "ABC"),
+    ("verification", "Requirements are covered by test cases", "requirements_to_tests", "ABCD"),
+    ("verification", "Executed test cases pass", "pass_rate", "ABCD"),
+    ("verification", "Requirements are verified by passing tests", "requirements_verified", "ABC"),
+    ("verification", "Traceability is bidirectional", "bidirectional_completeness", "AB"),
+    ("configuration_management", "Configuration items are baselined", "configuration_compliance", "ABCD"),
+    ("configuration_management", "Change requests are closed", "change_requests_closed", "ABCD"),
+    ("quality_assurance", "Requirements are reviewed", "requirements_reviewed", "ABC"),
+    ("quality_assurance", "Traceability gaps are resolved", "gaps_resolved", "ABCD"),
+    ("certification_liaison", "Certification liaison phase is completed", "certification_phase", "ABCD"),
+)
+DO178C_CATEGORIES = (
+    "planning", "development", "verification",
+    "configuration_management", "quality_assurance", "certification_liaison"
+)
+
 
 class ReportType:
     """Compliance report type constants."""
@@ -35,6 +90,396 @@ class ReportType:
     ARP4754A_COMPLIANCE = "arp4754a_compliance"
 
 
+def _percent(part: float, whole: float, empty: float = 0.0) -> float:
+    """part of whole in percent (rounded), or empty when whole is zero."""
+    return round(part / whole * 100, 1) if whole else empty
+
+
+def _key(value: Any) -> Any:
+    """Plain value of an enum column."""
+    return getattr(value, "value", value)
+
+
+class ComplianceSnapshot:
+    """
+    Aggregates of one project, each queried once on first use.
+
+    Args:
+        db: Database session
+        project_id: Project ID
+    """
+
+    def __init__(self, db: Session, project_id: int):
+        self.db = db
+        self.project_id = project_id
+
+    # ==================== Requirements ====================
+
+    def _requirement_has_design(self):
+        return exists().where(RequirementDesignTrace.requirement_id == Requirement.id)
+
+    def _requirement_has_tests(self):
+        return exists().where(RequirementTestTrace.requirement_id == Requirement.id)
+
+    @cached_property
+    def requirement_groups(self) -> List[Dict[str, Any]]:
+        """Requirement counts grouped by type, priority, status and coverage."""
+        has_design = self._requirement_has_design()
+        has_tests = self._requirement_has_tests()
+        rows = self.db.execute(
+            select(
+                Requirement.type, Requirement.priority, Requirement.status,
+                has_design, has_tests,
+                func.count(),
+                func.count(Requirement.rationale),
+                func.count(Requirement.acceptance_criteria),
+                func.count(Requirement.approved_by)
+            )
+            .where(Requirement.project_id == self.project_id)
+            .group_by(Requirement.type, Requirement.priority, Requirement.status, has_design, has_tests)
+        ).all()
+        return [
+            {
+                "type": _key(row[0]), "priority": _key(row[1]), "status": _key(row[2]),
+                "with_design": bool(row[3]), "with_tests": bool(row[4]), "count": row[5],
+                "with_rationale": row[6], "with_acceptance_criteria": row[7], "reviewed": row[8]
+            }
+            for row in rows
+        ]
+
+    @cached_property
+    def requirements(self) -> Dict[str, int]:
+        """Requirement totals."""
+        totals = {
+            "total": 0, "with_design": 0, "with_tests": 0, "fully_traced": 0, "orphaned": 0,
+            "approved": 0, "with_rationale": 0, "with_acceptance_criteria": 0, "reviewed": 0
+        }
+        approved = {s.value for s in APPROVED_REQUIREMENT_STATUSES}
+        for group in self.requirement_groups:
+            count = group["count"]
+            totals["total"] += count
+            totals["with_design"] += count if group["with_design"] else 0
+            totals["with_tests"] += count if group["with_tests"] else 0
+            totals["fully_traced"] += count if group["with_design"] and group["with_tests"] else 0
+            totals["orphaned"] += count if not (group["with_design"] or group["with_tests"]) else 0
+            totals["approved"] += count if group["status"] in approved else 0
+            for key in ("with_rationale", "with_acceptance_criteria", "reviewed"):
+                totals[key] += group[key]
+        return totals
+
+    def requirements_by(self, attribute: str) -> Dict[str, Dict[str, Any]]:
+        """Requirement coverage counts per value of type or priority."""
+        result: Dict[str, Dict[str, Any]] = {}
+        for group in self.requirement_groups:
+            counts = result.setdefault(group[attribute], {"total": 0, "with_design": 0, "with_tests": 0, "fully_traced": 0})
+            counts["total"] += group["count"]
+            counts["with_design"] += group["count"] if group["with_design"] else 0
+            counts["with_tests"] += group["count"] if group["with_tests"] else 0
+            counts["fully_traced"] += group["count"] if group["with_design"] and group["with_tests"] else 0
+        for counts in result.values():
+            counts["coverage_percentage"] = _percent(counts["fully_traced"], counts["total"])
+        return result
+
+    def requirements_by_status(self) -> Dict[str, int]:
+        """Requirement counts per status."""
+        result: Dict[str, int] = {}
+        for group in self.requirement_groups:
+            result[group["status"]] = result.get(group["status"], 0) + group["count"]
+        return result
+
+    def _requirement_list(self, condition) -> List[Dict[str, Any]]:
+        rows = self.db.execute(
+            select(Requirement.requirement_id, Requirement.title, Requirement.priority,
+                   self._requirement_has_design(), self._requirement_has_tests())
+            .where(Requirement.project_id == self.project_id, condition)
+            .order_by(Requirement.requirement_id)
+            .limit(LIST_LIMIT)
+        ).all()
+        return [
+            {"requirement_id": row[0], "title": row[1], "priority": _key(row[2]),
+             "has_design": bool(row[3]), "has_tests": bool(row[4])}
+            for row in rows
+        ]
+
+    @cached_property
+    def untraced_requirements(self) -> List[Dict[str, Any]]:
+        """Requirements lacking design or test coverage (capped)."""
+        return self._requirement_list(not_(and_(self._requirement_has_design(), self._requirement_has_tests())))
+
+    @cached_property
+    def untested_requirements(self) -> List[Dict[str, Any]]:
+        """Requirements without test cases (capped)."""
+        return self._requirement_list(not_(self._requirement_has_tests()))
+
+    @cached_property
+    def orphaned_requirements(self) -> List[Dict[str, Any]]:
+        """Requirements traced to neither design nor tests (capped)."""
+        return self._requirement_list(and_(not_(self._requirement_has_design()), not_(self._requirement_has_tests())))
+
+    @cached_property
+    def verification(self) -> Dict[str, int]:
+        """Requirement counts per verification status of their test cases."""
+        per_requirement = (
+            select(
+                func.count(TestCase.id).label("tests"),
+                func.sum(case((TestCase.status == TestStatus.PASSED, 1), else_=0)).label("passed"),
+                func.sum(case((TestCase.status == TestStatus.FAILED, 1), else_=0)).label("failed"),
+                func.sum(case((TestCase.status == TestStatus.BLOCKED, 1), else_=0)).label("blocked"),
+                func.sum(case((TestCase.status == TestStatus.NOT_RUN, 1), else_=0)).label("not_run")
+            )
+            .select_from(Requirement)
+            .outerjoin(RequirementTestTrace, RequirementTestTrace.requirement_id == Requirement.id)
+            .outerjoin(TestCase, TestCase.id == RequirementTestTrace.test_case_id)
+            .where(Requirement.project_id == self.project_id)
+            .group_by(Requirement.id)
+            .subquery()
+        )
+        c = per_requirement.c
+        status = case(
+            (c.tests == 0, "untested"),
+            (c.failed > 0, "failed"),
+            (c.blocked > 0, "blocked"),
+            (c.passed == c.tests, "verified"),
+            (c.not_run == c.tests, "not_run"),
+            else_="partially_verified"
+        )
+        return {row[0]: row[1] for row in self.db.execute(select(status, func.count()).group_by(status))}
+
+    # ==================== Design and tests ====================
+
+    @cached_property
+    def design(self) -> Dict[str, Any]:
+        """Design component totals and counts per status."""
+        has_requirements = exists().where(RequirementDesignTrace.design_component_id == DesignComponent.id)
+        has_tests = exists().where(DesignTestTrace.design_component_id == DesignComponent.id)
+        implemented = DesignComponent.file_path.isnot(None)
+        rows = self.db.execute(
+            select(DesignComponent.status, has_requirements, has_tests, implemented,
+                   func.count(), func.count(DesignComponent.interfaces))
+            .where(DesignComponent.project_id == self.project_id)
+            .group_by(DesignComponent.status, has_requirements, has_tests, implemented)
+        ).all()
+        totals = {"total": 0, "with_requirements": 0, "with_tests": 0, "with_code": 0,
+                  "implemented": 0, "with_interfaces": 0, "by_status": {}}
+        implemented_statuses = {s.value for s in IMPLEMENTED_DESIGN_STATUSES}
+        for status, with_requirements, with_tests, with_code, count, with_interfaces in rows:
+            status = _key(status)
+            totals["total"] += count
+            totals["with_requirements"] += count if with_requirements else 0
+            totals["with_tests"] += count if with_tests else 0
+            totals["with_code"] += count if with_code else 0
+            totals["implemented"] += count if status in implemented_statuses else 0
+            totals["with_interfaces"] += with_interfaces
+            totals["by_status"][status] = totals["by_status"].get(status, 0) + count
+
+        traces, traced = self.db.execute(
+            select(func.count(RequirementDesignTrace.id), func.count(RequirementDesignTrace.design_component_id.distinct()))
+            .join(DesignComponent, DesignComponent.id == RequirementDesignTrace.design_component_id)
+            .where(DesignComponent.project_id == self.project_id)
+        ).one()
+        totals["requirements_per_component"] = round(traces / traced, 2) if traced else 0.0
+        return totals
+
+    @cached_property
+    def orphaned_design_components(self) -> List[Dict[str, Any]]:
+        """Design components not traced to a requirement (capped)."""
+        rows = self.db.execute(
+            select(DesignComponent.component_id, DesignComponent.name)
+            .where(DesignComponent.project_id == self.project_id,
+                   not_(exists().where(RequirementDesignTrace.design_component_id == DesignComponent.id)))
+            .order_by(DesignComponent.component_id)
+            .limit(LIST_LIMIT)
+        ).all()
+        return [{"component_id": row[0], "name": row[1]} for row in rows]
+
+    @cached_property
+    def tests(self) -> Dict[str, Any]:
+        """Test case totals and counts per type and status."""
+        has_requirements = exists().where(RequirementTestTrace.test_case_id == TestCase.id)
+        rows = self.db.execute(
+            select(TestCase.type, TestCase.status, has_requirements, func.count())
+            .where(TestCase.project_id == self.project_id)
+            .group_by(TestCase.type, TestCase.status, has_requirements)
+        ).all()
+        totals = {"total": 0, "with_requirements": 0, "by_type": {}, "by_status": {}}
+        for test_type, status, with_requirements, count in rows:
+            test_type, status = _key(test_type), _key(status)
+            totals["total"] += count
+            totals["with_requirements"] += count if with_requirements else 0
+            totals["by_type"][test_type] = totals["by_type"].get(test_type, 0) + count
+            totals["by_status"][status] = totals["by_status"].get(status, 0) + count
+        return totals
+
+    def _test_list(self, condition) -> List[Dict[str, Any]]:
+        rows = self.db.execute(
+            select(TestCase.test_id, TestCase.title, TestCase.status)
+            .where(TestCase.project_id == self.project_id, condition)
+            .order_by(TestCase.test_id)
+            .limit(LIST_LIMIT)
+        ).all()
+        return [{"test_id": row[0], "title": row[1], "status": _key(row[2])} for row in rows]
+
+    @cached_property
+    def failed_tests(self) -> List[Dict[str, Any]]:
+        """Failed test cases (capped)."""
+        return self._test_list(TestCase.status == TestStatus.FAILED)
+
+    @cached_property
+    def orphaned_tests(self) -> List[Dict[str, Any]]:
+        """Test cases not traced to a requirement (capped)."""
+        return self._test_list(not_(exists().where(RequirementTestTrace.test_case_id == TestCase.id)))
+
+    # ==================== Gaps and configuration ====================
+
+    @cached_property
+    def gaps(self) -> Dict[str, Any]:
+        """Traceability gap totals."""
+        rows = self.db.execute(
+            select(TraceabilityGap.gap_type, TraceabilityGap.severity, TraceabilityGap.is_resolved,
+                   TraceabilityGap.detection_method, func.count())
+            .where(TraceabilityGap.project_id == self.project_id)
+            .group_by(TraceabilityGap.gap_type, TraceabilityGap.severity,
+                      TraceabilityGap.is_resolved, TraceabilityGap.detection_method)
+        ).all()
+        totals = {"total": 0, "open": 0, "found_in_review": 0, "open_by_severity": {}}
+        for gap_type, severity, is_resolved, detection_method, count in rows:
+            totals["total"] += count
+            if is_resolved:
+                totals["found_in_review"] += count if detection_method == "manual_review" else 0
+            else:
+                totals["open"] += count
+                totals["open_by_severity"][severity] = totals["open_by_severity"].get(severity, 0) + count
+        return totals
+
+    @cached_property
+    def open_gaps(self) -> List[Dict[str, Any]]:
+        """Unresolved traceability gaps (capped)."""
+        rows = self.db.execute(
+            select(TraceabilityGap.id, TraceabilityGap.gap_type, TraceabilityGap.severity, TraceabilityGap.description)
+            .where(TraceabilityGap.project_id == self.project_id, TraceabilityGap.is_resolved.isnot(True))
+            .order_by(TraceabilityGap.id)
+            .limit(LIST_LIMIT)
+        ).all()
+        return [
+            {"gap_id": row[0], "gap_type": _key(row[1]), "severity": row[2], "description": row[3]}
+            for row in rows
+        ]
+
+    @cached_property
+    def configuration_items(self) -> Dict[str, Any]:
+        """Configuration item counts per lifecycle phase, status and control level."""
+        rows = self.db.execute(
+            select(ConfigurationItem.lifecycle_phase, ConfigurationItem.status,
+                   ConfigurationItem.control_level, func.count())
+            .where(ConfigurationItem.project_id == self.project_id)
+            .group_by(ConfigurationItem.lifecycle_phase, ConfigurationItem.status, ConfigurationItem.control_level)
+        ).all()
+        totals = {"total": 0, "baselined": 0, "by_lifecycle_phase": {}, "by_status": {}, "by_control_level": {}}
+        baselined = {s.value for s in BASELINED_CI_STATUSES}
+        for phase, status, control_level, count in rows:
+            phase, status, control_level = _key(phase), _key(status), _key(control_level)
+            totals["total"] += count
+            totals["baselined"] += count if status in baselined else 0
+            for key, value in (("by_lifecycle_phase", phase), ("by_status", status), ("by_control_level", control_level)):
+                totals[key][value] = totals[key].get(value, 0) + count
+        return totals
+
+    @cached_property
+    def change_requests(self) -> Dict[str, Any]:
+        """Change request counts per status."""
+        rows = self.db.execute(
+            select(ChangeRequest.status, func.count())
+            .where(ChangeRequest.project_id == self.project_id)
+            .group_by(ChangeRequest.status)
+        ).all()
+        by_status = {_key(status): count for status, count in rows}
+        open_statuses = {s.value for s in OPEN_CHANGE_REQUEST_STATUSES}
+        return {
+            "total": sum(by_status.values()),
+            "open": sum(count for status, count in by_status.items() if status in open_statuses),
+            "by_status": by_status
+        }
+
+    @cached_property
+    def open_change_requests(self) -> List[Dict[str, Any]]:
+        """Open change requests (capped)."""
+        rows = self.db.execute(
+            select(ChangeRequest.cr_id, ChangeRequest.title, ChangeRequest.status, ChangeRequest.impact_level)
+            .where(ChangeRequest.project_id == self.project_id,
+                   ChangeRequest.status.in_(OPEN_CHANGE_REQUEST_STATUSES))
+            .order_by(ChangeRequest.cr_id)
+            .limit(LIST_LIMIT)
+        ).all()
+        return [
+            {"cr_id": row[0], "title": row[1], "status": _key(row[2]), "impact_level": _key(row[3])}
+            for row in rows
+        ]
+
+    # ==================== Process ====================
+
+    @cached_property
+    def phases(self) -> List[Dict[str, Any]]:
+        """
+        Phase instances of the project's state machines, rolled up per phase.
+
+        Each instance counts the deliverables and reviews of its phase's
+        definition; they count as completed once the instance is completed.
+        """
+        rows = self.db.execute(
+            select(
+                CIPhaseInstance.phase_id,
+                func.min(CIPhaseInstance.phase_name),
+                func.min(CIPhaseInstance.phase_order),
+                CIPhaseInstance.status,
+                func.count()
+            )
+            .join(CIStateMachine, CIStateMachine.id == CIPhaseInstance.state_machine_id)
+            .where(CIStateMachine.project_id == self.project_id)
+            .group_by(CIPhaseInstance.phase_id, CIPhaseInstance.status)
+        ).all()
+
+        phases: Dict[str, Dict[str, Any]] = {}
+        for phase_id, name, order, status, count in rows:
+            deliverables, reviews = (len(items) for items in self.phase_definitions.get(phase_id, ([], [])))
+            phase = phases.setdefault(phase_id, {
+                "phase_id": phase_id, "phase_name": name, "order": order, "instances": 0, "by_status": {},
+                "deliverables": 0, "completed_deliverables": 0, "reviews": 0, "completed_reviews": 0
+            })
+            phase["order"] = min(phase["order"], order)
+            phase["instances"] += count
+            phase["by_status"][status] = phase["by_status"].get(status, 0) + count
+            phase["deliverables"] += deliverables * count
+            phase["reviews"] += reviews * count
+            if status == "completed":
+                phase["completed_deliverables"] += deliverables * count
+                phase["completed_reviews"] += reviews * count
+        return sorted(phases.values(), key=lambda p: (p["order"], p["phase_id"]))
+
+    @cached_property
+    def phase_definitions(self) -> Dict[str, Tuple[list, list]]:
+        """Deliverables and reviews of each phase, from one instance of it."""
+        first_ids = (
+            select(func.min(CIPhaseInstance.id))
+            .join(CIStateMachine, CIStateMachine.id == CIPhaseInstance.state_machine_id)
+            .where(CIStateMachine.project_id == self.project_id)
+            .group_by(CIPhaseInstance.phase_id)
+        )
+        rows = self.db.execute(
+            select(CIPhaseInstance.phase_id, CIPhaseInstance.deliverables, CIPhaseInstance.reviews)
+            .where(CIPhaseInstance.id.in_(first_ids))
+        ).all()
+        return {row[0]: (row[1] or [], row[2] or []) for row in rows}
+
+    def phase_completion(self, keyword: str) -> float:
+        """Percentage of completed instances of phases whose ID contains keyword."""
+        instances = completed = 0
+        for phase in self.phases:
+            if keyword in phase["phase_id"]:
+                instances += phase["instances"]
+                completed += phase["by_status"].get("completed", 0)
+        return _percent(completed, instances)
+
+
 class ComplianceReportingService:
     """
     Service for automated generation of compliance reports.
@@ -51,6 +496,55 @@ class ComplianceReportingService:
             db: Database session
         """
         self.db = db
+        self._snapshot: Optional[ComplianceSnapshot] = None
+
+    @contextmanager
+    def snapshot(self, project_id: int) -> Iterator[ComplianceSnapshot]:
+        """
+        Share one snapshot of the project between the reports generated
+        inside the block.
+        """
+        previous = self._snapshot
+        self._snapshot = ComplianceSnapshot(self.db, project_id)
+        try:
+            yield self._snapshot
+        finally:
+            self._snapshot = previous
+
+    def _get_snapshot(self, project_id: int) -> ComplianceSnapshot:
+        """The shared snapshot of the project, or a fresh one."""
+        if self._snapshot is not None and self._snapshot.project_id == project_id:
+            return self._snapshot
+        return ComplianceSnapshot(self.db, project_id)
+
+    def _metrics(self, snapshot: ComplianceSnapshot) -> Dict[str, float]:
+        """Percentages shared by several reports."""
+        requirements = snapshot.requirements
+        design = snapshot.design
+        tests = snapshot.tests
+        executed = tests["by_status"].get(TestStatus.PASSED.value, 0) + tests["by_status"].get(TestStatus.FAILED.value, 0)
+        traced_items = requirements["fully_traced"] + design["with_requirements"] + tests["with_requirements"]
+        all_items = requirements["total"] + design["total"] + tests["total"]
+        return {
+            "requirements_to_design": _percent(requirements["with_design"], requirements["total"]),
+            "requirements_to_tests": _percent(requirements["with_tests"], requirements["total"]),
+            "fully_traced": _percent(requirements["fully_traced"], requirements["total"]),
+            "design_to_code": _percent(design["with_code"], design["total"]),
+            "design_implemented": _percent(design["implemented"], design["total"]),
+            "bidirectional_completeness": _percent(traced_items, all_items),
+            "requirements_approved": _percent(requirements["approved"], requirements["total"]),
+            "requirements_reviewed": _percent(requirements["reviewed"], requirements["total"]),
+            "requirements_verified": _percent(snapshot.verification.get("verified", 0), requirements["total"]),
+            "pass_rate": _percent(tests["by_status"].get(TestStatus.PASSED.value, 0), executed),
+            "configuration_compliance": _percent(snapshot.configuration_items["baselined"],
+                                                 snapshot.configuration_items["total"]),
+            "change_requests_closed": _percent(snapshot.change_requests["total"] - snapshot.change_requests["open"],
+                                               snapshot.change_requests["total"], empty=100.0),
+            "gaps_resolved": _percent(snapshot.gaps["total"] - snapshot.gaps["open"], snapshot.gaps["total"],
+                                      empty=100.0),
+            "planning_phase": snapshot.phase_completion("PLANNING"),
+            "certification_phase": snapshot.phase_completion("CERTIFICATION"),
+        }
 
     def generate_requirements_coverage_report(
         self,
@@ -73,23 +567,25 @@ class ComplianceReportingService:
         Returns:
             Requirements coverage report data
         """
-        # In production, query from database
+        snapshot = self._get_snapshot(project_id)
+        requirements = snapshot.requirements
         report = {
             "report_type": ReportType.REQUIREMENTS_COVERAGE,
             "project_id": project_id,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "total_requirements": 0,
-                "requirements_with_design": 0,
-                "requirements_with_tests": 0,
-                "fully_traced_requirements": 0,
-                "orphaned_requirements": 0,
-                "coverage_percentage": 0.0
+                "total_requirements": requirements["total"],
+                "requirements_with_design": requirements["with_design"],
+                "requirements_with_tests": requirements["with_tests"],
+                "fully_traced_requirements": requirements["fully_traced"],
+                "orphaned_requirements": requirements["orphaned"],
+                "coverage_percentage": _percent(requirements["fully_traced"], requirements["total"])
             },
             "details": {
-                "by_type": {},
-                "by_priority": {},
-                "gaps": []
+                "by_type": snapshot.requirements_by("type"),
+                "by_priority": snapshot.requirements_by("priority"),
+                "by_status": snapshot.requirements_by_status(),
+                "gaps": snapshot.untraced_requirements
             }
         }
 
@@ -116,22 +612,24 @@ class ComplianceReportingService:
         Returns:
             Traceability report data
         """
+        snapshot = self._get_snapshot(project_id)
+        metrics = self._metrics(snapshot)
         report = {
             "report_type": ReportType.TRACEABILITY_COMPLETENESS,
             "project_id": project_id,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "traceability_matrix_completeness": 0.0,
-                "requirements_to_design": 0.0,
-                "requirements_to_tests": 0.0,
-                "design_to_code": 0.0,
-                "bidirectional_completeness": 0.0
+                "traceability_matrix_completeness": metrics["fully_traced"],
+                "requirements_to_design": metrics["requirements_to_design"],
+                "requirements_to_tests": metrics["requirements_to_tests"],
+                "design_to_code": metrics["design_to_code"],
+                "bidirectional_completeness": metrics["bidirectional_completeness"]
             },
-            "gaps": [],
+            "gaps": snapshot.untraced_requirements,
             "orphaned_items": {
-                "requirements": [],
-                "design_components": [],
-                "test_cases": []
+                "requirements": snapshot.orphaned_requirements,
+                "design_components": snapshot.orphaned_design_components,
+                "test_cases": snapshot.orphaned_tests
             }
         }
 
@@ -160,23 +658,59 @@ class ComplianceReportingService:
         Returns:
             Process compliance report
         """
+        snapshot = self._get_snapshot(project_id)
+        phases = snapshot.phases
+        definitions = snapshot.phase_definitions
+        totals = {key: sum(phase[key] for phase in phases)
+                  for key in ("instances", "deliverables", "completed_deliverables", "reviews", "completed_reviews")}
+        completed_phases = sum(phase["by_status"].get("completed", 0) for phase in phases)
+
+        missing_deliverables = []
+        pending_reviews = []
+        for phase in phases:
+            pending = phase["instances"] - phase["by_status"].get("completed", 0)
+            if not pending:
+                continue
+            deliverables, reviews = definitions.get(phase["phase_id"], ([], []))
+            missing_deliverables.extend(
+                {"phase_id": phase["phase_id"], "deliverable_id": d.get("deliverable_id"),
+                 "name": d.get("name"), "pending_instances": pending}
+                for d in deliverables if d.get("required", True)
+            )
+            pending_reviews.extend(
+                {"phase_id": phase["phase_id"], "review_id": r.get("review_id"),
+                 "name": r.get("name"), "pending_instances": pending}
+                for r in reviews
+            )
+
+        ratios = [
+            completed / total
+            for completed, total in ((completed_phases, totals["instances"]),
+                                     (totals["completed_deliverables"], totals["deliverables"]),
+                                     (totals["completed_reviews"], totals["reviews"]))
+            if total
+        ]
         report = {
             "report_type": ReportType.PROCESS_COMPLIANCE,
             "project_id": project_id,
             "standard": standard,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "overall_compliance": 0.0,
-                "completed_phases": 0,
-                "total_phases": 0,
-                "completed_deliverables": 0,
-                "total_deliverables": 0,
-                "completed_reviews": 0,
-                "total_reviews": 0
+                "overall_compliance": round(sum(ratios) / len(ratios) * 100, 1) if ratios else 0.0,
+                "completed_phases": completed_phases,
+                "total_phases": totals["instances"],
+                "completed_deliverables": totals["completed_deliverables"],
+                "total_deliverables": totals["deliverables"],
+                "completed_reviews": totals["completed_reviews"],
+                "total_reviews": totals["reviews"]
             },
-            "phase_status": [],
-            "missing_deliverables": [],
-            "pending_reviews": []
+            "phase_status": [
+                {"phase_id": phase["phase_id"], "phase_name": phase["phase_name"],
+                 "instances": phase["instances"], **phase["by_status"]}
+                for phase in phases
+            ],
+            "missing_deliverables": missing_deliverables[:LIST_LIMIT],
+            "pending_reviews": pending_reviews[:LIST_LIMIT]
         }
 
         logger.info(f"Generated process compliance report for project {project_id} ({standard})")
@@ -202,22 +736,28 @@ class ComplianceReportingService:
         Returns:
             Verification status report
         """
+        snapshot = self._get_snapshot(project_id)
+        metrics = self._metrics(snapshot)
+        by_status = snapshot.tests["by_status"]
+        passed = by_status.get(TestStatus.PASSED.value, 0)
+        failed = by_status.get(TestStatus.FAILED.value, 0)
         report = {
             "report_type": ReportType.VERIFICATION_STATUS,
             "project_id": project_id,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "total_test_cases": 0,
-                "executed_tests": 0,
-                "passed_tests": 0,
-                "failed_tests": 0,
-                "blocked_tests": 0,
-                "test_coverage": 0.0,
-                "pass_rate": 0.0
+                "total_test_cases": snapshot.tests["total"],
+                "executed_tests": passed + failed,
+                "passed_tests": passed,
+                "failed_tests": failed,
+                "blocked_tests": by_status.get(TestStatus.BLOCKED.value, 0),
+                "test_coverage": metrics["requirements_to_tests"],
+                "pass_rate": metrics["pass_rate"]
             },
-            "coverage_by_requirement": {},
-            "failed_tests": [],
-            "untested_requirements": []
+            "coverage_by_requirement": snapshot.verification,
+            "tests_by_type": snapshot.tests["by_type"],
+            "failed_tests": snapshot.failed_tests,
+            "untested_requirements": snapshot.untested_requirements
         }
 
         logger.info(f"Generated verification status report for project {project_id}")
@@ -243,20 +783,27 @@ class ComplianceReportingService:
         Returns:
             Configuration management report
         """
+        snapshot = self._get_snapshot(project_id)
+        items = snapshot.configuration_items
         report = {
             "report_type": ReportType.CONFIG_MANAGEMENT,
             "project_id": project_id,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "total_configuration_items": 0,
-                "baselined_items": 0,
-                "open_change_requests": 0,
-                "open_problem_reports": 0,
-                "configuration_compliance": 0.0
+                "total_configuration_items": items["total"],
+                "baselined_items": items["baselined"],
+                "open_change_requests": snapshot.change_requests["open"],
+                "open_problem_reports": snapshot.gaps["open"],
+                "configuration_compliance": _percent(items["baselined"], items["total"])
             },
-            "baseline_status": {},
-            "pending_changes": [],
-            "open_problems": []
+            "baseline_status": {
+                "by_status": items["by_status"],
+                "by_lifecycle_phase": items["by_lifecycle_phase"],
+                "by_control_level": items["by_control_level"],
+                "change_requests_by_status": snapshot.change_requests["by_status"]
+            },
+            "pending_changes": snapshot.open_change_requests,
+            "open_problems": snapshot.open_gaps
         }
 
         logger.info(f"Generated configuration management report for project {project_id}")
@@ -277,35 +824,46 @@ class ComplianceReportingService:
         - Review effectiveness
         - Process efficiency
 
+        Scores are percentages: clarity of requirements with a rationale,
+        testability of those with acceptance criteria, completeness of
+        those approved or later; modularity of design components with
+        documented interfaces. Complexity is the mean number of
+        requirements per traced component. Defects are traceability gaps.
+
         Args:
             project_id: Project ID
 
         Returns:
             Quality metrics report
         """
+        snapshot = self._get_snapshot(project_id)
+        requirements = snapshot.requirements
+        design = snapshot.design
+        gaps = snapshot.gaps
         report = {
             "report_type": ReportType.QUALITY_METRICS,
             "project_id": project_id,
             "generated_at": datetime.utcnow().isoformat(),
             "metrics": {
                 "requirements_quality": {
-                    "clarity_score": 0.0,
-                    "testability_score": 0.0,
-                    "completeness_score": 0.0
+                    "clarity_score": _percent(requirements["with_rationale"], requirements["total"]),
+                    "testability_score": _percent(requirements["with_acceptance_criteria"], requirements["total"]),
+                    "completeness_score": _percent(requirements["approved"], requirements["total"])
                 },
                 "design_quality": {
-                    "modularity_score": 0.0,
-                    "complexity_score": 0.0
+                    "modularity_score": _percent(design["with_interfaces"], design["total"]),
+                    "complexity_score": design["requirements_per_component"]
                 },
                 "defect_metrics": {
-                    "total_defects": 0,
-                    "open_defects": 0,
-                    "defect_density": 0.0
+                    "total_defects": gaps["total"],
+                    "open_defects": gaps["open"],
+                    "defect_density": round(gaps["open"] / requirements["total"], 3) if requirements["total"] else 0.0,
+                    "open_by_severity": gaps["open_by_severity"]
                 },
                 "review_effectiveness": {
-                    "reviews_conducted": 0,
-                    "defects_found_in_review": 0,
-                    "review_coverage": 0.0
+                    "reviews_conducted": sum(phase["completed_reviews"] for phase in snapshot.phases),
+                    "defects_found_in_review": gaps["found_in_review"],
+                    "review_coverage": _percent(requirements["reviewed"], requirements["total"])
                 }
             }
         }
@@ -331,30 +889,41 @@ class ComplianceReportingService:
         Returns:
             DO-178C compliance report
         """
+        snapshot = self._get_snapshot(project_id)
+        metrics = self._metrics(snapshot)
+        level = dal_level.upper().replace("DAL_", "").replace("DAL", "").strip()[-1:]
+
+        objectives: Dict[str, List[Dict[str, Any]]] = {category: [] for category in DO178C_CATEGORIES}
+        gaps = []
+        for category, objective, metric, levels in DO178C_OBJECTIVES:
+            if level not in levels:
+                continue
+            value = metrics[metric]
+            entry = {"objective": objective, "metric": metric, "value": value, "satisfied": value >= 100.0}
+            objectives[category].append(entry)
+            if not entry["satisfied"]:
+                gaps.append({"category": category, **entry})
+
+        scores = {
+            category: _percent(sum(1 for o in entries if o["satisfied"]), len(entries), empty=100.0)
+            for category, entries in objectives.items()
+        }
+        applicable = [o for entries in objectives.values() for o in entries]
         report = {
             "report_type": ReportType.DO178C_COMPLIANCE,
             "project_id": project_id,
             "dal_level": dal_level,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "overall_compliance": 0.0,
-                "planning_objectives": 0.0,
-                "development_objectives": 0.0,
-                "verification_objectives": 0.0,
-                "configuration_management_objectives": 0.0,
-                "quality_assurance_objectives": 0.0,
-                "certification_liaison_objectives": 0.0
-            },
-            "objectives": {
-                "planning": [],
-                "development": [],
-                "verification": [],
-                "configuration_management": [],
-                "quality_assurance": [],
-                "certification_liaison": []
+                "overall_compliance": _percent(sum(1 for o in applicable if o["satisfied"]), len(applicable),
+                                               empty=100.0),
+                **{f"{category}_objectives": score for category, score in scores.items()}
             },
-            "gaps": [],
-            "recommendations": []
+            "objectives": objectives,
+            "gaps": gaps,
+            "recommendations": [
+                f"{gap['objective']}: {gap['value']}% achieved, 100% required" for gap in gaps
+            ]
         }
 
         logger.info(f"Generated DO-178C compliance report for project {project_id} (DAL {dal_level})")
@@ -369,6 +938,9 @@ class ComplianceReportingService:
         """
         Generate all compliance reports for a project.
 
+        The reports share one snapshot of the project: each aggregate is
+        queried once.
+
         Args:
             project_id: Project ID
             standard: Compliance standard
@@ -377,21 +949,22 @@ class ComplianceReportingService:
         Returns:
             Combined report with all sub-reports
         """
-        combined_report = {
-            "project_id": project_id,
-            "generated_at": datetime.utcnow().isoformat(),
-            "standard": standard,
-            "dal_level": dal_level,
-            "reports": {
-                "requirements_coverage": self.generate_requirements_coverage_report(project_id),
-                "traceability": self.generate_traceability_report(project_id),
-                "process_compliance": self.generate_process_compliance_report(project_id, standard),
-                "verification_status": self.generate_verification_status_report(project_id),
-                "configuration_management": self.generate_configuration_management_report(project_id),
-                "quality_metrics": self.generate_quality_metrics_report(project_id),
-                "do178c_compliance": self.generate_do178c_compliance_report(project_id, dal_level)
+        with self.snapshot(project_id):
+            combined_report = {
+                "project_id": project_id,
+                "generated_at": datetime.utcnow().isoformat(),
+                "standard": standard,
+                "dal_level": dal_level,
+                "reports": {
+                    "requirements_coverage": self.generate_requirements_coverage_report(project_id),
+                    "traceability": self.generate_traceability_report(project_id),
+                    "process_compliance": self.generate_process_compliance_report(project_id, standard),
+                    "verification_status": self.generate_verification_status_report(project_id),
+                    "configuration_management": self.generate_configuration_management_report(project_id),
+                    "quality_metrics": self.generate_quality_metrics_report(project_id),
+                    "do178c_compliance": self.generate_do178c_compliance_report(project_id, dal_level)
+                }
             }
-        }
 
         logger.info(f"Generated all compliance reports for project {project_id}")
         return combined_report
@@ -10,12 +10,13 @@ This service implements:
 - REQ-BE-013: BOM management CRUD operations
 """
 
-from typing import List, Dict, Any, Optional
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 import uuid
 import logging
-import json
 
 from models.configuration_item import (
     ConfigurationItem,
@@ -26,13 +27,15 @@ from models.configuration_item import (
     CIStatus,
     BOMType
 )
+from models.project import Project, CICurrentActivity, CIStateMachine
 from process_engine import (
     create_state_machine_for_ci,
     StateMachineController,
-    StateMachineInstance,
-    CIType as ProcessCIType
+    StateMachineGenerator
 )
 from services.process_event_service import get_event_service
+from services.process_dashboard import ProcessDashboard
+from services.state_machine_store import StateMachineStore
 
 logger = logging.getLogger(__name__)
 
@@ -473,32 +476,15 @@ class ConfigurationItemService:
                 dal_level=dal_level
             )
 
-            # Store in database (ci_state_machines table)
-            from models.project import CIStateMachine
-            sm_record = CIStateMachine(
-                guid=str(uuid.uuid4()),
-                ci_id=ci_id,
-                template_id=sm_instance.template_id,
-                template_name=sm_instance.template_name,
-                dal_level=sm_instance.dal_level,
-                current_phase_index=sm_instance.current_phase_index,
-                state_data=json.dumps(sm_instance.to_dict()),
-                created_by="system"
-            )
+            # Auto-start first phase if requested (before the single insert)
+            if auto_start:
+                StateMachineController(sm_instance).start_phase(0)
 
-            self.db.add(sm_record)
+            # Store in database (ci_state_machines + phase/activity rows)
+            sm_record = StateMachineStore(self.db).create(sm_instance, created_by="system")
             self.db.commit()
             self.db.refresh(sm_record)
 
-            # Auto-start first phase if requested
-            if auto_start:
-                controller = StateMachineController(sm_instance)
-                if controller.start_phase(0):
-                    # Update state in database
-                    sm_record.state_data = json.dumps(sm_instance.to_dict())
-                    sm_record.current_phase_index = sm_instance.current_phase_index
-                    self.db.commit()
-
             logger.info(f"Created state machine for CI {ci_id}: {sm_instance.template_name}")
 
             return {
@@ -513,9 +499,150 @@ class ConfigurationItemService:
             }
 
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to create state machine for CI {ci_id}: {str(e)}")
             return None
 
+    # Machines inserted per batch of statements by bulk creation
+    BULK_BATCH_SIZE = 500
+
+    def create_state_machines_for_project(
+        self,
+        project_id: int,
+        root_ci_id: Optional[int] = None,
+        dal_level: Optional[str] = None,
+        auto_start: bool = True,
+        created_by: str = "system"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Create state machines for every CI of a product structure.
+
+        Walks the CI tree top-down, picks each CI's template from its type
+        (_map_ci_type_to_process_type) and criticality, generates the
+        instances from shared prototypes and inserts them with batched
+        statements in a single transaction. CIs that already have a state
+        machine are skipped; CIs whose process cannot be generated are
+        reported as failed without aborting the others.
+
+        Traceability: REQ-SM-001 (Development lifecycle state machine)
+
+        Args:
+            project_id: Project ID
+            root_ci_id: Only this CI and its descendants (default: whole project)
+            dal_level: DAL level for all CIs (default: each CI's criticality)
+            auto_start: Whether to start the first phase of each machine
+            created_by: Recorded on the new machines
+
+        Returns:
+            Created/skipped/failed counts and failure details, or None if
+            the project (or root CI) does not exist
+        """
+        if not self.db.query(Project.id).filter(Project.id == project_id).scalar():
+            return None
+
+        rows = self.db.query(
+            ConfigurationItem.id,
+            ConfigurationItem.parent_id,
+            ConfigurationItem.ci_identifier,
+            ConfigurationItem.ci_type,
+            ConfigurationItem.criticality
+        ).filter(ConfigurationItem.project_id == project_id).order_by(ConfigurationItem.id).all()
+
+        cis = self._walk_ci_tree(rows, root_ci_id)
+        if cis is None:
+            return None
+
+        existing = {
+            ci_id for (ci_id,) in self.db.query(CIStateMachine.ci_id).join(
+                ConfigurationItem, ConfigurationItem.id == CIStateMachine.ci_id
+            ).filter(ConfigurationItem.project_id == project_id).distinct()
+        }
+        pending = [ci for ci in cis if ci.id not in existing]
+        structure = [
+            {
+                "id": ci.id,
+                "type": self._map_ci_type_to_process_type(ci.ci_type),
+                "dal_level": dal_level or (ci.criticality.replace(" ", "_").upper() if ci.criticality else None)
+            }
+            for ci in pending
+        ]
+
+        generator = StateMachineGenerator()
+        failures = []
+        try:
+            instances = generator.generate_for_product_structure(structure)
+        except Exception:
+            # Isolate the CIs whose template cannot be resolved
+            instances = {}
+            identifiers = {ci.id: ci.ci_identifier for ci in pending}
+            for entry in structure:
+                try:
+                    instances.update(generator.generate_for_product_structure([entry]))
+                except Exception as e:
+                    failures.append({"ci_id": entry["id"], "ci_identifier": identifiers[entry["id"]], "error": str(e)})
+
+        ordered = [instances[entry["id"]] for entry in structure if entry["id"] in instances]
+        if auto_start:
+            for instance in ordered:
+                StateMachineController(instance).start_phase(0)
+
+        store = StateMachineStore(self.db)
+        try:
+            for start in range(0, len(ordered), self.BULK_BATCH_SIZE):
+                store.create_many(ordered[start:start + self.BULK_BATCH_SIZE], created_by, project_id)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Bulk state machine creation failed for project {project_id}: {str(e)}")
+            raise
+
+        logger.info(
+            f"Bulk state machines for project {project_id}: {len(ordered)} created, "
+            f"{len(cis) - len(pending)} skipped, {len(failures)} failed"
+        )
+        return {
+            "project_id": project_id,
+            "root_ci_id": root_ci_id,
+            "created": len(ordered),
+            "skipped": len(cis) - len(pending),
+            "failed": len(failures),
+            "failures": failures
+        }
+
+    @staticmethod
+    def _walk_ci_tree(rows: List[Any], root_ci_id: Optional[int] = None) -> Optional[List[Any]]:
+        """
+        Order CIs parents first (breadth-first from the roots).
+
+        Returns:
+            The CIs of the tree (or of root_ci_id's subtree), or None if
+            root_ci_id is not one of them
+        """
+        by_id = {row.id: row for row in rows}
+        children: Dict[Optional[int], List[Any]] = {}
+        for row in rows:
+            # A parent outside the project makes the CI a root
+            parent = row.parent_id if row.parent_id in by_id else None
+            children.setdefault(parent, []).append(row)
+
+        if root_ci_id is None:
+            queue = deque(children.get(None, []))
+        elif root_ci_id in by_id:
+            queue = deque([by_id[root_ci_id]])
+        else:
+            return None
+
+        ordered = []
+        seen = set()
+        while queue:
+            row = queue.popleft()
+            if row.id in seen:
+                continue
+            seen.add(row.id)
+            ordered.append(row)
+            queue.extend(children.get(row.id, []))
+        return ordered
+
     def get_ci_state_machine(self, ci_id: int) -> Optional[Dict[str, Any]]:
         """
         Get the state machine instance for a CI.
@@ -526,90 +653,75 @@ class ConfigurationItemService:
         Returns:
             State machine data or None if not found
         """
-        from models.project import CIStateMachine
-
-        sm_record = self.db.query(CIStateMachine).filter(
-            CIStateMachine.ci_id == ci_id
-        ).order_by(CIStateMachine.created_at.desc()).first()
+        store = StateMachineStore(self.db)
+        sm_record = store.get_record(ci_id)
 
         if not sm_record:
             return None
 
-        # Parse state data
-        try:
-            state_data = json.loads(sm_record.state_data)
-            return {
-                "state_machine_id": sm_record.id,
-                "ci_id": ci_id,
-                "template_id": sm_record.template_id,
-                "template_name": sm_record.template_name,
-                "dal_level": sm_record.dal_level,
-                "current_phase_index": sm_record.current_phase_index,
-                "state_data": state_data,
-                "created_at": sm_record.created_at.isoformat() if sm_record.created_at else None,
-                "updated_at": sm_record.updated_at.isoformat() if sm_record.updated_at else None
-            }
-        except json.JSONDecodeError:
-            logger.error(f"Invalid state data for CI {ci_id}")
-            return None
+        return {
+            "state_machine_id": sm_record.id,
+            "ci_id": ci_id,
+            "template_id": sm_record.template_id,
+            "template_name": sm_record.template_name,
+            "dal_level": sm_record.dal_level,
+            "current_phase_index": sm_record.current_phase_index,
+            "version": sm_record.version,
+            "state_data": store.load(sm_record).to_dict(),
+            "created_at": sm_record.created_at.isoformat() if sm_record.created_at else None,
+            "updated_at": sm_record.updated_at.isoformat() if sm_record.updated_at else None
+        }
 
     def get_ci_current_activity(self, ci_id: int) -> Optional[Dict[str, Any]]:
         """
         Get the current activity that should be worked on for a CI.
 
+        Only the current phase's activity rows are read.
+
         Args:
             ci_id: Configuration Item ID
 
         Returns:
             Current activity information or None
         """
-        sm_data = self.get_ci_state_machine(ci_id)
-        if not sm_data:
+        store = StateMachineStore(self.db)
+        sm_record = store.get_record(ci_id)
+        if not sm_record:
             return None
 
-        # Reconstruct state machine instance
-        from process_engine.services.state_machine_generator import StateMachineInstance
-        state_dict = sm_data["state_data"]
-
-        # This is a simplified reconstruction - in production, you'd have a proper deserializer
-        current_phase = state_dict.get("phases", [])[state_dict.get("current_phase_index", 0)]
+        sm_instance = store.load_current_phase(sm_record)
+        current_phase = sm_instance.current_phase
         if not current_phase:
             return None
 
-        current_sub_phase_idx = current_phase.get("current_sub_phase_index", 0)
-        sub_phases = current_phase.get("sub_phases", [])
-
-        if current_sub_phase_idx >= len(sub_phases):
+        if current_phase.current_sub_phase_index >= len(current_phase.sub_phases):
             return None
 
-        current_sub_phase = sub_phases[current_sub_phase_idx]
-        current_activity_idx = current_sub_phase.get("current_activity_index", 0)
-        activities = current_sub_phase.get("activities", [])
-
-        if current_activity_idx >= len(activities):
+        current_sub_phase = current_phase.sub_phases[current_phase.current_sub_phase_index]
+        if current_sub_phase.current_activity_index >= len(current_sub_phase.activities):
             return None
 
-        current_activity = activities[current_activity_idx]
+        current_activity = current_sub_phase.activities[current_sub_phase.current_activity_index]
 
         return {
             "ci_id": ci_id,
             "phase": {
-                "name": current_phase.get("name"),
-                "order": current_phase.get("order"),
-                "status": current_phase.get("status")
+                "name": current_phase.name,
+                "order": current_phase.order,
+                "status": current_phase.status.value
             },
             "sub_phase": {
-                "name": current_sub_phase.get("name"),
-                "order": current_sub_phase.get("order"),
-                "status": current_sub_phase.get("status")
+                "name": current_sub_phase.name,
+                "order": current_sub_phase.order,
+                "status": current_sub_phase.status.value
             },
             "activity": {
-                "activity_id": current_activity.get("activity_id"),
-                "name": current_activity.get("name"),
-                "type": current_activity.get("activity_type"),
-                "status": current_activity.get("status"),
-                "required": current_activity.get("required", True),
-                "output_artifacts": current_activity.get("output_artifacts", [])
+                "activity_id": current_activity.activity_id,
+                "name": current_activity.name,
+                "type": current_activity.activity_type,
+                "status": current_activity.status.value,
+                "required": current_activity.required,
+                "output_artifacts": current_activity.output_artifacts
             }
         }
 
@@ -617,46 +729,51 @@ class ConfigurationItemService:
         """
         Get progress information for a CI's development process.
 
+        Read from the counters maintained by each transition: the header
+        row and the phase rows, without scanning activities.
+
+        Traceability: REQ-SM-001
+
         Args:
             ci_id: Configuration Item ID
 
         Returns:
-            Progress information including percentage completion
+            Progress information including percentage completion and a
+            per-phase breakdown
         """
-        sm_data = self.get_ci_state_machine(ci_id)
-        if not sm_data:
+        store = StateMachineStore(self.db)
+        sm_record = store.get_record(ci_id)
+        if not sm_record:
             return None
 
-        state_dict = sm_data["state_data"]
-        phases = state_dict.get("phases", [])
-
-        total_phases = len(phases)
-        completed_phases = sum(1 for p in phases if p.get("status") == "completed")
-
-        # Calculate overall progress from activities
-        total_activities = 0
-        completed_activities = 0
-
-        for phase in phases:
-            for sub_phase in phase.get("sub_phases", []):
-                for activity in sub_phase.get("activities", []):
-                    total_activities += 1
-                    if activity.get("status") in ["completed", "skipped"]:
-                        completed_activities += 1
-
-        progress_percent = (completed_activities / total_activities * 100) if total_activities > 0 else 0
+        store.ensure_progress(sm_record)
+        phases = store.get_phase_rows(sm_record)
+        current_phase_index = sm_record.current_phase_index
 
         return {
             "ci_id": ci_id,
-            "template_name": sm_data["template_name"],
-            "dal_level": sm_data.get("dal_level"),
-            "total_phases": total_phases,
-            "completed_phases": completed_phases,
-            "current_phase_index": sm_data["current_phase_index"],
-            "total_activities": total_activities,
-            "completed_activities": completed_activities,
-            "progress_percent": round(progress_percent, 1),
-            "current_phase_name": phases[sm_data["current_phase_index"]].get("name") if sm_data["current_phase_index"] < len(phases) else None
+            "template_name": sm_record.template_name,
+            "dal_level": sm_record.dal_level,
+            "total_phases": sm_record.total_phases,
+            "completed_phases": sm_record.completed_phases,
+            "current_phase_index": current_phase_index,
+            "total_activities": sm_record.total_activities,
+            "completed_activities": sm_record.completed_activities,
+            "progress_percent": round(sm_record.progress_percent, 1),
+            "current_phase_name": phases[current_phase_index].phase_name if current_phase_index < len(phases) else None,
+            "phases": [
+                {
+                    "phase_id": phase.phase_id,
+                    "name": phase.phase_name,
+                    "status": phase.status,
+                    "total_activities": phase.total_activities,
+                    "completed_activities": phase.completed_activities,
+                    "progress_percent": round(
+                        phase.completed_activities / phase.total_activities * 100 if phase.total_activities else 0.0, 1
+                    )
+                }
+                for phase in phases
+            ]
         }
 
     def complete_activity(
@@ -668,6 +785,9 @@ class ConfigurationItemService:
         """
         Mark an activity as complete and advance the state machine.
 
+        Only the touched phase/activity rows and the cursor are updated.
+        A concurrent update is retried on the latest state.
+
         Traceability: REQ-SM-003 (Activity sequencing)
 
         Args:
@@ -677,126 +797,43 @@ class ConfigurationItemService:
 
         Returns:
             Updated state machine data or None if failed
-        """
-        from models.project import CIStateMachine
-
-        # Get the state machine record
-        sm_record = self.db.query(CIStateMachine).filter(
-            CIStateMachine.ci_id == ci_id
-        ).order_by(CIStateMachine.created_at.desc()).first()
-
-        if not sm_record:
-            logger.error(f"No state machine found for CI {ci_id}")
-            return None
-
-        # Parse state data
-        try:
-            state_dict = json.loads(sm_record.state_data)
-        except json.JSONDecodeError:
-            logger.error(f"Invalid state data for CI {ci_id}")
-            return None
-
-        # Reconstruct state machine instance
-        from process_engine.services.state_machine_generator import (
-            StateMachineInstance,
-            StateMachineController,
-            PhaseInstance,
-            SubPhaseInstance,
-            ActivityInstance,
-            PhaseStatus,
-            SubPhaseStatus,
-            ActivityStatus
-        )
-        from datetime import datetime as dt
-
-        # Helper to reconstruct instances from dict
-        def dict_to_activity(act_dict: Dict) -> ActivityInstance:
-            return ActivityInstance(
-                activity_id=act_dict["activity_id"],
-                name=act_dict["name"],
-                activity_type=act_dict["activity_type"],
-                status=ActivityStatus(act_dict["status"]),
-                required=act_dict["required"],
-                started_at=dt.fromisoformat(act_dict["started_at"]) if act_dict.get("started_at") else None,
-                completed_at=dt.fromisoformat(act_dict["completed_at"]) if act_dict.get("completed_at") else None,
-                output_artifacts=act_dict.get("output_artifacts", []),
-                completion_data=act_dict.get("completion_data", {})
-            )
 
-        def dict_to_subphase(sp_dict: Dict) -> SubPhaseInstance:
-            return SubPhaseInstance(
-                sub_phase_id=sp_dict["sub_phase_id"],
-                name=sp_dict["name"],
-                order=sp_dict["order"],
-                status=SubPhaseStatus(sp_dict["status"]),
-                activities=[dict_to_activity(a) for a in sp_dict["activities"]],
-                started_at=dt.fromisoformat(sp_dict["started_at"]) if sp_dict.get("started_at") else None,
-                completed_at=dt.fromisoformat(sp_dict["completed_at"]) if sp_dict.get("completed_at") else None,
-                current_activity_index=sp_dict["current_activity_index"]
-            )
-
-        def dict_to_phase(p_dict: Dict) -> PhaseInstance:
-            return PhaseInstance(
-                phase_id=p_dict["phase_id"],
-                name=p_dict["name"],
-                order=p_dict["order"],
-                status=PhaseStatus(p_dict["status"]),
-                sub_phases=[dict_to_subphase(sp) for sp in p_dict["sub_phases"]],
-                deliverables=p_dict.get("deliverables", []),
-                reviews=p_dict.get("reviews", []),
-                started_at=dt.fromisoformat(p_dict["started_at"]) if p_dict.get("started_at") else None,
-                completed_at=dt.fromisoformat(p_dict["completed_at"]) if p_dict.get("completed_at") else None,
-                current_sub_phase_index=p_dict["current_sub_phase_index"],
-                entry_criteria_met=p_dict["entry_criteria_met"],
-                exit_criteria_met=p_dict["exit_criteria_met"]
-            )
+        Raises:
+            StateMachineConflictError: Another user changed the state machine
+                and the completion no longer applies
+        """
+        completed = {}
 
-        # Reconstruct full state machine
-        from process_engine import CIType as ProcessCIType
-        sm_instance = StateMachineInstance(
-            instance_id=state_dict["instance_id"],
-            ci_id=state_dict["ci_id"],
-            ci_type=ProcessCIType(state_dict["ci_type"]),
-            template_id=state_dict["template_id"],
-            template_name=state_dict["template_name"],
-            dal_level=state_dict.get("dal_level"),
-            phases=[dict_to_phase(p) for p in state_dict["phases"]],
-            current_phase_index=state_dict["current_phase_index"],
-            created_at=dt.fromisoformat(state_dict["created_at"]),
-            updated_at=dt.fromisoformat(state_dict["updated_at"]),
-            context=state_dict.get("context", {})
-        )
+        def transition(controller: StateMachineController) -> bool:
+            activity = controller.get_current_activity()
+            if activity is not None:
+                completed["name"] = activity.name
+            return controller.complete_activity(activity_id, completion_data or {})
 
-        # Create controller and complete activity
-        controller = StateMachineController(sm_instance)
-        success = controller.complete_activity(activity_id, completion_data or {})
+        sm_record = StateMachineStore(self.db).transact(ci_id, transition)
 
-        if not success:
+        if sm_record is None:
             logger.warning(f"Failed to complete activity {activity_id} for CI {ci_id}")
             return None
 
-        # Update database with new state
-        sm_record.state_data = json.dumps(sm_instance.to_dict())
-        sm_record.current_phase_index = sm_instance.current_phase_index
-        self.db.commit()
-
         logger.info(f"Completed activity {activity_id} for CI {ci_id}")
 
-        # Emit event for real-time updates
+        # Emit events for real-time updates
         event_service = get_event_service()
         event_service.emit_activity_completed(
             ci_id=ci_id,
             activity_id=activity_id,
-            activity_name=activity.name,
-            progress_percent=sm_instance.overall_progress
+            activity_name=completed.get("name", activity_id),
+            progress_percent=sm_record.progress_percent
         )
+        self._emit_progress(sm_record)
 
         return {
             "ci_id": ci_id,
             "activity_id": activity_id,
             "success": True,
-            "current_phase_index": sm_instance.current_phase_index,
-            "overall_progress": sm_instance.overall_progress
+            "current_phase_index": sm_record.current_phase_index,
+            "overall_progress": sm_record.progress_percent
         }
 
     def skip_activity(
@@ -817,109 +854,213 @@ class ConfigurationItemService:
 
         Returns:
             Updated state machine data or None if failed
-        """
-        from models.project import CIStateMachine
 
-        sm_record = self.db.query(CIStateMachine).filter(
-            CIStateMachine.ci_id == ci_id
-        ).order_by(CIStateMachine.created_at.desc()).first()
+        Raises:
+            StateMachineConflictError: Concurrent modification (see complete_activity)
+        """
+        sm_record = StateMachineStore(self.db).transact(
+            ci_id,
+            lambda controller: controller.skip_activity(activity_id, reason)
+        )
 
-        if not sm_record:
+        if sm_record is None:
+            logger.warning(f"Failed to skip activity {activity_id} for CI {ci_id}")
             return None
 
-        try:
-            state_dict = json.loads(sm_record.state_data)
-        except json.JSONDecodeError:
-            return None
+        logger.info(f"Skipped activity {activity_id} for CI {ci_id}: {reason}")
+        self._emit_progress(sm_record)
 
-        # Similar reconstruction as complete_activity
-        # (Using same helper functions)
-        from process_engine.services.state_machine_generator import (
-            StateMachineInstance,
-            StateMachineController,
-            PhaseInstance,
-            SubPhaseInstance,
-            ActivityInstance,
-            PhaseStatus,
-            SubPhaseStatus,
-            ActivityStatus
+        return {
+            "ci_id": ci_id,
+            "activity_id": activity_id,
+            "skipped": True,
+            "reason": reason,
+            "current_phase_index": sm_record.current_phase_index
+        }
+
+    @staticmethod
+    def _emit_progress(sm_record: CIStateMachine) -> None:
+        """Push the header progress counters to subscribed clients."""
+        get_event_service().emit_progress_updated(
+            ci_id=sm_record.ci_id,
+            progress_percent=sm_record.progress_percent,
+            completed_activities=sm_record.completed_activities,
+            total_activities=sm_record.total_activities
         )
-        from datetime import datetime as dt
-
-        def dict_to_activity(act_dict: Dict) -> ActivityInstance:
-            return ActivityInstance(
-                activity_id=act_dict["activity_id"],
-                name=act_dict["name"],
-                activity_type=act_dict["activity_type"],
-                status=ActivityStatus(act_dict["status"]),
-                required=act_dict["required"],
-                started_at=dt.fromisoformat(act_dict["started_at"]) if act_dict.get("started_at") else None,
-                completed_at=dt.fromisoformat(act_dict["completed_at"]) if act_dict.get("completed_at") else None,
-                output_artifacts=act_dict.get("output_artifacts", []),
-                completion_data=act_dict.get("completion_data", {})
-            )
 
-        def dict_to_subphase(sp_dict: Dict) -> SubPhaseInstance:
-            return SubPhaseInstance(
-                sub_phase_id=sp_dict["sub_phase_id"],
-                name=sp_dict["name"],
-                order=sp_dict["order"],
-                status=SubPhaseStatus(sp_dict["status"]),
-                activities=[dict_to_activity(a) for a in sp_dict["activities"]],
-                started_at=dt.fromisoformat(sp_dict["started_at"]) if sp_dict.get("started_at") else None,
-                completed_at=dt.fromisoformat(sp_dict["completed_at"]) if sp_dict.get("completed_at") else None,
-                current_activity_index=sp_dict["current_activity_index"]
-            )
+    # ==================== Process Dashboard ====================
 
-        def dict_to_phase(p_dict: Dict) -> PhaseInstance:
-            return PhaseInstance(
-                phase_id=p_dict["phase_id"],
-                name=p_dict["name"],
-                order=p_dict["order"],
-                status=PhaseStatus(p_dict["status"]),
-                sub_phases=[dict_to_subphase(sp) for sp in p_dict["sub_phases"]],
-                deliverables=p_dict.get("deliverables", []),
-                reviews=p_dict.get("reviews", []),
-                started_at=dt.fromisoformat(p_dict["started_at"]) if p_dict.get("started_at") else None,
-                completed_at=dt.fromisoformat(p_dict["completed_at"]) if p_dict.get("completed_at") else None,
-                current_sub_phase_index=p_dict["current_sub_phase_index"],
-                entry_criteria_met=p_dict["entry_criteria_met"],
-                exit_criteria_met=p_dict["exit_criteria_met"]
-            )
+    def get_project_process_dashboard(
+        self,
+        project_id: int,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Process state of every CI in a project, with rollups.
+
+        Per-CI phase, current activity and progress plus rollups by CI
+        type, DAL and current phase, from one join over the state machine
+        headers and the work-queue projection. Cached per project until the
+        next transition (see ProcessDashboard).
+
+        Traceability: REQ-SM-001, REQ-SM-003
+
+        Args:
+            project_id: Project ID
+            if_none_match: If-None-Match header of the request
+
+        Returns:
+            (etag, dashboard), with dashboard None when the client's copy
+            (if_none_match) is still current
+        """
+        dashboard = ProcessDashboard(self.db)
+        etag = dashboard.etag(project_id)
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return etag, None
+        return dashboard.get(project_id, etag)
+
+    # ==================== Work Queue ====================
+
+    def get_project_work_queue(
+        self,
+        project_id: int,
+        statuses: Optional[List[str]] = None,
+        phase_id: Optional[str] = None,
+        activity_type: Optional[str] = None,
+        ci_type: Optional[str] = None,
+        required: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Current activity of every CI in a project, from the work-queue projection.
+
+        Traceability: REQ-SM-003 (Activity sequencing)
 
-        from process_engine import CIType as ProcessCIType
-        sm_instance = StateMachineInstance(
-            instance_id=state_dict["instance_id"],
-            ci_id=state_dict["ci_id"],
-            ci_type=ProcessCIType(state_dict["ci_type"]),
-            template_id=state_dict["template_id"],
-            template_name=state_dict["template_name"],
-            dal_level=state_dict.get("dal_level"),
-            phases=[dict_to_phase(p) for p in state_dict["phases"]],
-            current_phase_index=state_dict["current_phase_index"],
-            created_at=dt.fromisoformat(state_dict["created_at"]),
-            updated_at=dt.fromisoformat(state_dict["updated_at"]),
-            context=state_dict.get("context", {})
+        Args:
+            project_id: Project ID
+            statuses: Activity statuses to include (e.g. in_progress, blocked)
+            phase_id: Only CIs currently in this phase
+            activity_type: Only current activities of this type
+            ci_type: Only state machines of this process CI type
+            required: Only required (True) or optional (False) activities
+            limit: Page size
+            offset: Pagination offset
+
+        Returns:
+            Total count, per-phase/status counts for the whole filtered queue
+            and one page of items ordered by phase then CI
+        """
+        query = self.db.query(CICurrentActivity).filter(
+            CICurrentActivity.project_id == project_id,
+            CICurrentActivity.activity_id.isnot(None)
         )
+        if statuses:
+            query = query.filter(CICurrentActivity.status.in_(statuses))
+        if phase_id:
+            query = query.filter(CICurrentActivity.phase_id == phase_id)
+        if activity_type:
+            query = query.filter(CICurrentActivity.activity_type == activity_type)
+        if ci_type:
+            query = query.filter(CICurrentActivity.ci_type == ci_type)
+        if required is not None:
+            query = query.filter(CICurrentActivity.is_required == required)
+
+        grouped = query.with_entities(
+            CICurrentActivity.phase_order,
+            CICurrentActivity.phase_id,
+            CICurrentActivity.phase_name,
+            CICurrentActivity.status,
+            func.count(CICurrentActivity.id)
+        ).group_by(
+            CICurrentActivity.phase_order,
+            CICurrentActivity.phase_id,
+            CICurrentActivity.phase_name,
+            CICurrentActivity.status
+        ).order_by(CICurrentActivity.phase_order).all()
+
+        by_phase: Dict[str, Dict[str, Any]] = {}
+        for phase_order, phase_key, phase_name, status, count in grouped:
+            entry = by_phase.setdefault(phase_key, {
+                "phase_id": phase_key,
+                "name": phase_name,
+                "order": phase_order,
+                "total": 0,
+                "by_status": {}
+            })
+            entry["by_status"][status] = entry["by_status"].get(status, 0) + count
+            entry["total"] += count
+
+        items = query.order_by(
+            CICurrentActivity.phase_order,
+            CICurrentActivity.ci_id
+        ).offset(offset).limit(limit).all()
 
-        controller = StateMachineController(sm_instance)
-        success = controller.skip_activity(activity_id, reason)
+        return {
+            "project_id": project_id,
+            "total": sum(entry["total"] for entry in by_phase.values()),
+            "limit": limit,
+            "offset": offset,
+            "by_phase": list(by_phase.values()),
+            "items": [item.to_dict() for item in items]
+        }
 
-        if not success:
-            logger.warning(f"Failed to skip activity {activity_id} for CI {ci_id}")
-            return None
+    # ==================== History ====================
 
-        # Update database
-        sm_record.state_data = json.dumps(sm_instance.to_dict())
-        sm_record.current_phase_index = sm_instance.current_phase_index
-        self.db.commit()
+    def get_ci_state_as_of(self, ci_id: int, at: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a CI's state machine as it was at a past time.
 
-        logger.info(f"Skipped activity {activity_id} for CI {ci_id}: {reason}")
+        Traceability: REQ-SM-001 (Development lifecycle state machine)
+
+        Args:
+            ci_id: Configuration Item ID
+            at: Point in time (naive values are UTC)
+
+        Returns:
+            State machine data or None if there was no state machine then
+        """
+        store = StateMachineStore(self.db)
+        sm_record = store.get_record(ci_id)
+        if not sm_record:
+            return None
+
+        instance = store.history.state_as_of(sm_record, at)
+        if instance is None:
+            return None
 
         return {
+            "state_machine_id": sm_record.id,
             "ci_id": ci_id,
-            "activity_id": activity_id,
-            "skipped": True,
-            "reason": reason,
-            "current_phase_index": sm_instance.current_phase_index
+            "as_of": at.isoformat(),
+            "current_phase_index": instance.current_phase_index,
+            "overall_progress": instance.overall_progress,
+            "state_data": instance.to_dict()
         }
+
+    def get_project_state_machine_history(
+        self,
+        project_id: int,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        ci_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        State machine history of a project, oldest first, keyset-paginated.
+
+        Traceability: REQ-SM-001 (Development lifecycle state machine)
+        """
+        return StateMachineStore(self.db).history.project_history(
+            project_id,
+            after_id=after_id,
+            limit=limit,
+            ci_id=ci_id,
+            change_types=change_types,
+            since=since,
+            until=until
+        )
@@ -0,0 +1,188 @@
+"""
+Display ID Allocator
+DO-178C Traceability: REQ-DB-064
+Purpose: Unique, dense human-readable IDs (REQ-FN-001, CI-SW-0001, LOG-...)
+
+Numbers come from the display_id_sequences table using hi/lo block
+allocation: a worker reserves a block of numbers with a single
+UPDATE ... RETURNING (the "hi" part), then hands them out from memory
+(the "lo" part). Reservations commit on their own connection, so a block
+is never handed out twice, even if the caller's transaction rolls back.
+
+Blocks are cached per process and database. Bulk requests reserve
+exactly the numbers they need in one round trip, so a 50k-requirement
+import costs one UPDATE and leaves no gap; only the unused rest of a
+worker's current block is lost when it shuts down.
+
+Sequences of a database that already holds display IDs must start after
+the highest number in use: seed_sequences() does this once, from the
+columns in DISPLAY_ID_COLUMNS (alembic revision 20261019_004).
+"""
+
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import re
+import weakref
+
+from sqlalchemy import column, inspect, insert, select, table, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.audit import DisplayIdSequence
+
+
+# (table, column) holding display IDs allocated from the sequences
+DISPLAY_ID_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("requirements", "requirement_id"),  # REQ-FN-001
+    ("design_components", "component_id"),  # DSN-MOD-001
+    ("configuration_items", "ci_identifier"),  # CI-SW-0001
+    ("projects", "project_code"),  # AVIO-2026-001
+)
+
+# Display ID: sequence name, dash, number
+_DISPLAY_ID = re.compile(r"^(.+)-(\d+)$")
+
+
+class DisplayIdAllocator:
+    """
+    Hands out numbers of named sequences, reserving them in blocks.
+
+    Args:
+        bind: Engine, or a Session whose engine is used
+        block_size: Numbers reserved per round trip (default from settings)
+        shared: Use the process-wide block cache of the engine; False
+            gives the allocator private blocks, as a separate worker has
+    """
+
+    _lock = Lock()
+    # engine -> sequence name -> [next number, end of block (exclusive)]
+    _blocks: "weakref.WeakKeyDictionary[Engine, Dict[str, List[int]]]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, bind: Union[Engine, Session], block_size: Optional[int] = None, shared: bool = True):
+        self.engine: Engine = bind.get_bind() if isinstance(bind, Session) else bind
+        self.block_size = max(1, block_size or settings.display_id_block_size)
+        if shared:
+            with self._lock:
+                self._sequences = self._blocks.setdefault(self.engine, {})
+        else:
+            self._sequences = {}
+
+    # ==================== Public API ====================
+
+    def next(self, sequence: str) -> int:
+        """Next number of a sequence."""
+        return self.take(sequence, 1)[0]
+
+    def take(self, sequence: str, count: int) -> List[int]:
+        """
+        The next count numbers of a sequence, in increasing order.
+
+        Uses the cached block first; a remainder of at least block_size is
+        reserved exactly (dense bulk allocation), a smaller one from a new block.
+        """
+        if count <= 0:
+            return []
+
+        with self._lock:
+            numbers: List[int] = []
+            block = self._sequences.get(sequence)
+            if block is not None and block[0] < block[1]:
+                taken = min(count, block[1] - block[0])
+                numbers.extend(range(block[0], block[0] + taken))
+                block[0] += taken
+
+            remaining = count - len(numbers)
+            if remaining >= self.block_size:
+                start = self._reserve(sequence, remaining)
+                numbers.extend(range(start, start + remaining))
+            elif remaining > 0:
+                start = self._reserve(sequence, self.block_size)
+                numbers.extend(range(start, start + remaining))
+                self._sequences[sequence] = [start + remaining, start + self.block_size]
+            return numbers
+
+    def next_display_id(self, prefix: str, width: int = 3) -> str:
+        """Next display ID of a prefix, e.g. "REQ-FN" -> "REQ-FN-042"."""
+        return format_display_id(prefix, self.next(prefix), width)
+
+    def take_display_ids(self, prefix: str, count: int, width: int = 3) -> List[str]:
+        """count display IDs of a prefix, for bulk imports."""
+        return [format_display_id(prefix, number, width) for number in self.take(prefix, count)]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all cached blocks (their unused numbers are skipped)."""
+        with cls._lock:
+            for sequences in cls._blocks.values():
+                sequences.clear()
+
+    # ==================== Reservation ====================
+
+    def _reserve(self, sequence: str, size: int) -> int:
+        """Reserve size numbers in one committed round trip; returns the first."""
+        table = DisplayIdSequence.__table__
+        advance = update(table).where(table.c.name == sequence).values(
+            next_value=table.c.next_value + size
+        ).returning(table.c.next_value)
+
+        for _ in range(2):
+            with self.engine.begin() as conn:
+                end = conn.execute(advance).scalar()
+            if end is not None:
+                return end - size
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(table).values(name=sequence, next_value=1 + size))
+                return 1
+            except IntegrityError:
+                # Another worker created the sequence first: advance it instead
+                continue
+        raise RuntimeError(f"Could not reserve display IDs for sequence '{sequence}'")
+
+
+def seed_sequences(
+    connection: Connection,
+    columns: Sequence[Tuple[str, str]] = DISPLAY_ID_COLUMNS
+) -> Dict[str, int]:
+    """
+    Move every sequence past the highest number already in use.
+
+    Scans the display ID columns once; a sequence that is already further
+    along is left as it is. Runs in the caller's transaction.
+
+    Returns:
+        New next_value of each sequence that was created or advanced
+    """
+    tables = set(inspect(connection).get_table_names())
+    highest: Dict[str, int] = {}
+    for table_name, column_name in columns:
+        if table_name not in tables:
+            continue
+        values = connection.execution_options(stream_results=True).execute(
+            select(column(column_name)).select_from(table(table_name)).where(column(column_name).isnot(None))
+        )
+        for (value,) in values:
+            match = _DISPLAY_ID.match(value)
+            if match:
+                name, number = match.group(1), int(match.group(2))
+                highest[name] = max(highest.get(name, 0), number)
+
+    sequences = DisplayIdSequence.__table__
+    current = dict(connection.execute(select(sequences.c.name, sequences.c.next_value)).all())
+    seeded = {}
+    for name, number in sorted(highest.items()):
+        if name not in current:
+            connection.execute(insert(sequences).values(name=name, next_value=number + 1))
+        elif current[name] <= number:
+            connection.execute(update(sequences).where(sequences.c.name == name).values(next_value=number + 1))
+        else:
+            continue
+        seeded[name] = number + 1
+    return seeded
+
+
+def format_display_id(prefix: str, number: int, width: int = 3) -> str:
+    """Format a display ID: prefix, dash, zero-padded number."""
+    return f"{prefix}-{number:0{width}d}"
@@ -0,0 +1,316 @@
+"""
+Document Blob Service
+DO-178C Traceability: REQ-DOC-001, REQ-CERT-004
+Purpose: Content-addressed, compressed storage of exported documents
+
+Exported files are stored once per distinct content, gzip-compressed, at
+EXPORT_OUTPUT_DIR/blobs/<sha256[:2]>/<sha256>.gz, where sha256 is the hash
+of the uncompressed content (the DocumentExport.file_hash). A nightly
+export that reproduces yesterday's document costs a database row, not a
+file. Content is compressed and hashed while it is rendered, so it is
+written once, and downloads are served straight from the compressed blob.
+
+The document_blobs table counts the exports referencing each blob.
+collect_garbage() first reconciles these counts with the exports that
+actually exist (exports removed by cascading deletes never release their
+blob), then deletes blobs that have been unreferenced for a grace period,
+and blob files whose row was never committed.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.document_export import DocumentBlob, DocumentExport
+from services.state_machine_history import to_utc
+
+logger = logging.getLogger(__name__)
+
+# Rendered text is encoded, hashed and compressed in blocks of about this size
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+@dataclass
+class StoredBlob:
+    """Result of writing content to the blob store."""
+    sha256: str
+    size: int
+    stored_size: int
+    created: bool  # False when identical content was already stored
+
+
+@dataclass
+class StagedBlob:
+    """Content written to a temporary file of the blob store, not yet placed."""
+    sha256: str
+    size: int
+    stored_size: int
+    temp_path: str
+
+
+class BlobStore:
+    """
+    Gzip-compressed files in a directory, named by the SHA-256 of their content.
+
+    Args:
+        root: Directory of the store
+        compression_level: gzip level (default from settings)
+    """
+
+    SUFFIX = ".gz"
+
+    def __init__(self, root: str, compression_level: Optional[int] = None):
+        self.root = root
+        self.compression_level = compression_level or settings.export_compression_level
+
+    def path(self, sha256: str) -> str:
+        """Path of the blob with the given content hash."""
+        return os.path.join(self.root, sha256[:2], sha256 + self.SUFFIX)
+
+    def write(self, chunks: Iterable[str]) -> StoredBlob:
+        """Compress, hash and store text chunks (stage() then place())."""
+        return self.place(self.stage(chunks))
+
+    def stage(self, chunks: Iterable[str]) -> StagedBlob:
+        """
+        Compress text chunks into a temporary file, hashing them on the way.
+
+        The blob is not visible until place() renames it into place, so a
+        blob is never seen partially written and a failed render leaves
+        nothing behind.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".blob.", suffix=".tmp")
+        sha256_hash = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                # mtime=0: identical content always compresses to identical bytes
+                with gzip.GzipFile(filename="", mode="wb", fileobj=raw,
+                                   compresslevel=self.compression_level, mtime=0) as f:
+                    buffer: List[str] = []
+                    buffered = 0
+
+                    def flush() -> None:
+                        nonlocal size
+                        data = "".join(buffer).encode("utf-8")
+                        sha256_hash.update(data)
+                        f.write(data)
+                        size += len(data)
+                        buffer.clear()
+
+                    for chunk in chunks:
+                        buffer.append(chunk)
+                        buffered += len(chunk)
+                        if buffered >= WRITE_BUFFER_SIZE:
+                            flush()
+                            buffered = 0
+                    flush()
+                stored_size = raw.tell()
+                raw.flush()
+                os.fsync(raw.fileno())
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return StagedBlob(sha256_hash.hexdigest(), size, stored_size, temp_path)
+
+    def place(self, staged: StagedBlob) -> StoredBlob:
+        """
+        Rename a staged blob into place.
+
+        Identical content that is already stored is replaced by the staged
+        copy (same bytes), which also restores a file deleted concurrently
+        and renews its mtime for the orphan check of garbage collection.
+        """
+        target = self.path(staged.sha256)
+        created = not os.path.exists(target)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(staged.temp_path, target)
+        except BaseException:
+            self.discard(staged)
+            raise
+        return StoredBlob(staged.sha256, staged.size, staged.stored_size, created=created)
+
+    @staticmethod
+    def discard(staged: StagedBlob) -> None:
+        """Delete a staged blob that will not be placed."""
+        if os.path.exists(staged.temp_path):
+            os.unlink(staged.temp_path)
+
+    def open(self, sha256: str) -> BinaryIO:
+        """Open a blob's compressed bytes."""
+        return open(self.path(sha256), "rb")
+
+    def open_content(self, sha256: str) -> BinaryIO:
+        """Open a blob's uncompressed content."""
+        return gzip.open(self.path(sha256), "rb")
+
+    def delete(self, sha256: str) -> bool:
+        """Delete a blob file; False if it did not exist."""
+        try:
+            os.unlink(self.path(sha256))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def entries(self) -> Iterator[Tuple[str, str]]:
+        """(sha256, path) of every stored blob."""
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.scandir(self.root):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.name.endswith(self.SUFFIX):
+                    yield entry.name[:-len(self.SUFFIX)], entry.path
+
+
+def get_blob_store() -> BlobStore:
+    """Blob store of the configured export directory."""
+    return BlobStore(os.path.join(settings.export_output_dir, "blobs"))
+
+
+class DocumentBlobService:
+    """
+    Stores exported documents as blobs and counts their references.
+
+    Args:
+        db: Database session; reference changes are flushed, not committed,
+            so they commit together with the caller's export rows
+        store: Blob store (default: get_blob_store())
+    """
+
+    def __init__(self, db: Session, store: Optional[BlobStore] = None):
+        self.db = db
+        self.store = store if store is not None else get_blob_store()
+
+    def add(self, chunks: Iterable[str]) -> DocumentBlob:
+        """
+        Store content and add a reference to its blob.
+
+        The reference is taken with one INSERT ... ON CONFLICT DO UPDATE, so
+        concurrent first exports of the same content share one row. The
+        file is placed after the reference is taken: garbage collection
+        either sees the reference and keeps the blob, or has already
+        deleted it, in which case the staged copy restores the file.
+        """
+        staged = self.store.stage(chunks)
+        try:
+            self.db.execute(self._reference(staged))
+        except BaseException:
+            self.store.discard(staged)
+            raise
+        self.store.place(staged)
+        return self.db.get(DocumentBlob, staged.sha256, populate_existing=True)
+
+    def _reference(self, staged: StagedBlob) -> Any:
+        """Upsert adding a reference to the staged content's blob row."""
+        insert = sqlite_insert if self.db.get_bind().dialect.name == "sqlite" else postgresql_insert
+        statement = insert(DocumentBlob).values(
+            sha256=staged.sha256,
+            size=staged.size,
+            stored_size=staged.stored_size,
+            compression="gzip",
+            ref_count=1
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[DocumentBlob.sha256],
+            set_={"ref_count": DocumentBlob.ref_count + 1, "released_at": None}
+        )
+
+    def release(self, sha256: str) -> None:
+        """Remove a reference to a blob."""
+        self.db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256, DocumentBlob.ref_count > 0)
+            .values(ref_count=DocumentBlob.ref_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256, DocumentBlob.ref_count == 0)
+            .values(released_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.flush()
+
+    def collect_garbage(self, grace_minutes: Optional[int] = None) -> Dict[str, int]:
+        """
+        Delete blobs no export has referenced for the grace period.
+
+        Args:
+            grace_minutes: Minimum time unreferenced (default from settings)
+
+        Returns:
+            Counts: reconciled reference counts, deleted blobs and orphan
+            files, and bytes freed
+        """
+        if grace_minutes is None:
+            grace_minutes = settings.export_blob_gc_grace_minutes
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=grace_minutes)
+        result = {"reconciled": 0, "deleted": 0, "orphans": 0, "bytes_freed": 0}
+
+        references = dict(
+            self.db.query(DocumentExport.file_hash, func.count(DocumentExport.id))
+            .filter(DocumentExport.file_hash.isnot(None))
+            .group_by(DocumentExport.file_hash)
+            .all()
+        )
+        collectable = []
+        for blob in self.db.query(DocumentBlob).all():
+            count = references.get(blob.sha256, 0)
+            if blob.ref_count != count:
+                result["reconciled"] += 1
+                blob.ref_count = count
+            if count:
+                blob.released_at = None
+            elif blob.released_at is None:
+                blob.released_at = now
+            elif to_utc(blob.released_at) <= cutoff:
+                collectable.append((blob.sha256, blob.stored_size))
+        self.db.flush()
+
+        collected = []
+        for sha256, stored_size in collectable:
+            # Skip blobs an export has referenced again in the meantime
+            deleted = self.db.execute(
+                delete(DocumentBlob)
+                .where(DocumentBlob.sha256 == sha256, DocumentBlob.ref_count == 0)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if deleted:
+                collected.append((sha256, stored_size))
+
+        # Files go while the deleted rows are still locked: an export adding
+        # a reference meanwhile waits, then recreates the row and the file
+        for sha256, stored_size in collected:
+            if self.store.delete(sha256):
+                result["bytes_freed"] += stored_size
+            result["deleted"] += 1
+        self.db.commit()
+
+        # Files written by an export whose transaction never committed
+        known = {sha256 for (sha256,) in self.db.query(DocumentBlob.sha256)}
+        for sha256, path in self.store.entries():
+            if sha256 in known:
+                continue
+            stat = os.stat(path)
+            if datetime.fromtimestamp(stat.st_mtime, timezone.utc) <= cutoff and self.store.delete(sha256):
+                result["orphans"] += 1
+                result["bytes_freed"] += stat.st_size
+
+        logger.info(f"Document blob garbage collection: {result}")
+        return result
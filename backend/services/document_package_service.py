@@ -0,0 +1,218 @@
+"""
+Document Package Service
+DO-178C Traceability: REQ-AG-001, REQ-AG-005, REQ-BE-029
+Purpose: Generate a project's complete certification package in parallel
+
+The package is the SRS, RTM, gap analysis and every compliance report.
+Source data is read once, in the request, into self-contained render jobs
+(see ArtifactGeneratorService.prepare). Rendering large templates is
+CPU-bound and holds the GIL, so the jobs run in a process pool, one
+document per worker, and each result is stored and reported as soon as it
+is done: the whole package takes about as long as its slowest document.
+
+Documents whose source data is unchanged come from storage without being
+rendered. Compliance reports are point-in-time, so they are rendered on
+every run and not versioned.
+
+DOCUMENT_RENDER_WORKERS sets the pool size; 0 renders in the calling thread.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import multiprocessing
+import time
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.project import Project
+from process_engine import (
+    ArtifactGeneratorService,
+    DocumentJob,
+    GeneratedDocument,
+    get_document_environment,
+    init_render_worker,
+    render_document,
+)
+from services.compliance_reporting_service import ComplianceReportingService
+
+logger = logging.getLogger(__name__)
+
+# Versioned documents of a package, in report order
+PACKAGE_DOCUMENTS = ("SRS", "RTM", "GAP_ANALYSIS")
+COMPLIANCE_TEMPLATE = "Compliance_Report_template.md"
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = Lock()
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the process-wide render pool, or None when rendering in-thread."""
+    global _pool
+    if settings.document_render_workers <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawned workers inherit no locks or database connections
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.document_render_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_render_worker,
+                    initargs=(settings.document_template_cache_dir, settings.debug)
+                )
+    return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render pool's worker processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+@dataclass
+class DocumentPackage:
+    """A prepared package: documents that are current, and jobs to render."""
+    project_id: int
+    current: List[GeneratedDocument] = field(default_factory=list)
+    jobs: List[DocumentJob] = field(default_factory=list)
+
+    @property
+    def document_types(self) -> List[str]:
+        return [doc.document_type for doc in self.current] + [job.document_type for job in self.jobs]
+
+
+class DocumentPackageService:
+    """
+    Prepares, renders and stores a project's certification package.
+
+    Args:
+        db: Database session used to read the source data
+        executor: Executor to render in (default: the process-wide pool)
+    """
+
+    def __init__(self, db: Session, executor: Optional[Executor] = None):
+        self.db = db
+        self.executor = executor if executor is not None else get_render_pool()
+
+    def prepare(self, project_id: int) -> DocumentPackage:
+        """
+        Snapshot everything the package needs, reading each source once.
+
+        Raises:
+            ValueError: If the project does not exist
+        """
+        project = self.db.get(Project, project_id)
+        if project is None:
+            raise ValueError(f"Project {project_id} not found")
+
+        package = DocumentPackage(project_id=project_id)
+        generator = ArtifactGeneratorService(self.db)
+        with generator.snapshot():
+            for doc_type in PACKAGE_DOCUMENTS:
+                prepared = generator.prepare(project_id, doc_type)
+                if isinstance(prepared, GeneratedDocument):
+                    package.current.append(prepared)
+                else:
+                    package.jobs.append(prepared)
+
+        reports = ComplianceReportingService(self.db).generate_all_compliance_reports(project_id)["reports"]
+        template_version = get_document_environment().template_version(COMPLIANCE_TEMPLATE)
+        project_data = {"name": project.name, "project_code": project.project_code}
+        for name, report in reports.items():
+            report_type = report.get("report_type", name)
+            package.jobs.append(DocumentJob(
+                document_id=f"{project.project_code or 'PROJ'}-{report_type.upper()}",
+                document_type=report_type.upper(),
+                title=f"{name.replace('_', ' ').title()} Report - {project.name}",
+                template=COMPLIANCE_TEMPLATE,
+                template_version=template_version,
+                data={"project": project_data, "report": report},
+                version=1,
+                source_data_hash=hashlib.sha256(
+                    json.dumps(report, sort_keys=True, default=str).encode()
+                ).hexdigest(),
+                project_id=project_id
+            ))
+        return package
+
+    def generate(self, package: DocumentPackage, db: Optional[Session] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Render a prepared package, yielding one event per finished document.
+
+        Events: "started" (document types), "document" per document
+        (status "unchanged" or "generated"), "error" per failed document
+        and "completed" with counts.
+
+        Args:
+            package: Package from prepare()
+            db: Session to store new versions with (default: the service's)
+        """
+        started = time.perf_counter()
+        generator = ArtifactGeneratorService(db if db is not None else self.db)
+        counts = {"generated": 0, "unchanged": 0, "failed": 0}
+
+        yield {"event": "started", "project_id": package.project_id, "documents": package.document_types}
+
+        for doc in package.current:
+            counts["unchanged"] += 1
+            yield self._document_event(doc, "unchanged", started)
+
+        for job, doc, error in self._render(package.jobs):
+            if error is None and job.document_type in ArtifactGeneratorService.DOCUMENT_TYPES:
+                try:
+                    generator.store_document(doc, job.fingerprint)
+                except Exception as e:
+                    generator.db_session.rollback()
+                    error = e
+            if error is not None:
+                logger.error(f"Failed to generate {job.document_type} for project {package.project_id}: {error}")
+                counts["failed"] += 1
+                yield {"event": "error", "document_type": job.document_type, "error": str(error)}
+                continue
+            counts["generated"] += 1
+            yield self._document_event(doc, "generated", started)
+
+        yield {
+            "event": "completed",
+            "project_id": package.project_id,
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    def _render(self, jobs: List[DocumentJob]) -> Iterator[Tuple[DocumentJob, Optional[GeneratedDocument], Optional[Exception]]]:
+        """Render jobs, in completion order when using an executor."""
+        if self.executor is None:
+            for job in jobs:
+                try:
+                    yield job, render_document(job), None
+                except Exception as e:
+                    yield job, None, e
+            return
+
+        futures = {self.executor.submit(render_document, job): job for job in jobs}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+
+    def _document_event(self, doc: GeneratedDocument, status: str, started: float) -> Dict[str, Any]:
+        return {
+            "event": "document",
+            "status": status,
+            "document_type": doc.document_type,
+            "document_id": doc.document_id,
+            "title": doc.title,
+            "version": doc.version,
+            "generated_at": doc.generated_at.isoformat(),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "content": doc.content
+        }
@@ -7,29 +7,67 @@ This service generates DO-178C compliant documentation including
 SRS, SDD, RTM, and test reports from the database.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import ChoiceLoader, Environment, FileSystemLoader, Template, select_autoescape
 from datetime import datetime
 import os
-import hashlib
 import logging
+import threading
 
 from models.project import Project
-from models.requirement import Requirement
+from models.requirement import Requirement, RequirementType
 from models.design_component import DesignComponent
 from models.test_case import TestCase
-from models.document_export import DocumentExport, DocumentType, ExportFormat
+from models.document_export import DocumentBlob, DocumentExport, DocumentType, ExportFormat
+from services.document_blob_service import DocumentBlobService
 from services.traceability_service import TraceabilityService
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Templates shipped with the backend; EXPORT_TEMPLATES_DIR may override them
+DEFAULT_EXPORT_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# Rows fetched per round trip while streaming requirements into a document
+REQUIREMENT_BATCH_SIZE = 500
+
+
+_export_env: Optional[Environment] = None
+_export_env_lock = threading.Lock()
+
+
+def get_export_environment() -> Environment:
+    """Get the process-wide Jinja environment for document exports."""
+    global _export_env
+    if _export_env is None:
+        with _export_env_lock:
+            if _export_env is None:
+                loaders = [FileSystemLoader(DEFAULT_EXPORT_TEMPLATES_PATH)]
+                template_dir = settings.export_templates_dir
+                if os.path.isdir(template_dir) and os.path.abspath(template_dir) != DEFAULT_EXPORT_TEMPLATES_PATH:
+                    loaders.insert(0, FileSystemLoader(template_dir))
+                _export_env = Environment(
+                    loader=ChoiceLoader(loaders),
+                    autoescape=select_autoescape(['html', 'xml']),
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    keep_trailing_newline=True,
+                    auto_reload=settings.debug
+                )
+    return _export_env
+
 
 class DocumentService:
     """
     Service for generating certification documents.
 
+    Documents are rendered with Jinja's streaming API straight into the
+    blob store, hashed and compressed as they are written: memory use does
+    not grow with the document and the file is written once, never read
+    back. Identical documents share one stored blob.
+
     Traceability:
     - REQ-DOC-002: Document generation
     - REQ-CERT-007: Certification artifacts
@@ -38,17 +76,8 @@ class DocumentService:
     def __init__(self, db: Session):
         self.db = db
         self.traceability_service = TraceabilityService(db)
-
-        # Initialize Jinja2 environment
-        template_dir = settings.export_templates_dir
-        if os.path.exists(template_dir):
-            self.jinja_env = Environment(
-                loader=FileSystemLoader(template_dir),
-                autoescape=select_autoescape(['html', 'xml'])
-            )
-        else:
-            logger.warning(f"Template directory not found: {template_dir}")
-            self.jinja_env = None
+        self.jinja_env = get_export_environment()
+        self.blobs = DocumentBlobService(db)
 
     def generate_srs(
         self,
@@ -73,33 +102,26 @@ class DocumentService:
         if not project:
             raise ValueError(f"Project {project_id} not found")
 
-        requirements = self.db.query(Requirement).filter(
+        requirement_count = self.db.query(func.count(Requirement.id)).filter(
             Requirement.project_id == project_id
-        ).order_by(Requirement.requirement_id).all()
+        ).scalar()
+        included_requirements: List[int] = []
+        generated_at = datetime.utcnow()
 
         # Prepare document data
         document_data = {
             "project": project,
-            "requirements": requirements,
-            "generated_at": datetime.utcnow(),
+            "requirements": self._stream_requirements(project_id, included_requirements),
+            "requirement_count": requirement_count,
+            "generated_at": generated_at,
             "generated_by": generated_by,
             "document_type": "Software Requirements Specification",
-            "document_id": f"SRS-{project.project_code}-{datetime.utcnow().strftime('%Y%m%d')}"
+            "document_id": f"SRS-{project.project_code}-{generated_at.strftime('%Y%m%d')}"
         }
 
-        # Generate markdown content
-        content = self._render_srs_markdown(document_data)
-
-        # Save to file
-        filename = f"SRS_{project.project_code}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.md"
-        file_path = os.path.join(settings.export_output_dir, filename)
-
-        os.makedirs(settings.export_output_dir, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        # Calculate file hash
-        file_hash = self._calculate_file_hash(file_path)
+        # Render straight to the blob store
+        blob = self._write_document("srs.md", document_data)
+        filename = f"SRS_{project.project_code}_{generated_at.strftime('%Y%m%d_%H%M%S')}.md"
 
         # Create export record
         export = DocumentExport(
@@ -107,11 +129,13 @@ class DocumentService:
             document_type=DocumentType.SRS,
             export_format=ExportFormat.MARKDOWN,
             title=f"Software Requirements Specification - {project.name}",
-            file_path=file_path,
-            file_size=os.path.getsize(file_path),
-            file_hash=file_hash,
+            file_path=self.blobs.store.path(blob.sha256),
+            file_name=filename,
+            file_size=blob.size,
+            file_hash=blob.sha256,
+            template_used="srs.md",
             generated_by=generated_by,
-            included_requirements=[req.id for req in requirements],
+            included_requirements=included_requirements,
             version="1.0"
         )
 
@@ -119,7 +143,7 @@ class DocumentService:
         self.db.commit()
         self.db.refresh(export)
 
-        logger.info(f"Generated SRS for project {project_id}: {file_path}")
+        logger.info(f"Generated SRS for project {project_id}: {filename} ({blob.sha256[:12]})")
         return export
 
     def generate_rtm(
@@ -148,30 +172,22 @@ class DocumentService:
         # Get traceability matrix
         matrix_data = self.traceability_service.generate_traceability_matrix(project_id)
 
+        generated_at = datetime.utcnow()
+
         # Prepare document data
         document_data = {
             "project": project,
             "matrix": matrix_data["matrix"],
             "statistics": matrix_data["statistics"],
-            "generated_at": datetime.utcnow(),
+            "generated_at": generated_at,
             "generated_by": generated_by,
             "document_type": "Requirements Traceability Matrix",
-            "document_id": f"RTM-{project.project_code}-{datetime.utcnow().strftime('%Y%m%d')}"
+            "document_id": f"RTM-{project.project_code}-{generated_at.strftime('%Y%m%d')}"
         }
 
-        # Generate markdown content
-        content = self._render_rtm_markdown(document_data)
-
-        # Save to file
-        filename = f"RTM_{project.project_code}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.md"
-        file_path = os.path.join(settings.export_output_dir, filename)
-
-        os.makedirs(settings.export_output_dir, exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        # Calculate file hash
-        file_hash = self._calculate_file_hash(file_path)
+        # Render straight to the blob store
+        blob = self._write_document("rtm.md", document_data)
+        filename = f"RTM_{project.project_code}_{generated_at.strftime('%Y%m%d_%H%M%S')}.md"
 
         # Create export record
         export = DocumentExport(
@@ -179,9 +195,11 @@ class DocumentService:
             document_type=DocumentType.RTM,
             export_format=ExportFormat.MARKDOWN,
             title=f"Requirements Traceability Matrix - {project.name}",
-            file_path=file_path,
-            file_size=os.path.getsize(file_path),
-            file_hash=file_hash,
+            file_path=self.blobs.store.path(blob.sha256),
+            file_name=filename,
+            file_size=blob.size,
+            file_hash=blob.sha256,
+            template_used="rtm.md",
             generated_by=generated_by,
             version="1.0"
         )
@@ -190,134 +208,29 @@ class DocumentService:
         self.db.commit()
         self.db.refresh(export)
 
-        logger.info(f"Generated RTM for project {project_id}: {file_path}")
+        logger.info(f"Generated RTM for project {project_id}: {filename} ({blob.sha256[:12]})")
         return export
 
-    def _render_srs_markdown(self, data: Dict[str, Any]) -> str:
-        """Render SRS as markdown."""
-        content = f"""# Software Requirements Specification
-
-**Project:** {data['project'].name}
-**Project Code:** {data['project'].project_code}
-**Certification Level:** DO-178C Level {data['project'].certification_level}
-**Document ID:** {data['document_id']}
-**Generated:** {data['generated_at'].strftime('%Y-%m-%d %H:%M:%S UTC')}
-**Generated By:** {data['generated_by']}
-
----
-
-## 1. Introduction
-
-This Software Requirements Specification (SRS) defines the requirements for {data['project'].name}.
-
-**Project Description:**
-{data['project'].description or 'N/A'}
-
-**Certification Level:**
-This project is being developed to DO-178C Level {data['project'].certification_level}.
-
----
-
-## 2. Requirements
-
-Total Requirements: {len(data['requirements'])}
-
-"""
-        # Group requirements by type
-        by_type = {}
-        for req in data['requirements']:
-            req_type = req.type.value
-            if req_type not in by_type:
-                by_type[req_type] = []
-            by_type[req_type].append(req)
-
-        for req_type, reqs in by_type.items():
-            content += f"\n### 2.{list(by_type.keys()).index(req_type) + 1} {req_type.replace('_', ' ').title()} Requirements\n\n"
-
-            for req in reqs:
-                content += f"#### {req.requirement_id}: {req.title}\n\n"
-                content += f"**Description:**  \n{req.description}\n\n"
-                content += f"**Priority:** {req.priority.value.title()}  \n"
-                content += f"**Status:** {req.status.value.replace('_', ' ').title()}  \n\n"
+    def _write_document(self, template_name: str, data: Dict[str, Any]) -> DocumentBlob:
+        """Render a template chunk by chunk into a referenced blob."""
+        template: Template = self.jinja_env.get_template(template_name)
+        return self.blobs.add(template.generate(**data))
 
-                if req.rationale:
-                    content += f"**Rationale:**  \n{req.rationale}\n\n"
-
-                if req.acceptance_criteria:
-                    content += f"**Acceptance Criteria:**  \n{req.acceptance_criteria}\n\n"
-
-                content += "---\n\n"
-
-        content += f"""
-## 3. Traceability
-
-This SRS is part of a complete traceability system. See the Requirements Traceability Matrix (RTM) for links to design and test artifacts.
-
----
-
-## 4. Document Control
-
-**Version:** {data.get('version', '1.0')}
-**Status:** Draft
-**Approvals:** Pending
-
----
-
-*This document was automatically generated by AISET (AI Systems Engineering Tool)*
-"""
-        return content
-
-    def _render_rtm_markdown(self, data: Dict[str, Any]) -> str:
-        """Render RTM as markdown."""
-        stats = data['statistics']
-
-        content = f"""# Requirements Traceability Matrix
-
-**Project:** {data['project'].name}
-**Project Code:** {data['project'].project_code}
-**Document ID:** {data['document_id']}
-**Generated:** {data['generated_at'].strftime('%Y-%m-%d %H:%M:%S UTC')}
-**Generated By:** {data['generated_by']}
-
----
-
-## Coverage Statistics
-
-- **Total Requirements:** {stats['total_requirements']}
-- **Fully Traced:** {stats['fully_traced']} ({stats['coverage_percentage']:.1f}%)
-- **With Design Coverage:** {stats['with_design_coverage']} ({stats['design_coverage_percentage']:.1f}%)
-- **With Test Coverage:** {stats['with_test_coverage']} ({stats['test_coverage_percentage']:.1f}%)
-
----
-
-## Traceability Matrix
-
-| Requirement ID | Title | Type | Priority | Design Components | Test Cases | Status |
-|---------------|-------|------|----------|-------------------|------------|--------|
-"""
-        for row in data['matrix']:
-            design_list = ', '.join([d['id'] for d in row['design_components']]) or '-'
-            test_list = ', '.join([t['id'] for t in row['test_cases']]) or '-'
-            status = '✓' if row['fully_traced'] else '⚠'
-
-            content += f"| {row['requirement_id']} | {row['title'][:40]} | {row['type']} | {row['priority']} | {design_list} | {test_list} | {status} |\n"
-
-        content += """
-
-**Legend:**
-✓ = Fully traced (has both design and test coverage)
-⚠ = Incomplete traceability
+    def _stream_requirements(self, project_id: int, seen_ids: List[int]) -> Iterator[Requirement]:
+        """
+        Yield a project's requirements in batches, grouped by type.
 
----
+        Types come in RequirementType order so the template can start a new
+        section whenever the type changes. Database ids are appended to
+        seen_ids as the requirements are rendered.
+        """
+        type_order = case(
+            *[(Requirement.type == req_type, index) for index, req_type in enumerate(RequirementType)]
+        )
+        query = self.db.query(Requirement).filter(
+            Requirement.project_id == project_id
+        ).order_by(type_order, Requirement.requirement_id).yield_per(REQUIREMENT_BATCH_SIZE)
 
-*This document was automatically generated by AISET (AI Systems Engineering Tool)*
-"""
-        return content
-
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate SHA-256 hash of file for integrity verification."""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        for req in query:
+            seen_ids.append(req.id)
+            yield req
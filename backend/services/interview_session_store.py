@@ -0,0 +1,296 @@
+"""
+Interview Session Store
+DO-178C Traceability: REQ-IS-001, REQ-MONITOR-002
+Purpose: Bounded, expiring storage for live interview sessions
+
+A session is stored as its compact state (script name, project and
+InterviewState.to_dict() as JSON), never as an executor: executors are
+rebuilt per request from the shared, read-only script cache (see
+InterviewScriptCache), so a session costs only its answers and context.
+
+Two backends are available, selected by INTERVIEW_SESSION_BACKEND:
+- memory: per-worker LRU with a sliding TTL and a session cap
+- database: the interview_sessions table, shared by all workers and
+  surviving restarts; expired rows are purged periodically
+
+Both report session counts and stored bytes for /metrics/interview-sessions.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models.project import InterviewSessionState
+from process_engine import InterviewState
+
+
+@dataclass
+class InterviewSession:
+    """A live interview: which script, for which project, and where it is."""
+    session_id: str
+    script_name: str
+    project_id: Optional[int]
+    state: InterviewState
+
+    def to_json(self) -> str:
+        """Compact JSON form of the session."""
+        return json.dumps({
+            "session_id": self.session_id,
+            "script_name": self.script_name,
+            "project_id": self.project_id,
+            "state": self.state.to_dict()
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: str) -> "InterviewSession":
+        """Rebuild a session from to_json() output."""
+        raw = json.loads(data)
+        return cls(
+            session_id=raw["session_id"],
+            script_name=raw["script_name"],
+            project_id=raw.get("project_id"),
+            state=InterviewState.from_dict(raw["state"])
+        )
+
+
+class InterviewSessionStore(ABC):
+    """
+    Storage for interview sessions.
+
+    get() returns a fresh copy; changes are kept only once put() back.
+    Every put() pushes the session's expiry ttl_seconds forward.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        """Get a session, or None if unknown or expired."""
+        pass
+
+    @abstractmethod
+    def put(self, session: InterviewSession) -> None:
+        """Store (create or replace) a session."""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Delete a session; False if it did not exist."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Session count, stored bytes and backend counters."""
+        pass
+
+
+class MemoryInterviewSessionStore(InterviewSessionStore):
+    """
+    Per-worker store: an LRU of serialized sessions with a sliding TTL.
+
+    Sessions beyond max_sessions evict the least recently used one.
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        super().__init__(ttl_seconds)
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._lock = Lock()
+        # session_id -> (expires_at, serialized session)
+        self._sessions: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "evicted_ttl": 0, "evicted_lru": 0}
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        now = self._clock()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[0] <= now:
+                self._remove(session_id)
+                self._counters["evicted_ttl"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self._counters["hits"] += 1
+            data = entry[1]
+        return InterviewSession.from_json(data)
+
+    def put(self, session: InterviewSession) -> None:
+        data = session.to_json()
+        now = self._clock()
+        with self._lock:
+            if session.session_id in self._sessions:
+                self._remove(session.session_id)
+            self._sessions[session.session_id] = (now + self.ttl_seconds, data)
+            self._bytes += len(data)
+            self._evict(now)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._remove(session_id)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict(self._clock())
+            return {
+                "backend": "memory",
+                "sessions": len(self._sessions),
+                "bytes": self._bytes,
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                **self._counters
+            }
+
+    def _remove(self, session_id: str) -> None:
+        _, data = self._sessions.pop(session_id)
+        self._bytes -= len(data)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired sessions, then the least recently used over the cap."""
+        expired = [sid for sid, (expires_at, _) in self._sessions.items() if expires_at <= now]
+        for sid in expired:
+            self._remove(sid)
+        self._counters["evicted_ttl"] += len(expired)
+        while len(self._sessions) > self.max_sessions:
+            sid = next(iter(self._sessions))
+            self._remove(sid)
+            self._counters["evicted_lru"] += 1
+
+
+class DatabaseInterviewSessionStore(InterviewSessionStore):
+    """
+    Shared store over the interview_sessions table.
+
+    Each operation uses its own short-lived database session, so the
+    store never holds a request's session or transaction.
+    """
+
+    # Minimum seconds between purges of expired rows
+    PURGE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, session_factory: Callable[[], Session], ttl_seconds: float):
+        super().__init__(ttl_seconds)
+        self._session_factory = session_factory
+        self._lock = Lock()
+        self._last_purge = 0.0
+        self._counters = {"hits": 0, "misses": 0, "evicted_ttl": 0}
+
+    def get(self, session_id: str) -> Optional[InterviewSession]:
+        db = self._session_factory()
+        try:
+            row = db.get(InterviewSessionState, session_id)
+            if row is None or row.expires_at <= datetime.utcnow():
+                self._count("misses")
+                return None
+            data = row.state_json
+        finally:
+            db.close()
+        self._count("hits")
+        return InterviewSession.from_json(data)
+
+    def put(self, session: InterviewSession) -> None:
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        db = self._session_factory()
+        try:
+            row = db.get(InterviewSessionState, session.session_id)
+            if row is None:
+                row = InterviewSessionState(session_id=session.session_id)
+                db.add(row)
+            row.script_name = session.script_name
+            row.project_id = session.project_id
+            row.state_json = session.to_json()
+            row.expires_at = expires_at
+            db.commit()
+        finally:
+            db.close()
+        self._maybe_purge()
+
+    def delete(self, session_id: str) -> bool:
+        db = self._session_factory()
+        try:
+            deleted = db.query(InterviewSessionState).filter(
+                InterviewSessionState.session_id == session_id
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        return deleted > 0
+
+    def stats(self) -> Dict[str, Any]:
+        self.purge_expired()
+        db = self._session_factory()
+        try:
+            sessions, stored = db.query(
+                func.count(InterviewSessionState.session_id),
+                func.coalesce(func.sum(func.length(InterviewSessionState.state_json)), 0)
+            ).one()
+        finally:
+            db.close()
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "backend": "database",
+            "sessions": sessions,
+            "bytes": int(stored),
+            "ttl_seconds": self.ttl_seconds,
+            **counters
+        }
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        db = self._session_factory()
+        try:
+            purged = db.query(InterviewSessionState).filter(
+                InterviewSessionState.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            self._last_purge = time.monotonic()
+            self._counters["evicted_ttl"] += purged
+        return purged
+
+    def _maybe_purge(self) -> None:
+        with self._lock:
+            due = time.monotonic() - self._last_purge >= self.PURGE_INTERVAL_SECONDS
+        if due:
+            self.purge_expired()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+
+_session_store: Optional[InterviewSessionStore] = None
+_session_store_lock = Lock()
+
+
+def get_interview_session_store() -> InterviewSessionStore:
+    """Get the process-wide interview session store selected in settings."""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                ttl_seconds = settings.interview_session_ttl_minutes * 60
+                if settings.interview_session_backend == "database":
+                    from database.connection import SessionLocal
+                    _session_store = DatabaseInterviewSessionStore(SessionLocal, ttl_seconds)
+                else:
+                    _session_store = MemoryInterviewSessionStore(settings.interview_session_max, ttl_seconds)
+    return _session_store
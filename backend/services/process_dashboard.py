@@ -0,0 +1,282 @@
+"""
+Project Process Dashboard
+DO-178C Traceability: REQ-SM-001, REQ-SM-003
+Purpose: One aggregate view of every CI's process state in a project
+
+The dashboard is built from a single join of configuration_items, the
+ci_state_machines header (cursor, status, progress counters) and the
+ci_current_activities projection, so its cost is one indexed query
+whatever the size of the product structure; no state machine is loaded.
+Machines stored before the normalized tables or the progress counters are
+the exception: their progress is computed in memory, and a read never
+writes; the migration or their next transition stores it.
+
+Built dashboards are cached per project under a revision signature read
+by one aggregate query: the number of CIs and state machines, the highest
+ids, the latest CI update and the sum of the machines' versions. Every
+transition bumps its machine's version (see StateMachineStore.apply), so
+any transition in the project changes the signature and invalidates the
+cached dashboard, in every worker. The signature is also the ETag.
+"""
+
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from models.configuration_item import ConfigurationItem
+from models.project import CIStateMachine, CICurrentActivity
+from services.state_machine_store import StateMachineStore
+
+# Rollup key for CIs without a DAL / without a current phase
+NO_DAL = "none"
+NO_PHASE = "completed"
+
+
+class ProcessDashboard:
+    """
+    Builds and caches project process dashboards.
+
+    The cache is process-wide and bounded; entries are revalidated
+    against the project's revision signature on every read.
+    """
+
+    # Projects kept in the cache (least recently used are evicted)
+    CACHE_SIZE = 128
+
+    _lock = RLock()
+    _cache: "OrderedDict[int, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ==================== Public API ====================
+
+    def etag(self, project_id: int) -> str:
+        """Current ETag of a project's dashboard (one aggregate query)."""
+        return self._revision(project_id)
+
+    def get(self, project_id: int, etag: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Get a project's dashboard.
+
+        Args:
+            etag: Current ETag, if the caller just read it
+
+        Returns:
+            (etag, dashboard); the dashboard is shared and must not be mutated
+        """
+        if etag is None:
+            etag = self._revision(project_id)
+        with self._lock:
+            cached = self._cache.get(project_id)
+            if cached is not None and cached[0] == etag:
+                self._cache.move_to_end(project_id)
+                return cached
+
+        dashboard = self._build(project_id)
+        dashboard["etag"] = etag
+        with self._lock:
+            self._cache[project_id] = (etag, dashboard)
+            self._cache.move_to_end(project_id)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return etag, dashboard
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached dashboards."""
+        with cls._lock:
+            cls._cache.clear()
+
+    # ==================== Revision ====================
+
+    def _revision(self, project_id: int) -> str:
+        signature = tuple(self.db.query(
+            func.count(ConfigurationItem.id),
+            func.max(ConfigurationItem.id),
+            func.max(ConfigurationItem.updated_at),
+            func.count(CIStateMachine.id),
+            func.max(CIStateMachine.id),
+            func.coalesce(func.sum(CIStateMachine.version), 0)
+        ).select_from(ConfigurationItem).outerjoin(
+            CIStateMachine, CIStateMachine.ci_id == ConfigurationItem.id
+        ).filter(
+            ConfigurationItem.project_id == project_id
+        ).one())
+        digest = hashlib.sha1(repr((project_id,) + signature).encode("utf-8")).hexdigest()
+        return f'"{digest}"'
+
+    # ==================== Building ====================
+
+    def _build(self, project_id: int) -> Dict[str, Any]:
+        rows = self.db.query(
+            ConfigurationItem.id,
+            ConfigurationItem.ci_identifier,
+            ConfigurationItem.name,
+            ConfigurationItem.ci_type,
+            ConfigurationItem.parent_id,
+            CIStateMachine.id.label("state_machine_id"),
+            CIStateMachine.template_name,
+            CIStateMachine.dal_level,
+            CIStateMachine.status.label("state_machine_status"),
+            CIStateMachine.current_phase_index,
+            CIStateMachine.total_phases,
+            CIStateMachine.completed_phases,
+            CIStateMachine.total_activities,
+            CIStateMachine.completed_activities,
+            CIStateMachine.progress_percent,
+            or_(
+                CIStateMachine.state_data.isnot(None), CIStateMachine.total_activities.is_(None)
+            ).label("without_progress"),
+            CICurrentActivity.phase_id,
+            CICurrentActivity.phase_name,
+            CICurrentActivity.phase_order,
+            CICurrentActivity.sub_phase_id,
+            CICurrentActivity.sub_phase_name,
+            CICurrentActivity.activity_id,
+            CICurrentActivity.activity_name,
+            CICurrentActivity.activity_type,
+            CICurrentActivity.is_required,
+            CICurrentActivity.status.label("activity_status")
+        ).select_from(ConfigurationItem).outerjoin(
+            CIStateMachine, CIStateMachine.ci_id == ConfigurationItem.id
+        ).outerjoin(
+            CICurrentActivity, CICurrentActivity.state_machine_id == CIStateMachine.id
+        ).filter(
+            ConfigurationItem.project_id == project_id
+        ).order_by(ConfigurationItem.id, CIStateMachine.id).all()
+
+        # The latest machine of a CI wins (same rule as StateMachineStore.get_record)
+        items: Dict[int, Dict[str, Any]] = {}
+        without_progress: Dict[int, int] = {}
+        for row in rows:
+            items[row.id] = self._item(row)
+            without_progress.pop(row.id, None)
+            if row.state_machine_id is not None and row.without_progress:
+                without_progress[row.id] = row.state_machine_id
+        self._fill_progress(items, without_progress)
+
+        by_ci_type: Dict[str, Dict[str, Any]] = {}
+        by_dal: Dict[str, Dict[str, Any]] = {}
+        by_phase: Dict[str, Dict[str, Any]] = {}
+        totals = self._rollup_entry()
+        for item in items.values():
+            process = item["process"]
+            if process is None:
+                continue
+            phase = item["phase"]
+            self._add(totals, process)
+            self._add(by_ci_type.setdefault(item["ci_type"], self._rollup_entry(ci_type=item["ci_type"])), process)
+            dal = process["dal_level"] or NO_DAL
+            self._add(by_dal.setdefault(dal, self._rollup_entry(dal_level=dal)), process)
+            phase_key = phase["phase_id"] if phase else NO_PHASE
+            entry = by_phase.setdefault(phase_key, self._rollup_entry(
+                phase_id=phase_key,
+                name=phase["name"] if phase else None,
+                order=phase["order"] if phase else None
+            ))
+            self._add(entry, process)
+
+        return {
+            "project_id": project_id,
+            "total_cis": len(items),
+            "cis_with_process": sum(1 for item in items.values() if item["process"] is not None),
+            "totals": self._finish(totals),
+            "by_ci_type": [self._finish(e) for _, e in sorted(by_ci_type.items(), key=lambda kv: str(kv[0]))],
+            "by_dal_level": [self._finish(e) for _, e in sorted(by_dal.items())],
+            "by_phase": [
+                self._finish(e) for e in sorted(
+                    by_phase.values(),
+                    key=lambda e: (e["order"] is None, e["order"] if e["order"] is not None else 0, e["phase_id"])
+                )
+            ],
+            "items": list(items.values())
+        }
+
+    def _fill_progress(self, items: Dict[int, Dict[str, Any]], without_progress: Dict[int, int]) -> None:
+        """
+        Progress of machines stored before the normalized tables or the
+        counters, computed in memory; they are backfilled by the migration
+        or by their next transition, never by a read.
+        """
+        if not without_progress:
+            return
+        store = StateMachineStore(self.db)
+        records = self.db.query(CIStateMachine).filter(CIStateMachine.id.in_(without_progress.values()))
+        for record in records:
+            progress = store.read_progress(record)
+            progress["progress_percent"] = round(progress["progress_percent"] or 0.0, 1)
+            items[record.ci_id]["process"].update(progress)
+
+    @staticmethod
+    def _item(row: Any) -> Dict[str, Any]:
+        ci_type = row.ci_type.value if row.ci_type is not None else None
+        item: Dict[str, Any] = {
+            "ci_id": row.id,
+            "ci_identifier": row.ci_identifier,
+            "name": row.name,
+            "ci_type": ci_type,
+            "parent_id": row.parent_id,
+            "process": None,
+            "phase": None,
+            "activity": None
+        }
+        if row.state_machine_id is None:
+            return item
+
+        item["process"] = {
+            "template_name": row.template_name,
+            "dal_level": row.dal_level,
+            "status": row.state_machine_status,
+            "current_phase_index": row.current_phase_index,
+            "total_phases": row.total_phases,
+            "completed_phases": row.completed_phases,
+            "total_activities": row.total_activities,
+            "completed_activities": row.completed_activities,
+            "progress_percent": round(row.progress_percent or 0.0, 1)
+        }
+        if row.phase_id is not None:
+            item["phase"] = {"phase_id": row.phase_id, "name": row.phase_name, "order": row.phase_order}
+        if row.activity_id is not None:
+            item["activity"] = {
+                "activity_id": row.activity_id,
+                "name": row.activity_name,
+                "type": row.activity_type,
+                "required": row.is_required,
+                "status": row.activity_status,
+                "sub_phase_id": row.sub_phase_id,
+                "sub_phase_name": row.sub_phase_name
+            }
+        return item
+
+    # ==================== Rollups ====================
+
+    @staticmethod
+    def _rollup_entry(**key: Any) -> Dict[str, Any]:
+        return {
+            **key,
+            "cis": 0,
+            "total_activities": 0,
+            "completed_activities": 0,
+            "by_status": {}
+        }
+
+    @staticmethod
+    def _add(entry: Dict[str, Any], process: Dict[str, Any]) -> None:
+        entry["cis"] += 1
+        entry["total_activities"] += process["total_activities"] or 0
+        entry["completed_activities"] += process["completed_activities"] or 0
+        status = process["status"]
+        entry["by_status"][status] = entry["by_status"].get(status, 0) + 1
+
+    @staticmethod
+    def _finish(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the activity-weighted progress."""
+        total = entry["total_activities"]
+        entry["progress_percent"] = round(entry["completed_activities"] / total * 100, 1) if total else 0.0
+        return entry
+
@@ -133,11 +133,19 @@ class ProcessEventService:
             "progress_percent": progress_percent
         })
 
-    def emit_progress_updated(self, ci_id: int, progress_percent: float):
+    def emit_progress_updated(
+        self,
+        ci_id: int,
+        progress_percent: float,
+        completed_activities: Optional[int] = None,
+        total_activities: Optional[int] = None
+    ):
         """Emit progress update event."""
         self.emit("progress_updated", {
             "ci_id": ci_id,
-            "progress_percent": progress_percent
+            "progress_percent": progress_percent,
+            "completed_activities": completed_activities,
+            "total_activities": total_activities
         })
 
     async def _broadcast_event(self, event_type: str, data: Dict[str, Any]):
@@ -179,7 +187,9 @@ class ProcessEventService:
         elif event_type == "progress_updated":
             await ws_manager.broadcast_progress_updated(
                 ci_id=ci_id,
-                progress_percent=data.get('progress_percent', 0.0)
+                progress_percent=data.get('progress_percent', 0.0),
+                completed_activities=data.get('completed_activities'),
+                total_activities=data.get('total_activities')
             )
 
 
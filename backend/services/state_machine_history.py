@@ -0,0 +1,223 @@
+"""
+State Machine History
+DO-178C Traceability: REQ-SM-001, REQ-SM-003
+Purpose: Event-sourced audit trail of state machine transitions
+
+Every TransitionEvent produced by the StateMachineController is appended to
+state_machine_history in the same transaction as the state change itself.
+A full snapshot (format 1 dict) is written when a machine is created and
+after every SNAPSHOT_INTERVAL command events, so the state "as of" any past
+time is rebuilt from the nearest earlier snapshot by replaying at most
+SNAPSHOT_INTERVAL commands.
+
+Project-wide history is read with keyset pagination on the row id.
+
+changed_at is stored as timezone-aware UTC (TIMESTAMP WITH TIME ZONE), so
+comparisons do not depend on the database session's time zone. The process
+engine itself works in naive UTC; naive values passed in are taken as UTC.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models.project import CIStateMachine, StateMachineHistory
+from process_engine.services.state_codec import decode_instance
+from process_engine.services.state_machine_generator import (
+    StateMachineController,
+    StateMachineInstance,
+    TransitionEvent,
+    TransitionType,
+)
+
+
+def to_utc(value: datetime) -> datetime:
+    """Timezone-aware UTC datetime (naive values are UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Naive UTC datetime, as used by the process engine."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class StateMachineHistoryStore:
+    """
+    Appends and replays state machine history.
+
+    Like StateMachineStore, it flushes but never commits.
+    """
+
+    # Command events between two snapshots (bounds the replay on reads)
+    SNAPSHOT_INTERVAL = 50
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ==================== Writing ====================
+
+    def append(
+        self,
+        record: CIStateMachine,
+        events: List[TransitionEvent],
+        changed_by: Optional[str] = None
+    ) -> int:
+        """
+        Append controller events in order.
+
+        Returns:
+            Number of command (replayable) events appended
+        """
+        if not events:
+            return 0
+        self.db.execute(insert(StateMachineHistory.__table__), [
+            {
+                "state_machine_id": record.id,
+                "ci_id": record.ci_id,
+                "project_id": record.project_id,
+                "change_type": event.change_type.value,
+                "is_command": event.command,
+                "phase_id": event.phase_id,
+                "activity_id": event.activity_id,
+                "from_status": event.from_status,
+                "to_status": event.to_status,
+                "event_data": event.data or None,
+                "changed_by": changed_by,
+                "changed_at": to_utc(event.at)
+            }
+            for event in events
+        ])
+        return sum(1 for event in events if event.command)
+
+    def snapshot(
+        self,
+        record: CIStateMachine,
+        instance: StateMachineInstance,
+        at: datetime,
+        change_type: TransitionType = TransitionType.SNAPSHOT,
+        changed_by: Optional[str] = None
+    ) -> None:
+        """Append a full snapshot of a completely loaded instance."""
+        self.db.execute(insert(StateMachineHistory).values(
+            **self._snapshot_values(record, instance, at, change_type, changed_by)
+        ))
+
+    def snapshot_many(
+        self,
+        pairs: List[Tuple[CIStateMachine, StateMachineInstance]],
+        change_type: TransitionType = TransitionType.SNAPSHOT,
+        changed_by: Optional[str] = None
+    ) -> None:
+        """Append snapshots of several machines, each at its updated_at, in one executemany."""
+        self.db.execute(insert(StateMachineHistory.__table__), [
+            self._snapshot_values(record, instance, instance.updated_at, change_type, changed_by)
+            for record, instance in pairs
+        ])
+
+    @staticmethod
+    def _snapshot_values(
+        record: CIStateMachine,
+        instance: StateMachineInstance,
+        at: datetime,
+        change_type: TransitionType,
+        changed_by: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "state_machine_id": record.id,
+            "ci_id": record.ci_id,
+            "project_id": record.project_id,
+            "change_type": change_type.value,
+            "is_command": False,
+            "state_snapshot": instance.to_dict(),
+            "changed_by": changed_by,
+            "changed_at": to_utc(at)
+        }
+
+    # ==================== Reading ====================
+
+    def state_as_of(self, record: CIStateMachine, at: datetime) -> Optional[StateMachineInstance]:
+        """
+        Rebuild the state of a machine at a past time.
+
+        Returns:
+            The instance, or None if the machine did not exist yet
+        """
+        at = to_utc(at)
+        snapshot = self.db.query(StateMachineHistory).filter(
+            StateMachineHistory.state_machine_id == record.id,
+            StateMachineHistory.state_snapshot.isnot(None),
+            StateMachineHistory.changed_at <= at
+        ).order_by(StateMachineHistory.id.desc()).first()
+        if snapshot is None:
+            return None
+
+        instance = decode_instance(snapshot.state_snapshot)
+        commands = self.db.query(StateMachineHistory).filter(
+            StateMachineHistory.state_machine_id == record.id,
+            StateMachineHistory.id > snapshot.id,
+            StateMachineHistory.is_command.is_(True),
+            StateMachineHistory.changed_at <= at
+        ).order_by(StateMachineHistory.id).all()
+
+        controller = StateMachineController(instance)
+        for row in commands:
+            controller.replay(self._to_event(row))
+        return instance
+
+    def project_history(
+        self,
+        project_id: int,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        ci_id: Optional[int] = None,
+        change_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of a project's history, oldest first.
+
+        Keyset pagination: pass the returned next_cursor as after_id to
+        read the following page; cost does not grow with the page number.
+        """
+        query = self.db.query(StateMachineHistory).filter(StateMachineHistory.project_id == project_id)
+        if after_id is not None:
+            query = query.filter(StateMachineHistory.id > after_id)
+        if ci_id is not None:
+            query = query.filter(StateMachineHistory.ci_id == ci_id)
+        if change_types:
+            query = query.filter(StateMachineHistory.change_type.in_(change_types))
+        if since is not None:
+            query = query.filter(StateMachineHistory.changed_at >= to_utc(since))
+        if until is not None:
+            query = query.filter(StateMachineHistory.changed_at <= to_utc(until))
+
+        rows = query.order_by(StateMachineHistory.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "project_id": project_id,
+            "items": [row.to_dict() for row in rows],
+            "has_more": has_more,
+            "next_cursor": rows[-1].id if has_more else None
+        }
+
+    @staticmethod
+    def _to_event(row: StateMachineHistory) -> TransitionEvent:
+        return TransitionEvent(
+            change_type=TransitionType(row.change_type),
+            at=to_naive_utc(row.changed_at),
+            command=row.is_command,
+            phase_id=row.phase_id,
+            activity_id=row.activity_id,
+            from_status=row.from_status,
+            to_status=row.to_status,
+            data=row.event_data or {}
+        )
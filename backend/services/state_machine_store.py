@@ -0,0 +1,798 @@
+"""
+State Machine Store
+DO-178C Traceability: REQ-SM-001, REQ-SM-002, REQ-SM-003
+Purpose: Normalized persistence of process engine state machines
+
+A StateMachineInstance is stored as one ci_state_machines header row
+(cursor, status, context), one ci_phase_instances row per phase and one
+ci_activity_instances row per activity.
+
+Transitions load only the phases they can touch (the current one and the
+next one), run the StateMachineController on that window and write back
+only the rows whose state changed. The cost of a transition therefore no
+longer grows with the size of the process template.
+
+New machines are inserted with one batched statement per table, however
+many machines are created at once (create_many).
+
+Concurrent transitions are serialized optimistically: the header UPDATE is
+a compare-and-swap on ci_state_machines.version. transact() retries a
+transition that lost the race on freshly loaded state and raises
+StateMachineConflictError once it can no longer be applied.
+
+Each transition also rewrites the machine's ci_current_activities row, the
+work-queue projection of where every CI currently stands, and appends its
+events to state_machine_history (see StateMachineHistoryStore).
+
+Progress counters (completed/total activities per phase and per machine,
+completed phases, progress_percent) are kept on the phase and header rows
+and adjusted by the delta of each transition, so reading progress never
+scans ci_activity_instances.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from models.configuration_item import ConfigurationItem
+from models.project import CIStateMachine, CIPhaseInstance, CIActivityInstance, CICurrentActivity
+from process_engine.services.state_machine_generator import (
+    StateMachineInstance,
+    StateMachineController,
+    TransitionType,
+    ProcessPrototype,
+    PhasePrototype,
+    SubPhasePrototype,
+    ActivityPrototype,
+    PhaseInstance,
+    SubPhaseInstance,
+    ActivityInstance,
+    CIType as ProcessCIType,
+    PhaseStatus,
+    SubPhaseStatus,
+    ActivityStatus
+)
+from process_engine.services.state_codec import StateCodecError, decode_instance
+from services.state_machine_history import StateMachineHistoryStore
+
+logger = logging.getLogger(__name__)
+
+# Activity statuses that count as done for sub-phase derivation and progress
+DONE_STATUSES = (ActivityStatus.COMPLETED.value, ActivityStatus.SKIPPED.value)
+
+# Header columns maintained by apply() and backfilled by ensure_progress()
+PROGRESS_COUNTERS = (
+    "total_phases", "completed_phases", "total_activities", "completed_activities", "progress_percent"
+)
+
+
+class StateMachineConflictError(Exception):
+    """A transition lost a concurrent update and could not be re-applied."""
+
+    def __init__(self, ci_id: int, current_state: Optional[Dict[str, Any]] = None):
+        super().__init__(f"State machine for CI {ci_id} was modified concurrently")
+        self.ci_id = ci_id
+        self.current_state = current_state
+
+
+class StateMachineStore:
+    """
+    Reads and writes state machines in the normalized tables.
+
+    Callers own the transaction: the store flushes but does not commit
+    (except in transact()).
+
+    Machines persisted as one encoded document (state_data, before the
+    normalized tables existed) are moved by migrate_legacy(), run once by
+    the database migration. Until then they are decoded in memory for
+    reads and migrated by their first transition.
+    """
+
+    # Attempts per transition before a conflict is reported
+    MAX_TRANSITION_ATTEMPTS = 3
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.history = StateMachineHistoryStore(db)
+
+    # ==================== Records ====================
+
+    def get_record(self, ci_id: int) -> Optional[CIStateMachine]:
+        """Get the latest state machine header for a CI."""
+        return self.db.query(CIStateMachine).filter(
+            CIStateMachine.ci_id == ci_id
+        ).order_by(CIStateMachine.created_at.desc(), CIStateMachine.id.desc()).first()
+
+    def create(self, instance: StateMachineInstance, created_by: str = "system") -> CIStateMachine:
+        """Insert a new state machine (header, phase rows, activity rows)."""
+        return self.create_many([instance], created_by)[0]
+
+    def create_many(
+        self,
+        instances: List[StateMachineInstance],
+        created_by: str = "system",
+        project_id: Optional[int] = None
+    ) -> List[CIStateMachine]:
+        """
+        Insert new state machines with one batched statement per table.
+
+        Headers and phase rows are flushed as ORM batches (their ids are
+        needed by the child rows); activities, work-queue rows and CREATED
+        snapshots are each one executemany over all machines.
+
+        Args:
+            instances: Machines to insert
+            created_by: Recorded on the headers and snapshots
+            project_id: Project of all the CIs, if known (otherwise looked up)
+
+        Returns:
+            The header rows, in the order of instances
+        """
+        if not instances:
+            return []
+        if project_id is None:
+            project_ids = dict(self.db.query(ConfigurationItem.id, ConfigurationItem.project_id).filter(
+                ConfigurationItem.id.in_({instance.ci_id for instance in instances})
+            ).all())
+        else:
+            project_ids = {}
+
+        records = []
+        for instance in instances:
+            record = CIStateMachine(
+                guid=instance.instance_id,
+                ci_id=instance.ci_id,
+                ci_type=instance.ci_type.value,
+                project_id=project_id if project_id is not None else project_ids.get(instance.ci_id),
+                template_id=instance.template_id,
+                template_name=instance.template_name,
+                dal_level=instance.dal_level,
+                context_json=dict(instance.context),
+                created_by=created_by
+            )
+            self._write_cursor(record, instance)
+            self._write_progress(record, instance)
+            records.append(record)
+        self.db.add_all(records)
+        self.db.flush()
+
+        pairs = list(zip(records, instances))
+        self._insert_rows(pairs)
+        self._insert_current_activities(pairs)
+        self.history.snapshot_many(pairs, TransitionType.CREATED, created_by)
+        return records
+
+    def _project_id(self, ci_id: int) -> Optional[int]:
+        return self.db.query(ConfigurationItem.project_id).filter(ConfigurationItem.id == ci_id).scalar()
+
+    def _insert_rows(self, pairs: List[Tuple[CIStateMachine, StateMachineInstance]]) -> None:
+        phase_table = CIPhaseInstance.__table__
+        phase_values = [
+            {
+                "state_machine_id": record.id,
+                "ci_id": record.ci_id,
+                "phase_id": phase.phase_id,
+                "phase_name": phase.name,
+                "phase_order": phase.order,
+                "deliverables": list(phase.deliverables),
+                "reviews": list(phase.reviews),
+                "total_activities": phase.total_activities,
+                **self._phase_state(phase)
+            }
+            for record, instance in pairs
+            for phase in instance.phases
+        ]
+        # Batched INSERT ... RETURNING; the activity rows need the phase ids
+        phase_ids = self.db.execute(
+            insert(phase_table).returning(phase_table.c.id, sort_by_parameter_order=True),
+            phase_values
+        ).scalars().all()
+
+        activity_values = []
+        phase_id_iter = iter(phase_ids)
+        for record, instance in pairs:
+            for phase, phase_instance_id in zip(instance.phases, phase_id_iter):
+                for sub_phase in phase.sub_phases:
+                    for position, activity in enumerate(sub_phase.activities):
+                        activity_values.append({
+                            "state_machine_id": record.id,
+                            "phase_instance_id": phase_instance_id,
+                            "ci_id": record.ci_id,
+                            "activity_id": activity.activity_id,
+                            "activity_name": activity.name,
+                            "activity_type": activity.activity_type,
+                            "sub_phase_id": sub_phase.sub_phase_id,
+                            "sub_phase_name": sub_phase.name,
+                            "sub_phase_order": sub_phase.order,
+                            "activity_order": position,
+                            "is_required": activity.required,
+                            "output_artifact_types": list(activity.output_artifacts),
+                            **self._activity_state(activity)
+                        })
+
+        # One executemany instead of an ORM object per activity
+        if activity_values:
+            self.db.execute(insert(CIActivityInstance.__table__), activity_values)
+
+    # ==================== Legacy rows ====================
+
+    def migrate_legacy(self, batch_size: int = 100) -> int:
+        """
+        Move every machine still stored as one encoded document into the
+        normalized tables (the one-off upgrade of a deployed database).
+
+        Returns:
+            Number of machines migrated
+        """
+        migrated = 0
+        last_id = 0
+        while True:
+            records = self.db.query(CIStateMachine).filter(
+                CIStateMachine.state_data.isnot(None),
+                CIStateMachine.id > last_id
+            ).order_by(CIStateMachine.id).limit(batch_size).all()
+            if not records:
+                return migrated
+            for record in records:
+                migrated += self._migrate_legacy(record)
+            last_id = records[-1].id
+
+    def _migrate_legacy(self, record: CIStateMachine) -> bool:
+        """
+        Move a machine stored as one encoded document into the normalized tables.
+
+        Flushes only; the caller's transaction commits the migration. The
+        header is written first with a version bump, so a concurrent
+        migration of the same machine fails with StaleDataError instead of
+        duplicating its rows.
+        """
+        instance = self._decode_legacy(record)
+        if instance is None:
+            return False
+
+        record.ci_type = instance.ci_type.value
+        record.context_json = dict(instance.context)
+        if record.project_id is None:
+            record.project_id = self._project_id(record.ci_id)
+        self._write_cursor(record, instance)
+        self._write_progress(record, instance)
+        record.state_data = None
+        record.version = (record.version or 0) + 1
+        self.db.flush()
+
+        self._insert_rows([(record, instance)])
+        self._sync_current_activity(record, instance)
+        self.history.snapshot(record, instance, instance.updated_at, TransitionType.CREATED)
+        logger.info(f"Migrated state machine {record.id} to normalized storage")
+        return True
+
+    @staticmethod
+    def _decode_legacy(record: CIStateMachine) -> Optional[StateMachineInstance]:
+        try:
+            return decode_instance(record.state_data)
+        except (StateCodecError, ValueError) as e:
+            logger.error(f"Invalid legacy state data for state machine {record.id}: {e}")
+            return None
+
+    # ==================== Loading ====================
+
+    def load(self, record: CIStateMachine) -> StateMachineInstance:
+        """Load the complete state machine instance."""
+        instance, _, _ = self._load(record, window=False)
+        return instance
+
+    def load_current_phase(self, record: CIStateMachine) -> StateMachineInstance:
+        """
+        Load an instance in which only the current phase has sub-phases.
+
+        All phases are present with their own status; the others have no
+        sub-phases or activities loaded.
+        """
+        instance, _, _ = self._load(record, window=True, lookahead=0)
+        return instance
+
+    def _load(
+        self,
+        record: CIStateMachine,
+        window: bool,
+        lookahead: int = 1
+    ) -> Tuple[StateMachineInstance, List[Tuple[PhaseInstance, CIPhaseInstance]], List[Tuple[ActivityInstance, CIActivityInstance]]]:
+        """
+        Build an instance from the rows.
+
+        With window=True only the current phase (and `lookahead` following
+        phases) get their activities loaded.
+
+        Returns:
+            (instance, loaded phase pairs, loaded activity pairs)
+        """
+        if record.state_data:
+            instance = self._decode_legacy(record)
+            if instance is not None:
+                return instance, [], []
+
+        phase_rows = self.db.query(CIPhaseInstance).filter(
+            CIPhaseInstance.state_machine_id == record.id
+        ).order_by(CIPhaseInstance.id).all()
+
+        current_index = record.current_phase_index or 0
+        if window:
+            loaded_rows = phase_rows[current_index:current_index + 1 + lookahead]
+        else:
+            loaded_rows = phase_rows
+
+        activities_by_phase: Dict[int, List[CIActivityInstance]] = {row.id: [] for row in loaded_rows}
+        if loaded_rows:
+            query = self.db.query(CIActivityInstance).filter(
+                CIActivityInstance.state_machine_id == record.id
+            )
+            if window:
+                query = query.filter(CIActivityInstance.phase_instance_id.in_(list(activities_by_phase)))
+            for row in query.order_by(CIActivityInstance.id):
+                activities_by_phase[row.phase_instance_id].append(row)
+
+        grouped: Dict[int, List[List[CIActivityInstance]]] = {
+            phase_id: self._group_by_sub_phase(rows) for phase_id, rows in activities_by_phase.items()
+        }
+        prototype = ProcessPrototype(
+            template_id=record.template_id,
+            template_name=record.template_name,
+            dal_level=record.dal_level,
+            phases=tuple(
+                PhasePrototype(
+                    phase_id=row.phase_id,
+                    name=row.phase_name,
+                    order=row.phase_order,
+                    deliverables=tuple(row.deliverables or ()),
+                    reviews=tuple(row.reviews or ()),
+                    sub_phases=tuple(self._sub_phase_prototype(group) for group in grouped.get(row.id, ()))
+                )
+                for row in phase_rows
+            )
+        )
+        instance = StateMachineInstance(
+            instance_id=record.guid,
+            ci_id=record.ci_id,
+            ci_type=ProcessCIType(record.ci_type),
+            prototype=prototype,
+            current_phase_index=current_index,
+            created_at=record.created_at or datetime.utcnow(),
+            updated_at=record.updated_at or record.created_at or datetime.utcnow(),
+            context=dict(record.context_json or {})
+        )
+
+        # Views write through to the instance, so the pairs stay valid
+        phase_pairs = []
+        activity_pairs = []
+        for index, (phase, row) in enumerate(zip(instance.phases, phase_rows)):
+            is_current = index == current_index
+            phase.status = PhaseStatus(row.status)
+            phase.started_at = row.started_at
+            phase.completed_at = row.completed_at
+            phase.entry_criteria_met = row.entry_criteria_met
+            phase.exit_criteria_met = row.exit_criteria_met
+            if row.id in grouped:
+                self._restore_sub_phases(
+                    phase.sub_phases,
+                    grouped[row.id],
+                    activity_pairs,
+                    record.current_activity_index if is_current else None,
+                    record.current_sub_phase_index if is_current else None
+                )
+                phase_pairs.append((phase, row))
+            if is_current:
+                phase.current_sub_phase_index = record.current_sub_phase_index or 0
+            elif phase.status == PhaseStatus.COMPLETED and phase.node.sub_phases:
+                phase.current_sub_phase_index = len(phase.node.sub_phases) - 1
+
+        return instance, phase_pairs, activity_pairs
+
+    @staticmethod
+    def _group_by_sub_phase(activity_rows: List[CIActivityInstance]) -> List[List[CIActivityInstance]]:
+        """Split a phase's activity rows (in template order) into sub-phase runs."""
+        groups: List[List[CIActivityInstance]] = []
+        for row in activity_rows:
+            if not groups or groups[-1][0].sub_phase_id != row.sub_phase_id:
+                groups.append([])
+            groups[-1].append(row)
+        return groups
+
+    @staticmethod
+    def _sub_phase_prototype(rows: List[CIActivityInstance]) -> SubPhasePrototype:
+        first = rows[0]
+        return SubPhasePrototype(
+            sub_phase_id=first.sub_phase_id,
+            name=first.sub_phase_name,
+            order=first.sub_phase_order,
+            activities=tuple(
+                ActivityPrototype(
+                    activity_id=row.activity_id,
+                    name=row.activity_name,
+                    activity_type=row.activity_type,
+                    required=row.is_required,
+                    output_artifacts=tuple(row.output_artifact_types or ())
+                )
+                for row in rows
+            )
+        )
+
+    @staticmethod
+    def _restore_sub_phases(
+        sub_phases: List[SubPhaseInstance],
+        groups: List[List[CIActivityInstance]],
+        activity_pairs: List[Tuple[ActivityInstance, CIActivityInstance]],
+        cursor_activity_index: Optional[int],
+        cursor_sub_phase_index: Optional[int]
+    ) -> None:
+        """Restore activity state from the rows and derive sub-phase status."""
+        for index, (sub_phase, rows) in enumerate(zip(sub_phases, groups)):
+            activities = sub_phase.activities
+            for activity, row in zip(activities, rows):
+                activity.status = ActivityStatus(row.status)
+                activity.started_at = row.started_at
+                activity.completed_at = row.completed_at
+                activity.completion_data = dict(row.completion_data or {})
+                activity_pairs.append((activity, row))
+
+            if all(row.status in DONE_STATUSES for row in rows):
+                sub_phase.status = SubPhaseStatus.COMPLETED
+                sub_phase.completed_at = rows[-1].completed_at
+                sub_phase.current_activity_index = len(rows) - 1
+            elif any(row.status != ActivityStatus.NOT_STARTED.value for row in rows):
+                sub_phase.status = SubPhaseStatus.IN_PROGRESS
+            if sub_phase.status != SubPhaseStatus.NOT_STARTED:
+                sub_phase.started_at = rows[0].started_at
+            if index == cursor_sub_phase_index:
+                sub_phase.current_activity_index = cursor_activity_index or 0
+
+    # ==================== Transitions ====================
+
+    def apply(
+        self,
+        record: CIStateMachine,
+        transition: Callable[[StateMachineController], bool],
+        changed_by: Optional[str] = None
+    ) -> Optional[StateMachineInstance]:
+        """
+        Run a controller transition and persist only what it changed.
+
+        The controller's events are appended to the history, followed by a
+        full snapshot once SNAPSHOT_INTERVAL command events have accumulated.
+
+        Args:
+            record: State machine header row
+            transition: Called with a controller over the current window;
+                returns False to abort without writing
+            changed_by: User recorded in the history
+
+        Returns:
+            The (windowed) instance after the transition, or None if rejected.
+            Phases outside the window carry their status but no sub-phases,
+            so its own progress figures only cover the window; the header
+            row's counters cover the whole machine.
+        """
+        if record.state_data:
+            self._migrate_legacy(record)
+        self.ensure_progress(record)
+        instance, phase_pairs, activity_pairs = self._load(record, window=True)
+        phase_before = [self._phase_state(phase) for phase, _ in phase_pairs]
+        activity_before = [self._activity_state(activity) for activity, _ in activity_pairs]
+
+        controller = StateMachineController(instance)
+        if not transition(controller):
+            return None
+
+        done_delta = 0
+        for (phase, row), before in zip(phase_pairs, phase_before):
+            after = self._phase_state(phase)
+            done_delta += after["completed_activities"] - before["completed_activities"]
+            self._update_row(row, before, after)
+        for (activity, row), before in zip(activity_pairs, activity_before):
+            self._update_row(row, before, self._activity_state(activity))
+        self._write_cursor(record, instance)
+        # Every phase carries its status even outside the window
+        record.completed_phases = sum(1 for phase in instance.phases if phase.status == PhaseStatus.COMPLETED)
+        record.completed_activities += done_delta
+        record.progress_percent = self._percent(record.completed_activities, record.total_activities)
+        self._sync_current_activity(record, instance)
+
+        commands = self.history.append(record, controller.events, changed_by)
+        pending = (record.events_since_snapshot or 0) + commands
+        snapshot_due = pending >= self.history.SNAPSHOT_INTERVAL
+        record.events_since_snapshot = 0 if snapshot_due else pending
+
+        # Compare-and-swap: UPDATE ... WHERE version = <version read>
+        record.version = (record.version or 0) + 1
+        self.db.flush()
+
+        if snapshot_due:
+            self.history.snapshot(record, self.load(record), controller.events[-1].at, changed_by=changed_by)
+        return instance
+
+    def transact(
+        self,
+        ci_id: int,
+        transition: Callable[[StateMachineController], bool],
+        changed_by: Optional[str] = None
+    ) -> Optional[CIStateMachine]:
+        """
+        Apply a transition and commit, retrying on concurrent modification.
+
+        On a version conflict the transaction is rolled back and the
+        transition is re-run against the state the other writer committed.
+
+        Returns:
+            The committed header row (cursor and progress counters), or None
+            if there is no state machine or the transition is rejected
+
+        Raises:
+            StateMachineConflictError: The transition kept losing the race,
+                or was rejected after the state changed underneath it
+        """
+        conflicted = False
+        for attempt in range(1, self.MAX_TRANSITION_ATTEMPTS + 1):
+            record = self.get_record(ci_id)
+            if record is None:
+                return None
+            try:
+                if self.apply(record, transition, changed_by) is None:
+                    if conflicted:
+                        raise self._conflict(ci_id)
+                    return None
+                self.db.commit()
+                return record
+            except StaleDataError:
+                self.db.rollback()
+                conflicted = True
+                logger.info(f"Concurrent update of state machine for CI {ci_id} (attempt {attempt})")
+
+        raise self._conflict(ci_id)
+
+    def _conflict(self, ci_id: int) -> StateMachineConflictError:
+        self.db.rollback()
+        record = self.get_record(ci_id)
+        current_state = None
+        if record is not None:
+            current_state = {
+                "version": record.version,
+                "current_phase_index": record.current_phase_index,
+                "state_data": self.load(record).to_dict()
+            }
+        return StateMachineConflictError(ci_id, current_state)
+
+    @staticmethod
+    def _update_row(row: Any, before: Dict[str, Any], after: Dict[str, Any]) -> None:
+        for key, value in after.items():
+            if before[key] != value:
+                setattr(row, key, value)
+
+    # ==================== Work queue projection ====================
+
+    def _sync_current_activity(
+        self,
+        record: CIStateMachine,
+        instance: StateMachineInstance,
+        inserted: bool = True
+    ) -> None:
+        """
+        Rewrite the machine's ci_current_activities row.
+
+        Args:
+            inserted: Whether the row may already exist; False skips the
+                UPDATE for a machine that is being created
+        """
+        if inserted:
+            result = self.db.execute(
+                update(CICurrentActivity)
+                .where(CICurrentActivity.state_machine_id == record.id)
+                .values(**self._current_activity_values(record, instance))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                return
+
+        # First write (new machine, or one created before the projection)
+        self._insert_current_activities([(record, instance)])
+
+    def _insert_current_activities(self, pairs: List[Tuple[CIStateMachine, StateMachineInstance]]) -> None:
+        self.db.execute(insert(CICurrentActivity.__table__), [
+            {
+                "state_machine_id": record.id,
+                "ci_id": record.ci_id,
+                "project_id": record.project_id,
+                "ci_type": record.ci_type,
+                "dal_level": record.dal_level,
+                **self._current_activity_values(record, instance)
+            }
+            for record, instance in pairs
+        ])
+
+    @staticmethod
+    def _current_activity_values(record: CIStateMachine, instance: StateMachineInstance) -> Dict[str, Any]:
+        values: Dict[str, Any] = {
+            "phase_id": None,
+            "phase_name": None,
+            "phase_order": None,
+            "sub_phase_id": None,
+            "sub_phase_name": None,
+            "activity_id": None,
+            "activity_name": None,
+            "activity_type": None,
+            "is_required": None,
+            "started_at": None,
+            "status": record.status,
+            "state_machine_status": record.status
+        }
+
+        phase = instance.current_phase
+        if phase is None:
+            return values
+        values.update(phase_id=phase.phase_id, phase_name=phase.name, phase_order=phase.order)
+
+        sub_phases = phase.sub_phases
+        if phase.current_sub_phase_index >= len(sub_phases):
+            return values
+        sub_phase = sub_phases[phase.current_sub_phase_index]
+        values.update(sub_phase_id=sub_phase.sub_phase_id, sub_phase_name=sub_phase.name)
+
+        activities = sub_phase.activities
+        if sub_phase.current_activity_index >= len(activities):
+            return values
+        activity = activities[sub_phase.current_activity_index]
+        values.update(
+            activity_id=activity.activity_id,
+            activity_name=activity.name,
+            activity_type=activity.activity_type,
+            is_required=activity.required,
+            started_at=activity.started_at,
+            status=activity.status.value
+        )
+        return values
+
+    # ==================== Queries ====================
+
+    def get_phase_rows(self, record: CIStateMachine) -> List[CIPhaseInstance]:
+        """Phase rows in template order."""
+        return self.db.query(CIPhaseInstance).filter(
+            CIPhaseInstance.state_machine_id == record.id
+        ).order_by(CIPhaseInstance.id).all()
+
+    def count_activities(self, record: CIStateMachine) -> Tuple[int, int]:
+        """Return (total, completed or skipped) activity counts."""
+        self.ensure_progress(record)
+        return record.total_activities, record.completed_activities
+
+    # ==================== Progress counters ====================
+
+    def ensure_progress(self, record: CIStateMachine) -> None:
+        """
+        Backfill the counters of a machine stored before they existed.
+
+        One grouped scan of its activity rows, after which the counters are
+        maintained by apply().
+        """
+        if record.total_activities is not None:
+            return
+        if record.state_data:
+            instance = self._decode_legacy(record)
+            if instance is not None:
+                self._write_progress(record, instance)
+                return
+
+        by_phase = self._count_by_phase(record)
+        phase_rows = self.get_phase_rows(record)
+        for row in phase_rows:
+            row.total_activities, row.completed_activities = by_phase.get(row.id, (0, 0))
+        progress = self._row_progress([row.status for row in phase_rows], by_phase)
+        for key, value in progress.items():
+            setattr(record, key, value)
+
+    def read_progress(self, record: CIStateMachine) -> Dict[str, Any]:
+        """
+        Header counters of a machine, without writing anything.
+
+        The stored counters, or for a machine not backfilled yet the same
+        figures ensure_progress() would store, computed in memory.
+        """
+        if record.total_activities is not None:
+            return {key: getattr(record, key) for key in PROGRESS_COUNTERS}
+        if record.state_data:
+            instance = self._decode_legacy(record)
+            if instance is not None:
+                return self._instance_progress(instance)
+
+        statuses = [status for (status,) in self.db.query(CIPhaseInstance.status).filter(
+            CIPhaseInstance.state_machine_id == record.id
+        )]
+        return self._row_progress(statuses, self._count_by_phase(record))
+
+    def _count_by_phase(self, record: CIStateMachine) -> Dict[int, Tuple[int, int]]:
+        """(total, done) activities per phase row: one grouped scan."""
+        counts = self.db.query(
+            CIActivityInstance.phase_instance_id,
+            func.count(CIActivityInstance.id),
+            func.sum(case((CIActivityInstance.status.in_(DONE_STATUSES), 1), else_=0))
+        ).filter(
+            CIActivityInstance.state_machine_id == record.id
+        ).group_by(CIActivityInstance.phase_instance_id).all()
+        return {phase_instance_id: (total, int(done or 0)) for phase_instance_id, total, done in counts}
+
+    @classmethod
+    def _row_progress(cls, phase_statuses: List[str], by_phase: Dict[int, Tuple[int, int]]) -> Dict[str, Any]:
+        total = sum(total for total, _ in by_phase.values())
+        done = sum(done for _, done in by_phase.values())
+        return {
+            "total_phases": len(phase_statuses),
+            "completed_phases": sum(1 for status in phase_statuses if status == PhaseStatus.COMPLETED.value),
+            "total_activities": total,
+            "completed_activities": done,
+            "progress_percent": cls._percent(done, total)
+        }
+
+    @classmethod
+    def _write_progress(cls, record: CIStateMachine, instance: StateMachineInstance) -> None:
+        """Set the header counters from a completely loaded instance."""
+        for key, value in cls._instance_progress(instance).items():
+            setattr(record, key, value)
+
+    @classmethod
+    def _instance_progress(cls, instance: StateMachineInstance) -> Dict[str, Any]:
+        return {
+            "total_phases": len(instance.phases),
+            "completed_phases": sum(1 for phase in instance.phases if phase.status == PhaseStatus.COMPLETED),
+            "total_activities": instance.total_activities,
+            "completed_activities": instance.completed_activities,
+            "progress_percent": cls._percent(instance.completed_activities, instance.total_activities)
+        }
+
+    @staticmethod
+    def _percent(completed: int, total: int) -> float:
+        return completed / total * 100 if total else 0.0
+
+    # ==================== Row state ====================
+
+    @staticmethod
+    def _phase_state(phase: PhaseInstance) -> Dict[str, Any]:
+        return {
+            "status": phase.status.value,
+            "entry_criteria_met": phase.entry_criteria_met,
+            "exit_criteria_met": phase.exit_criteria_met,
+            "completed_activities": phase.completed_activities,
+            "started_at": phase.started_at,
+            "completed_at": phase.completed_at
+        }
+
+    @staticmethod
+    def _activity_state(activity: ActivityInstance) -> Dict[str, Any]:
+        return {
+            "status": activity.status.value,
+            "started_at": activity.started_at,
+            "completed_at": activity.completed_at,
+            "completion_data": dict(activity.completion_data)
+        }
+
+    @staticmethod
+    def _write_cursor(record: CIStateMachine, instance: StateMachineInstance) -> None:
+        record.current_phase_index = instance.current_phase_index
+        record.current_sub_phase_index = 0
+        record.current_activity_index = 0
+
+        phase = instance.current_phase
+        if phase is not None:
+            record.current_sub_phase_index = phase.current_sub_phase_index
+            if phase.current_sub_phase_index < len(phase.sub_phases):
+                sub_phase = phase.sub_phases[phase.current_sub_phase_index]
+                record.current_activity_index = sub_phase.current_activity_index
+
+        if instance.phases and all(p.status == PhaseStatus.COMPLETED for p in instance.phases):
+            record.status = "completed"
+        elif phase is not None and phase.status == PhaseStatus.BLOCKED:
+            record.status = "blocked"
+        elif any(p.status != PhaseStatus.NOT_STARTED for p in instance.phases):
+            record.status = "in_progress"
+        else:
+            record.status = "not_started"
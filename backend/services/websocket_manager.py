@@ -12,7 +12,7 @@ Features:
 - Automatic reconnection handling
 """
 
-from typing import Dict, Set, Any
+from typing import Dict, Set, Any, Optional
 from datetime import datetime
 import logging
 import socketio
@@ -194,14 +194,22 @@ class WebSocketManager:
         await self.sio.emit('process_event', event_data, room=f'ci_{ci_id}')
         logger.info(f"Broadcasted phase_completed for CI {ci_id}")
 
-    async def broadcast_progress_updated(self, ci_id: int, progress_percent: float):
+    async def broadcast_progress_updated(
+        self,
+        ci_id: int,
+        progress_percent: float,
+        completed_activities: Optional[int] = None,
+        total_activities: Optional[int] = None
+    ):
         """Broadcast progress update to subscribed clients."""
         event_data = {
             "type": "progress_updated",
             "timestamp": datetime.utcnow().isoformat(),
             "data": {
                 "ci_id": ci_id,
-                "progress_percent": progress_percent
+                "progress_percent": progress_percent,
+                "completed_activities": completed_activities,
+                "total_activities": total_activities
             }
         }
 
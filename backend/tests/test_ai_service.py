@@ -5,7 +5,7 @@ DO-178C Traceability: Verification of REQ-AI-001, REQ-AI-002, REQ-AI-010
 
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
-from services.ai_service import AIService, ClaudeProvider, LMStudioProvider
+from services.ai_service import AIService, ClaudeProvider, LMStudioProvider, FakeProvider, FakeProviderError
 
 
 class TestAIServiceBehavior:
@@ -273,6 +273,83 @@ class TestTraceabilitySuggestion:
         assert suggestions[0]["confidence_score"] == 0.85
 
 
+class TestFakeProvider:
+    """Test the deterministic fake provider used for load testing."""
+
+    @pytest.fixture
+    def fake(self):
+        """Fake provider with no simulated latency."""
+        return FakeProvider(seed=42, script_path="", ttft_ms=0, ms_per_token=0, error_rate=0)
+
+    @pytest.mark.asyncio
+    async def test_same_prompt_same_output(self, fake):
+        """
+        Test REQ-TEST-001: Fake output is deterministic for a given seed and prompt.
+
+        Verification Method: Test
+        Expected: Identical requests produce identical content and token counts.
+        """
+        messages = [{"role": "user", "content": "A flight computer"}]
+        first = await fake.chat(messages, system_prompt="Ask one question")
+        second = await fake.chat(messages, system_prompt="Ask one question")
+
+        assert first["content"] == second["content"]
+        assert first["input_tokens"] == second["input_tokens"]
+        assert first["tokens_used"] == first["input_tokens"] + first["output_tokens"]
+
+    @pytest.mark.asyncio
+    async def test_extraction_returns_json(self, fake):
+        """
+        Test REQ-AI-009: Fake extraction output parses as a requirements array.
+
+        Verification Method: Test
+        Expected: extract_requirements returns structured requirements.
+        """
+        service = AIService()
+        service.provider = fake
+
+        requirements = await service.extract_requirements("user: the system must hold altitude")
+
+        assert len(requirements) >= 1
+        assert "title" in requirements[0]
+
+    @pytest.mark.asyncio
+    async def test_scripted_response(self, tmp_path):
+        """
+        Test REQ-TEST-001: Scripted responses override generated output.
+
+        Verification Method: Test
+        Expected: Matching rule content is returned, truncated to max_tokens.
+        """
+        import json
+        script = tmp_path / "script.json"
+        script.write_text(json.dumps({
+            "responses": [{"match": "altitude", "content": "What is the maximum altitude?"}],
+            "default": "x" * 400
+        }))
+        fake = FakeProvider(seed=1, script_path=str(script), ttft_ms=0, ms_per_token=0, error_rate=0)
+
+        matched = await fake.chat([{"role": "user", "content": "Altitude hold"}])
+        fallback = await fake.chat([{"role": "user", "content": "Other"}], max_tokens=10)
+
+        assert matched["content"] == "What is the maximum altitude?"
+        assert fallback["stop_reason"] == "max_tokens"
+        assert fallback["output_tokens"] == 10
+
+    @pytest.mark.asyncio
+    async def test_error_injection(self):
+        """
+        Test REQ-TEST-001: Configured error rate raises provider errors.
+
+        Verification Method: Test
+        Expected: error_rate=1 always raises FakeProviderError.
+        """
+        fake = FakeProvider(seed=1, script_path="", ttft_ms=0, ms_per_token=0, error_rate=1.0)
+
+        with pytest.raises(FakeProviderError):
+            await fake.chat([{"role": "user", "content": "hello"}])
+
+
 # Test execution metadata
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
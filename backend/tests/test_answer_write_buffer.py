@@ -0,0 +1,184 @@
+"""
+Unit tests for the interview answer write buffer
+DO-178C Traceability: Verification of REQ-DC-003, REQ-IS-001
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Query, Session
+
+from models.project import InterviewAnswer, Project
+from process_engine import AnswerWriteBuffer, DataCaptureService, create_interview
+
+SCRIPT = "project_initialization"
+
+
+def _question(question_id, column, json_path=None):
+    target = {"table": "projects", "column": column}
+    if json_path:
+        target.update({"transformation": "json_merge", "json_path": json_path})
+    return {"question_id": question_id, "variants": [f"{question_id}?"], "target": target}
+
+
+@pytest.fixture
+def project_updates(engine):
+    """UPDATE statements issued against the projects table."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE PROJECTS"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+class TestBuffering:
+    """Test coalescing of project writes."""
+
+    def test_answers_applied_in_one_update(self, db: Session, test_project, project_updates):
+        """
+        Test REQ-DC-003: Pending answers are applied with a single project UPDATE.
+
+        Verification Method: Test
+        Expected: No project write before flush; one after; JSON keys merged in order.
+        """
+        project_id = test_project.id
+        buffer = AnswerWriteBuffer(db, project_id, "session-1")
+        capture = DataCaptureService(db)
+        answers = [
+            (_question("Q1", "description"), "First description"),
+            (_question("Q2", "initialization_context", "team_size"), "small"),
+            (_question("Q3", "initialization_context", "certification_required"), True),
+            (_question("Q4", "initialization_context", "team_size"), "large"),
+            (_question("Q5", "description"), "Final description"),
+        ]
+        for question_def, value in answers:
+            result = capture.capture(value, question_def, project_id, answer_buffer=buffer)
+            assert result.buffered and not result.stored
+
+        assert project_updates == []
+        assert buffer.flush().success
+        assert len(project_updates) == 1
+
+        db.expire_all()
+        project = db.get(Project, project_id)
+        assert project.description == "Final description"
+        assert project.initialization_context == {"team_size": "large", "certification_required": True}
+        rows = db.query(InterviewAnswer).order_by(InterviewAnswer.id).all()
+        assert [row.question_id for row in rows] == ["Q1", "Q2", "Q3", "Q4", "Q5"]
+        assert all(row.storage_successful and row.session_id == "session-1" for row in rows)
+
+        # Nothing left pending
+        assert buffer.flush().success and len(project_updates) == 1
+
+    def test_pending_answers_survive_restart(self, db: Session, test_project):
+        """
+        Test REQ-DC-003: Answers recorded before a crash are applied by a later flush.
+
+        Verification Method: Test
+        Expected: A new buffer for the project applies the earlier session's answers.
+        """
+        project_id = test_project.id
+        AnswerWriteBuffer(db, project_id, "lost").record(
+            _question("Q1", "product_type"), "FCC", "FCC", _question("Q1", "product_type")["target"]
+        )
+        db.expire_all()
+
+        assert AnswerWriteBuffer(db, project_id).flush().success
+        assert db.get(Project, project_id).product_type == "FCC"
+
+    def test_rejected_answer_does_not_block_others(self, db: Session, test_project):
+        """
+        Test REQ-DC-003: A write the database rejects is set aside, the rest applied.
+
+        Verification Method: Test
+        Expected: Duplicate project name rejected with storage_error; description stored.
+        """
+        db.add(Project(name="Other Project", project_code="OTHER-001"))
+        db.commit()
+        project_id = test_project.id
+        buffer = AnswerWriteBuffer(db, project_id)
+        buffer.record(_question("Q1", "name"), "Other Project", "Other Project", {"table": "projects", "column": "name"})
+        buffer.record(_question("Q2", "description"), "Kept", "Kept", {"table": "projects", "column": "description"})
+
+        result = buffer.flush()
+
+        assert not result.success and "Q1" in result.error
+        db.expire_all()
+        assert db.get(Project, project_id).description == "Kept"
+        rejected = db.query(InterviewAnswer).filter(InterviewAnswer.question_id == "Q1").one()
+        assert rejected.storage_error and not rejected.storage_successful
+        assert buffer.flush().success
+
+
+class TestFlushBoundaries:
+    """Test when an interview flushes its buffer."""
+
+    def test_flush_on_sub_phase_boundary(self, db: Session, test_project, project_updates):
+        """
+        Test REQ-IS-001: Answers within a sub-phase are held until the next sub-phase starts.
+
+        Verification Method: Test
+        Expected: No project UPDATE for PI-001 and PI-002; one when PI-003 leads into PI_DOMAIN.
+        """
+        project_id = test_project.id
+        executor = create_interview(SCRIPT, db)
+        buffer = AnswerWriteBuffer(db, project_id, "session-2")
+        state = executor.create_initial_state()
+
+        for answer in ["Buffered Project", "A flight control computer for a light aircraft.", "fcc-01"]:
+            previous = state.current_sub_phase
+            question_id = state.current_question_id
+            result = executor.process_answer(question_id, answer, state.context, project_id, answer_buffer=buffer)
+            assert result.valid
+            state = executor.update_state(state, question_id, result)
+            executor.flush_answers(buffer, previous, state, result)
+            if state.current_sub_phase == previous:
+                assert project_updates == []
+
+        assert state.current_sub_phase == "PI_DOMAIN"
+        assert len(project_updates) == 1
+        db.expire_all()
+        project = db.get(Project, project_id)
+        assert (project.name, project.project_code) == ("Buffered Project", "FCC-01")
+
+    def test_flush_when_due(self, db: Session, test_project):
+        """
+        Test REQ-DC-003: A pending answer older than the maximum delay makes a flush due.
+
+        Verification Method: Test
+        Expected: due() false for a fresh answer, true once it is older than the delay.
+        """
+        buffer = AnswerWriteBuffer(db, test_project.id)
+        assert not buffer.due()
+
+        buffer.record(_question("Q1", "product_type"), "FCC", "FCC", {"table": "projects", "column": "product_type"})
+        assert not buffer.due()
+
+        row = db.query(InterviewAnswer).one()
+        row.answered_at = datetime.now(timezone.utc) - timedelta(seconds=AnswerWriteBuffer.MAX_DELAY_SECONDS + 1)
+        db.commit()
+        assert buffer.due()
+
+    @pytest.mark.parametrize("offset_hours", [0, -5])
+    def test_due_with_timezone_aware_timestamps(self, db: Session, test_project, monkeypatch, offset_hours):
+        """
+        Test REQ-DC-003: due() accepts the aware timestamps of TIMESTAMP WITH TIME ZONE columns.
+
+        Verification Method: Test
+        Expected: The age is computed in UTC whatever the returned offset; no TypeError.
+        """
+        buffer = AnswerWriteBuffer(db, test_project.id)
+        zone = timezone(timedelta(hours=offset_hours))
+        fresh = datetime.now(zone)
+        stale = fresh - timedelta(seconds=AnswerWriteBuffer.MAX_DELAY_SECONDS + 1)
+
+        # PostgreSQL returns aware values; SQLite does not, so substitute the MIN() result
+        monkeypatch.setattr(Query, "scalar", lambda query: fresh)
+        assert not buffer.due()
+        monkeypatch.setattr(Query, "scalar", lambda query: stale)
+        assert buffer.due()
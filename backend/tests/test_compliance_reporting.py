@@ -0,0 +1,268 @@
+"""
+Unit tests for aggregate-backed compliance reporting
+DO-178C Traceability: Verification of REQ-BE-029
+"""
+
+from functools import cached_property
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import CIStateMachine, ConfigurationItem, DesignComponent, Requirement, TestCase
+from models.audit import ChangeRequest, ChangeRequestStatus, ImpactLevel
+from models.configuration_item import CIStatus
+from models.project import CIPhaseInstance
+from models.requirement import RequirementStatus
+from models.test_case import TestStatus
+from models.traceability import GapType, RequirementDesignTrace, RequirementTestTrace, TraceabilityGap
+from services import compliance_reporting_service
+from services.compliance_reporting_service import ComplianceReportingService, ComplianceSnapshot
+
+
+@pytest.fixture
+def project_data(db: Session, test_project):
+    """
+    Four requirements: REQ-1 traced to design and a passing test, REQ-2 to
+    a failing test, REQ-3 to design only, REQ-4 untraced.
+    """
+    pid = test_project.id
+    requirements = [
+        Requirement(project_id=pid, requirement_id=f"REQ-{i}", title=f"Requirement {i}", description="-",
+                    type=req_type, status=status)
+        for i, req_type, status in (
+            (1, "functional", RequirementStatus.APPROVED),
+            (2, "functional", RequirementStatus.VERIFIED),
+            (3, "safety", RequirementStatus.DRAFT),
+            (4, "safety", RequirementStatus.DRAFT),
+        )
+    ]
+    component = DesignComponent(project_id=pid, component_id="COMP-1", name="Controller", description="-",
+                                type="module", file_path="controller.py")
+    passing = TestCase(project_id=pid, test_id="TEST-1", title="Passing", description="-", type="unit",
+                       status=TestStatus.PASSED)
+    failing = TestCase(project_id=pid, test_id="TEST-2", title="Failing", description="-", type="unit",
+                       status=TestStatus.FAILED)
+    db.add_all([*requirements, component, passing, failing])
+    db.flush()
+    db.add_all([
+        RequirementDesignTrace(requirement_id=requirements[0].id, design_component_id=component.id),
+        RequirementDesignTrace(requirement_id=requirements[2].id, design_component_id=component.id),
+        RequirementTestTrace(requirement_id=requirements[0].id, test_case_id=passing.id),
+        RequirementTestTrace(requirement_id=requirements[1].id, test_case_id=failing.id),
+        TraceabilityGap(project_id=pid, gap_type=GapType.MISSING_TEST, requirement_id=requirements[3].id,
+                        severity="high", description="No test"),
+    ])
+    db.commit()
+    return test_project
+
+
+@pytest.fixture
+def configuration(db: Session, test_project):
+    """Two configuration items with a state machine each, and two change requests."""
+    items = [
+        ConfigurationItem(guid=f"ci-{i}", ci_identifier=f"CI-{i}", project_id=test_project.id, name=f"CI {i}",
+                          status=status)
+        for i, status in ((1, CIStatus.RELEASED), (2, CIStatus.DRAFT))
+    ]
+    db.add_all(items)
+    db.flush()
+    for item in items:
+        machine = CIStateMachine(guid=f"sm-{item.id}", ci_id=item.id, project_id=test_project.id,
+                                 template_id="do178c_software_process")
+        db.add(machine)
+        db.flush()
+        db.add_all([
+            CIPhaseInstance(state_machine_id=machine.id, ci_id=item.id, phase_id="SW_PLANNING",
+                            phase_name="Planning", phase_order=0, status="completed",
+                            deliverables=[{"deliverable_id": "PSAC", "name": "PSAC"}],
+                            reviews=[{"review_id": "SOI-1", "name": "SOI #1"}]),
+            CIPhaseInstance(state_machine_id=machine.id, ci_id=item.id, phase_id="SW_CERTIFICATION",
+                            phase_name="Certification", phase_order=1,
+                            status="completed" if item.status == CIStatus.RELEASED else "not_started",
+                            deliverables=[{"deliverable_id": "SAS", "name": "SAS"}], reviews=[]),
+        ])
+    db.add_all([
+        ChangeRequest(project_id=test_project.id, cr_id=f"CR-{i}", title=f"Change {i}", description="-",
+                      impact_level=ImpactLevel.LOW, status=status, created_by="test_user")
+        for i, status in ((1, ChangeRequestStatus.PENDING_REVIEW), (2, ChangeRequestStatus.IMPLEMENTED))
+    ])
+    db.commit()
+    return test_project
+
+
+class TestRequirementAggregates:
+    """Test requirement coverage and verification rollups."""
+
+    def test_coverage_counts(self, db: Session, project_data):
+        """
+        Test REQ-BE-029: Coverage is counted per requirement from trace existence.
+
+        Verification Method: Test
+        Expected: Design, test, full and orphan counts; per-type breakdown; untraced list.
+        """
+        report = ComplianceReportingService(db).generate_requirements_coverage_report(project_data.id)
+
+        assert report["summary"] == {
+            "total_requirements": 4,
+            "requirements_with_design": 2,
+            "requirements_with_tests": 2,
+            "fully_traced_requirements": 1,
+            "orphaned_requirements": 1,
+            "coverage_percentage": 25.0,
+        }
+        assert report["details"]["by_type"]["safety"]["total"] == 2
+        assert report["details"]["by_type"]["safety"]["with_design"] == 1
+        assert [gap["requirement_id"] for gap in report["details"]["gaps"]] == ["REQ-2", "REQ-3", "REQ-4"]
+
+    def test_verification_rollup(self, db: Session, project_data):
+        """
+        Test REQ-BE-029: Each requirement is classified by the results of its tests.
+
+        Verification Method: Test
+        Expected: One verified, one failed, two untested; failed test listed.
+        """
+        report = ComplianceReportingService(db).generate_verification_status_report(project_data.id)
+
+        assert report["coverage_by_requirement"] == {"verified": 1, "failed": 1, "untested": 2}
+        assert report["summary"]["executed_tests"] == 2
+        assert report["summary"]["pass_rate"] == 50.0
+        assert [test["test_id"] for test in report["failed_tests"]] == ["TEST-2"]
+
+    def test_lists_capped(self, db: Session, project_data, monkeypatch):
+        """
+        Test REQ-BE-029: Item lists are capped while summaries count everything.
+
+        Verification Method: Test
+        Expected: Two of three untraced requirements listed; summary unchanged.
+        """
+        monkeypatch.setattr(compliance_reporting_service, "LIST_LIMIT", 2)
+
+        report = ComplianceReportingService(db).generate_requirements_coverage_report(project_data.id)
+
+        assert len(report["details"]["gaps"]) == 2
+        assert report["summary"]["total_requirements"] == 4
+
+
+class TestProcessAndConfiguration:
+    """Test phase, configuration item and change request rollups."""
+
+    def test_phase_rollup(self, db: Session, configuration):
+        """
+        Test REQ-BE-029: Phase instances of all state machines are rolled up per phase.
+
+        Verification Method: Test
+        Expected: Completed phases, deliverables and reviews counted; pending deliverables listed.
+        """
+        report = ComplianceReportingService(db).generate_process_compliance_report(configuration.id)
+
+        assert report["summary"]["completed_phases"] == 3
+        assert report["summary"]["total_phases"] == 4
+        assert (report["summary"]["completed_deliverables"], report["summary"]["total_deliverables"]) == (3, 4)
+        assert (report["summary"]["completed_reviews"], report["summary"]["total_reviews"]) == (2, 2)
+        assert [phase["phase_id"] for phase in report["phase_status"]] == ["SW_PLANNING", "SW_CERTIFICATION"]
+        assert report["missing_deliverables"] == [
+            {"phase_id": "SW_CERTIFICATION", "deliverable_id": "SAS", "name": "SAS", "pending_instances": 1}
+        ]
+
+    def test_phase_rollup_uses_portable_sql(self, db: Session, engine, configuration):
+        """
+        Test REQ-BE-029: The phase rollup does not use JSON functions of one dialect.
+
+        Verification Method: Test
+        Expected: Deliverables and reviews counted without SQL JSON functions.
+        """
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.lower())
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            phases = ComplianceSnapshot(db, configuration.id).phases
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert [(p["deliverables"], p["reviews"]) for p in phases] == [(2, 2), (2, 0)]
+        assert not [s for s in statements if "json" in s]
+
+    def test_configuration_rollup(self, db: Session, configuration):
+        """
+        Test REQ-BE-029: Configuration items and change requests are counted by status.
+
+        Verification Method: Test
+        Expected: One of two items baselined; the pending change request listed as open.
+        """
+        report = ComplianceReportingService(db).generate_configuration_management_report(configuration.id)
+
+        assert report["summary"]["total_configuration_items"] == 2
+        assert report["summary"]["baselined_items"] == 1
+        assert report["summary"]["open_change_requests"] == 1
+        assert [change["cr_id"] for change in report["pending_changes"]] == ["CR-1"]
+
+
+class TestDO178C:
+    """Test DO-178C objective evaluation."""
+
+    def test_objectives_filtered_by_dal(self, db: Session, project_data):
+        """
+        Test REQ-BE-029: Only objectives applicable to the DAL are evaluated.
+
+        Verification Method: Test
+        Expected: DAL A has more objectives than DAL D; "DAL_D" and "D" are equivalent.
+        """
+        service = ComplianceReportingService(db)
+
+        def objectives(level):
+            report = service.generate_do178c_compliance_report(project_data.id, level)
+            return [o["metric"] for entries in report["objectives"].values() for o in entries]
+
+        assert "bidirectional_completeness" in objectives("A")
+        assert "bidirectional_completeness" not in objectives("D")
+        assert objectives("DAL_D") == objectives("D")
+        assert len(objectives("A")) > len(objectives("D"))
+
+    def test_unsatisfied_objectives_reported_as_gaps(self, db: Session, project_data):
+        """
+        Test REQ-BE-029: Objectives below 100% are reported as gaps with recommendations.
+
+        Verification Method: Test
+        Expected: Partial test coverage reported as a verification gap.
+        """
+        report = ComplianceReportingService(db).generate_do178c_compliance_report(project_data.id, "B")
+
+        gap = next(g for g in report["gaps"] if g["metric"] == "requirements_to_tests")
+        assert gap["category"] == "verification" and gap["value"] == 50.0
+        assert len(report["recommendations"]) == len(report["gaps"])
+
+
+class TestSharedSnapshot:
+    """Test that combined reports query each aggregate once."""
+
+    def test_all_reports_share_one_snapshot(self, db: Session, project_data, monkeypatch):
+        """
+        Test REQ-BE-029: Generating all reports loads each aggregate once.
+
+        Verification Method: Test
+        Expected: Requirement groups queried once for all reports, once per report otherwise.
+        """
+        calls = []
+        original = ComplianceSnapshot.requirement_groups.func
+
+        def counting(snapshot):
+            calls.append(snapshot.project_id)
+            return original(snapshot)
+
+        groups = cached_property(counting)
+        groups.__set_name__(ComplianceSnapshot, "requirement_groups")
+        monkeypatch.setattr(ComplianceSnapshot, "requirement_groups", groups)
+        service = ComplianceReportingService(db)
+
+        combined = service.generate_all_compliance_reports(project_data.id, dal_level="B")
+        shared_calls = len(calls)
+        service.generate_requirements_coverage_report(project_data.id)
+        service.generate_traceability_report(project_data.id)
+
+        assert len(combined["reports"]) == 7
+        assert shared_calls == 1
+        assert len(calls) == 3
@@ -0,0 +1,148 @@
+"""
+Unit tests for compiled validation and transformation pipelines
+DO-178C Traceability: Verification of REQ-DC-001, REQ-DC-002
+"""
+
+import pytest
+
+import routers.process_engine as process_engine_router
+from process_engine import (
+    DataCaptureService,
+    QuestionPipeline,
+    ValidationPipeline,
+    create_interview,
+    get_script_cache,
+)
+
+
+def _errors(results):
+    return [result.error for result in results]
+
+
+class TestValidationPipeline:
+    """Test compiled rules against the documented rule semantics."""
+
+    @pytest.mark.parametrize("rule, value, expected", [
+        ({"type": "required"}, "", ["This field is required"]),
+        ({"type": "required"}, "   ", ["This field is required"]),
+        ({"type": "required", "params": {"error": "Name needed"}}, None, ["Name needed"]),
+        ({"type": "min_length", "params": {"min": 3}}, "ab", ["Must be at least 3 characters"]),
+        ({"type": "max_length", "params": {"max": 2}}, "abc", ["Must be no more than 2 characters"]),
+        ({"type": "pattern", "params": {"pattern": "^[A-Z]+$"}}, "abc", ["Must match pattern: ^[A-Z]+$"]),
+        ({"type": "pattern", "params": {"pattern": "^[A-Z]+$"}}, "ABC", []),
+        ({"type": "allowed_values", "params": {"values": ["A", "B"]}}, "C", ["Must be one of: A, B"]),
+        ({"type": "min_selections", "params": {"min": 2}}, ["x"], ["Must select at least 2 option(s)"]),
+        ({"type": "min_selections"}, None, ["Must select at least 1 option(s)"]),
+        ({"type": "shall_statement"}, "The system works", ["Requirement must contain 'shall' statement"]),
+        ({"type": "shall_statement"}, "It shall run and shall stop",
+         ["Split compound requirements: only one 'shall' per requirement"]),
+        ({"type": "numeric_range", "params": {"min": 1, "max": 5}}, "7", ["Must be at most 5"]),
+        ({"type": "numeric_range", "params": {"min": 1}}, "x", ["Must be a valid number"]),
+        ({"type": "unknown_rule"}, "", []),
+    ])
+    def test_rule_semantics(self, rule, value, expected):
+        """
+        Test REQ-DC-001: Each compiled rule reports the same errors as the rule definition.
+
+        Verification Method: Test
+        Expected: Documented default or custom messages; unknown rules never fail.
+        """
+        assert _errors(DataCaptureService().validate(value, [rule])) == expected
+
+    def test_validate_many(self):
+        """
+        Test REQ-DC-001: A batch is validated with one pipeline, in order.
+
+        Verification Method: Test
+        Expected: One error list per value, matching single validation.
+        """
+        rules = [
+            {"type": "required", "params": {}},
+            {"type": "min_length", "params": {"min": 3}},
+            {"type": "pattern", "params": {"pattern": "^[a-z]+$", "error": "lowercase only"}},
+        ]
+        values = ["abc", "", "AB", "abcd", None]
+        service = DataCaptureService()
+
+        batch = service.validate_many(values, rules)
+        assert [_errors(e) for e in batch] == [_errors(service.validate(v, rules)) for v in values]
+        assert [bool(e) for e in batch] == [False, True, True, False, True]
+        assert ValidationPipeline(rules).validate_many(iter(values)) == batch
+
+
+    @pytest.mark.asyncio
+    async def test_batch_compiles_repeated_inline_rules_once(self, monkeypatch):
+        """
+        Test REQ-DC-001: Batch items repeating the same inline rules share one pipeline.
+
+        Verification Method: Test
+        Expected: Shared rules plus two distinct inline rule sets compiled; per-item results.
+        """
+        compiled = []
+
+        class CountingPipeline(ValidationPipeline):
+            def __init__(self, rules):
+                compiled.append(rules)
+                super().__init__(rules)
+
+        monkeypatch.setattr(process_engine_router, "ValidationPipeline", CountingPipeline)
+        short = [{"type": "min_length", "params": {"min": 3}}]
+        reordered = [{"params": {"min": 3}, "type": "min_length"}]
+        required = [{"type": "required"}]
+        items = [process_engine_router.BatchValidateItem(value=value, rules=rules) for value, rules in (
+            ("ab", short), ("abc", reordered), ("", required), ("abcd", short), ("x", required)
+        )]
+
+        result = await process_engine_router.validate_data_batch(
+            process_engine_router.BatchValidateRequest(items=items)
+        )
+
+        assert len(compiled) == 3
+        assert [r["valid"] for r in result["results"]] == [False, True, False, True, True]
+
+
+class TestQuestionPipeline:
+    """Test per-question pipelines in compiled scripts."""
+
+    def test_transformation_bound(self):
+        """
+        Test REQ-DC-002: The target transformation is resolved once and applied.
+
+        Verification Method: Test
+        Expected: Transformed value; failures and unknown names return the value.
+        """
+        assert QuestionPipeline({"target": {"transformation": "strip"}}).transform("  x ") == "x"
+        assert QuestionPipeline({"target": {"transformation": "to_int"}}).transform("x") == "x"
+        assert QuestionPipeline({"target": {"transformation": "nope"}}).transform(5) == 5
+        assert DataCaptureService().transform("a, b", "array_from_csv") == ["a", "b"]
+
+    def test_script_questions_compiled(self):
+        """
+        Test REQ-DC-001: Compiled scripts carry a pipeline for every question.
+
+        Verification Method: Test
+        Expected: Executor validation uses the script's pipelines.
+        """
+        compiled = get_script_cache().get("project_initialization")
+        assert set(compiled.pipelines) == set(compiled.questions)
+
+        executor = create_interview("project_initialization")
+        result = executor.process_answer("PI-001", "x", {})
+        assert not result.valid and "at least 3 characters" in result.error
+
+    def test_capture_does_not_mutate_shared_definition(self):
+        """
+        Test REQ-DC-002: Capturing an answer leaves the shared question definition intact.
+
+        Verification Method: Test
+        Expected: set_context still holds the $value placeholder afterwards.
+        """
+        compiled = get_script_cache().get("project_initialization")
+        question_def = compiled.questions["PI-001"]
+
+        result = DataCaptureService().capture(
+            "Flight Control", question_def, project_id=1, pipeline=compiled.pipelines["PI-001"]
+        )
+
+        assert result.valid and result.context_updates == {"project_name": "Flight Control"}
+        assert question_def["on_answer"]["default"]["set_context"] == {"project_name": "$value"}
@@ -0,0 +1,193 @@
+"""
+Unit tests for block-allocated display ID sequences
+DO-178C Traceability: Verification of REQ-DB-064
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from database.connection import Base
+from process_engine import AutoPopulationService
+from models import DesignComponent, Requirement
+from services.display_id_allocator import DisplayIdAllocator, seed_sequences
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Each test starts without cached blocks."""
+    DisplayIdAllocator.clear_cache()
+    yield
+    DisplayIdAllocator.clear_cache()
+
+
+@pytest.fixture
+def sequence_updates(engine):
+    """UPDATE statements issued against display_id_sequences."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE DISPLAY_ID_SEQUENCES"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+class TestBlockAllocation:
+    """Test hi/lo reservation."""
+
+    def test_one_round_trip_per_block(self, engine, sequence_updates):
+        """
+        Test REQ-DB-064: Numbers are handed out from reserved blocks.
+
+        Verification Method: Test
+        Expected: Dense numbers from 1; one UPDATE per block after the first insert.
+        """
+        allocator = DisplayIdAllocator(engine, block_size=10)
+
+        numbers = [allocator.next("REQ-FN") for _ in range(25)]
+
+        assert numbers == list(range(1, 26))
+        # First block created by INSERT, the next two by UPDATE
+        assert len(sequence_updates) == 3
+        assert allocator.next_display_id("REQ-FN") == "REQ-FN-026"
+
+    def test_bulk_take_is_dense_single_round_trip(self, engine, sequence_updates):
+        """
+        Test REQ-DB-064: A bulk import reserves exactly what it needs at once.
+
+        Verification Method: Test
+        Expected: 50k consecutive numbers with one UPDATE; the next ID follows directly.
+        """
+        allocator = DisplayIdAllocator(engine, block_size=20)
+        allocator.next("REQ-FN")
+        sequence_updates.clear()
+
+        numbers = allocator.take("REQ-FN", 50_000)
+
+        assert numbers == list(range(2, 50_002))
+        assert len(sequence_updates) == 1
+        # The cached block was used up first, so nothing was skipped
+        assert allocator.take_display_ids("REQ-FN", 2) == ["REQ-FN-50002", "REQ-FN-50003"]
+
+    def test_sequences_are_independent(self, engine):
+        """
+        Test REQ-DB-064: Each prefix has its own sequence.
+
+        Verification Method: Test
+        Expected: Both start at 1.
+        """
+        allocator = DisplayIdAllocator(engine)
+        assert allocator.next_display_id("CI-SW", width=4) == "CI-SW-0001"
+        assert allocator.next_display_id("TC-UNIT") == "TC-UNIT-001"
+
+
+class TestUniqueness:
+    """Test uniqueness across workers and restarts."""
+
+    def test_workers_never_share_numbers(self, engine):
+        """
+        Test REQ-DB-064: Workers with their own blocks get disjoint numbers.
+
+        Verification Method: Test
+        Expected: Interleaved allocations are unique and, once blocks are used up, dense.
+        """
+        workers = [DisplayIdAllocator(engine, block_size=5, shared=False) for _ in range(3)]
+
+        numbers = [workers[i % 3].next("CR") for i in range(30)]
+
+        assert len(set(numbers)) == 30
+        assert sorted(numbers) == list(range(1, 31))
+
+    def test_restart_continues_sequence(self, engine):
+        """
+        Test REQ-DB-064: After a restart numbers continue, never restart from 1.
+
+        Verification Method: Test
+        Expected: New numbers above every number reserved before the restart.
+        """
+        allocator = DisplayIdAllocator(engine, block_size=10)
+        before = [allocator.next("LOG") for _ in range(3)]
+
+        DisplayIdAllocator.clear_cache()
+        after = DisplayIdAllocator(engine, block_size=10).next("LOG")
+
+        assert after > max(before) and after == 11
+
+    def test_concurrent_threads(self, tmp_path):
+        """
+        Test REQ-DB-064: Concurrent workers on a shared database get unique numbers.
+
+        Verification Method: Test
+        Expected: 800 distinct numbers, 1 to 800.
+        """
+        file_engine = create_engine(
+            f"sqlite:///{tmp_path / 'ids.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+        )
+        Base.metadata.create_all(bind=file_engine)
+        try:
+            def work(_):
+                allocator = DisplayIdAllocator(file_engine, block_size=5, shared=False)
+                return [allocator.next("DES-CMP") for _ in range(200)]
+
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                numbers = [n for chunk in pool.map(work, range(4)) for n in chunk]
+        finally:
+            file_engine.dispose()
+
+        assert sorted(numbers) == list(range(1, 801))
+
+    def test_auto_population_uses_database_sequence(self, db):
+        """
+        Test REQ-DB-064: Auto-populated requirement IDs are unique across service instances.
+
+        Verification Method: Test
+        Expected: Two services (as two workers) never produce the same requirement_id.
+        """
+        first = AutoPopulationService(db)
+        second = AutoPopulationService(db)
+
+        ids = [
+            service.populate_defaults("requirements", {"type": "FN"})["requirement_id"]
+            for service in (first, second, first, second)
+        ]
+
+        assert len(set(ids)) == 4
+        assert ids[0] == "REQ-FN-001"
+
+
+class TestSeeding:
+    """Test seeding sequences of a database that already holds display IDs."""
+
+    def test_sequences_start_after_ids_in_use(self, db, engine, test_project):
+        """
+        Test REQ-DB-064: Seeded sequences continue after the highest number in use.
+
+        Verification Method: Test
+        Expected: New numbers follow existing requirement and design IDs; a
+            sequence already further along is kept; seeding twice changes nothing.
+        """
+        db.add_all([
+            Requirement(project_id=test_project.id, requirement_id=requirement_id, title="-", description="-",
+                        type="functional")
+            for requirement_id in ("REQ-FN-007", "REQ-FN-012", "REQ-SF-003", "REQ-FN-draft")
+        ])
+        db.add(DesignComponent(project_id=test_project.id, component_id="DSN-MOD-041", name="-", description="-",
+                               type="module"))
+        db.commit()
+        DisplayIdAllocator(engine).take("REQ-SF", 10)
+
+        with engine.begin() as connection:
+            seeded = seed_sequences(connection)
+        with engine.begin() as connection:
+            assert seed_sequences(connection) == {}
+
+        assert (seeded["REQ-FN"], seeded["DSN-MOD"]) == (13, 42) and "REQ-SF" not in seeded
+        DisplayIdAllocator.clear_cache()
+        allocator = DisplayIdAllocator(engine)
+        assert allocator.next_display_id("REQ-FN") == "REQ-FN-013"
+        assert allocator.next_display_id("DSN-MOD") == "DSN-MOD-042"
+        assert allocator.next("REQ-SF") > 10
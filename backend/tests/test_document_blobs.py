@@ -0,0 +1,203 @@
+"""
+Unit tests for content-addressed document blob storage
+DO-178C Traceability: Verification of REQ-DOC-001, REQ-CERT-004
+"""
+
+import hashlib
+import os
+
+import pytest
+from sqlalchemy.orm import Session
+
+from models import DocumentBlob, DocumentExport
+from models.document_export import DocumentType, ExportFormat
+from services.document_blob_service import BlobStore, DocumentBlobService
+
+
+@pytest.fixture
+def store(tmp_path):
+    """An empty blob store."""
+    return BlobStore(str(tmp_path / "blobs"), compression_level=6)
+
+
+@pytest.fixture
+def blobs(db: Session, store):
+    """Blob service over the test store."""
+    return DocumentBlobService(db, store)
+
+
+def _export(db: Session, project, blob: DocumentBlob) -> DocumentExport:
+    export = DocumentExport(project_id=project.id, document_type=DocumentType.SRS, export_format=ExportFormat.MARKDOWN,
+                            title="SRS", file_path="-", file_hash=blob.sha256, generated_by="test")
+    db.add(export)
+    db.commit()
+    return export
+
+
+def _after_stage(stage, action):
+    """Wrap BlobStore.stage to run action once the content is staged."""
+    def staged(chunks):
+        result = stage(chunks)
+        action()
+        return result
+    return staged
+
+
+class TestBlobStore:
+    """Test compressed, atomic blob writes."""
+
+    def test_content_hashed_and_compressed_across_buffers(self, store):
+        """
+        Test REQ-DOC-001: Content spanning several write buffers is hashed and stored exactly.
+
+        Verification Method: Test
+        Expected: SHA-256 and size of the uncompressed bytes; blob decompresses to them and is smaller.
+        """
+        lines = [f"| REQ-{i:05d} | ✓ |\n" for i in range(20000)]
+
+        stored = store.write(iter(lines))
+
+        data = "".join(lines).encode("utf-8")
+        assert (stored.sha256, stored.size) == (hashlib.sha256(data).hexdigest(), len(data))
+        with store.open_content(stored.sha256) as f:
+            assert f.read() == data
+        assert stored.stored_size == os.path.getsize(store.path(stored.sha256)) < len(data) / 4
+
+    def test_identical_content_stored_once(self, store):
+        """
+        Test REQ-DOC-001: Writing identical content again keeps the existing blob.
+
+        Verification Method: Test
+        Expected: Second write not created; one file in the store.
+        """
+        first = store.write(["# SRS\n", "content\n"])
+        second = store.write(["# SRS\ncontent\n"])
+
+        assert first.created and not second.created
+        assert first.sha256 == second.sha256
+        assert [sha256 for sha256, _ in store.entries()] == [first.sha256]
+
+    def test_failed_render_leaves_nothing(self, store):
+        """
+        Test REQ-DOC-001: A render that fails midway stores nothing.
+
+        Verification Method: Test
+        Expected: Exception propagated; no blob or temporary file left.
+        """
+        def chunks():
+            yield "partial"
+            raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            store.write(chunks())
+
+        assert os.listdir(store.root) == []
+
+
+class TestReferences:
+    """Test reference counting and garbage collection."""
+
+    def test_shared_blob_counts_references(self, db: Session, blobs):
+        """
+        Test REQ-CERT-004: Exports of identical content share one referenced blob.
+
+        Verification Method: Test
+        Expected: One blob row and file with two references; release decrements.
+        """
+        first = blobs.add(["same content\n"])
+        second = blobs.add(["same content\n"])
+        db.commit()
+
+        assert first.sha256 == second.sha256
+        assert db.query(DocumentBlob).one().ref_count == 2
+        blobs.release(first.sha256)
+        db.commit()
+        assert db.query(DocumentBlob).one().ref_count == 1
+
+    def test_unreferenced_blobs_collected_after_grace(self, db: Session, test_project, blobs, store):
+        """
+        Test REQ-CERT-004: Released blobs are deleted once unreferenced for the grace period.
+
+        Verification Method: Test
+        Expected: Kept within the grace period; then only the unreferenced blob is deleted.
+        """
+        kept = blobs.add(["kept\n"])
+        released = blobs.add(["released\n"]).sha256
+        _export(db, test_project, kept)
+        blobs.release(released)
+        db.commit()
+
+        assert blobs.collect_garbage(grace_minutes=60)["deleted"] == 0
+        result = blobs.collect_garbage(grace_minutes=0)
+
+        assert result["deleted"] == 1 and result["bytes_freed"] > 0
+        assert [b.sha256 for b in db.query(DocumentBlob)] == [kept.sha256]
+        assert not os.path.exists(store.path(released))
+        assert os.path.exists(store.path(kept.sha256))
+
+    def test_counts_reconciled_with_exports(self, db: Session, test_project, blobs, store):
+        """
+        Test REQ-CERT-004: Exports deleted without releasing their blob are detected.
+
+        Verification Method: Test
+        Expected: Count reconciled to zero, then the blob is collected.
+        """
+        blob = blobs.add(["content\n"])
+        _export(db, test_project, blob)
+        db.query(DocumentExport).delete()
+        db.commit()
+
+        first = blobs.collect_garbage(grace_minutes=0)
+        second = blobs.collect_garbage(grace_minutes=0)
+
+        assert (first["reconciled"], first["deleted"]) == (1, 0)
+        assert second["deleted"] == 1
+        assert list(store.entries()) == []
+
+    def test_blob_added_concurrently_shared(self, db: Session, store):
+        """
+        Test REQ-CERT-004: A first export racing another export of the same content shares its row.
+
+        Verification Method: Test
+        Expected: No duplicate key error; one row with both references.
+        """
+        other = DocumentBlobService(db, BlobStore(store.root))
+        store.stage = _after_stage(store.stage, lambda: (other.add(["same content\n"]), db.commit()))
+
+        blob = DocumentBlobService(db, store).add(["same content\n"])
+        db.commit()
+
+        assert db.query(DocumentBlob).one().ref_count == blob.ref_count == 2
+        assert [sha256 for sha256, _ in store.entries()] == [blob.sha256]
+
+    def test_blob_collected_while_adding_restored(self, db: Session, blobs, store):
+        """
+        Test REQ-CERT-004: Content collected while an export adds it again is stored again.
+
+        Verification Method: Test
+        Expected: New row with one reference; the blob file exists and is readable.
+        """
+        first = blobs.add(["content\n"]).sha256
+        blobs.release(first)
+        db.commit()
+        store.stage = _after_stage(store.stage, lambda: blobs.collect_garbage(grace_minutes=0))
+
+        blob = blobs.add(["content\n"])
+        db.commit()
+
+        assert (blob.sha256, blob.ref_count, blob.released_at) == (first, 1, None)
+        with store.open_content(first) as f:
+            assert f.read() == b"content\n"
+
+    def test_orphan_files_collected(self, db: Session, blobs, store):
+        """
+        Test REQ-CERT-004: Blob files without a committed row are deleted after the grace period.
+
+        Verification Method: Test
+        Expected: Orphan kept within the grace period, deleted afterwards.
+        """
+        stored = store.write(["never committed\n"])
+
+        assert blobs.collect_garbage(grace_minutes=60)["orphans"] == 0
+        assert blobs.collect_garbage(grace_minutes=0)["orphans"] == 1
+        assert not os.path.exists(store.path(stored.sha256))
@@ -0,0 +1,127 @@
+"""
+Unit tests for the shared document template environment
+DO-178C Traceability: Verification of REQ-AG-001
+"""
+
+import os
+
+import pytest
+from jinja2 import Environment
+
+from process_engine import ArtifactGeneratorService, DocumentTemplateEnvironment, get_document_environment
+
+
+@pytest.fixture
+def templates(tmp_path):
+    """A template directory with one document template."""
+    path = tmp_path / "templates"
+    path.mkdir()
+    (path / "Demo_template.md").write_text("# {{ title }} ({{ when | date }})\n")
+    return path
+
+
+@pytest.fixture
+def compile_count(monkeypatch):
+    """Number of template compilations from source."""
+    calls = []
+    original = Environment.compile
+
+    def counting(self, source, *args, **kwargs):
+        calls.append(source)
+        return original(self, source, *args, **kwargs)
+
+    monkeypatch.setattr(Environment, "compile", counting)
+    return calls
+
+
+class TestSharedEnvironment:
+    """Test compile-once behaviour within a process."""
+
+    def test_services_share_compiled_templates(self):
+        """
+        Test REQ-AG-001: Generators share one environment and its compiled templates.
+
+        Verification Method: Test
+        Expected: Same environment and template object for every service instance.
+        """
+        first = ArtifactGeneratorService()
+        second = ArtifactGeneratorService()
+
+        assert first.env is second.env is get_document_environment().env
+        assert first.env.get_template("SRS_template.md") is second.env.get_template("SRS_template.md")
+        assert "join_ids" in first.env.filters
+
+    def test_warm_compiles_all_templates(self, compile_count):
+        """
+        Test REQ-AG-001: Startup precompiles every shipped template once.
+
+        Verification Method: Test
+        Expected: Every template compiled by warm(); none when they are used afterwards.
+        """
+        names = ["SRS_template.md", "RTM_template.md", "Gap_Analysis_template.md", "Compliance_Report_template.md"]
+        environment = DocumentTemplateEnvironment()
+
+        assert environment.warm() == len(names)
+        assert len(compile_count) == len(names)
+        for name in names:
+            environment.get_template(name)
+        assert len(compile_count) == len(names)
+
+
+class TestBytecodeCache:
+    """Test the filesystem bytecode cache shared by workers."""
+
+    def test_new_worker_loads_bytecode(self, templates, tmp_path, compile_count):
+        """
+        Test REQ-AG-001: A second worker loads compiled templates from the shared cache.
+
+        Verification Method: Test
+        Expected: Bytecode written by the first environment; the second compiles nothing.
+        """
+        cache_dir = tmp_path / "bytecode"
+        DocumentTemplateEnvironment(templates, bytecode_cache_dir=str(cache_dir)).warm()
+        assert len(compile_count) == 1 and os.listdir(cache_dir)
+
+        worker = DocumentTemplateEnvironment(templates, bytecode_cache_dir=str(cache_dir))
+        content = worker.get_template("Demo_template.md").render(title="Demo", when=None)
+
+        assert content.startswith("# Demo ()")
+        assert len(compile_count) == 1
+
+
+class TestReload:
+    """Test change detection of template files."""
+
+    def _edit(self, templates):
+        path = templates / "Demo_template.md"
+        path.write_text("# Changed {{ title }}\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_no_reload_outside_debug(self, templates):
+        """
+        Test REQ-AG-001: Without auto-reload a loaded template is not re-checked.
+
+        Verification Method: Test
+        Expected: The originally compiled template keeps being used.
+        """
+        environment = DocumentTemplateEnvironment(templates)
+        environment.get_template("Demo_template.md")
+
+        self._edit(templates)
+
+        assert environment.get_template("Demo_template.md").render(title="X").startswith("# X")
+
+    def test_reload_in_debug(self, templates):
+        """
+        Test REQ-AG-001: With auto-reload (debug) an edited template is recompiled.
+
+        Verification Method: Test
+        Expected: The edited template is rendered.
+        """
+        environment = DocumentTemplateEnvironment(templates, auto_reload=True)
+        environment.get_template("Demo_template.md")
+
+        self._edit(templates)
+
+        assert environment.get_template("Demo_template.md").render(title="X") == "# Changed X"
@@ -0,0 +1,196 @@
+"""
+Unit tests for streamed document export and download
+DO-178C Traceability: Verification of REQ-DOC-002, REQ-DOC-003, REQ-DOC-004
+"""
+
+import gzip
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from database.connection import get_db
+from models import Requirement
+from routers import documents
+from services import document_service
+from services.document_service import DocumentService
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    """Write exports to a temporary directory."""
+    path = tmp_path / "exports"
+    monkeypatch.setattr(document_service.settings, "export_output_dir", str(path))
+    return path
+
+
+@pytest.fixture
+def requirements(db: Session, test_project):
+    """Requirements of two types, added out of type order."""
+    db.add_all([
+        Requirement(project_id=test_project.id, requirement_id="REQ-SF-001", title="Safe state",
+                    description="The system shall enter a safe state on fault.", type="safety"),
+        Requirement(project_id=test_project.id, requirement_id="REQ-FN-002", title="Logging",
+                    description="The system shall log events.", type="functional"),
+        Requirement(project_id=test_project.id, requirement_id="REQ-FN-001", title="Startup",
+                    description="The system shall start in 2 s.", type="functional",
+                    rationale="Availability"),
+    ])
+    db.commit()
+
+
+def _content(export):
+    with gzip.open(export.file_path, "rb") as f:
+        return f.read()
+
+
+class TestStreamedGeneration:
+    """Test rendering documents straight to disk."""
+
+    def test_srs_written_and_hashed_in_one_pass(self, db: Session, test_project, requirements, monkeypatch):
+        """
+        Test REQ-DOC-003: The SRS is streamed to file with its hash computed while writing.
+
+        Verification Method: Test
+        Expected: Recorded size and hash match the file; sections grouped by type; file not read back.
+        """
+        reads = []
+        original_open = open
+
+        def tracking_open(file, mode="r", *args, **kwargs):
+            if "r" in mode and "exports" in str(file):
+                reads.append(file)
+            return original_open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", tracking_open)
+        export = DocumentService(db).generate_srs(test_project.id)
+        monkeypatch.undo()
+
+        assert reads == []
+        data = _content(export)
+        assert export.file_hash == hashlib.sha256(data).hexdigest()
+        assert export.file_size == len(data)
+        content = data.decode("utf-8")
+        assert "Total Requirements: 3" in content
+        assert content.index("### 2.1 Functional") < content.index("#### REQ-FN-001") \
+            < content.index("#### REQ-FN-002") < content.index("### 2.2 Safety") < content.index("#### REQ-SF-001")
+        assert "**Rationale:**  \nAvailability" in content
+        assert len(export.included_requirements) == 3
+
+    def test_rtm_rendered(self, db: Session, test_project, requirements):
+        """
+        Test REQ-DOC-004: The RTM is streamed to file.
+
+        Verification Method: Test
+        Expected: One matrix row per requirement; hash matches the file.
+        """
+        export = DocumentService(db).generate_rtm(test_project.id)
+
+        data = _content(export)
+        content = data.decode("utf-8")
+        assert "| REQ-SF-001 | Safe state | safety | medium | - | - | ⚠ |" in content
+        assert "- **Total Requirements:** 3" in content
+        assert export.file_hash == hashlib.sha256(data).hexdigest()
+
+
+class TestDownload:
+    """Test the download endpoint."""
+
+    @pytest.fixture
+    def client(self, engine):
+        app = FastAPI()
+        app.include_router(documents.router, prefix="/api/v1")
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        return TestClient(app)
+
+    @pytest.fixture
+    def export(self, db: Session, test_project, requirements):
+        return DocumentService(db).generate_srs(test_project.id)
+
+    def test_full_download(self, client, export):
+        """
+        Test REQ-DOC-002: The whole document is served with its hash as ETag.
+
+        Verification Method: Test
+        Expected: 200, document content, ETag and Accept-Ranges headers; 404 for unknown documents.
+        """
+        response = client.get(f"/api/v1/documents/{export.id}/download", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert response.content == _content(export)
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == f'"{export.file_hash}"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-disposition"].endswith('.md"')
+        assert client.get("/api/v1/documents/9999/download").status_code == 404
+
+    def test_compressed_blob_served_as_is(self, client, export):
+        """
+        Test REQ-DOC-002: Clients accepting gzip get the stored blob without recompression.
+
+        Verification Method: Test
+        Expected: Content-Encoding gzip; raw body equals the blob file; ranges over its bytes.
+        """
+        url = f"/api/v1/documents/{export.id}/download"
+        blob = open(export.file_path, "rb").read()
+
+        with client.stream("GET", url, headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+            headers = response.headers
+        with client.stream("GET", url, headers={"Accept-Encoding": "gzip", "Range": "bytes=10-"}) as response:
+            partial = b"".join(response.iter_raw())
+            status = response.status_code
+
+        assert headers["content-encoding"] == "gzip"
+        assert headers["etag"] == f'"{export.file_hash}-gzip"'
+        assert raw == blob
+        assert status == 206 and partial == blob[10:]
+
+    def test_range_requests(self, client, export):
+        """
+        Test REQ-DOC-002: Byte ranges are served as partial content.
+
+        Verification Method: Test
+        Expected: 206 with Content-Range for explicit, open and suffix ranges; 416 past the end.
+        """
+        url = f"/api/v1/documents/{export.id}/download"
+        data = _content(export)
+        size = len(data)
+
+        def get(byte_range):
+            return client.get(url, headers={"Range": byte_range, "Accept-Encoding": "identity"})
+
+        first = get("bytes=0-99")
+        rest = get("bytes=100-")
+        tail = get("bytes=-10")
+        beyond = get(f"bytes={size}-")
+
+        assert first.status_code == 206 and first.content == data[:100]
+        assert first.headers["content-range"] == f"bytes 0-99/{size}"
+        assert rest.status_code == 206 and first.content + rest.content == data
+        assert tail.content == data[-10:]
+        assert beyond.status_code == 416 and beyond.headers["content-range"] == f"bytes */{size}"
+
+    def test_if_range_mismatch_serves_whole_file(self, client, export):
+        """
+        Test REQ-DOC-002: A resumed download of a different version gets the whole file.
+
+        Verification Method: Test
+        Expected: 200 with the full content when If-Range does not match the ETag.
+        """
+        response = client.get(f"/api/v1/documents/{export.id}/download",
+                              headers={"Range": "bytes=0-9", "If-Range": '"stale"', "Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert len(response.content) == export.file_size
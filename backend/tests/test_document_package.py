@@ -0,0 +1,141 @@
+"""
+Unit tests for parallel certification package generation
+DO-178C Traceability: Verification of REQ-AG-001, REQ-AG-005, REQ-BE-029
+"""
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from database.connection import get_db
+from models import GeneratedDocumentRecord, Requirement
+from process_engine import ArtifactGeneratorService, init_render_worker
+from routers import documents
+from services import document_package_service
+from services.document_package_service import PACKAGE_DOCUMENTS, DocumentPackageService
+
+
+@pytest.fixture
+def requirements(db: Session, test_project):
+    """Requirements of the test project."""
+    db.add_all([
+        Requirement(project_id=test_project.id, requirement_id=f"REQ-FN-{i:03d}", title=f"Requirement {i}",
+                    description=f"The system shall perform function {i}.", type="functional")
+        for i in range(1, 6)
+    ])
+    db.commit()
+
+
+@pytest.fixture(autouse=True)
+def in_thread(monkeypatch):
+    """Render in the calling thread unless a test passes an executor; fingerprints settled."""
+    monkeypatch.setattr(document_package_service.settings, "document_render_workers", 0)
+    monkeypatch.setattr(ArtifactGeneratorService, "FINGERPRINT_SETTLE_SECONDS", 0.0)
+
+
+def _documents(events):
+    return {e["document_type"]: e for e in events if e["event"] == "document"}
+
+
+class TestPackageGeneration:
+    """Test generation of the full package."""
+
+    def test_full_package_in_process_pool(self, db: Session, test_project, requirements):
+        """
+        Test REQ-BE-029: All documents are rendered in worker processes and stored.
+
+        Verification Method: Test
+        Expected: Versioned documents and every compliance report generated; versions stored.
+        """
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=2, mp_context=context, initializer=init_render_worker) as pool:
+            service = DocumentPackageService(db, executor=pool)
+            events = list(service.generate(service.prepare(test_project.id)))
+
+        assert events[0]["event"] == "started" and events[-1]["event"] == "completed"
+        documents = _documents(events)
+        assert set(PACKAGE_DOCUMENTS) <= set(documents)
+        assert "REQUIREMENTS_COVERAGE" in documents and "DO178C_COMPLIANCE" in documents
+        assert all(e["status"] == "generated" for e in documents.values())
+        assert "REQ-FN-005" in documents["SRS"]["content"]
+        assert events[-1]["failed"] == 0 and events[-1]["generated"] == len(documents)
+        stored = {r.document_type: r.version for r in db.query(GeneratedDocumentRecord).all()}
+        assert stored == {doc_type: 1 for doc_type in PACKAGE_DOCUMENTS}
+
+    def test_unchanged_documents_not_rendered(self, db: Session, test_project, requirements):
+        """
+        Test REQ-AG-005: A repeated package reuses stored documents.
+
+        Verification Method: Test
+        Expected: Versioned documents reported unchanged, still at version 1.
+        """
+        service = DocumentPackageService(db)
+        list(service.generate(service.prepare(test_project.id)))
+
+        package = service.prepare(test_project.id)
+        events = list(service.generate(package))
+
+        assert all(job.document_type not in PACKAGE_DOCUMENTS for job in package.jobs)
+        documents = _documents(events)
+        assert all(documents[t]["status"] == "unchanged" and documents[t]["version"] == 1 for t in PACKAGE_DOCUMENTS)
+        assert events[-1]["unchanged"] == len(PACKAGE_DOCUMENTS)
+
+    def test_source_rows_loaded_once(self, db: Session, test_project, requirements, monkeypatch):
+        """
+        Test REQ-AG-001: Preparing the package reads each kind of source data once.
+
+        Verification Method: Test
+        Expected: One requirements query for SRS, RTM and gap analysis together.
+        """
+        calls = []
+        original = ArtifactGeneratorService._get_requirements
+
+        def counting(self, project_id):
+            if self._memo is None or ("requirements", project_id) not in self._memo:
+                calls.append(project_id)
+            return original(self, project_id)
+
+        monkeypatch.setattr(ArtifactGeneratorService, "_get_requirements", counting)
+        service = DocumentPackageService(db)
+
+        assert len(service.prepare(test_project.id).jobs) > len(PACKAGE_DOCUMENTS)
+        assert calls == [test_project.id]
+
+
+class TestGenerateAllEndpoint:
+    """Test the streaming endpoint."""
+
+    def test_streams_events(self, engine, test_project, requirements):
+        """
+        Test REQ-BE-029: generate-all streams one JSON event per line.
+
+        Verification Method: Test
+        Expected: started, one event per document, completed; 404 for an unknown project.
+        """
+        app = FastAPI()
+        app.include_router(documents.router, prefix="/api/v1")
+        session_factory = sessionmaker(bind=engine)
+
+        def override_get_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        response = client.post(f"/api/v1/projects/{test_project.id}/documents/generate-all")
+        missing = client.post("/api/v1/projects/9999/documents/generate-all")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [events[0]["event"], events[-1]["event"]] == ["started", "completed"]
+        assert len(_documents(events)) == len(events[0]["documents"])
+        assert missing.status_code == 404
@@ -0,0 +1,155 @@
+"""
+Unit tests for compiled interview scripts
+DO-178C Traceability: Verification of REQ-IS-001, REQ-IS-002
+"""
+
+import builtins
+import json
+import os
+
+import pytest
+
+from process_engine import InterviewScriptCache, InterviewScriptExecutor, create_interview
+
+
+def _write_script(root, questions):
+    script_dir = root / "demo"
+    (script_dir / "questions").mkdir(parents=True)
+    script = {
+        "script_id": "DEMO",
+        "sub_phases": [
+            {"sub_phase_id": "A", "order": 1, "questions": ["Q1", "Q2", "Q3"]},
+            {"sub_phase_id": "B", "order": 2, "questions": ["Q4", "Q5"]},
+        ]
+    }
+    (script_dir / "script.json").write_text(json.dumps(script))
+    for question in questions:
+        (script_dir / "questions" / f"{question['question_id']}.json").write_text(json.dumps(question))
+    return script_dir
+
+
+@pytest.fixture
+def demo_cache(tmp_path, monkeypatch):
+    """A script cache over a five-question demo script, used by create_interview."""
+    questions = [
+        {"question_id": "Q1", "sub_phase": "A", "variants": ["Industry?"], "options": [
+            {"value": "aero", "label": "Aerospace"},
+            {"value": "rail", "label": "Rail", "condition": {"context.region": ["EU", "UK"]}},
+        ]},
+        {"question_id": "Q2", "sub_phase": "A", "variants": ["Airframe?"],
+         "skip_if": [{"context.industry": "rail"}]},
+        {"question_id": "Q3", "sub_phase": "A", "variants": ["Track gauge?"],
+         "skip_if": [{"context.industry": ["aero"]}, {"region": "US"}]},
+        {"question_id": "Q4", "sub_phase": "B", "variants": ["Name?"]},
+        {"question_id": "Q5", "sub_phase": "B", "variants": ["Done?"]},
+    ]
+    _write_script(tmp_path, questions)
+    cache = InterviewScriptCache(tmp_path)
+    monkeypatch.setattr("process_engine.services.interview_executor._script_cache", cache)
+    return cache
+
+
+class TestNavigation:
+    """Test precomputed navigation and compiled conditions."""
+
+    def test_next_question_follows_skip_conditions(self, demo_cache):
+        """
+        Test REQ-IS-002: Next question honours skip conditions across sub-phases.
+
+        Verification Method: Test
+        Expected: Skipped questions are passed over, including into the next sub-phase.
+        """
+        executor = create_interview("demo")
+
+        assert executor._get_next_question_id("Q1", {"industry": "aero"}) == "Q2"
+        assert executor._get_next_question_id("Q2", {"industry": "aero"}) == "Q4"
+        assert executor._get_next_question_id("Q1", {"industry": "rail"}) == "Q3"
+        assert executor._get_next_question_id("Q1", {"industry": "rail", "region": "US"}) == "Q4"
+        assert executor._get_next_question_id("Q5", {}) is None
+        assert executor._get_next_question_id("UNKNOWN", {}) is None
+
+    def test_option_conditions(self, demo_cache):
+        """
+        Test REQ-IS-002: Options are filtered by their compiled conditions.
+
+        Verification Method: Test
+        Expected: Conditional option shown only when its condition holds; no condition keys returned.
+        """
+        executor = create_interview("demo")
+
+        assert [o["value"] for o in executor.get_question("Q1", {}).options] == ["aero"]
+        options = executor.get_question("Q1", {"region": "UK"}).options
+        assert [o["value"] for o in options] == ["aero", "rail"]
+        assert all("condition" not in option for option in options)
+
+        options[0]["label"] = "changed"
+        assert executor.get_question("Q1", {"region": "UK"}).options[0]["label"] == "Aerospace"
+
+    def test_skipped_question_resolves_to_next(self, demo_cache):
+        """
+        Test REQ-IS-002: Asking for a skipped question returns the next one.
+
+        Verification Method: Test
+        Expected: Q3 skipped for aerospace, so Q4 is presented.
+        """
+        executor = create_interview("demo")
+        assert executor.get_question("Q3", {"industry": "aero"}).question_id == "Q4"
+
+
+class TestScriptCache:
+    """Test sharing and reloading of compiled scripts."""
+
+    def test_no_file_io_after_compilation(self, demo_cache, monkeypatch):
+        """
+        Test REQ-IS-001: Starting and advancing an interview reads no files once compiled.
+
+        Verification Method: Test
+        Expected: open() is never called; executors share one compiled script.
+        """
+        first = create_interview("demo")
+
+        def forbidden(*args, **kwargs):
+            raise AssertionError("file opened")
+
+        monkeypatch.setattr(builtins, "open", forbidden)
+        executor = create_interview("demo")
+        state = executor.create_initial_state()
+        question = executor.get_first_question(state.context)
+        result = executor.process_answer(question.question_id, "aero", state.context)
+        state = executor.update_state(state, question.question_id, result)
+
+        assert executor.compiled is first.compiled
+        assert executor.get_progress(state)["current_sub_phase_index"] == 0
+
+    def test_reload_on_change(self, demo_cache, tmp_path, monkeypatch):
+        """
+        Test REQ-IS-001: A changed question file is recompiled.
+
+        Verification Method: Test
+        Expected: New compiled script with the edited skip condition.
+        """
+        monkeypatch.setattr(InterviewScriptCache, "CHECK_INTERVAL_SECONDS", 0.0)
+        before = demo_cache.get("demo")
+
+        path = tmp_path / "demo" / "questions" / "Q2.json"
+        question = json.loads(path.read_text())
+        question["skip_if"] = [{"context.industry": "aero"}]
+        path.write_text(json.dumps(question))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        after = demo_cache.get("demo")
+        assert after is not before
+        assert after.next_question_id("Q1", {"industry": "aero"}) == "Q4"
+
+    def test_real_scripts_compile(self):
+        """
+        Test REQ-IS-001: The shipped scripts compile and start.
+
+        Verification Method: Test
+        Expected: Every question listed in a sub-phase has a definition.
+        """
+        cache = InterviewScriptCache(InterviewScriptExecutor.SCRIPTS_PATH)
+        compiled = cache.get("project_initialization")
+        listed = {q for sp in compiled.sub_phases for q in sp.get("questions", [])}
+        assert compiled.first_questions and listed <= set(compiled.questions)
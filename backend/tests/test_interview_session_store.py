@@ -0,0 +1,181 @@
+"""
+Unit tests for the interview session store
+DO-178C Traceability: Verification of REQ-IS-001, REQ-MONITOR-002
+"""
+
+from sqlalchemy.orm import sessionmaker
+
+from models.project import InterviewSessionState
+from process_engine import create_interview
+from services.interview_session_store import (
+    InterviewSession,
+    MemoryInterviewSessionStore,
+    DatabaseInterviewSessionStore,
+)
+
+SCRIPT = "project_initialization"
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _new_session(session_id: str) -> InterviewSession:
+    executor = create_interview(SCRIPT)
+    return InterviewSession(
+        session_id=session_id,
+        script_name=SCRIPT,
+        project_id=7,
+        state=executor.create_initial_state()
+    )
+
+
+def _answer(session: InterviewSession, answer):
+    """Answer the current question with a freshly built executor."""
+    executor = create_interview(session.script_name)
+    question_id = session.state.current_question_id
+    result = executor.process_answer(question_id, answer, session.state.context)
+    assert result.valid
+    session.state = executor.update_state(session.state, question_id, result)
+    return executor
+
+
+class TestMemoryStore:
+    """Test the in-memory LRU/TTL backend."""
+
+    def test_ttl_slides_and_expires(self):
+        """
+        Test REQ-IS-001: Sessions expire after the TTL unless written again.
+
+        Verification Method: Test
+        Expected: A put extends the expiry; an idle session is gone after the TTL.
+        """
+        clock = FakeClock()
+        store = MemoryInterviewSessionStore(max_sessions=10, ttl_seconds=60, clock=clock)
+        store.put(_new_session("a"))
+
+        clock.now += 50
+        session = store.get("a")
+        store.put(session)
+        clock.now += 50
+        assert store.get("a") is not None
+
+        clock.now += 61
+        assert store.get("a") is None
+        assert store.stats()["evicted_ttl"] == 1
+
+    def test_lru_cap(self):
+        """
+        Test REQ-IS-001: The least recently used session is evicted over the cap.
+
+        Verification Method: Test
+        Expected: Two sessions kept; the one not read recently is evicted.
+        """
+        store = MemoryInterviewSessionStore(max_sessions=2, ttl_seconds=60, clock=FakeClock())
+        store.put(_new_session("a"))
+        store.put(_new_session("b"))
+        store.get("a")
+        store.put(_new_session("c"))
+
+        assert store.get("b") is None
+        assert store.get("a") is not None and store.get("c") is not None
+        stats = store.stats()
+        assert stats["sessions"] == 2 and stats["evicted_lru"] == 1
+        assert stats["bytes"] == len(_new_session("a").to_json()) + len(_new_session("c").to_json())
+
+    def test_get_returns_copy(self):
+        """
+        Test REQ-IS-001: Changes to a loaded session are kept only once put back.
+
+        Verification Method: Test
+        Expected: The stored context is unchanged until put().
+        """
+        store = MemoryInterviewSessionStore(max_sessions=10, ttl_seconds=60, clock=FakeClock())
+        store.put(_new_session("a"))
+
+        session = store.get("a")
+        _answer(session, "Flight Control Unit")
+        assert store.get("a").state.context == {}
+
+        store.put(session)
+        assert store.get("a").state.context == {"project_name": "Flight Control Unit"}
+        assert store.delete("a") and not store.delete("a")
+
+
+class TestDatabaseStore:
+    """Test the interview_sessions table backend."""
+
+    def test_round_trip_and_expiry(self, engine, db):
+        """
+        Test REQ-IS-001: Sessions survive in the database and expired rows are purged.
+
+        Verification Method: Test
+        Expected: Same state after a round trip; expired sessions unreadable and purged.
+        """
+        store = DatabaseInterviewSessionStore(sessionmaker(bind=engine), ttl_seconds=60)
+        session = _new_session("db-1")
+        _answer(session, "Flight Control Unit")
+        store.put(session)
+
+        loaded = store.get("db-1")
+        assert loaded.state.to_dict() == session.state.to_dict()
+        assert loaded.project_id == 7 and loaded.script_name == SCRIPT
+        stats = store.stats()
+        assert stats["sessions"] == 1 and stats["bytes"] == len(session.to_json())
+
+        expired = DatabaseInterviewSessionStore(sessionmaker(bind=engine), ttl_seconds=-1)
+        expired.PURGE_INTERVAL_SECONDS = float("inf")
+        expired.put(_new_session("db-2"))
+        assert store.get("db-2") is None
+        assert store.purge_expired() == 1
+        assert db.query(InterviewSessionState).count() == 1
+
+        assert store.delete("db-1")
+        assert store.stats()["sessions"] == 0
+
+
+class TestRehydration:
+    """Test executors rebuilt from stored state."""
+
+    def test_resumed_interview_matches_uninterrupted(self):
+        """
+        Test REQ-IS-001: An interview resumed from its stored state continues identically.
+
+        Verification Method: Test
+        Expected: Same next question, context and progress as a live executor.
+        """
+        answers = ["Flight Control Unit", "Primary flight control computer for a light aircraft."]
+
+        live_executor = create_interview(SCRIPT)
+        live_state = live_executor.create_initial_state()
+        for answer in answers:
+            question_id = live_state.current_question_id
+            result = live_executor.process_answer(question_id, answer, live_state.context)
+            live_state = live_executor.update_state(live_state, question_id, result)
+
+        store = MemoryInterviewSessionStore(max_sessions=10, ttl_seconds=60)
+        store.put(_new_session("r"))
+        for answer in answers:
+            session = store.get("r")
+            executor = _answer(session, answer)
+            store.put(session)
+
+        resumed = store.get("r")
+        assert resumed.state.current_question_id == live_state.current_question_id
+        assert resumed.state.context == live_state.context
+        assert executor.get_progress(resumed.state) == live_executor.get_progress(live_state)
+
+    def test_executors_share_script_definitions(self):
+        """
+        Test REQ-IS-001: Rebuilt executors reuse the cached script, not a copy.
+
+        Verification Method: Test
+        Expected: Two executors hold the same question definitions object.
+        """
+        assert create_interview(SCRIPT).questions is create_interview(SCRIPT).questions
@@ -0,0 +1,183 @@
+"""
+Unit tests for the project process dashboard
+DO-178C Traceability: Verification of REQ-SM-001, REQ-SM-003
+"""
+
+import pytest
+from sqlalchemy import event
+
+from models.configuration_item import CIType
+from models.project import CIStateMachine
+from services.process_dashboard import ProcessDashboard
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Each test starts with no cached dashboards."""
+    ProcessDashboard.clear_cache()
+    yield
+    ProcessDashboard.clear_cache()
+
+
+@pytest.fixture
+def project_cis(ci_service, test_project):
+    """Two DAL B software CIs, one DAL C hardware CI and one CI without a process."""
+    specs = [
+        ("SW-D1", CIType.SOFTWARE, "DAL_B"),
+        ("SW-D2", CIType.SOFTWARE, "DAL_B"),
+        ("HW-D1", CIType.HARDWARE, "DAL_C"),
+        ("DOC-D1", CIType.DOCUMENT, None),
+    ]
+    cis = []
+    for identifier, ci_type, dal in specs:
+        ci = ci_service.create_ci(
+            project_id=test_project.id,
+            ci_identifier=identifier,
+            name=f"Dashboard {identifier}",
+            ci_type=ci_type,
+            created_by="test_user"
+        )
+        if dal is not None:
+            ci_service.create_state_machine_for_ci_item(ci_id=ci.id, dal_level=dal)
+        cis.append(ci)
+    return cis
+
+
+def _complete_next(ci_service, ci_id):
+    activity = ci_service.get_ci_current_activity(ci_id)["activity"]
+    assert ci_service.complete_activity(ci_id, activity["activity_id"])["success"]
+
+
+class TestDashboardContent:
+    """Test per-CI entries and rollups."""
+
+    def test_items_match_per_ci_endpoints(self, ci_service, test_project, project_cis):
+        """
+        Test REQ-SM-003: Each CI entry equals what the per-CI calls return.
+
+        Verification Method: Test
+        Expected: Same current activity and progress; CIs without a process listed.
+        """
+        _complete_next(ci_service, project_cis[0].id)
+
+        _, dashboard = ci_service.get_project_process_dashboard(test_project.id)
+        items = {item["ci_id"]: item for item in dashboard["items"]}
+
+        assert dashboard["total_cis"] == 4 and dashboard["cis_with_process"] == 3
+        assert items[project_cis[3].id]["process"] is None
+        for ci in project_cis[:3]:
+            current = ci_service.get_ci_current_activity(ci.id)
+            progress = ci_service.get_ci_progress(ci.id)
+            assert items[ci.id]["activity"]["activity_id"] == current["activity"]["activity_id"]
+            assert items[ci.id]["phase"]["name"] == current["phase"]["name"]
+            assert items[ci.id]["process"]["completed_activities"] == progress["completed_activities"]
+            assert items[ci.id]["process"]["progress_percent"] == progress["progress_percent"]
+
+    def test_rollups(self, ci_service, test_project, project_cis):
+        """
+        Test REQ-SM-001: Rollups by CI type, DAL and phase add up.
+
+        Verification Method: Test
+        Expected: Counts per group and activity-weighted totals.
+        """
+        _complete_next(ci_service, project_cis[0].id)
+        _, dashboard = ci_service.get_project_process_dashboard(test_project.id)
+
+        by_type = {entry["ci_type"]: entry for entry in dashboard["by_ci_type"]}
+        by_dal = {entry["dal_level"]: entry for entry in dashboard["by_dal_level"]}
+        assert by_type["software"]["cis"] == 2 and by_type["hardware"]["cis"] == 1
+        assert by_dal["DAL_B"]["cis"] == 2 and by_dal["DAL_C"]["cis"] == 1
+        assert sum(entry["cis"] for entry in dashboard["by_phase"]) == 3
+
+        totals = dashboard["totals"]
+        assert totals["completed_activities"] == 1
+        assert totals["total_activities"] == sum(
+            item["process"]["total_activities"] for item in dashboard["items"] if item["process"]
+        )
+        assert totals["progress_percent"] == round(1 / totals["total_activities"] * 100, 1)
+
+
+    def test_progress_without_counters_not_written(self, db, engine, ci_service, test_project, project_cis):
+        """
+        Test REQ-SM-003: Machines without progress counters are reported
+        without a read writing them.
+
+        Verification Method: Test
+        Expected: Same progress as with counters; no INSERT, UPDATE or
+            commit issued; the counters stay NULL.
+        """
+        _complete_next(ci_service, project_cis[0].id)
+        _, expected = ci_service.get_project_process_dashboard(test_project.id)
+        db.query(CIStateMachine).update({
+            "total_phases": None, "completed_phases": None, "total_activities": None,
+            "completed_activities": None, "progress_percent": None
+        })
+        db.commit()
+        ProcessDashboard.clear_cache()
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        event.listen(db, "after_commit", lambda session: statements.append("COMMIT"))
+        try:
+            _, dashboard = ci_service.get_project_process_dashboard(test_project.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert dashboard["items"] == expected["items"]
+        assert dashboard["totals"] == expected["totals"]
+        assert not [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+        assert db.query(CIStateMachine).filter(CIStateMachine.total_activities.isnot(None)).count() == 0
+
+
+class TestDashboardCaching:
+    """Test caching, invalidation and ETag revalidation."""
+
+    def test_cached_until_transition(self, engine, ci_service, test_project, project_cis):
+        """
+        Test REQ-SM-003: The dashboard is served from cache until a transition.
+
+        Verification Method: Test
+        Expected: A repeat read issues only the signature query; a transition
+            changes the ETag and the content.
+        """
+        project_id = test_project.id
+        etag, first = ci_service.get_project_process_dashboard(project_id)
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            again_etag, again = ci_service.get_project_process_dashboard(project_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert again is first and again_etag == etag
+        assert len(statements) == 1
+
+        _complete_next(ci_service, project_cis[0].id)
+        new_etag, updated = ci_service.get_project_process_dashboard(project_id)
+        assert new_etag != etag
+        assert updated["totals"]["completed_activities"] == 1
+
+    def test_if_none_match(self, ci_service, test_project, project_cis):
+        """
+        Test REQ-SM-003: A current If-None-Match yields no body (304).
+
+        Verification Method: Test
+        Expected: None while unchanged, the dashboard once a transition happened.
+        """
+        etag, _ = ci_service.get_project_process_dashboard(test_project.id)
+
+        assert ci_service.get_project_process_dashboard(test_project.id, if_none_match=etag) == (etag, None)
+        assert ci_service.get_project_process_dashboard(test_project.id, if_none_match=f"W/{etag}")[1] is None
+
+        _complete_next(ci_service, project_cis[1].id)
+        new_etag, dashboard = ci_service.get_project_process_dashboard(test_project.id, if_none_match=etag)
+        assert new_etag != etag and dashboard is not None
@@ -17,6 +17,7 @@ from services.configuration_item_service import ConfigurationItemService
 from process_engine import (
     create_state_machine_for_ci,
     StateMachineController,
+    StateMachineGenerator,
     CIType as ProcessCIType,
     PhaseStatus,
     ActivityStatus
@@ -343,6 +344,72 @@ class TestDALFiltering:
         assert progress_a["total_activities"] >= progress_d["total_activities"]
 
 
+class TestProcessPrototypes:
+    """Test DAL-specialized prototype caching."""
+
+    def test_prototype_reused_per_dal(self):
+        """
+        Test REQ-SM-001: One prototype per (template, DAL level).
+
+        Verification Method: Test
+        Expected: Same prototype for the same DAL, distinct one per DAL.
+        """
+        generator = StateMachineGenerator()
+        template = generator.loader.load_template_for_ci_type(ProcessCIType.SOFTWARE)
+
+        dal_a = generator.get_prototype(template, "DAL_A")
+
+        assert generator.get_prototype(template, "DAL_A") is dal_a
+        assert generator.get_prototype(template, "DAL_D") is not dal_a
+
+    def test_instances_do_not_share_mutable_state(self):
+        """
+        Test REQ-SM-001: Clones from one prototype are independent.
+
+        Verification Method: Test
+        Expected: Template data is shared; completing an activity in one
+            instance leaves the other untouched.
+        """
+        structure = [
+            {"id": 1, "type": "SOFTWARE", "dal_level": "DAL_B"},
+            {"id": 2, "type": "SOFTWARE", "dal_level": "DAL_B"},
+        ]
+        instances = StateMachineGenerator().generate_for_product_structure(structure)
+
+        controller = StateMachineController(instances[1])
+        controller.start_phase(0)
+        activity = controller.get_current_activity()
+        controller.complete_activity(activity.activity_id, {"result": "success"})
+
+        other = instances[2].phases[0].sub_phases[0].activities[0]
+        assert other.node is activity.node
+        assert isinstance(other.output_artifacts, tuple)
+        assert other.status == ActivityStatus.NOT_STARTED
+        assert other.completion_data == {}
+        assert activity.completion_data == {"result": "success"}
+
+    def test_views_write_through_to_instance(self):
+        """
+        Test REQ-SM-001: Phase, sub-phase and activity objects are views.
+
+        Verification Method: Test
+        Expected: State set through one view is seen through a fresh one and
+            instances carry no per-instance attribute dictionary.
+        """
+        instance = create_state_machine_for_ci(ci_id=1, ci_type="SOFTWARE", dal_level="DAL_B")
+
+        first = instance.phases[0]
+        first.entry_criteria_met = True
+        first.sub_phases[0].activities[1].status = ActivityStatus.IN_PROGRESS
+
+        again = instance.phases[0]
+        assert again.entry_criteria_met is True
+        assert again.exit_criteria_met is False
+        assert again.sub_phases[0].activities[1].status == ActivityStatus.IN_PROGRESS
+        assert again.sub_phases[0].activities[0].status == ActivityStatus.NOT_STARTED
+        assert not hasattr(instance, "__dict__")
+
+
 class TestStateMachineController:
     """Test state machine controller functionality."""
 
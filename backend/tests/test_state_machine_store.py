@@ -0,0 +1,527 @@
+"""
+Unit tests for normalized state machine persistence
+DO-178C Traceability: Verification of REQ-SM-001, REQ-SM-003
+"""
+
+import json
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from database.connection import Base
+from models.configuration_item import CIType
+from models.project import CIStateMachine, CIPhaseInstance, CIActivityInstance, CICurrentActivity, StateMachineHistory
+from process_engine import create_state_machine_for_ci, StateMachineController
+from services.state_machine_store import StateMachineStore, StateMachineConflictError
+
+
+def _strip_volatile(state):
+    """Drop IDs and timestamps so two runs can be compared."""
+    if isinstance(state, dict):
+        return {
+            k: _strip_volatile(v) for k, v in state.items()
+            if k not in ("instance_id", "started_at", "completed_at", "created_at", "updated_at")
+        }
+    if isinstance(state, list):
+        return [_strip_volatile(v) for v in state]
+    return state
+
+
+@pytest.fixture
+def software_ci(ci_service, test_project):
+    """A DAL B software CI."""
+    return ci_service.create_ci(
+        project_id=test_project.id,
+        ci_identifier="SW-STORE",
+        name="Store Test Software",
+        ci_type=CIType.SOFTWARE,
+        criticality="DAL B",
+        created_by="test_user"
+    )
+
+
+@pytest.fixture
+def two_sessions(tmp_path):
+    """Two sessions on separate connections to one file database, sharing a machine for CI 1."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'concurrency.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    first, second = factory(), factory()
+
+    instance = create_state_machine_for_ci(ci_id=1, ci_type="SOFTWARE", dal_level="DAL_B")
+    StateMachineController(instance).start_phase(0)
+    StateMachineStore(first).create(instance)
+    first.commit()
+
+    yield first, second
+
+    first.close()
+    second.close()
+    engine.dispose()
+
+
+def _complete_current(controller: StateMachineController) -> bool:
+    activity = controller.get_current_activity()
+    return activity is not None and controller.complete_activity(activity.activity_id)
+
+
+class TestNormalizedPersistence:
+    """Test that persisted state matches the in-memory controller."""
+
+    def test_full_walk_matches_in_memory_controller(self, ci_service, software_ci):
+        """
+        Test REQ-SM-003: Persisted transitions reproduce controller behaviour.
+
+        Verification Method: Test
+        Expected: After every completion the stored state equals an in-memory run.
+        """
+        ci_service.create_state_machine_for_ci_item(ci_id=software_ci.id, dal_level="DAL_B")
+
+        reference = create_state_machine_for_ci(ci_id=software_ci.id, ci_type="SOFTWARE", dal_level="DAL_B")
+        controller = StateMachineController(reference)
+        controller.start_phase(0)
+
+        steps = 0
+        while (current := controller.get_current_activity()) is not None:
+            result = ci_service.complete_activity(software_ci.id, current.activity_id, {"step": steps})
+            assert result["success"] is True
+            controller.complete_activity(current.activity_id, {"step": steps})
+            steps += 1
+
+            stored = ci_service.get_ci_state_machine(software_ci.id)["state_data"]
+            assert _strip_volatile(stored) == _strip_volatile(reference.to_dict())
+
+        progress = ci_service.get_ci_progress(software_ci.id)
+        assert steps == progress["total_activities"] == progress["completed_activities"]
+        assert progress["completed_phases"] == progress["total_phases"]
+
+    def test_completion_updates_only_touched_rows(self, engine, db: Session, ci_service, software_ci):
+        """
+        Test REQ-SM-003: Completing an activity writes only changed rows.
+
+        Verification Method: Test
+        Expected: One activity row, the phase and header counters/cursor and
+            the work-queue row are updated.
+        """
+        ci_service.create_state_machine_for_ci_item(ci_id=software_ci.id, dal_level="DAL_B")
+        activity = ci_service.get_ci_current_activity(software_ci.id)["activity"]
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE"):
+                rows = len(parameters) if executemany else 1
+                statements.append((statement.split()[1], rows))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            ci_service.complete_activity(software_ci.id, activity["activity_id"])
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        updated = {}
+        for table, rows in statements:
+            updated[table] = updated.get(table, 0) + rows
+        assert updated == {
+            "ci_activity_instances": 1,
+            "ci_phase_instances": 1,
+            "ci_state_machines": 1,
+            "ci_current_activities": 1
+        }
+
+        touched = db.query(CIActivityInstance).filter(CIActivityInstance.status != "not_started").all()
+        assert [(row.activity_id, row.status) for row in touched] == [(activity["activity_id"], "completed")]
+
+    def test_wrong_activity_rejected(self, ci_service, software_ci):
+        """
+        Test REQ-SM-003: Only the current activity can be completed.
+
+        Verification Method: Test
+        Expected: None is returned and the cursor does not move.
+        """
+        ci_service.create_state_machine_for_ci_item(ci_id=software_ci.id)
+        before = ci_service.get_ci_current_activity(software_ci.id)
+
+        assert ci_service.complete_activity(software_ci.id, "NOT_AN_ACTIVITY") is None
+        assert ci_service.get_ci_current_activity(software_ci.id) == before
+
+    @pytest.fixture
+    def legacy_instance(self, db: Session, software_ci):
+        """A machine stored as one JSON document, one activity completed."""
+        instance = create_state_machine_for_ci(ci_id=software_ci.id, ci_type="SOFTWARE", dal_level="DAL_B")
+        controller = StateMachineController(instance)
+        controller.start_phase(0)
+        controller.complete_activity(controller.get_current_activity().activity_id)
+
+        db.add(CIStateMachine(
+            guid=str(uuid.uuid4()),
+            ci_id=software_ci.id,
+            template_id=instance.template_id,
+            template_name=instance.template_name,
+            dal_level=instance.dal_level,
+            current_phase_index=instance.current_phase_index,
+            state_data=json.dumps(instance.to_dict())
+        ))
+        db.commit()
+        return instance
+
+    def test_legacy_json_row_read_without_writing(self, db: Session, ci_service, software_ci, legacy_instance):
+        """
+        Test REQ-SM-001: Machines stored as one JSON document are readable before migration.
+
+        Verification Method: Test
+        Expected: State and progress decoded in memory; nothing written.
+        """
+        stored = ci_service.get_ci_state_machine(software_ci.id)["state_data"]
+        progress = ci_service.get_ci_progress(software_ci.id)
+        db.rollback()
+
+        record = StateMachineStore(db).get_record(software_ci.id)
+        assert _strip_volatile(stored) == _strip_volatile(legacy_instance.to_dict())
+        assert progress["completed_activities"] == 1
+        assert record.state_data is not None and record.version == 1
+        assert db.query(CIPhaseInstance).count() == 0
+
+    def test_legacy_json_row_is_migrated(self, db: Session, ci_service, software_ci, legacy_instance):
+        """
+        Test REQ-SM-001: The one-off migration moves JSON documents into the normalized tables.
+
+        Verification Method: Test
+        Expected: Rows are created, state_data is cleared and state is preserved.
+        """
+        assert StateMachineStore(db).migrate_legacy() == 1
+        db.commit()
+
+        stored = ci_service.get_ci_state_machine(software_ci.id)["state_data"]
+        record = StateMachineStore(db).get_record(software_ci.id)
+        assert record.state_data is None
+        assert _strip_volatile(stored) == _strip_volatile(legacy_instance.to_dict())
+        assert ci_service.get_ci_progress(software_ci.id)["completed_activities"] == 1
+        assert StateMachineStore(db).migrate_legacy() == 0
+
+    def test_legacy_json_row_migrated_by_transition(self, db: Session, ci_service, software_ci, legacy_instance):
+        """
+        Test REQ-SM-001: The first transition of an unmigrated machine migrates it in its transaction.
+
+        Verification Method: Test
+        Expected: Rows created and the transition applied on top of the preserved state.
+        """
+        activity = ci_service.get_ci_current_activity(software_ci.id)["activity"]
+
+        assert ci_service.complete_activity(software_ci.id, activity["activity_id"]) is not None
+
+        record = StateMachineStore(db).get_record(software_ci.id)
+        assert record.state_data is None
+        assert ci_service.get_ci_progress(software_ci.id)["completed_activities"] == 2
+
+
+class TestProgressCounters:
+    """Test incrementally maintained progress counters."""
+
+    def test_counters_match_full_walk(self, db: Session, ci_service, software_ci):
+        """
+        Test REQ-SM-001: Persisted counters equal a recount of the activity rows.
+
+        Verification Method: Test
+        Expected: After completions and a skip, header and phase counters match.
+        """
+        ci_service.create_state_machine_for_ci_item(ci_id=software_ci.id, dal_level="DAL_B")
+        skipped = False
+        for _ in range(12):
+            activity = ci_service.get_ci_current_activity(software_ci.id)["activity"]
+            if not activity["required"] and not skipped:
+                skipped = ci_service.skip_activity(software_ci.id, activity["activity_id"], "n/a") is not None
+            else:
+                ci_service.complete_activity(software_ci.id, activity["activity_id"])
+
+        rows = db.query(CIActivityInstance).filter(CIActivityInstance.ci_id == software_ci.id).all()
+        done = [row for row in rows if row.status in ("completed", "skipped")]
+        progress = ci_service.get_ci_progress(software_ci.id)
+
+        assert progress["total_activities"] == len(rows)
+        assert progress["completed_activities"] == len(done) == 12
+        assert progress["progress_percent"] == round(len(done) / len(rows) * 100, 1)
+        phase_ids = {row.id: row.phase_id for row in db.query(CIPhaseInstance)}
+        for phase in progress["phases"]:
+            in_phase = [row for row in done if phase_ids[row.phase_instance_id] == phase["phase_id"]]
+            assert phase["completed_activities"] == len(in_phase)
+        assert progress["completed_phases"] == sum(1 for phase in progress["phases"] if phase["status"] == "completed")
+
+    def test_progress_read_does_not_scan_activities(self, engine, ci_service, software_ci):
+        """
+        Test REQ-SM-001: Reading progress touches only header and phase rows.
+
+        Verification Method: Test
+        Expected: No statement against ci_activity_instances.
+        """
+        ci_service.create_state_machine_for_ci_item(ci_id=software_ci.id, dal_level="DAL_B")
+        activity = ci_service.get_ci_current_activity(software_ci.id)["activity"]
+        ci_service.complete_activity(software_ci.id, activity["activity_id"])
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            progress = ci_service.get_ci_progress(software_ci.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert progress["completed_activities"] == 1
+        assert not any("ci_activity_instances" in statement for statement in statements)
+
+    def test_legacy_counters_backfilled(self, db: Session, ci_service, software_ci):
+        """
+        Test REQ-SM-001: Machines stored before the counters existed are backfilled.
+
+        Verification Method: Test
+        Expected: NULL counters are recomputed and then maintained.
+        """
+        ci_service.create_state_machine_for_ci_item(ci_id=software_ci.id, dal_level="DAL_B")
+        activity = ci_service.get_ci_current_activity(software_ci.id)["activity"]
+        ci_service.complete_activity(software_ci.id, activity["activity_id"])
+
+        record = StateMachineStore(db).get_record(software_ci.id)
+        expected = (record.total_activities, record.completed_activities)
+        record.total_activities = record.completed_activities = record.progress_percent = None
+        db.commit()
+
+        assert StateMachineStore(db).count_activities(record) == expected
+        activity = ci_service.get_ci_current_activity(software_ci.id)["activity"]
+        ci_service.complete_activity(software_ci.id, activity["activity_id"])
+        assert ci_service.get_ci_progress(software_ci.id)["completed_activities"] == expected[1] + 1
+
+
+class TestBulkCreation:
+    """Test bulk state machine creation for a product structure."""
+
+    @pytest.fixture
+    def product_tree(self, ci_service, test_project):
+        """System > (software, hardware > component), plus a document CI."""
+        def make(identifier, ci_type, parent=None, criticality=None):
+            return ci_service.create_ci(
+                project_id=test_project.id,
+                ci_identifier=identifier,
+                name=f"Bulk {identifier}",
+                ci_type=ci_type,
+                parent_id=parent.id if parent else None,
+                criticality=criticality,
+                created_by="test_user"
+            )
+
+        system = make("SYS-B", CIType.SYSTEM, criticality="DAL A")
+        software = make("SW-B", CIType.SOFTWARE, system, "DAL B")
+        hardware = make("HW-B", CIType.HARDWARE, system, "DAL C")
+        component = make("CMP-B", CIType.COMPONENT, hardware)
+        document = make("DOC-B", CIType.DOCUMENT, system)
+        return {"system": system, "software": software, "hardware": hardware,
+                "component": component, "document": document}
+
+    def test_bulk_matches_single_creation(self, db: Session, ci_service, test_project, product_tree):
+        """
+        Test REQ-SM-001: Bulk creation stores the same machines as one-by-one creation.
+
+        Verification Method: Test
+        Expected: Existing machines skipped, untemplated CIs failed, others
+            created identically and listed in the work queue.
+        """
+        software = product_tree["software"]
+        ci_service.create_state_machine_for_ci_item(ci_id=software.id)
+        single = ci_service.get_ci_state_machine(software.id)["state_data"]
+
+        result = ci_service.create_state_machines_for_project(test_project.id)
+
+        assert (result["created"], result["skipped"], result["failed"]) == (3, 1, 1)
+        assert result["failures"][0]["ci_id"] == product_tree["document"].id
+
+        for model in (CICurrentActivity, CIStateMachine):
+            db.query(model).filter(model.ci_id == software.id).delete()
+        db.commit()
+        ci_service.create_state_machines_for_project(test_project.id, root_ci_id=software.id)
+        bulk = ci_service.get_ci_state_machine(software.id)["state_data"]
+        assert _strip_volatile(bulk) == _strip_volatile(single)
+
+        assert ci_service.get_project_work_queue(test_project.id)["total"] == 4
+        progress = ci_service.get_ci_progress(product_tree["component"].id)
+        assert progress["total_activities"] > 0 and progress["completed_activities"] == 0
+
+    def test_subtree_and_rerun(self, ci_service, test_project, product_tree):
+        """
+        Test REQ-SM-001: root_ci_id limits the walk; a rerun creates nothing.
+
+        Verification Method: Test
+        Expected: Only the hardware subtree first, everything skipped on rerun.
+        """
+        result = ci_service.create_state_machines_for_project(
+            test_project.id, root_ci_id=product_tree["hardware"].id
+        )
+        assert (result["created"], result["skipped"], result["failed"]) == (2, 0, 0)
+        assert ci_service.get_ci_state_machine(product_tree["system"].id) is None
+
+        again = ci_service.create_state_machines_for_project(
+            test_project.id, root_ci_id=product_tree["hardware"].id
+        )
+        assert (again["created"], again["skipped"]) == (0, 2)
+        assert ci_service.create_state_machines_for_project(test_project.id, root_ci_id=999999) is None
+
+
+class TestWorkQueue:
+    """Test the current-activity projection and the work-queue query."""
+
+    @pytest.fixture
+    def project_cis(self, ci_service, test_project):
+        cis = []
+        for index in range(3):
+            ci = ci_service.create_ci(
+                project_id=test_project.id,
+                ci_identifier=f"SW-Q{index}",
+                name=f"Queue Software {index}",
+                ci_type=CIType.SOFTWARE,
+                criticality="DAL B",
+                created_by="test_user"
+            )
+            ci_service.create_state_machine_for_ci_item(ci_id=ci.id, dal_level="DAL_B")
+            cis.append(ci)
+        return cis
+
+    def test_projection_follows_transitions(self, db: Session, ci_service, project_cis):
+        """
+        Test REQ-SM-003: The projection always holds the current activity.
+
+        Verification Method: Test
+        Expected: After each completion it matches get_ci_current_activity.
+        """
+        ci = project_cis[0]
+        for _ in range(5):
+            current = ci_service.get_ci_current_activity(ci.id)
+            row = db.query(CICurrentActivity).filter(CICurrentActivity.ci_id == ci.id).one()
+            assert row.activity_id == current["activity"]["activity_id"]
+            assert row.status == current["activity"]["status"]
+            assert row.phase_name == current["phase"]["name"]
+            ci_service.complete_activity(ci.id, current["activity"]["activity_id"])
+
+    def test_filtered_paginated_queue(self, ci_service, test_project, project_cis):
+        """
+        Test REQ-SM-003: The work queue filters, groups by phase and paginates.
+
+        Verification Method: Test
+        Expected: Status filter, per-phase counts and pages are consistent.
+        """
+        first = project_cis[0]
+        ci_service.complete_activity(first.id, ci_service.get_ci_current_activity(first.id)["activity"]["activity_id"])
+
+        queue = ci_service.get_project_work_queue(test_project.id)
+        assert queue["total"] == 3
+        assert sum(p["total"] for p in queue["by_phase"]) == 3
+
+        in_progress = ci_service.get_project_work_queue(test_project.id, statuses=["in_progress"])
+        assert sorted(item["ci_id"] for item in in_progress["items"]) == [c.id for c in project_cis[1:]]
+        assert in_progress["by_phase"][0]["by_status"] == {"in_progress": 2}
+
+        pages = [
+            ci_service.get_project_work_queue(test_project.id, limit=2, offset=offset)["items"]
+            for offset in (0, 2)
+        ]
+        assert [len(page) for page in pages] == [2, 1]
+        assert len({item["ci_id"] for page in pages for item in page}) == 3
+
+        assert ci_service.get_project_work_queue(test_project.id, phase_id="NOT_A_PHASE")["total"] == 0
+
+
+class TestOptimisticConcurrency:
+    """Test compare-and-swap transitions on the state machine version."""
+
+    def test_lost_update_is_retried(self, two_sessions):
+        """
+        Test REQ-SM-003: A transition that loses a race is re-applied.
+
+        Verification Method: Test
+        Expected: Both completions are persisted and the version advances twice.
+        """
+        first, second = two_sessions
+        calls = []
+
+        def racing_transition(controller):
+            if not calls:
+                # Another user commits between our read and our write
+                StateMachineStore(second).transact(1, _complete_current)
+            calls.append(controller.get_current_activity().activity_id)
+            return _complete_current(controller)
+
+        StateMachineStore(first).transact(1, racing_transition)
+
+        record = StateMachineStore(first).get_record(1)
+        assert len(calls) == 2 and calls[0] != calls[1]
+        assert record.version == 3
+        assert StateMachineStore(first).count_activities(record)[1] == 2
+
+    def test_inapplicable_retry_raises_conflict(self, two_sessions):
+        """
+        Test REQ-SM-003: Completing an activity someone else just completed conflicts.
+
+        Verification Method: Test
+        Expected: StateMachineConflictError carrying the committed state.
+        """
+        first, second = two_sessions
+        activity_id = StateMachineStore(first).load_current_phase(
+            StateMachineStore(first).get_record(1)
+        ).phases[0].sub_phases[0].activities[0].activity_id
+
+        def racing_transition(controller):
+            if StateMachineStore(second).get_record(1).version == 1:
+                StateMachineStore(second).transact(1, _complete_current)
+            return controller.complete_activity(activity_id)
+
+        with pytest.raises(StateMachineConflictError) as excinfo:
+            StateMachineStore(first).transact(1, racing_transition)
+
+        current = excinfo.value.current_state
+        assert current["version"] == 2
+        assert current["state_data"]["phases"][0]["sub_phases"][0]["activities"][0]["status"] == "completed"
+
+    def test_stale_header_update_rejected(self, two_sessions):
+        """
+        Test REQ-SM-003: A write based on an old version never overwrites.
+
+        Verification Method: Test
+        Expected: StaleDataError on flush, newer state kept.
+        """
+        first, second = two_sessions
+        stale = StateMachineStore(first).get_record(1)
+        StateMachineStore(second).transact(1, _complete_current)
+
+        with pytest.raises(StaleDataError):
+            StateMachineStore(first).apply(stale, _complete_current)
+        first.rollback()
+
+        assert StateMachineStore(first).get_record(1).version == 2
+
+    def test_concurrent_legacy_migration_applied_once(self, two_sessions):
+        """
+        Test REQ-SM-001: Two writers migrating the same legacy row do not duplicate it.
+
+        Verification Method: Test
+        Expected: The second migration fails with StaleDataError; one set of rows and one snapshot.
+        """
+        first, second = two_sessions
+        instance = create_state_machine_for_ci(ci_id=2, ci_type="SOFTWARE", dal_level="DAL_B")
+        first.add(CIStateMachine(guid=str(uuid.uuid4()), ci_id=2, template_id=instance.template_id,
+                                 state_data=json.dumps(instance.to_dict())))
+        first.commit()
+        stale = StateMachineStore(second).get_record(2)
+
+        assert StateMachineStore(first).migrate_legacy() == 1
+        first.commit()
+        with pytest.raises(StaleDataError):
+            StateMachineStore(second)._migrate_legacy(stale)
+        second.rollback()
+
+        record = StateMachineStore(first).get_record(2)
+        assert first.query(CIPhaseInstance).filter(CIPhaseInstance.state_machine_id == record.id).count() \
+            == len(instance.phases)
+        assert first.query(StateMachineHistory).filter(StateMachineHistory.state_machine_id == record.id).count() == 1
@@ -0,0 +1,142 @@
+"""
+Unit tests for the Process Template Registry
+DO-178C Traceability: Verification of REQ-SM-001
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from process_engine.services.template_registry import (
+    DEFAULT_TEMPLATES_DIR,
+    ProcessTemplateRegistry,
+    TemplateValidationError,
+)
+from process_engine.services.state_machine_generator import ProcessTemplateLoader, CIType
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    """Copy of the shipped templates in a writable directory."""
+    target = tmp_path / "templates"
+    shutil.copytree(DEFAULT_TEMPLATES_DIR, target)
+    return target
+
+
+@pytest.fixture
+def registry(templates_dir):
+    """Registry that re-scans on every access."""
+    registry = ProcessTemplateRegistry(templates_dir=templates_dir)
+    registry.CHECK_INTERVAL_SECONDS = 0
+    return registry
+
+
+def _touch(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestTemplateRegistry:
+    """Test indexing, validation and invalidation."""
+
+    def test_shipped_templates_are_valid_and_indexed(self, registry):
+        """
+        Test REQ-SM-001: All shipped templates validate and are indexed.
+
+        Verification Method: Test
+        Expected: Five templates, lookups by ID and CI type agree.
+        """
+        assert registry.warm() == 5
+        assert registry.get_errors() == {}
+        assert registry.get_for_ci_type("SOFTWARE") is registry.get("DO178C_SOFTWARE_V1")
+        assert {s["template_id"] for s in registry.list_summaries()} >= {
+            "ARP4754A_SYSTEM_V1", "DO254_HARDWARE_V1", "COMPONENT_PART_V1"
+        }
+
+    def test_templates_parsed_once(self, registry):
+        """
+        Test REQ-SM-001: Repeated lookups return the cached object.
+
+        Verification Method: Test
+        Expected: Same dict instance until the file changes.
+        """
+        first = registry.get("DO254_HARDWARE_V1")
+        assert registry.get("DO254_HARDWARE_V1") is first
+
+    def test_reload_on_file_change(self, registry, templates_dir):
+        """
+        Test REQ-SM-001: Editing a template file invalidates its cache entry.
+
+        Verification Method: Test
+        Expected: Updated name is returned after modification.
+        """
+        path = templates_dir / "do254_hardware_process.json"
+        assert registry.get("DO254_HARDWARE_V1")["name"] != "Edited"
+
+        template = json.loads(path.read_text())
+        template["name"] = "Edited"
+        path.write_text(json.dumps(template))
+        _touch(path)
+
+        assert registry.get("DO254_HARDWARE_V1")["name"] == "Edited"
+
+    def test_invalid_template_rejected(self, registry, templates_dir):
+        """
+        Test REQ-SM-001: Templates violating the schema are excluded.
+
+        Verification Method: Test
+        Expected: Error is reported and the template cannot be loaded.
+        """
+        path = templates_dir / "component_part_process.json"
+        template = json.loads(path.read_text())
+        del template["phases"]
+        path.write_text(json.dumps(template))
+        _touch(path)
+
+        assert "component_part_process.json" in registry.get_errors()
+        with pytest.raises(ValueError):
+            registry.get("COMPONENT_PART_V1")
+        with pytest.raises(TemplateValidationError):
+            registry.get_by_file("component_part_process.json")
+
+    def test_snapshot_warm_start(self, templates_dir, tmp_path):
+        """
+        Test REQ-SM-001: A persisted snapshot is reused by a new registry.
+
+        Verification Method: Test
+        Expected: Unchanged files are served from the snapshot without parsing.
+        """
+        snapshot = tmp_path / "templates.snapshot"
+        ProcessTemplateRegistry(templates_dir=templates_dir, snapshot_path=snapshot).warm()
+        assert snapshot.exists()
+
+        warm = ProcessTemplateRegistry(templates_dir=templates_dir, snapshot_path=snapshot)
+        warm._get_validator = lambda: pytest.fail("snapshot entries must not be re-validated")
+
+        assert warm.warm() == 5
+
+
+class TestProcessTemplateLoader:
+    """Test the loader facade over the registry."""
+
+    def test_equipment_uses_explicit_mapping(self):
+        """
+        Test REQ-SM-001: Explicit CI type mapping takes precedence.
+
+        Verification Method: Test
+        Expected: EQUIPMENT maps to the ARP4754A system process.
+        """
+        template = ProcessTemplateLoader.load_template_for_ci_type(CIType.EQUIPMENT)
+        assert template["template_id"] == "ARP4754A_SYSTEM_V1"
+
+    def test_unmapped_ci_type_raises(self):
+        """
+        Test REQ-SM-001: CI types without a template are rejected.
+
+        Verification Method: Test
+        Expected: DOCUMENT has no process template.
+        """
+        with pytest.raises(ValueError):
+            ProcessTemplateLoader.load_template_for_ci_type(CIType.DOCUMENT)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+AI Pipeline Load Harness
+DO-178C Traceability: REQ-MONITOR-002, REQ-TEST-001
+Purpose: Drive concurrent interviews and extractions through the FastAPI app
+
+Each simulated session runs a project initialization interview, a
+requirements elicitation conversation and a requirements extraction.
+By default the app is called in-process with the fake AI provider
+(AI_SERVICE=fake) and a throwaway SQLite database, so no upstream model
+or server is needed. Use --base-url to target a running server instead.
+
+Usage:
+    python scripts/ai_load_test.py --sessions 50 --concurrency 10
+    FAKE_AI_TTFT_MS=50 python scripts/ai_load_test.py --sessions 200
+    python scripts/ai_load_test.py --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+API = "/api/v1"
+
+INTERVIEW_TURNS = [
+    "A flight control computer for a small unmanned aircraft",
+    "Yes, it is safety critical",
+    "Aerospace",
+    "Both hardware and software",
+]
+
+ELICITATION_TURNS = [
+    "The system must hold altitude",
+    "It should alert the pilot when a sensor fails",
+    "Response time must be under 50 ms",
+]
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100.0 * len(ordered)) - 1)]
+
+
+class LoadStats:
+    """Collects per-operation latencies and errors."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def timed(self, name: str, client, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            self.errors[name] += 1
+            return None
+        finally:
+            self.latencies[name].append((time.perf_counter() - started) * 1000)
+
+    def report(self, elapsed: float) -> None:
+        total = sum(len(v) for v in self.latencies.values())
+        print(f"\n{'operation':<28}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for name, samples in sorted(self.latencies.items()):
+            print(
+                f"{name:<28}{len(samples):>7}{self.errors[name]:>8}"
+                f"{percentile(samples, 50):>10.1f}{percentile(samples, 99):>10.1f}"
+                f"{sum(samples) / len(samples):>10.1f}"
+            )
+        print(f"\nRequests: {total}  Elapsed: {elapsed:.2f}s  Throughput: {total / elapsed:.1f} req/s")
+
+
+async def run_session(client, stats: LoadStats, index: int) -> None:
+    """One end-to-end user session: interview, elicitation, extraction."""
+    project_id: Optional[int] = None
+    conversation_id: Optional[int] = None
+    for turn in INTERVIEW_TURNS:
+        result = await stats.timed(
+            "initialization_interview", client, "POST", f"{API}/projects/initialize",
+            json={
+                "project_id": project_id,
+                "conversation_id": conversation_id,
+                "user_input": f"{turn} (session {index})"
+            }
+        )
+        if result is None:
+            return
+        project_id, conversation_id = result["project_id"], result["conversation_id"]
+
+    conversation = await stats.timed(
+        "create_conversation", client, "POST", f"{API}/conversations",
+        json={"project_id": project_id}
+    )
+    if conversation is None:
+        return
+
+    conversation_id = conversation["conversation_id"]
+    for turn in ELICITATION_TURNS:
+        await stats.timed(
+            "requirements_elicitation", client, "POST",
+            f"{API}/conversations/{conversation_id}/messages",
+            params={"message": turn}
+        )
+
+    await stats.timed(
+        "requirements_extraction", client, "POST",
+        f"{API}/conversations/{conversation_id}/extract"
+    )
+
+
+async def run(args) -> None:
+    import httpx
+
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from database.connection import init_db
+        from main import app
+
+        init_db()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    stats = LoadStats()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=300.0) as client:
+        async def bounded(index: int) -> None:
+            async with semaphore:
+                await run_session(client, stats, index)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+
+        stats.report(elapsed)
+
+        metrics = (await client.get(f"{API}/metrics/ai")).json()
+        print(f"\n{'AI call site':<28}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'out tok':>10}")
+        for name, site in metrics["call_sites"].items():
+            print(
+                f"{name:<28}{site['calls']:>7}{site['errors']:>8}"
+                f"{site['wall_time_ms']['p50'] or 0:>10.1f}{site['wall_time_ms']['p99'] or 0:>10.1f}"
+                f"{site['output_tokens']['sum']:>10.0f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AISET AI pipeline load harness")
+    parser.add_argument("--sessions", type=int, default=20, help="Number of user sessions")
+    parser.add_argument("--concurrency", type=int, default=5, help="Concurrent sessions")
+    parser.add_argument("--base-url", default="", help="Target a running server instead of in-process app")
+    args = parser.parse_args()
+
+    if not args.base_url:
+        # In-process run: fake provider and a throwaway database
+        db_path = os.path.join(tempfile.mkdtemp(prefix="aiset-load-"), "load.db")
+        os.environ.setdefault("AI_SERVICE", "fake")
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path}?check_same_thread=false")
+        os.environ.setdefault("SECRET_KEY", "load-test-secret-key")
+        os.environ.setdefault("ENABLE_AUDIT_TRAIL", "False")
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
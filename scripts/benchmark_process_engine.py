@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Process Engine Benchmarks
+DO-178C Traceability: REQ-SM-001
+Purpose: Measure state machine generation, serialization, answer
+validation and document rendering throughput
+
+Usage:
+    python scripts/benchmark_process_engine.py generate --cis 5000
+    python scripts/benchmark_process_engine.py codec --iterations 2000
+    python scripts/benchmark_process_engine.py memory --cis 5000
+    python scripts/benchmark_process_engine.py validation --answers 50000
+    python scripts/benchmark_process_engine.py documents --requirements 200
+    python scripts/benchmark_process_engine.py package --requirements 2000 --workers 3
+    python scripts/benchmark_process_engine.py compliance --requirements 20000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from process_engine.services.state_machine_generator import (  # noqa: E402
+    CIType,
+    ProcessPrototype,
+    StateMachineController,
+    StateMachineGenerator,
+)
+from process_engine.services import state_codec  # noqa: E402
+from process_engine.services.data_capture import DataCaptureService, ValidationPipeline  # noqa: E402
+from process_engine.services.artifact_generator import (  # noqa: E402
+    DocumentJob,
+    DocumentTemplateEnvironment,
+    init_render_worker,
+    render_document,
+)
+
+CI_TYPES = ["SYSTEM", "SUBSYSTEM", "SOFTWARE", "HARDWARE", "ASSEMBLY", "COMPONENT", "PART"]
+DAL_LEVELS = ["DAL_A", "DAL_B", "DAL_C", "DAL_D", None]
+
+
+def build_product_structure(count: int):
+    """Synthetic product structure cycling through CI types and DAL levels."""
+    return [
+        {"id": i, "type": CI_TYPES[i % len(CI_TYPES)], "dal_level": DAL_LEVELS[i % len(DAL_LEVELS)]}
+        for i in range(count)
+    ]
+
+
+def bench_generate(args) -> None:
+    structure = build_product_structure(args.cis)
+    generator = StateMachineGenerator()
+
+    # Unspecialized baseline: DAL filtering re-resolved for every CI
+    started = time.perf_counter()
+    for ci in structure:
+        ci_type = CIType(ci["type"])
+        template = generator._resolve_template(ci_type, None)
+        ProcessPrototype(
+            template_id=template["template_id"],
+            template_name=template["name"],
+            dal_level=ci["dal_level"],
+            phases=tuple(generator._generate_phases(template, ci["dal_level"]))
+        ).instantiate(ci["id"], ci_type)
+    baseline = time.perf_counter() - started
+
+    started = time.perf_counter()
+    instances = generator.generate_for_product_structure(structure)
+    elapsed = time.perf_counter() - started
+
+    activities = sum(
+        len(sp.activities)
+        for sm in instances.values() for p in sm.phases for sp in p.sub_phases
+    )
+    print(f"CIs: {len(instances)}  activities: {activities}")
+    print(f"per-CI specialization: {args.cis / baseline:>10.0f} instances/s")
+    print(f"cached prototypes:     {args.cis / elapsed:>10.0f} instances/s")
+
+
+def _timed(iterations: int, fn) -> float:
+    """Operations per second of fn over the given iterations."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def bench_codec(args) -> None:
+    # Largest template (ARP4754A system, DAL A), half-way through its activities
+    instance = StateMachineGenerator().generate_for_ci(1, CIType.SYSTEM, "DAL_A")
+    controller = StateMachineController(instance)
+    controller.start_phase(0)
+    total = sum(len(sp.activities) for p in instance.phases for sp in p.sub_phases)
+    for step in range(total // 2):
+        controller.complete_activity(controller.get_current_activity().activity_id, {"step": step})
+
+    verbose = json.dumps(instance.to_dict())
+    compact = state_codec.encode_instance(instance)
+    backend = "orjson" if state_codec.orjson is not None else "json"
+
+    print(f"template: {instance.template_id}  activities: {total}  backend: {backend}")
+    print(f"size      dict+json: {len(verbose.encode('utf-8')):>8} bytes   compact: {len(compact):>8} bytes")
+
+    rows = [
+        ("encode", lambda: json.dumps(instance.to_dict()), lambda: state_codec.encode_instance(instance)),
+        ("decode", lambda: state_codec.instance_from_dict(json.loads(verbose)),
+         lambda: state_codec.decode_instance(compact)),
+    ]
+    for name, baseline, candidate in rows:
+        print(
+            f"{name:<8}  dict+json: {_timed(args.iterations, baseline):>8.0f} ops/s"
+            f"   compact: {_timed(args.iterations, candidate):>8.0f} ops/s"
+        )
+
+
+def bench_memory(args) -> None:
+    structure = build_product_structure(args.cis)
+    generator = StateMachineGenerator()
+    # Build prototypes first so only per-instance allocations are measured
+    generator.generate_for_product_structure(structure[:len(CI_TYPES) * len(DAL_LEVELS)])
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = generator.generate_for_product_structure(structure)
+
+    # Walk every tenth machine half-way so timestamps and completion data count too
+    for ci_id in range(0, args.cis, 10):
+        controller = StateMachineController(instances[ci_id])
+        controller.start_phase(0)
+        total = sum(len(sp.activities) for p in instances[ci_id].phases for sp in p.sub_phases)
+        for step in range(total // 2):
+            controller.complete_activity(controller.get_current_activity().activity_id, {"step": step})
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    activities = sum(
+        len(sp.activities)
+        for sm in instances.values() for p in sm.phases for sp in p.sub_phases
+    )
+    print(f"CIs: {len(instances)}  activities: {activities}")
+    print(f"per instance: {allocated / len(instances):>10.0f} bytes")
+    print(f"per activity: {allocated / activities:>10.1f} bytes")
+
+
+def bench_validation(args) -> None:
+    # Rules of a typical text question (see PI-001): required, lengths, pattern
+    rules = [
+        {"type": "required", "params": {}},
+        {"type": "min_length", "params": {"min": 3}},
+        {"type": "max_length", "params": {"max": 255}},
+        {"type": "pattern", "params": {"pattern": "^[a-zA-Z0-9][a-zA-Z0-9\\s\\-_]+$"}},
+    ]
+    # A spreadsheet column: mostly valid names, every seventh one invalid
+    values = [f"Project {i}" if i % 7 else f"#{i}" for i in range(args.answers)]
+
+    service = DataCaptureService()
+    started = time.perf_counter()
+    per_call = [service.validate(value, rules) for value in values]
+    baseline = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = ValidationPipeline(rules).validate_many(values)
+    elapsed = time.perf_counter() - started
+
+    assert [len(e) for e in per_call] == [len(e) for e in batch]
+    invalid = sum(1 for errors in batch if errors)
+    print(f"answers: {len(values)}  invalid: {invalid}")
+    print(f"compile per answer: {len(values) / baseline:>10.0f} answers/s")
+    print(f"compiled pipeline:  {len(values) / elapsed:>10.0f} answers/s")
+
+
+def _document_data(count: int):
+    """A synthetic project and its requirements, as template data."""
+    types = ["functional", "performance", "interface", "safety", "reliability"]
+    project = SimpleNamespace(
+        name="Flight Control Computer", project_code="FCC-01", description="Benchmark project",
+        domain="aerospace", product_type="avionics", dal_level="DAL_B", safety_critical=True,
+        initialization_context={"development_process": "v_model", "current_lifecycle_phase": "requirements"},
+    )
+    requirements = [
+        SimpleNamespace(
+            id=i, requirement_id=f"REQ-{i:04d}", type=types[i % len(types)], priority="High",
+            title=f"Requirement {i}", description=f"The system shall satisfy requirement {i}.",
+            rationale="Derived from system need", source="SYS-001", safety_impact="Minor" if i % 3 else None,
+        )
+        for i in range(count)
+    ]
+    return project, requirements
+
+
+def bench_documents(args) -> None:
+    project, requirements = _document_data(args.requirements)
+    context = {
+        "project": project,
+        "requirements": requirements,
+        "standards": [{"name": "DO-178C", "version": "2011"}],
+        "document": {"version": 1, "generated_at": datetime.utcnow(), "status": "draft"},
+    }
+    name = "SRS_template.md"
+
+    def fresh():
+        # What each request used to do: new environment, compile, render
+        DocumentTemplateEnvironment().get_template(name).render(**context)
+
+    def compile_only():
+        DocumentTemplateEnvironment().get_template(name)
+
+    bytecode_dir = tempfile.mkdtemp(prefix="aiset-bench-")
+    DocumentTemplateEnvironment(bytecode_cache_dir=bytecode_dir).warm()
+
+    def load_bytecode():
+        # A new worker with the shared bytecode cache
+        DocumentTemplateEnvironment(bytecode_cache_dir=bytecode_dir).get_template(name)
+
+    shared = DocumentTemplateEnvironment()
+    template = shared.get_template(name)
+
+    def cached():
+        shared.get_template(name).render(**context)
+
+    fresh_rate = _timed(args.iterations, fresh)
+    compile_rate = _timed(args.iterations, compile_only)
+    bytecode_rate = _timed(args.iterations, load_bytecode)
+    shutil.rmtree(bytecode_dir, ignore_errors=True)
+    render_rate = _timed(args.iterations, lambda: template.render(**context))
+    cached_rate = _timed(args.iterations, cached)
+
+    print(f"template: {name}  requirements: {args.requirements}")
+    print(f"compile only:            {1000 / compile_rate:>8.3f} ms")
+    print(f"load from bytecode:      {1000 / bytecode_rate:>8.3f} ms")
+    print(f"render only:             {1000 / render_rate:>8.3f} ms")
+    print(f"fresh environment:       {1000 / fresh_rate:>8.3f} ms/document")
+    print(f"shared environment:      {1000 / cached_rate:>8.3f} ms/document")
+    print(f"render share (shared):   {100 * cached_rate / render_rate:>8.1f} %")
+
+
+def bench_package(args) -> None:
+    project, requirements = _document_data(args.requirements)
+    traces = [
+        {"type": "requirement_design", "requirement_id": r.requirement_id, "design_ids": [f"COMP-{r.id % 50:03d}"]}
+        for r in requirements[::2]
+    ]
+    unallocated = [{"requirement_id": r.requirement_id, "title": r.title} for r in requirements[1::2]]
+    gaps = {"requirements_without_design": unallocated, "requirements_without_tests": unallocated}
+    datasets = {
+        "SRS_template.md": {"project": project, "requirements": requirements, "standards": []},
+        "RTM_template.md": {"project": project, "requirements": requirements, "traces": traces,
+                            "gaps": gaps, "coverage": {"total_requirements": len(requirements)}},
+        "Gap_Analysis_template.md": {"project": project, "gaps": gaps,
+                                     "summary": {"total_requirements": len(requirements)}},
+    }
+    jobs = [
+        DocumentJob(document_id=name, document_type=name, title=name, template=name, template_version="bench",
+                    data=data, version=1, source_data_hash="")
+        for name, data in datasets.items()
+    ]
+
+    slowest = 0.0
+    started = time.perf_counter()
+    for job in jobs:
+        job_started = time.perf_counter()
+        render_document(job)
+        slowest = max(slowest, time.perf_counter() - job_started)
+    serial = time.perf_counter() - started
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(args.workers, mp_context=context, initializer=init_render_worker) as pool:
+        list(pool.map(render_document, jobs))  # start and warm the workers
+        started = time.perf_counter()
+        list(pool.map(render_document, jobs))
+        parallel = time.perf_counter() - started
+
+    print(f"documents: {len(jobs)}  requirements: {args.requirements}  workers: {args.workers}  cpus: {os.cpu_count()}")
+    print(f"slowest document:   {slowest * 1000:>9.1f} ms")
+    print(f"serial package:     {serial * 1000:>9.1f} ms")
+    print(f"process pool:       {parallel * 1000:>9.1f} ms")
+
+
+def bench_compliance(args) -> None:
+    # The application engine is never used; the benchmark builds its own in-memory database
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/aiset_benchmark.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("ENABLE_AUDIT_TRAIL", "False")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+    from database.connection import Base
+    from models import (CIStateMachine, ConfigurationItem, DesignComponent, Project, Requirement,
+                        RequirementDesignTrace, RequirementTestTrace, TestCase)
+    from models.project import CIPhaseInstance
+    from services.compliance_reporting_service import ComplianceReportingService
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    n = args.requirements
+    components, tests, cis = max(n // 10, 1), max(n // 2, 1), max(n // 100, 1)
+    types = ["FUNCTIONAL", "PERFORMANCE", "INTERFACE", "SAFETY"]
+    priorities = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+    statuses = ["DRAFT", "APPROVED", "VERIFIED"]
+    with Session(engine) as db:
+        project = Project(name="Benchmark", project_code="BENCH", created_by="bench")
+        db.add(project)
+        db.flush()
+        pid = project.id
+        db.execute(insert(Requirement), [
+            {"project_id": pid, "requirement_id": f"REQ-{i:06d}", "title": f"Requirement {i}", "description": "-",
+             "type": types[i % 4], "priority": priorities[i % 4], "status": statuses[i % 3],
+             "rationale": "-" if i % 2 else None}
+            for i in range(1, n + 1)
+        ])
+        db.execute(insert(DesignComponent), [
+            {"project_id": pid, "component_id": f"COMP-{i:06d}", "name": f"C{i}", "description": "-",
+             "type": "MODULE", "file_path": f"c{i}.py" if i % 3 else None}
+            for i in range(1, components + 1)
+        ])
+        db.execute(insert(TestCase), [
+            {"project_id": pid, "test_id": f"TEST-{i:06d}", "title": f"T{i}", "description": "-",
+             "type": "UNIT", "status": ["PASSED", "FAILED", "NOT_RUN"][i % 3]}
+            for i in range(1, tests + 1)
+        ])
+        db.execute(insert(RequirementDesignTrace), [
+            {"requirement_id": i, "design_component_id": i % components + 1} for i in range(1, n + 1, 2)
+        ])
+        db.execute(insert(RequirementTestTrace), [
+            {"requirement_id": i, "test_case_id": i % tests + 1} for i in range(1, n + 1, 3)
+        ])
+        db.execute(insert(ConfigurationItem), [
+            {"guid": f"ci-{i}", "ci_identifier": f"CI-{i}", "project_id": pid, "name": f"CI {i}"}
+            for i in range(1, cis + 1)
+        ])
+        db.execute(insert(CIStateMachine), [
+            {"guid": f"sm-{i}", "ci_id": i, "project_id": pid, "template_id": "do178c_software_process"}
+            for i in range(1, cis + 1)
+        ])
+        db.execute(insert(CIPhaseInstance), [
+            {"state_machine_id": i, "ci_id": i, "phase_id": f"PH_{p}", "phase_name": p, "phase_order": order,
+             "status": "completed" if order < 2 else "not_started",
+             "deliverables": [{"deliverable_id": f"DEL_{p}", "name": p}], "reviews": []}
+            for i in range(1, cis + 1)
+            for order, p in enumerate(["SW_PLANNING", "SW_REQUIREMENTS", "SW_DESIGN", "SW_CERTIFICATION"])
+        ])
+        db.commit()
+
+        service = ComplianceReportingService(db)
+        reports = [
+            service.generate_requirements_coverage_report,
+            service.generate_traceability_report,
+            lambda pid: service.generate_process_compliance_report(pid),
+            service.generate_verification_status_report,
+            service.generate_configuration_management_report,
+            service.generate_quality_metrics_report,
+            lambda pid: service.generate_do178c_compliance_report(pid, "B"),
+        ]
+        separate = _timed(args.iterations, lambda: [report(pid) for report in reports])
+        shared = _timed(args.iterations, lambda: service.generate_all_compliance_reports(pid, dal_level="B"))
+
+    print(f"requirements: {n}  design components: {components}  test cases: {tests}  CIs: {cis}")
+    print(f"7 reports, snapshot each:   {1000 / separate:>9.1f} ms")
+    print(f"all reports, one snapshot:  {1000 / shared:>9.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AISET process engine benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    generate = sub.add_parser("generate", help="State machine instantiation throughput")
+    generate.add_argument("--cis", type=int, default=5000)
+    generate.set_defaults(func=bench_generate)
+
+    codec = sub.add_parser("codec", help="State machine encode/decode throughput")
+    codec.add_argument("--iterations", type=int, default=2000)
+    codec.set_defaults(func=bench_codec)
+
+    memory = sub.add_parser("memory", help="Resident bytes per state machine instance")
+    memory.add_argument("--cis", type=int, default=5000)
+    memory.set_defaults(func=bench_memory)
+
+    validation = sub.add_parser("validation", help="Answer validation throughput")
+    validation.add_argument("--answers", type=int, default=50000)
+    validation.set_defaults(func=bench_validation)
+
+    documents = sub.add_parser("documents", help="Document template compile vs render time")
+    documents.add_argument("--requirements", type=int, default=200)
+    documents.add_argument("--iterations", type=int, default=200)
+    documents.set_defaults(func=bench_documents)
+
+    package = sub.add_parser("package", help="Certification package wall time, serial vs process pool")
+    package.add_argument("--requirements", type=int, default=2000)
+    package.add_argument("--workers", type=int, default=3)
+    package.set_defaults(func=bench_package)
+
+    compliance = sub.add_parser("compliance", help="Compliance report generation time")
+    compliance.add_argument("--requirements", type=int, default=20000)
+    compliance.add_argument("--iterations", type=int, default=5)
+    compliance.set_defaults(func=bench_compliance)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()